@@ -94,9 +94,49 @@ EVENT_ACTIONS = (
 
 # Discord
 DISCORD_API_BASE_URL = "https://discord.com/api/v10"
+# Discord HTTP client. A single keep-alive connection pool is shared by every
+# Discord client in the process; its size should match gunicorn's ``--threads``
+# so each worker thread can hold a connection without waiting for another.
+DISCORD_HTTP_POOL_SIZE_DEFAULT = 4
+DISCORD_HTTP_CONNECT_TIMEOUT = 3.05  # Seconds to establish the TCP+TLS connection.
+DISCORD_HTTP_READ_TIMEOUT = 10  # Seconds to wait for Discord's response.
+# Discord rate limits. Requests are delayed *before* they would exceed a known
+# bucket, but never by more than the max wait: beyond that the call fails fast
+# with a 429 DiscordAPIError rather than parking a web worker thread.
+DISCORD_GLOBAL_RATE_LIMIT = 50  # Requests per second allowed per bot token.
+DISCORD_RATE_LIMIT_MAX_WAIT = 5  # Seconds a single request may be held back.
+# Discord circuit breaker. When enough of the last calls failed (network error,
+# timeout, 5xx) or were slow, calls fail fast for a cooldown instead of tying up
+# web worker threads; a few probe calls then decide whether Discord is back.
+DISCORD_BREAKER_WINDOW = 20  # Most recent calls the rates are computed over.
+DISCORD_BREAKER_MIN_CALLS = 10  # Calls needed in the window before it may open.
+DISCORD_BREAKER_FAILURE_RATE = 0.5  # Share of failed calls that opens the circuit.
+DISCORD_BREAKER_SLOW_CALL_SECONDS = 5.0  # A call taking longer counts as slow.
+DISCORD_BREAKER_SLOW_CALL_RATE = 0.8  # Share of slow calls that opens the circuit.
+DISCORD_BREAKER_OPEN_SECONDS = 30  # Cooldown before probing Discord again.
+DISCORD_BREAKER_PROBES = 2  # Successful probes needed to close the circuit.
+# Independent Discord calls of one flow (e.g. deleting a game's channel and its
+# role) run concurrently on at most this many threads; keep it within the pool.
+DISCORD_FAN_OUT_WORKERS = 4
 PLAYER_ROLE_PERMISSION = "563362270661696"
 GM_ROLE_PERMISSION = "2815265163693120"
 
+# Guild member sweep. ``GET /guilds/{id}/members`` returns at most this many
+# members per page; the whole guild is paged through with ``after=<last id>``.
+# The bot needs the privileged "Server Members" intent for this endpoint.
+DISCORD_MEMBERS_PAGE_SIZE = 1000
+
+# Discord Gateway (optional push worker, see website/gateway.py). Only the
+# GUILDS and GUILD_MEMBERS intents are requested; GUILD_MEMBERS is the same
+# privileged "Server Members" intent the member sweep already needs.
+DISCORD_GATEWAY_QUERY = "?v=10&encoding=json"
+DISCORD_GATEWAY_INTENTS = (1 << 0) | (1 << 1)  # GUILDS | GUILD_MEMBERS
+DISCORD_GATEWAY_CONNECT_TIMEOUT = 10  # Seconds to open the socket and receive HELLO.
+DISCORD_GATEWAY_POLL_INTERVAL = 1.0  # Longest wait on the socket before checking for shutdown.
+# Reconnect backoff (seconds), doubled after each failed connection.
+DISCORD_GATEWAY_RECONNECT_MIN_DELAY = 1
+DISCORD_GATEWAY_RECONNECT_MAX_DELAY = 60
+
 # Discord role limits
 # A Discord guild is hard-capped at 250 roles. When the count nears this limit,
 # the scheduler auto-enables direct per-player channel permissions for new games
@@ -104,8 +144,15 @@ GM_ROLE_PERMISSION = "2815265163693120"
 # admin-configurable (DB-backed); this constant is only its default value.
 DISCORD_ROLE_LIMIT = 250
 DISCORD_ROLE_AUTO_THRESHOLD_DEFAULT = 230
-# How long (seconds) to cache the guild role count shown on the admin settings page.
-DISCORD_ROLE_COUNT_CACHE_TIMEOUT = 3600
+
+# Guild snapshot: the guild's roles and channels, cached together in Redis and
+# edited in place when the app creates or deletes one. It is refetched from
+# Discord when it expires (seconds) or on an explicit reconcile.
+DISCORD_GUILD_SNAPSHOT_TIMEOUT = 3600
+
+# How long (seconds) the fingerprint of a posted announcement is remembered. An
+# edit rendering the same embed and buttons within that time is not sent.
+DISCORD_EMBED_FINGERPRINT_TIMEOUT = 86400
 
 # Discord channel categories
 DISCORD_CATEGORY_CHANNEL_LIMIT = 50  # Discord hard cap: channels per category.
@@ -115,6 +162,25 @@ DISCORD_CATEGORY_AUTO_THRESHOLD_DEFAULT = 45
 DISCORD_CHANNEL_TYPE_TEXT = 0  # Discord channel type: GUILD_TEXT.
 DISCORD_CHANNEL_TYPE_CATEGORY = 4  # Discord channel type: GUILD_CATEGORY.
 
+# Discord outbox. Discord side effects of game changes are written to the
+# discord_outbox table in the same transaction and sent by a background
+# dispatcher, so Discord latency never shows up as page latency.
+OUTBOX_DISPATCH_INTERVAL = 2  # Seconds between dispatcher runs.
+OUTBOX_BATCH_SIZE = 50  # Most operations sent per dispatcher run.
+OUTBOX_MAX_ATTEMPTS = 8  # Attempts before an operation is dead-lettered.
+OUTBOX_BACKOFF_BASE = 5  # Seconds before the first retry, doubled on each failure.
+OUTBOX_BACKOFF_MAX = 600  # Upper bound (seconds) for the retry delay.
+# How long (seconds) a claimed operation is hidden from other dispatchers. Must
+# outlast one Discord call including its own retries and rate-limit waits.
+OUTBOX_LEASE_SECONDS = 120
+OUTBOX_RETENTION_DAYS = 7  # Sent operations are pruned after this many days.
+# Announcement edits queued within this many seconds of each other are sent as a
+# single PATCH rendering the game's latest state.
+OUTBOX_ANNONCE_DEBOUNCE = 5
+# Player changes of a direct-permission game queued within this many seconds of
+# each other are applied to its channel as a single overwrite sync.
+OUTBOX_ACCESS_SYNC_DEBOUNCE = 2
+
 # Category name templates, keyed by game type. ``{n}`` is the per-type sequence number.
 CATEGORY_NAME_TEMPLATES = {
     GAME_TYPE_CAMPAIGN: "🎲 CAMPAGNES {n} 📖",
@@ -153,7 +219,11 @@ BADGE_CAMPAIGN_GM_ID = 4
 
 # Discord
 DEFAULT_AVATAR = "/static/img/avatar.webp"
-AVATAR_BASE_URL = "https://cdn.discordapp.com/avatars/{}/{}"
+# Avatar URLs are built from the hashes in member payloads (no CDN probe). Hashes
+# starting with "a_" are animated and served as GIF.
+DISCORD_CDN_URL = "https://cdn.discordapp.com"
+AVATAR_BASE_URL = DISCORD_CDN_URL + "/avatars/{user_id}/{hash}.{ext}"
+GUILD_AVATAR_URL = DISCORD_CDN_URL + "/guilds/{guild_id}/users/{user_id}/avatars/{hash}.{ext}"
 
 # Pagination
 GAMES_PER_PAGE = 12  # Default card-grid page size; admin-overridable at runtime.
@@ -164,10 +234,14 @@ API_MAX_PER_PAGE = 100
 ADMIN_PAGE_SIZE = 25
 
 # User profile refresh (scheduler, admin-configurable). The refresh job fetches
-# each sampled profile from Discord sequentially, so a large batch bursts many
+# the stalest profiles from Discord sequentially, so a large batch bursts many
 # requests back-to-back and trips Discord's per-route rate limits. Keep it modest.
+# The batch grows past the configured size when needed to refresh every active
+# user within PROFILE_REFRESH_WINDOW_HOURS, and shrinks to the member route's
+# remaining rate-limit budget when other traffic is draining it.
 PROFILE_REFRESH_BATCH_SIZE_DEFAULT = 20  # Active users refreshed per run.
 PROFILE_REFRESH_BATCH_SIZE_MAX = 100  # Upper bound for the admin-configurable batch size.
+PROFILE_REFRESH_WINDOW_HOURS = 24  # Every active profile is refreshed at least this often.
 
 # Dashboard (admin-configurable limits use the *_DEFAULT values as fallbacks).
 DASHBOARD_AGENDA_LIMIT_DEFAULT = 10  # Upcoming sessions listed in the agenda.
@@ -177,6 +251,15 @@ DASHBOARD_AGENDA_PAST = 3  # Recent past sessions shown before the upcoming ones
 DASHBOARD_RYTHME_MONTHS = 12  # Months of activity shown in the "Rythme" chart.
 DASHBOARD_TOP_SYSTEMS = 3  # Number of systems listed in each "Top systèmes" ranking.
 DASHBOARD_STATS_CACHE_TIMEOUT = 300  # Seconds to cache a user's computed dashboard stats.
+STATS_REFRESH_INTERVAL = 30  # Seconds between recomputations of flagged user_stats rows.
+STATS_REFRESH_BATCH_SIZE = 100  # Most user_stats rows (and their co-play edges) per run.
+TABLE_MATES_LIMIT_DEFAULT = 10  # Table-mates listed by the "frequent table-mates" API.
+TABLE_MATES_LIMIT_MAX = 50  # Upper bound for the table-mates ``limit`` query parameter.
+
+# Trophy leaderboards (Redis sorted sets, see website/utils/leaderboard.py).
+LEADERBOARD_LIMIT_DEFAULT = 10  # Entries listed by the per-trophy leaderboard API.
+LEADERBOARD_LIMIT_MAX = 100  # Upper bound for its ``limit`` query parameter.
+LEADERBOARD_REBUILD_TIMEOUT = 60  # Seconds a rebuild may take before another one can start.
 
 # Game sessions
 # Upper bound (hours) for a single play session. Guards against date-entry typos
@@ -203,8 +286,21 @@ HUMAN_TIMEFORMAT = "%a %d/%m - %Hh%M"
 MSG_ADMIN_ACCESS_REQUIRED = "Admin access required."
 
 # Cache Timeouts (seconds)
+# A *_SOFT_TIMEOUT is how long a value is served before one request refreshes it
+# while the others keep the stale copy (see website/utils/single_flight.py).
 CACHE_USER_PROFILE_TIMEOUT = 60 * 60 * 24  # 24 hours
+CACHE_USER_PROFILE_SOFT_TIMEOUT = 60 * 60 * 12  # 12 hours
 CACHE_USER_PROFILE_404_TIMEOUT = 60 * 60 * 24 * 7  # 7 days
+CACHE_USER_ROLES_TIMEOUT = 300  # 5 minutes
+CACHE_USER_ROLES_SOFT_TIMEOUT = 240  # 4 minutes
+# How long an indexed member's roles are trusted for authorization before
+# Discord is asked again (the role cache TTL the index replaced).
+GUILD_MEMBER_INDEX_MAX_AGE = CACHE_USER_ROLES_TIMEOUT
+# Single-flight cache misses: how long the fetching caller holds its lock, how
+# long the other callers wait for its result, and how often they check for it.
+SINGLE_FLIGHT_LOCK_TIMEOUT = 15  # Longer than a Discord call with its timeouts.
+SINGLE_FLIGHT_WAIT = 2.0
+SINGLE_FLIGHT_POLL_INTERVAL = 0.05
 
 # Error Templates
 TEMPLATE_403 = "403.html"
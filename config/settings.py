@@ -23,7 +23,31 @@ class Settings:
     DISCORD_PLAYER_ROLE_ID = os.environ.get("DISCORD_PLAYER_ROLE_ID")
     POSTS_CHANNEL_ID = os.environ.get("POSTS_CHANNEL_ID")
     ADMIN_CHANNEL_ID = os.environ.get("ADMIN_CHANNEL_ID")
-    SQLALCHEMY_DATABASE_URI = f"""postgresql://{os.environ.get("POSTGRES_USER")}:{os.environ.get("POSTGRES_PASSWORD")}@{os.environ.get("POSTGRES_HOST")}:5432/{os.environ.get("POSTGRES_DB")}"""
+    # Discord HTTP pool (see website/client/discord.py); match gunicorn --threads.
+    DISCORD_HTTP_POOL_SIZE = int(os.environ.get("QM_DISCORD_POOL_SIZE", "4"))
+    DISCORD_HTTP_CONNECT_TIMEOUT = float(os.environ.get("QM_DISCORD_CONNECT_TIMEOUT", "3.05"))
+    DISCORD_HTTP_READ_TIMEOUT = float(os.environ.get("QM_DISCORD_READ_TIMEOUT", "10"))
+    # REST API root override, e.g. the local stub in tests/discord_stub.py; default:
+    # Discord.
+    DISCORD_API_BASE_URL = os.environ.get("QM_DISCORD_API_BASE_URL")
+    # How user profiles are refreshed from Discord: "sample" (default) fetches the
+    # least recently refreshed members one by one and re-checks inactive users daily;
+    # "sweep" pages through the whole guild member list instead (opt-in: needs the
+    # bot's "Server Members" intent).
+    PROFILE_REFRESH_MODE = os.environ.get("QM_PROFILE_REFRESH_MODE", "sample")
+    # Background sender of queued Discord operations (see website/services/discord_outbox.py).
+    OUTBOX_DISPATCH_ENABLED = os.environ.get("QM_OUTBOX_DISPATCH", "1") != "0"
+    # Background recomputation of flagged dashboard statistics (see website/services/stats.py).
+    STATS_REFRESH_ENABLED = os.environ.get("QM_STATS_REFRESH", "1") != "0"
+    # Set when the Discord Gateway worker (``flask discord-gateway``) runs: member
+    # and role changes are then pushed, so the scheduler stops polling them.
+    GATEWAY_ENABLED = os.environ.get("QM_GATEWAY", "0") == "1"
+    # Gateway URL override, e.g. a local stub gateway (default: asked from Discord).
+    DISCORD_GATEWAY_URL = os.environ.get("QM_DISCORD_GATEWAY_URL")
+    SQLALCHEMY_DATABASE_URI = (
+        f"postgresql://{os.environ.get('POSTGRES_USER')}:{os.environ.get('POSTGRES_PASSWORD')}"
+        f"@{os.environ.get('POSTGRES_HOST')}:5432/{os.environ.get('POSTGRES_DB')}"
+    )
     CACHE_TYPE = "RedisCache"
     CACHE_REDIS_HOST = os.environ.get("REDIS_HOST")
     CACHE_REDIS_PORT = 6379
@@ -0,0 +1,49 @@
+"""Add the discord_outbox table for deferred Discord side effects
+
+Game changes enqueue their Discord calls (role grants, embed updates, channel
+and role clean-up) here in the same transaction; a background dispatcher sends
+them with retries. ``game_id`` is intentionally not a foreign key: clean-up
+operations must survive the deletion of their game.
+
+Revision ID: a1b2c3d4e5f7
+Revises: f7a8b9c0d1e2
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "a1b2c3d4e5f7"
+down_revision = "f7a8b9c0d1e2"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "discord_outbox",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("game_id", sa.Integer(), nullable=True),
+        sa.Column("action", sa.String(length=32), nullable=False),
+        sa.Column("payload", sa.JSON(), nullable=False),
+        sa.Column("status", sa.String(length=16), nullable=False),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column("next_attempt_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("last_error", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("processed_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_index(
+        "ix_discord_outbox_status_next_attempt",
+        "discord_outbox",
+        ["status", "next_attempt_at"],
+    )
+    op.create_index("ix_discord_outbox_game_id", "discord_outbox", ["game_id", "id"])
+
+
+def downgrade():
+    op.drop_index("ix_discord_outbox_game_id", table_name="discord_outbox")
+    op.drop_index("ix_discord_outbox_status_next_attempt", table_name="discord_outbox")
+    op.drop_table("discord_outbox")
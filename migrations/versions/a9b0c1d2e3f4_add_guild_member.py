@@ -0,0 +1,34 @@
+"""Add the guild_member table recording which members the role index covers
+
+A member holding no role has no guild_member_role row, so role lookups could
+not tell them from a member the index had not seen and called Discord every
+time. Members are recorded here by the next member sweep or Gateway event;
+until then they keep falling back to the Discord lookup, so no backfill is
+needed.
+
+Revision ID: a9b0c1d2e3f4
+Revises: f8a9b0c1d2e3
+Create Date: 2026-10-18 22:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "a9b0c1d2e3f4"
+down_revision = "f8a9b0c1d2e3"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "guild_member",
+        sa.Column("user_id", sa.String(), primary_key=True),
+        sa.Column("indexed_at", sa.DateTime(timezone=True), nullable=False),
+    )
+
+
+def downgrade():
+    op.drop_table("guild_member")
@@ -0,0 +1,55 @@
+"""Index user_stats.valid_until and flag every user for a background refresh
+
+Statistics rows are no longer recomputed in the transaction of each change:
+changes flag the row (valid_until set to the time of the change) and a
+scheduler job recomputes flagged rows, stalest first, through this index.
+
+Rows used to be created on a user's first dashboard visit, which no longer
+writes. Every user without a row gets a flagged all-zero one here, so the job
+computes it (and the user's co-play edges) in its first runs.
+
+Revision ID: b0c1d2e3f4a5
+Revises: a9b0c1d2e3f4
+Create Date: 2026-10-18 23:00:00.000000
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "b0c1d2e3f4a5"
+down_revision = "a9b0c1d2e3f4"
+branch_labels = None
+depends_on = None
+
+COUNT_COLUMNS = (
+    "gm_games",
+    "player_games",
+    "oneshot_games",
+    "campaign_games",
+    "gm_sessions",
+    "player_sessions",
+    "oneshot_sessions",
+    "campaign_sessions",
+    "gm_seconds",
+    "player_seconds",
+    "badges",
+)
+
+
+def upgrade():
+    op.create_index("ix_user_stats_valid_until", "user_stats", ["valid_until"])
+    columns = ", ".join(COUNT_COLUMNS)
+    zeros = ", ".join("0" for _ in COUNT_COLUMNS)
+    op.execute(
+        f"""
+        INSERT INTO user_stats (user_id, {columns}, systems, months, valid_until, updated_at)
+        SELECT id, {zeros}, '{{}}'::jsonb, '{{}}'::jsonb, now()::timestamp, now()::timestamp
+        FROM "user"
+        ON CONFLICT (user_id) DO NOTHING
+        """
+    )
+
+
+def downgrade():
+    op.drop_index("ix_user_stats_valid_until", table_name="user_stats")
@@ -0,0 +1,35 @@
+"""Store the avatar URL and profile freshness on the user table
+
+The avatar used to live only in the ``user_profile_<id>`` cache key, so a
+Redis eviction or flush forced a Discord refetch for every member. Profiles
+are now rendered from the row; ``profile_refreshed_at`` records when it was
+last synced with Discord.
+
+Revision ID: b3c4d5e6f7a8
+Revises: a1b2c3d4e5f7
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "b3c4d5e6f7a8"
+down_revision = "a1b2c3d4e5f7"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table("user", schema=None) as batch_op:
+        batch_op.add_column(sa.Column("avatar_url", sa.String(), nullable=True))
+        batch_op.add_column(
+            sa.Column("profile_refreshed_at", sa.DateTime(timezone=True), nullable=True)
+        )
+
+
+def downgrade():
+    with op.batch_alter_table("user", schema=None) as batch_op:
+        batch_op.drop_column("profile_refreshed_at")
+        batch_op.drop_column("avatar_url")
@@ -0,0 +1,33 @@
+"""Index the profile refresh queue on the user table
+
+The profile refresh job picks the active users refreshed longest ago
+(never-refreshed first); this partial index lets it read just one batch
+instead of every active user ID.
+
+Revision ID: c5d6e7f8a9b0
+Revises: b3c4d5e6f7a8
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "c5d6e7f8a9b0"
+down_revision = "b3c4d5e6f7a8"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        "ix_user_profile_refresh_queue",
+        "user",
+        [sa.text("profile_refreshed_at ASC NULLS FIRST")],
+        postgresql_where=sa.text("not_player_as_of IS NULL"),
+    )
+
+
+def downgrade():
+    op.drop_index("ix_user_profile_refresh_queue", table_name="user")
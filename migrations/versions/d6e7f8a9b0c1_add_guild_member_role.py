@@ -0,0 +1,32 @@
+"""Add the guild_member_role table indexing the guild's role memberships
+
+Authorization checks used to fetch the member from Discord (cached for five
+minutes) on every page view; they now read this table, rebuilt by the member
+sweep and updated when the app grants or revokes a role.
+
+Revision ID: d6e7f8a9b0c1
+Revises: c5d6e7f8a9b0
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "d6e7f8a9b0c1"
+down_revision = "c5d6e7f8a9b0"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "guild_member_role",
+        sa.Column("user_id", sa.String(), primary_key=True),
+        sa.Column("role_id", sa.String(), primary_key=True),
+    )
+
+
+def downgrade():
+    op.drop_table("guild_member_role")
@@ -0,0 +1,57 @@
+"""Add the user_stats table holding each user's dashboard statistics
+
+The dashboard used to rebuild a user's whole history (games with systems,
+sessions and players) on every cache miss; it now reads this row, refreshed by
+the service layer whenever the user's games, sessions, registrations or
+trophies change. Rows are computed on first read, so no backfill is needed.
+
+Revision ID: e7f8a9b0c1d2
+Revises: d6e7f8a9b0c1
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "e7f8a9b0c1d2"
+down_revision = "d6e7f8a9b0c1"
+branch_labels = None
+depends_on = None
+
+COUNT_COLUMNS = (
+    "gm_games",
+    "player_games",
+    "oneshot_games",
+    "campaign_games",
+    "gm_sessions",
+    "player_sessions",
+    "oneshot_sessions",
+    "campaign_sessions",
+    "gm_seconds",
+    "player_seconds",
+    "badges",
+)
+
+
+def upgrade():
+    op.create_table(
+        "user_stats",
+        sa.Column(
+            "user_id",
+            sa.String(),
+            sa.ForeignKey("user.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        *(sa.Column(name, sa.Integer(), nullable=False) for name in COUNT_COLUMNS),
+        sa.Column("systems", postgresql.JSONB(), nullable=False),
+        sa.Column("months", postgresql.JSONB(), nullable=False),
+        sa.Column("valid_until", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+    )
+
+
+def downgrade():
+    op.drop_table("user_stats")
@@ -0,0 +1,78 @@
+"""Add the co_play table holding who-played-with-whom edges
+
+The dashboard network used to walk every player of every game a user was in,
+loading each user; it now reads the user's edges, refreshed by the service
+layer whenever games, sessions or registrations change. The edges are
+backfilled from the existing games here.
+
+Revision ID: f8a9b0c1d2e3
+Revises: e7f8a9b0c1d2
+Create Date: 2026-10-18 20:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "f8a9b0c1d2e3"
+down_revision = "e7f8a9b0c1d2"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "co_play",
+        sa.Column(
+            "user_id",
+            sa.String(),
+            sa.ForeignKey("user.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column(
+            "mate_id",
+            sa.String(),
+            sa.ForeignKey("user.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("games_together", sa.Integer(), nullable=False),
+        sa.Column("gm_games", sa.Integer(), nullable=False),
+        sa.Column("last_played", sa.DateTime(), nullable=True),
+    )
+    op.create_index("ix_co_play_mate_id", "co_play", ["mate_id"])
+    op.execute(
+        """
+        INSERT INTO co_play (user_id, mate_id, games_together, gm_games, last_played)
+        WITH involved AS (
+            SELECT g.gm_id AS user_id, g.id AS game_id
+            FROM game g
+            WHERE g.status != 'draft'
+            UNION ALL
+            SELECT p.player_id, p.game_id
+            FROM game_players p JOIN game g ON g.id = p.game_id
+            WHERE g.status != 'draft' AND p.player_id != g.gm_id
+        ), pairs AS (
+            SELECT i.user_id, m.player_id AS mate_id, i.game_id, false AS via_gm
+            FROM involved i JOIN game_players m ON m.game_id = i.game_id
+            WHERE m.player_id != i.user_id
+            UNION ALL
+            SELECT p.player_id, g.gm_id, g.id, true
+            FROM game_players p JOIN game g ON g.id = p.game_id
+            WHERE g.status != 'draft' AND p.player_id != g.gm_id
+        )
+        SELECT
+            pairs.user_id,
+            pairs.mate_id,
+            count(DISTINCT pairs.game_id) FILTER (WHERE NOT pairs.via_gm),
+            count(DISTINCT pairs.game_id) FILTER (WHERE pairs.via_gm),
+            max(s.start)
+        FROM pairs LEFT JOIN game_session s ON s.game_id = pairs.game_id
+        GROUP BY pairs.user_id, pairs.mate_id
+        """
+    )
+
+
+def downgrade():
+    op.drop_index("ix_co_play_mate_id", table_name="co_play")
+    op.drop_table("co_play")
@@ -20,3 +20,10 @@ def test_health_no_auth_required(api_client):
     """Health endpoint should not require authentication."""
     response = api_client.get("/api/v1/health")
     assert response.status_code == 200
+
+
+def test_health_reports_the_discord_circuit(api_client):
+    """The Discord section exposes this worker's circuit breaker state."""
+    data = api_client.get("/api/v1/health").get_json()
+
+    assert data["discord"]["circuit"]["state"] == "closed"
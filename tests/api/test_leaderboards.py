@@ -48,3 +48,23 @@ class TestGetLeaderboards:
         data = response.get_json()
         for category in ["oneshot_players", "campaign_players", "oneshot_gms", "campaign_gms"]:
             assert data[category] == []
+
+
+class TestGetTrophyLeaderboard:
+    """Tests for GET /api/v1/leaderboards/<trophy_id>/."""
+
+    @patch("website.api.leaderboards.trophy_service")
+    def test_returns_entries_and_my_rank(self, mock_service, api_client, auth_headers_user):
+        """Returns the top entries, with a bounded limit, and the caller's rank."""
+        user = MagicMock()
+        user.to_dict.return_value = {"id": "123456789012345678", "name": "Top Player"}
+        mock_service.get_leaderboard.return_value = [(user, 42)]
+        mock_service.get_user_rank.return_value = {"rank": 3, "count": 7}
+
+        response = api_client.get("/api/v1/leaderboards/5/?limit=1000", headers=auth_headers_user)
+
+        assert response.status_code == 200
+        data = response.get_json()
+        assert data["entries"] == [{"user": user.to_dict.return_value, "count": 42}]
+        assert data["me"] == {"rank": 3, "count": 7}
+        mock_service.get_leaderboard.assert_called_once_with(5, 100)
@@ -38,6 +38,28 @@ class TestGetCurrentUser:
         mock_service.get_by_id.assert_called_once_with(TEST_REGULAR_USER_ID)
 
 
+class TestGetMyTableMates:
+    """Tests for GET /api/v1/users/me/table-mates/."""
+
+    def test_requires_auth(self, api_client):
+        """Endpoint requires authentication."""
+        response = api_client.get("/api/v1/users/me/table-mates/")
+        assert response.status_code == 403
+
+    @patch("website.api.users.stats_service")
+    def test_returns_table_mates(self, mock_service, api_client, auth_headers_user):
+        """Returns the current user's table-mates, with a bounded limit."""
+        mock_service.get_table_mates.return_value = [{"id": "1", "games_together": 3}]
+
+        response = api_client.get(
+            "/api/v1/users/me/table-mates/?limit=500", headers=auth_headers_user
+        )
+
+        assert response.status_code == 200
+        assert response.get_json() == [{"id": "1", "games_together": 3}]
+        mock_service.get_table_mates.assert_called_once_with(TEST_REGULAR_USER_ID, 50)
+
+
 class TestGetUser:
     """Tests for GET /api/v1/users/<user_id>/."""
 
@@ -11,6 +11,11 @@ config = load_dotenv()
 
 import os
 
+# Tests drain the Discord outbox and refresh statistics explicitly; background
+# jobs would share the test's pinned connection.
+os.environ.setdefault("QM_OUTBOX_DISPATCH", "0")
+os.environ.setdefault("QM_STATS_REFRESH", "0")
+
 import pytest
 
 from tests.constants import (
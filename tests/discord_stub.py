@@ -0,0 +1,534 @@
+"""Local stand-in for the Discord REST API, for load and integration testing.
+
+Implements the endpoints :class:`~website.client.discord.Discord` uses
+(members, roles, channels, messages, pins and permission overwrites) against an
+in-memory guild, with configurable latency, per-bucket and global rate limits
+(sent with Discord's ``X-RateLimit-*`` headers and 429 bodies) and injected
+5xx errors or hangs. It is a development tool, not part of the app; run it
+from the repository root and point the app at it with::
+
+    python -m tests.discord_stub --port 8090 --latency lognormal:40:0.5 --bucket-limit 5
+    QM_DISCORD_API_BASE_URL=http://127.0.0.1:8090/api/v10 flask run
+
+Behaviour can be changed while it runs: ``POST /_stub/config`` takes any
+:class:`StubConfig` field as JSON, ``GET /_stub/stats`` returns the request and
+response counts, and ``POST /_stub/reset`` clears the counters and limits.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import itertools
+import json
+import random
+import re
+import threading
+import time
+from collections import Counter
+from collections.abc import Callable
+from dataclasses import asdict, dataclass, fields
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import click
+
+from config.constants import DISCORD_CHANNEL_TYPE_TEXT
+from website.client.ratelimit import route_key
+
+API_PREFIX = "/api/v10"
+STUB_GUILD_ID = "900000000000000001"
+
+
+def parse_latency(spec: str) -> Callable[[random.Random], float]:
+    """Parse a latency distribution into a sampler.
+
+    Supported specs, in milliseconds: ``fixed:MS``, ``uniform:LOW:HIGH`` and
+    ``lognormal:MEDIAN:SIGMA`` (a long-tailed distribution around ``MEDIAN``).
+
+    Args:
+        spec: Distribution spec.
+
+    Returns:
+        Callable drawing a latency in seconds from the given random generator.
+
+    Raises:
+        ValueError: If the spec is not recognised.
+    """
+    kind, _, rest = spec.partition(":")
+    try:
+        args = [float(value) for value in rest.split(":")] if rest else []
+        if kind == "fixed" and len(args) == 1:
+            return lambda rng: args[0] / 1000
+        if kind == "uniform" and len(args) == 2:
+            return lambda rng: rng.uniform(args[0], args[1]) / 1000
+        if kind == "lognormal" and len(args) == 2 and args[0] > 0:
+            return lambda rng: rng.lognormvariate(0, args[1]) * args[0] / 1000
+    except ValueError:
+        pass
+    raise ValueError(f"Invalid latency spec: {spec!r}")
+
+
+@dataclass
+class StubConfig:
+    """Behaviour of the stub API.
+
+    Attributes:
+        latency: Latency distribution (see :func:`parse_latency`).
+        bucket_limit: Requests allowed per route bucket and major parameter in
+            each window (0: unlimited).
+        bucket_window: Length of a bucket window, in seconds.
+        global_limit: Requests allowed per second across all routes (0: unlimited).
+        error_rate: Share of requests answered with ``error_status``.
+        error_status: Status code of injected errors.
+        hang_rate: Share of requests held for ``hang_seconds`` before being
+            answered, to trip client read timeouts.
+        hang_seconds: How long a hanging request is held.
+        seed: Seed of the random generator (None: unseeded).
+    """
+
+    latency: str = "fixed:0"
+    bucket_limit: int = 0
+    bucket_window: float = 1.0
+    global_limit: int = 0
+    error_rate: float = 0.0
+    error_status: int = 503
+    hang_rate: float = 0.0
+    hang_seconds: float = 15.0
+    seed: int | None = None
+
+
+class _RateLimits:
+    """Discord-style bucket and global limits, counted per fixed window."""
+
+    def __init__(self):
+        self.windows: dict[str, tuple[float, int]] = {}
+
+    def take(self, key: str, limit: int, window: float, now: float) -> tuple[int, float]:
+        """Count a request; return the remaining budget (-1 if over) and reset delay."""
+        started, count = self.windows.get(key, (now, 0))
+        if now >= started + window:
+            started, count = now, 0
+        reset_after = started + window - now
+        if count >= limit:
+            return -1, reset_after
+        self.windows[key] = (started, count + 1)
+        return limit - count - 1, reset_after
+
+
+class _NotFound(Exception):
+    """An entity of the request does not exist (Discord's "Unknown ..." errors)."""
+
+    def __init__(self, message: str, code: int):
+        super().__init__(message)
+        self.code = code
+
+
+class DiscordStub:
+    """In-memory guild answering Discord API requests.
+
+    Attributes:
+        config: Current :class:`StubConfig`.
+        guild_id: ID of the only guild.
+        stats: Counter of requests per route and of responses per status.
+    """
+
+    def __init__(self, config: StubConfig | None = None, members: int = 50, guild_id=None):
+        self.guild_id = guild_id or STUB_GUILD_ID
+        self.stats: Counter = Counter()
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1_000_000_000_000_000)
+        self._limits = _RateLimits()
+        self.configure(asdict(config or StubConfig()))
+        self.members = {}
+        for i in range(members):
+            user_id = self._new_id()
+            self.members[user_id] = {
+                "user": {
+                    "id": user_id,
+                    "username": f"member{i}",
+                    "global_name": f"Member {i}",
+                    "avatar": None,
+                },
+                "nick": None,
+                "avatar": None,
+                "roles": [],
+            }
+        self.roles = {
+            self.guild_id: {"id": self.guild_id, "name": "@everyone", "permissions": "0"}
+        }
+        self.channels: dict[str, dict] = {}
+        self.messages: dict[str, dict[str, dict]] = {}
+        self._routes = [
+            ("GET", r"/gateway/bot", self._get_gateway),
+            ("GET", r"/guilds/{g}/members", self._list_members),
+            ("GET", r"/guilds/{g}/members/(\d+)", self._get_member),
+            ("PUT", r"/guilds/{g}/members/(\d+)/roles/(\d+)", self._add_member_role),
+            ("DELETE", r"/guilds/{g}/members/(\d+)/roles/(\d+)", self._remove_member_role),
+            ("GET", r"/guilds/{g}/roles", self._list_roles),
+            ("POST", r"/guilds/{g}/roles", self._create_role),
+            ("DELETE", r"/guilds/{g}/roles/(\d+)", self._delete_role),
+            ("GET", r"/guilds/{g}/channels", self._list_channels),
+            ("POST", r"/guilds/{g}/channels", self._create_channel),
+            ("GET", r"/channels/(\d+)", self._get_channel),
+            ("PATCH", r"/channels/(\d+)", self._edit_channel),
+            ("DELETE", r"/channels/(\d+)", self._delete_channel),
+            ("PUT", r"/channels/(\d+)/permissions/(\d+)", self._set_permission),
+            ("DELETE", r"/channels/(\d+)/permissions/(\d+)", self._delete_permission),
+            ("POST", r"/channels/(\d+)/messages", self._create_message),
+            ("PATCH", r"/channels/(\d+)/messages/(\d+)", self._edit_message),
+            ("DELETE", r"/channels/(\d+)/messages/(\d+)", self._delete_message),
+            ("PUT", r"/channels/(\d+)/messages/pins/(\d+)", self._pin_message),
+        ]
+        self._routes = [
+            (method, re.compile(pattern.replace("{g}", self.guild_id) + "$"), handler)
+            for method, pattern, handler in self._routes
+        ]
+
+    def configure(self, values: dict) -> None:
+        """Update the configuration (and reseed the random generator).
+
+        Args:
+            values: :class:`StubConfig` fields to change.
+
+        Raises:
+            ValueError: If a field is unknown or the latency spec is invalid.
+        """
+        known = {f.name for f in fields(StubConfig)}
+        unknown = set(values) - known
+        if unknown:
+            raise ValueError(f"Unknown stub settings: {sorted(unknown)}")
+        config = StubConfig(**{**asdict(getattr(self, "config", StubConfig())), **values})
+        sample = parse_latency(config.latency)
+        with self._lock:
+            self.config = config
+            self._sample_latency = sample
+            self._rng = random.Random(config.seed)
+
+    def reset(self) -> None:
+        """Clear the counters and the rate-limit windows."""
+        with self._lock:
+            self.stats.clear()
+            self._limits = _RateLimits()
+
+    def handle(self, method: str, endpoint: str, query: dict, body) -> tuple[int, object, dict]:
+        """Answer one API request.
+
+        Args:
+            method: HTTP method.
+            endpoint: Path below the API prefix (e.g. ``/channels/1``).
+            query: Query string parameters (single values).
+            body: Decoded JSON body, or None.
+
+        Returns:
+            Tuple of the status code, the JSON-serialisable body (None for an
+            empty 204) and the extra response headers.
+        """
+        route, major = route_key(method, endpoint)
+        with self._lock:
+            config = self.config
+            self.stats[f"requests {route}"] += 1
+            latency = self._sample_latency(self._rng)
+            roll = self._rng.random()
+            limited, headers = self._rate_limit(route, major, config)
+        time.sleep(latency)
+
+        if limited is not None:
+            return self._count(429, limited, headers)
+        if roll < config.hang_rate:
+            time.sleep(config.hang_seconds)
+        elif roll < config.hang_rate + config.error_rate:
+            return self._count(config.error_status, {"message": "Injected failure", "code": 0}, {})
+
+        for route_method, pattern, handler in self._routes:
+            match = pattern.match(endpoint)
+            if route_method == method and match:
+                try:
+                    with self._lock:
+                        status, payload = handler(*match.groups(), query=query, body=body or {})
+                except _NotFound as e:
+                    return self._count(404, {"message": str(e), "code": e.code}, headers)
+                return self._count(status, payload, headers)
+        return self._count(404, {"message": "404: Not Found", "code": 0}, headers)
+
+    def _count(self, status: int, payload, headers: dict) -> tuple[int, object, dict]:
+        with self._lock:
+            self.stats[f"status {status}"] += 1
+        return status, payload, headers
+
+    def _rate_limit(self, route: str, major: str, config: StubConfig):
+        """Apply the global then the bucket limit (lock held).
+
+        Returns:
+            Tuple of the 429 body (None if the request may proceed) and the
+            rate-limit headers.
+        """
+        now = time.monotonic()
+        if config.global_limit:
+            remaining, reset_after = self._limits.take("global", config.global_limit, 1.0, now)
+            if remaining < 0:
+                body = {"message": "You are being rate limited.", "retry_after": reset_after}
+                body["global"] = True
+                headers = {"Retry-After": f"{reset_after:.3f}", "X-RateLimit-Global": "true"}
+                return body, headers | {"X-RateLimit-Scope": "global"}
+        if not config.bucket_limit:
+            return None, {}
+        # Discord shares one bucket hash across major parameters, not its counters.
+        shape = route.replace(f"/{major}", "/{major}", 1) if major else route
+        bucket = hashlib.sha1(shape.encode()).hexdigest()[:16]
+        remaining, reset_after = self._limits.take(
+            f"{bucket}:{major}", config.bucket_limit, config.bucket_window, now
+        )
+        headers = {
+            "X-RateLimit-Bucket": bucket,
+            "X-RateLimit-Limit": str(config.bucket_limit),
+            "X-RateLimit-Remaining": str(max(remaining, 0)),
+            "X-RateLimit-Reset-After": f"{reset_after:.3f}",
+        }
+        if remaining >= 0:
+            return None, headers
+        body = {"message": "You are being rate limited.", "retry_after": reset_after}
+        body["global"] = False
+        return body, headers | {"Retry-After": f"{reset_after:.3f}", "X-RateLimit-Scope": "user"}
+
+    def _new_id(self) -> str:
+        return str(next(self._ids))
+
+    # -------------------------------------------------------------------------
+    # Endpoints (called with the lock held)
+    # -------------------------------------------------------------------------
+
+    def _member(self, user_id: str) -> dict:
+        if user_id not in self.members:
+            raise _NotFound("Unknown Member", 10007)
+        return self.members[user_id]
+
+    def _channel(self, channel_id: str) -> dict:
+        if channel_id not in self.channels:
+            raise _NotFound("Unknown Channel", 10003)
+        return self.channels[channel_id]
+
+    def _message(self, channel_id: str, message_id: str) -> dict:
+        self._channel(channel_id)
+        if message_id not in self.messages[channel_id]:
+            raise _NotFound("Unknown Message", 10008)
+        return self.messages[channel_id][message_id]
+
+    def _get_gateway(self, query, body):
+        return 200, {"url": "wss://gateway.invalid"}
+
+    def _list_members(self, query, body):
+        limit = min(int(query.get("limit", 1)), 1000)
+        after = int(query.get("after", 0))
+        ids = sorted((user_id for user_id in self.members if int(user_id) > after), key=int)
+        return 200, [self.members[user_id] for user_id in ids[:limit]]
+
+    def _get_member(self, user_id, query, body):
+        return 200, self._member(user_id)
+
+    def _add_member_role(self, user_id, role_id, query, body):
+        roles = self._member(user_id)["roles"]
+        if role_id not in self.roles:
+            raise _NotFound("Unknown Role", 10011)
+        if role_id not in roles:
+            roles.append(role_id)
+        return 204, None
+
+    def _remove_member_role(self, user_id, role_id, query, body):
+        roles = self._member(user_id)["roles"]
+        if role_id in roles:
+            roles.remove(role_id)
+        return 204, None
+
+    def _list_roles(self, query, body):
+        return 200, list(self.roles.values())
+
+    def _create_role(self, query, body):
+        role = {"id": self._new_id(), "permissions": "0", "color": 0} | body
+        self.roles[role["id"]] = role
+        return 200, role
+
+    def _delete_role(self, role_id, query, body):
+        if self.roles.pop(role_id, None) is None:
+            raise _NotFound("Unknown Role", 10011)
+        for member in self.members.values():
+            if role_id in member["roles"]:
+                member["roles"].remove(role_id)
+        return 204, None
+
+    def _list_channels(self, query, body):
+        return 200, list(self.channels.values())
+
+    def _create_channel(self, query, body):
+        channel = {
+            "id": self._new_id(),
+            "guild_id": self.guild_id,
+            "type": DISCORD_CHANNEL_TYPE_TEXT,
+            "parent_id": None,
+            "permission_overwrites": [],
+        } | body
+        self.channels[channel["id"]] = channel
+        self.messages[channel["id"]] = {}
+        return 201, channel
+
+    def _get_channel(self, channel_id, query, body):
+        return 200, self._channel(channel_id)
+
+    def _edit_channel(self, channel_id, query, body):
+        channel = self._channel(channel_id)
+        channel.update(body)
+        return 200, channel
+
+    def _delete_channel(self, channel_id, query, body):
+        channel = self._channel(channel_id)
+        del self.channels[channel_id]
+        del self.messages[channel_id]
+        return 200, channel
+
+    def _set_permission(self, channel_id, target_id, query, body):
+        channel = self._channel(channel_id)
+        overwrites = [o for o in channel["permission_overwrites"] if o["id"] != target_id]
+        overwrites.append({"id": target_id, "type": body.get("type", 1), "deny": "0"} | body)
+        channel["permission_overwrites"] = overwrites
+        return 204, None
+
+    def _delete_permission(self, channel_id, target_id, query, body):
+        channel = self._channel(channel_id)
+        channel["permission_overwrites"] = [
+            o for o in channel["permission_overwrites"] if o["id"] != target_id
+        ]
+        return 204, None
+
+    def _create_message(self, channel_id, query, body):
+        self._channel(channel_id)
+        message = {"id": self._new_id(), "channel_id": channel_id, "pinned": False} | body
+        self.messages[channel_id][message["id"]] = message
+        return 200, message
+
+    def _edit_message(self, channel_id, message_id, query, body):
+        message = self._message(channel_id, message_id)
+        message.update(body)
+        return 200, message
+
+    def _delete_message(self, channel_id, message_id, query, body):
+        self._message(channel_id, message_id)
+        del self.messages[channel_id][message_id]
+        return 204, None
+
+    def _pin_message(self, channel_id, message_id, query, body):
+        self._message(channel_id, message_id)["pinned"] = True
+        return 204, None
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    """HTTP front end of a :class:`DiscordStub`."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def do_PUT(self):
+        self._dispatch("PUT")
+
+    def do_PATCH(self):
+        self._dispatch("PATCH")
+
+    def do_DELETE(self):
+        self._dispatch("DELETE")
+
+    def log_message(self, format, *args):
+        pass
+
+    def _dispatch(self, method: str) -> None:
+        stub = self.server.stub
+        url = urlsplit(self.path)
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            body = json.loads(self.rfile.read(length)) if length else None
+        except ValueError:
+            self._reply(400, {"message": "400: Bad Request", "code": 50109}, {})
+            return
+
+        if url.path.startswith("/_stub/"):
+            self._control(stub, method, url.path, body)
+            return
+        if not url.path.startswith(API_PREFIX):
+            self._reply(404, {"message": "404: Not Found", "code": 0}, {})
+            return
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        self._reply(*stub.handle(method, url.path[len(API_PREFIX) :], query, body))
+
+    def _control(self, stub: DiscordStub, method: str, path: str, body) -> None:
+        if method == "GET" and path == "/_stub/stats":
+            self._reply(200, dict(stub.stats), {})
+        elif method == "POST" and path == "/_stub/config":
+            try:
+                stub.configure(body or {})
+            except (TypeError, ValueError) as e:
+                self._reply(400, {"message": str(e)}, {})
+                return
+            self._reply(200, asdict(stub.config), {})
+        elif method == "POST" and path == "/_stub/reset":
+            stub.reset()
+            self._reply(204, None, {})
+        else:
+            self._reply(404, {"message": "Unknown stub endpoint"}, {})
+
+    def _reply(self, status: int, payload, headers: dict) -> None:
+        data = b"" if payload is None else json.dumps(payload).encode()
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        if data:
+            self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class DiscordStubServer(ThreadingHTTPServer):
+    """Threaded HTTP server serving a :class:`DiscordStub`.
+
+    Attributes:
+        stub: The stub answering requests.
+        api_base_url: Value for ``QM_DISCORD_API_BASE_URL``.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, stub: DiscordStub, host: str = "127.0.0.1", port: int = 0):
+        super().__init__((host, port), _StubHandler)
+        self.stub = stub
+        self.api_base_url = f"http://{host}:{self.server_address[1]}{API_PREFIX}"
+
+
+@click.command("discord-stub")
+@click.option("--host", default="127.0.0.1", show_default=True)
+@click.option("--port", default=8090, show_default=True, type=int)
+@click.option("--members", default=50, show_default=True, help="Fake guild members.")
+@click.option("--guild-id", default=STUB_GUILD_ID, show_default=True)
+@click.option("--latency", default="fixed:0", show_default=True, help="See parse_latency.")
+@click.option("--bucket-limit", default=0, show_default=True, help="Per bucket (0: off).")
+@click.option("--bucket-window", default=1.0, show_default=True, help="Seconds.")
+@click.option("--global-limit", default=0, show_default=True, help="Per second (0: off).")
+@click.option("--error-rate", default=0.0, show_default=True, help="Share of 5xx answers.")
+@click.option("--hang-rate", default=0.0, show_default=True, help="Share of hung requests.")
+@click.option("--seed", default=None, type=int)
+def discord_stub(host, port, members, guild_id, **config):
+    """Serve a local Discord API stub until interrupted."""
+    stub = DiscordStub(StubConfig(**config), members=members, guild_id=guild_id)
+    server = DiscordStubServer(stub, host, port)
+    click.echo(f"Discord API stub for guild {guild_id} on {server.api_base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    discord_stub()
@@ -1,7 +1,12 @@
 import pytest
 
 from website.exceptions.base import QuestMasterError
-from website.exceptions.discord import DiscordAPIError, DiscordError
+from website.exceptions.discord import (
+    DiscordAPIError,
+    DiscordError,
+    DiscordGatewayError,
+    DiscordUnavailableError,
+)
 
 
 class TestDiscordError:
@@ -107,3 +112,29 @@ class TestDiscordAPIError:
         r = repr(err)
         assert "DiscordAPIError" in r
         assert "DISCORD_API_404" in r
+
+
+class TestDiscordUnavailableError:
+    """Tests for DiscordUnavailableError."""
+
+    def test_is_a_503_api_error(self):
+        err = DiscordUnavailableError(retry_after=12.4)
+        assert isinstance(err, DiscordAPIError)
+        assert err.status_code == 503
+        assert err.retry_after == 12.4
+        assert "retrying in 12s" in err.message
+
+
+class TestDiscordGatewayError:
+    """Tests for DiscordGatewayError."""
+
+    def test_inherits_from_discord_error(self):
+        err = DiscordGatewayError("Authentication failed", close_code=4004)
+        assert isinstance(err, DiscordError)
+
+    def test_basic_creation(self):
+        err = DiscordGatewayError("Disallowed intents", close_code=4014)
+        assert err.close_code == 4014
+        assert err.code == "DISCORD_GATEWAY_4014"
+        assert err.details == {"close_code": 4014}
+        assert "[4014]" in err.message
@@ -27,6 +27,12 @@ class TestExceptionPackageExports:
     def test_discord_api_error(self):
         assert hasattr(exceptions, "DiscordAPIError")
 
+    def test_discord_gateway_error(self):
+        assert hasattr(exceptions, "DiscordGatewayError")
+
+    def test_discord_unavailable_error(self):
+        assert hasattr(exceptions, "DiscordUnavailableError")
+
     def test_game_error(self):
         assert hasattr(exceptions, "GameError")
 
@@ -51,6 +57,8 @@ class TestExceptionPackageExports:
             "DatabaseError",
             "DiscordError",
             "DiscordAPIError",
+            "DiscordGatewayError",
+            "DiscordUnavailableError",
             "GameError",
             "GameFullError",
             "GameClosedError",
@@ -2,9 +2,9 @@ from datetime import datetime
 from unittest.mock import MagicMock, patch
 
 import pytest
-from flask import Flask
 
 from config.constants import DEFAULT_AVATAR
+from tests.factories import UserFactory
 from website.exceptions import ValidationError
 from website.models.user import User
 
@@ -157,22 +157,41 @@ def test_repr_eq_ne():
 
 
 @patch("website.models.user.get_user_roles")
-def test_refresh_roles(mock_get_roles):
-    # Create a minimal Flask app with proper context
-    app = Flask(__name__)
-    app.config["DISCORD_GM_ROLE_ID"] = "gm"
-    app.config["DISCORD_ADMIN_ROLE_ID"] = "admin"
-    app.config["DISCORD_PLAYER_ROLE_ID"] = "player"
+def test_refresh_roles(mock_get_roles, db_session):
+    """A member missing from the local role index falls back to Discord."""
+    from website.services.setting import SettingsService
 
+    settings = SettingsService()
     user = User(id="12345678901234567", name="Alice")
-    mock_get_roles.return_value = ["gm", "admin"]
+    mock_get_roles.return_value = [
+        settings.get("DISCORD_GM_ROLE_ID"),
+        settings.get("DISCORD_ADMIN_ROLE_ID"),
+    ]
 
-    # Run within app context
-    with app.app_context():
-        user.refresh_roles()
-        assert user.is_gm is True
-        assert user.is_admin is True
-        assert user.is_player is False
+    user.refresh_roles()
+
+    assert user.is_gm is True
+    assert user.is_admin is True
+    assert user.is_player is False
+
+
+@patch("website.models.user.get_user_roles")
+def test_refresh_roles_reads_the_local_role_index(mock_get_roles, db_session):
+    from website.models import GuildMember, GuildMemberRole
+    from website.services.setting import SettingsService
+
+    user = UserFactory(db_session)
+    db_session.add(GuildMember(user_id=user.id))
+    db_session.add(
+        GuildMemberRole(user_id=user.id, role_id=SettingsService().get("DISCORD_PLAYER_ROLE_ID"))
+    )
+    db_session.flush()
+
+    user.refresh_roles()
+
+    assert user.is_player is True
+    assert user.is_gm is False
+    mock_get_roles.assert_not_called()
 
 
 def test_not_player_as_of_default_none():
@@ -243,7 +262,12 @@ def test_get_user_profile_returns_username(mock_get_bot, test_app):
 
     mock_bot = MagicMock()
     mock_bot.get_user.return_value = {
-        "user": {"username": "alice123", "global_name": "Alice", "avatar": None},
+        "user": {
+            "id": "99999999999999997",
+            "username": "alice123",
+            "global_name": "Alice",
+            "avatar": None,
+        },
         "nick": None,
         "roles": [],
     }
@@ -297,3 +321,143 @@ def test_get_user_profile_does_not_cache_non_404_errors(mock_get_bot, test_app):
 
         cached = cache.get("user_profile_99999999999999998")
         assert cached is None
+
+
+def test_avatar_url_static_and_animated():
+    from website.models.user import build_avatar_url
+
+    assert build_avatar_url("1", "abc") == "https://cdn.discordapp.com/avatars/1/abc.png"
+    assert build_avatar_url("1", "a_abc") == "https://cdn.discordapp.com/avatars/1/a_abc.gif"
+
+
+def test_avatar_url_prefers_guild_avatar():
+    from website.models.user import build_avatar_url
+
+    url = build_avatar_url("1", "abc", guild_id="9", guild_avatar_hash="a_def")
+    assert url == "https://cdn.discordapp.com/guilds/9/users/1/avatars/a_def.gif"
+    # Without the guild ID the server avatar cannot be addressed.
+    assert build_avatar_url("1", "abc", guild_avatar_hash="def").endswith("/avatars/1/abc.png")
+
+
+def test_avatar_url_defaults_without_hash():
+    from website.models.user import build_avatar_url
+
+    assert build_avatar_url("1", None) == DEFAULT_AVATAR
+
+
+@patch("website.models.user.get_bot")
+def test_get_user_profile_builds_avatar_from_payload(mock_get_bot, test_app):
+    """A cache miss costs one API call: the avatar URL is not probed."""
+    from website.extensions import cache
+    from website.models.user import get_user_profile
+
+    mock_bot = MagicMock(guild_id="9")
+    mock_bot.get_user.return_value = {
+        "user": {"id": "99999999999999996", "username": "bob", "avatar": "abc"},
+        "avatar": "a_guild",
+        "nick": "Bob",
+    }
+    mock_get_bot.return_value = mock_bot
+
+    with test_app.app_context():
+        cache.delete("user_profile_99999999999999996")
+        with patch("requests.head") as head:
+            result = get_user_profile("99999999999999996", force_refresh=True)
+        cache.delete("user_profile_99999999999999996")
+
+    head.assert_not_called()
+    assert result["avatar"] == (
+        "https://cdn.discordapp.com/guilds/9/users/99999999999999996/avatars/a_guild.gif"
+    )
+
+
+def test_loading_users_does_no_profile_io(db_session):
+    """ORM hydration alone never touches the cache or Discord."""
+    with (
+        patch("website.models.user.get_user_profile") as fetch,
+        patch("website.models.user.cache") as cache,
+    ):
+        db_session.expunge_all()
+        users = db_session.query(User).all()
+
+    assert users
+    fetch.assert_not_called()
+    cache.get_many.assert_not_called()
+
+
+def test_first_avatar_access_hydrates_the_whole_session(db_session):
+    """One get_many resolves the avatars of every user loaded in the session."""
+    db_session.expunge_all()
+    users = db_session.query(User).limit(3).all()
+    profiles = [{"name": u.name, "avatar": f"/img/{u.id}.png"} for u in users]
+
+    with (
+        patch("website.models.user.cache") as cache,
+        patch("website.models.user.get_user_profile") as fetch,
+    ):
+        cache.get_many.return_value = profiles
+        avatars = [u.avatar for u in users]
+
+    cache.get_many.assert_called_once()
+    assert len(cache.get_many.call_args.args) == len(users)
+    fetch.assert_not_called()
+    assert avatars == [f"/img/{u.id}.png" for u in users]
+
+
+def test_stored_avatar_url_skips_profile_lookup(test_app):
+    """A user row holding its avatar URL renders without cache or Discord I/O."""
+    user = User(id="10000000000000001", name="Stored")
+    user.avatar_url = "/img/stored.png"
+    with (
+        test_app.app_context(),
+        patch("website.models.user.cache") as cache,
+        patch("website.models.user.get_user_profile") as fetch,
+    ):
+        assert user.avatar == "/img/stored.png"
+
+    cache.get_many.assert_not_called()
+    fetch.assert_not_called()
+
+
+def test_hydrate_leaves_cache_misses_to_the_refresh_queue(test_app):
+    from website.models.user import hydrate_profiles
+
+    users = [User(id=f"1{n:017d}", name="Stored") for n in range(3)]
+    with (
+        test_app.app_context(),
+        patch("website.models.user.cache") as cache,
+        patch("website.models.user.get_user_profile") as fetch,
+    ):
+        cache.get_many.return_value = [{"name": "Cached", "avatar": "/img/cached.png"}, None, None]
+        hydrate_profiles(users)
+
+    fetch.assert_not_called()
+    assert users[0].avatar == "/img/cached.png"
+    assert users[-1].avatar == DEFAULT_AVATAR
+    assert users[0].name == "Stored"
+
+
+def test_avatar_after_a_commit_does_not_reload_every_peer(db_session):
+    """Expired peers are not refreshed one by one to find who needs a profile."""
+    from sqlalchemy import event
+
+    users = [UserFactory(db_session) for _ in range(4)]
+    db_session.commit()
+    db_session.expire_all()
+    selects = []
+
+    def count(conn, cursor, statement, *args):
+        if statement.startswith("SELECT"):
+            selects.append(statement)
+
+    engine = db_session.get_bind()
+    event.listen(engine, "before_cursor_execute", count)
+    try:
+        with patch("website.models.user.cache") as cache:
+            cache.get_many.return_value = [None]
+            avatar = users[0].avatar
+    finally:
+        event.remove(engine, "before_cursor_execute", count)
+
+    assert avatar == DEFAULT_AVATAR
+    assert len(selects) == 1  # the user's own row, not its peers'
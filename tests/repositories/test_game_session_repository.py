@@ -2,6 +2,7 @@
 
 from datetime import datetime
 
+from tests.factories import GameFactory, GameSessionFactory, UserFactory
 from website.models import GameSession
 from website.repositories.game_session import GameSessionRepository
 
@@ -49,3 +50,27 @@ class TestGameSessionRepository:
         session_id = session.id
         repo.delete(session)
         assert repo.get_by_id(session_id) is None
+
+    def test_find_agenda_rows(self, db_session, default_system):
+        """Past sessions are capped to the most recent, both sides in start order."""
+        user = UserFactory(db_session)
+        own = GameFactory(db_session, gm_id=user.id, system_id=default_system.id, status="open")
+        own.players.append(user)  # registered in their own game: still listed as GM
+        joined = GameFactory(db_session, system_id=default_system.id, status="open")
+        joined.players.append(user)
+        draft = GameFactory(db_session, gm_id=user.id, system_id=default_system.id)
+        for game, day in ((own, 1), (joined, 2), (own, 3), (draft, 4), (joined, 20), (own, 21)):
+            GameSessionFactory(
+                db_session,
+                game_id=game.id,
+                start=datetime(2033, 1, day, 20, 0),
+                end=datetime(2033, 1, day, 23, 0),
+            )
+
+        past, upcoming = GameSessionRepository().find_agenda_rows(
+            user.id, datetime(2033, 1, 10), 2
+        )
+
+        assert [(r.start.day, r.is_gm) for r in past] == [(2, False), (3, True)]
+        assert [(r.start.day, r.slug) for r in upcoming] == [(20, joined.slug), (21, own.slug)]
+        assert upcoming[0].system_name == default_system.name
@@ -122,3 +122,16 @@ class TestTrophyRepository:
         names = [t.name for t in all_trophies]
         assert "Trophy1" in names
         assert "Trophy2" in names
+
+    def test_get_rank(self, db_session):
+        """Equal quantities share a rank; non-holders have none."""
+        repo = TrophyRepository()
+        trophy = TrophyFactory(db_session)
+        users = [UserFactory(db_session) for _ in range(4)]
+        for user, quantity in zip(users, (9, 9, 2)):
+            UserTrophyFactory(db_session, user_id=user.id, trophy_id=trophy.id, quantity=quantity)
+
+        assert repo.get_rank(trophy.id, users[1].id) == (1, 9)
+        assert repo.get_rank(trophy.id, users[2].id) == (3, 2)
+        assert repo.get_rank(trophy.id, users[3].id) == (None, 0)
+        assert repo.get_scores(trophy.id) == {users[0].id: 9, users[1].id: 9, users[2].id: 2}
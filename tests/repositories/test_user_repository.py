@@ -1,4 +1,4 @@
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 
 from tests.constants import TEST_ADMIN_USER_ID
 from tests.factories import UserFactory
@@ -67,6 +67,22 @@ class TestUserRepository:
         assert active_user.id in ids
         assert inactive_user.id not in ids
 
+    def test_get_stalest_active_user_ids(self, db_session):
+        """Never-refreshed users come first, then the oldest refresh; inactive users never."""
+        now = datetime.now(timezone.utc)
+        recent, old, never = (UserFactory(db_session) for _ in range(3))
+        recent.profile_refreshed_at = now
+        old.profile_refreshed_at = now - timedelta(days=30)
+        db_session.flush()
+        inactive = UserFactory(db_session, not_player_as_of=datetime(2025, 1, 1))
+        repo = UserRepository()
+
+        ids = repo.get_stalest_active_user_ids(limit=repo.count_active())
+
+        assert inactive.id not in ids
+        assert ids.index(never.id) < ids.index(old.id) < ids.index(recent.id)
+        assert len(repo.get_stalest_active_user_ids(limit=1)) == 1
+
     def test_get_inactive_user_ids(self, db_session):
         repo = UserRepository()
         active_user = UserFactory(db_session)
@@ -39,45 +39,6 @@ class TestChannelService:
         channel.size = original_size
         db_session.flush()
 
-    def test_adjust_category_size(self, db_session):
-        service = ChannelService()
-        channel = db_session.get(Channel, TEST_ONESHOT_CHANNEL_ID)
-        original_size = channel.size
-
-        # Set up a known size
-        channel.size = 5
-        db_session.commit()
-
-        # Mock the bot to return the channel's parent_id
-        mock_bot = MagicMock()
-        mock_bot.get_channel.return_value = {"parent_id": channel.id}
-
-        mock_game = MagicMock()
-        mock_game.channel = "fake-discord-channel-id"
-        mock_game.id = 999
-
-        service.adjust_category_size(mock_bot, mock_game)
-
-        refreshed = db_session.get(Channel, channel.id)
-        assert refreshed.size == 4
-
-        # Restore
-        channel.size = original_size
-        db_session.commit()
-
-    def test_adjust_category_size_handles_errors(self, db_session):
-        service = ChannelService()
-
-        mock_bot = MagicMock()
-        mock_bot.get_channel.side_effect = Exception("Discord error")
-
-        mock_game = MagicMock()
-        mock_game.channel = "fake-channel"
-        mock_game.id = 999
-
-        # Should not raise — errors are logged and swallowed
-        service.adjust_category_size(mock_bot, mock_game)
-
 
 class TestReconcileSizes:
     def test_corrects_drift_only(self, db_session):
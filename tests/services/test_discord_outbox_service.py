@@ -0,0 +1,358 @@
+"""Tests for DiscordOutboxService (queuing, ordered dispatch, retries)."""
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import Mock
+
+import pytest
+
+from config.constants import OUTBOX_MAX_ATTEMPTS
+from website.exceptions import DiscordAPIError, DiscordUnavailableError
+from website.models import DiscordOutbox
+from website.services.discord_outbox import DiscordOutboxService
+
+
+@pytest.fixture
+def outbox(mock_discord):
+    """Provide an outbox service sending to the mocked DiscordService."""
+    settings = Mock()
+    settings.get.return_value = "posts_channel"
+    return DiscordOutboxService(discord_service=mock_discord, settings_service=settings)
+
+
+def _make_due(db_session, op):
+    """Move an operation's retry time into the past so it can be sent again."""
+    op.next_attempt_at = datetime.now(timezone.utc) - timedelta(seconds=1)
+    db_session.commit()
+
+
+class TestEnqueue:
+    def test_enqueue_is_part_of_the_callers_transaction(self, db_session, sample_game, outbox):
+        """A rolled-back change takes its queued Discord operations with it."""
+        outbox.enqueue(sample_game.id, "delete_role", role_id="role_1")
+        assert outbox.has_pending(sample_game.id)
+
+        db_session.rollback()
+
+        assert not outbox.has_pending(sample_game.id)
+
+    def test_unknown_action_is_rejected(self, db_session, sample_game, outbox):
+        with pytest.raises(ValueError, match="Unknown outbox action"):
+            outbox.enqueue(sample_game.id, "launch_rocket")
+
+
+class TestAnnonceRefresh:
+    def test_refreshes_are_coalesced_until_sent(
+        self, db_session, sample_game, mock_discord, outbox
+    ):
+        """Several status flips in a row end up as a single announcement edit."""
+        sample_game.msg_id = "annonce_msg"
+        first = outbox.enqueue_annonce_refresh(sample_game.id)
+        for status in ("closed", "open", "closed"):
+            sample_game.status = status
+            assert outbox.enqueue_annonce_refresh(sample_game.id) is first
+        db_session.commit()
+
+        # Held back for the debounce window, then sent once with the latest state.
+        assert outbox.dispatch_pending() == 0
+        _make_due(db_session, first)
+        assert outbox.dispatch_pending() == 1
+
+        mock_discord.send_game_embed.assert_called_once_with(sample_game, embed_type="annonce")
+        assert mock_discord.send_game_embed.call_args.args[0].status == "closed"
+
+    def test_coalescing_keeps_the_original_position(self, db_session, sample_game, outbox):
+        """Later changes neither requeue the refresh nor push its send time back."""
+        first = outbox.enqueue_annonce_refresh(sample_game.id)
+        db_session.commit()
+        op_id, due = first.id, first.next_attempt_at
+
+        outbox.enqueue(sample_game.id, "delete_role", role_id="role_1")
+        assert outbox.enqueue_annonce_refresh(sample_game.id) is first
+        db_session.commit()
+
+        assert first.id == op_id
+        assert first.next_attempt_at == due
+
+    def test_attempted_refresh_is_not_reused(self, db_session, sample_game, mock_discord, outbox):
+        """A refresh that may already have rendered the old state is not reused."""
+        sample_game.msg_id = "annonce_msg"
+        mock_discord.send_game_embed.side_effect = DiscordAPIError("Down", status_code=503)
+        first = outbox.enqueue_annonce_refresh(sample_game.id)
+        db_session.commit()
+        _make_due(db_session, first)
+        outbox.dispatch_pending()
+
+        second = outbox.enqueue_annonce_refresh(sample_game.id)
+
+        assert second is not first
+        assert len(outbox.repo.find_pending(sample_game.id, "refresh_annonce")) == 2
+
+
+class TestAccessSync:
+    def test_syncs_are_coalesced_and_read_the_players_when_sent(
+        self, db_session, sample_game, regular_user, mock_discord, outbox
+    ):
+        """Several player changes end up as one overwrite sync of the final list."""
+        sample_game.channel = "chan_1"
+        first = outbox.enqueue_access_sync(sample_game.id)
+        sample_game.players.append(regular_user)
+        assert outbox.enqueue_access_sync(sample_game.id) is first
+        db_session.commit()
+
+        assert outbox.dispatch_pending() == 0
+        _make_due(db_session, first)
+        assert outbox.dispatch_pending() == 1
+
+        mock_discord.sync_channel_members.assert_called_once_with("chan_1", [regular_user.id])
+
+    def test_player_embed_waits_for_the_access_sync(
+        self, db_session, sample_game, regular_user, mock_discord, outbox
+    ):
+        """Players are not pinged in the channel before they can see it."""
+        sample_game.channel = "chan_1"
+        sample_game.players.append(regular_user)
+        sync = outbox.enqueue_access_sync(sample_game.id)
+        embed = outbox.enqueue(sample_game.id, "register_embed", user_id=regular_user.id)
+        db_session.commit()
+        sent = []
+        mock_discord.sync_channel_members.side_effect = lambda *_: sent.append("sync_access")
+        mock_discord.send_game_embed.side_effect = lambda *_, **__: sent.append("register_embed")
+
+        assert outbox.dispatch_pending() == 0
+        assert embed.attempts == 0
+
+        _make_due(db_session, sync)
+        assert outbox.dispatch_pending() == 2
+        assert sent == ["sync_access", "register_embed"]
+
+    def test_role_games_are_not_synced(self, db_session, sample_game, mock_discord, outbox):
+        sample_game.channel, sample_game.role = "chan_1", "role_1"
+        op = outbox.enqueue_access_sync(sample_game.id)
+        db_session.commit()
+        _make_due(db_session, op)
+
+        outbox.dispatch_pending()
+
+        assert op.status == "done"
+        mock_discord.sync_channel_members.assert_not_called()
+
+
+class TestDispatch:
+    def test_sends_a_games_operations_in_order(
+        self, db_session, sample_game, mock_discord, outbox
+    ):
+        calls = []
+        mock_discord.delete_channel.side_effect = lambda *a: calls.append("channel")
+        mock_discord.delete_role.side_effect = lambda *a: calls.append("role")
+        outbox.enqueue(sample_game.id, "delete_channel", channel_id="chan_1")
+        outbox.enqueue(sample_game.id, "delete_role", role_id="role_1")
+        db_session.commit()
+
+        assert outbox.dispatch_pending() == 2
+
+        assert calls == ["channel", "role"]
+        assert not outbox.has_pending(sample_game.id)
+
+    def test_failed_operation_blocks_later_ones_of_the_same_game(
+        self, db_session, sample_game, mock_discord, outbox
+    ):
+        """A retrying operation holds back its game's later operations."""
+        mock_discord.delete_channel.side_effect = DiscordAPIError("Down", status_code=503)
+        first = outbox.enqueue(sample_game.id, "delete_channel", channel_id="chan_1")
+        outbox.enqueue(sample_game.id, "delete_role", role_id="role_1")
+        db_session.commit()
+
+        assert outbox.dispatch_pending() == 0
+
+        mock_discord.delete_role.assert_not_called()
+        assert first.status == "pending"
+        assert first.attempts == 1
+        assert first.next_attempt_at > datetime.now(timezone.utc)
+        assert "503" in first.last_error
+
+        # Once Discord recovers, both go through in order.
+        mock_discord.delete_channel.side_effect = None
+        _make_due(db_session, first)
+        assert outbox.dispatch_pending() == 2
+        mock_discord.delete_role.assert_called_once_with("role_1")
+
+    def test_debounced_refresh_does_not_block_later_operations(
+        self, db_session, sample_game, regular_user, mock_discord, outbox
+    ):
+        """A grant queued after a debounced refresh (e.g. auto-close) is sent right away."""
+        sample_game.msg_id = "annonce_msg"
+        refresh = outbox.enqueue_annonce_refresh(sample_game.id)
+        outbox.enqueue(sample_game.id, "grant_access", user_id=regular_user.id, role_id="role_1")
+        db_session.commit()
+
+        assert outbox.dispatch_pending() == 1
+
+        mock_discord.add_role_to_user.assert_called_once_with(regular_user.id, "role_1")
+        mock_discord.send_game_embed.assert_not_called()
+        assert refresh.status == "pending"
+
+        _make_due(db_session, refresh)
+        assert outbox.dispatch_pending() == 1
+        mock_discord.send_game_embed.assert_called_once()
+
+    def test_refresh_still_waits_for_earlier_operations(
+        self, db_session, sample_game, mock_discord, outbox
+    ):
+        """Only later operations skip ahead of a refresh, never the refresh itself."""
+        sample_game.msg_id = "annonce_msg"
+        mock_discord.send_game_embed.side_effect = DiscordAPIError("Down", status_code=503)
+        post = outbox.enqueue(sample_game.id, "post_annonce")
+        refresh = outbox.enqueue_annonce_refresh(sample_game.id)
+        db_session.commit()
+        outbox.dispatch_pending()
+        _make_due(db_session, refresh)
+
+        assert outbox.dispatch_pending() == 0
+
+        assert post.attempts == 1
+        assert refresh.attempts == 0
+
+    def test_permanent_error_dead_letters_immediately(
+        self, db_session, sample_game, mock_discord, outbox
+    ):
+        mock_discord.add_role_to_user.side_effect = DiscordAPIError("Forbidden", status_code=403)
+        op = outbox.enqueue(
+            sample_game.id, "grant_access", user_id="u1", role_id="role_1", channel_id=None
+        )
+        db_session.commit()
+
+        outbox.dispatch_pending()
+
+        assert op.status == "dead"
+        assert op.processed_at is not None
+
+    def test_unavailable_discord_defers_without_using_an_attempt(
+        self, db_session, sample_game, mock_discord, outbox
+    ):
+        """An operation refused by the open circuit breaker is simply postponed."""
+        mock_discord.delete_role.side_effect = DiscordUnavailableError(retry_after=30)
+        op = outbox.enqueue(sample_game.id, "delete_role", role_id="role_1")
+        db_session.commit()
+
+        assert outbox.dispatch_pending() == 0
+
+        assert op.status == "pending"
+        assert op.attempts == 0
+        assert op.next_attempt_at > datetime.now(timezone.utc) + timedelta(seconds=25)
+
+    def test_nothing_is_claimed_while_discord_is_unavailable(
+        self, db_session, sample_game, mock_discord, outbox
+    ):
+        mock_discord.is_available.return_value = False
+        op = outbox.enqueue(sample_game.id, "delete_role", role_id="role_1")
+        db_session.commit()
+
+        assert outbox.dispatch_pending() == 0
+
+        assert op.attempts == 0
+        mock_discord.delete_role.assert_not_called()
+
+    def test_dead_letters_after_max_attempts(self, db_session, sample_game, mock_discord, outbox):
+        mock_discord.delete_role.side_effect = DiscordAPIError("Down", status_code=502)
+        op = outbox.enqueue(sample_game.id, "delete_role", role_id="role_1")
+        db_session.commit()
+
+        for _ in range(OUTBOX_MAX_ATTEMPTS):
+            _make_due(db_session, op)
+            outbox.dispatch_pending()
+
+        assert op.status == "dead"
+        assert op.attempts == OUTBOX_MAX_ATTEMPTS
+
+    def test_role_grants_update_the_local_role_index(self, db_session, sample_game, outbox):
+        outbox.member_roles.replace_for_user("u1", [])
+        outbox.enqueue(
+            sample_game.id, "grant_access", user_id="u1", role_id="role_1", channel_id=None
+        )
+        db_session.commit()
+        outbox.dispatch_pending()
+        assert outbox.member_roles.get_role_ids("u1") == ["role_1"]
+
+        outbox.enqueue(
+            sample_game.id, "revoke_access", user_id="u1", role_id="role_1", channel_id=None
+        )
+        db_session.commit()
+        outbox.dispatch_pending()
+        assert outbox.member_roles.get_role_ids("u1") == []
+
+    def test_missing_resource_counts_as_deleted(
+        self, db_session, sample_game, mock_discord, outbox
+    ):
+        mock_discord.delete_role.side_effect = DiscordAPIError("Unknown Role", status_code=404)
+        op = outbox.enqueue(sample_game.id, "delete_role", role_id="role_1")
+        db_session.commit()
+
+        assert outbox.dispatch_pending() == 1
+        assert op.status == "done"
+
+    def test_post_annonce_stores_message_id(self, db_session, sample_game, mock_discord, outbox):
+        mock_discord.send_game_embed.return_value = "annonce_msg"
+        outbox.enqueue(sample_game.id, "post_annonce")
+        db_session.commit()
+
+        outbox.dispatch_pending()
+
+        assert sample_game.msg_id == "annonce_msg"
+
+    def test_post_details_is_not_posted_twice_when_pin_fails(
+        self, db_session, sample_game, mock_discord, outbox
+    ):
+        sample_game.channel = "chan_1"
+        mock_discord.pin_message.side_effect = [DiscordAPIError("Down", status_code=500), None]
+        op = outbox.enqueue(sample_game.id, "post_details")
+        db_session.commit()
+
+        outbox.dispatch_pending()
+        _make_due(db_session, op)
+        outbox.dispatch_pending()
+
+        mock_discord.send_game_embed.assert_called_once()
+        assert mock_discord.pin_message.call_count == 2
+        assert op.status == "done"
+
+    def test_delete_annonce_clears_message_id(self, db_session, sample_game, mock_discord, outbox):
+        sample_game.msg_id = "annonce_msg"
+        outbox.enqueue(sample_game.id, "delete_annonce", message_id="annonce_msg")
+        db_session.commit()
+
+        outbox.dispatch_pending()
+
+        mock_discord.delete_message.assert_called_once_with("annonce_msg", "posts_channel")
+        assert sample_game.msg_id is None
+
+    def test_delete_channel_frees_category_slot(
+        self, db_session, sample_game, mock_discord, outbox, oneshot_channel
+    ):
+        size = oneshot_channel.size
+        mock_discord.delete_channel.return_value = {
+            "id": "chan_1",
+            "parent_id": oneshot_channel.id,
+        }
+        outbox.enqueue(sample_game.id, "delete_channel", channel_id="chan_1")
+        db_session.commit()
+
+        outbox.dispatch_pending()
+
+        assert oneshot_channel.size == max(0, size - 1)
+
+
+class TestPrune:
+    def test_prune_keeps_recent_and_dead_operations(self, db_session, sample_game, outbox):
+        old = datetime.now(timezone.utc) - timedelta(days=30)
+        for status, processed_at in (("done", old), ("done", None), ("dead", old)):
+            op = outbox.enqueue(sample_game.id, "delete_role", role_id="role_1")
+            op.status = status
+            op.processed_at = processed_at or datetime.now(timezone.utc)
+        db_session.commit()
+
+        assert outbox.prune(retention_days=7) == 1
+
+        statuses = sorted(
+            op.status for op in db_session.query(DiscordOutbox).filter_by(game_id=sample_game.id)
+        )
+        assert statuses == ["dead", "done"]
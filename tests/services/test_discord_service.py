@@ -1,10 +1,16 @@
 """Tests for DiscordService."""
 
+import threading
+import uuid
 from unittest.mock import MagicMock, patch
 
 import pytest
 
-from website.services.discord import DiscordService
+from config.constants import GM_ROLE_PERMISSION, PLAYER_ROLE_PERMISSION
+from website.exceptions import DiscordAPIError
+from website.extensions import cache
+from website.services.discord import GUILD_SNAPSHOT_KEY, DiscordService, embed_edit_stats
+from website.utils.single_flight import acquire_lock
 
 
 class TestDiscordService:
@@ -20,6 +26,13 @@ class TestDiscordService:
         """Create DiscordService with injected mock bot."""
         return DiscordService(bot=mock_bot)
 
+    @pytest.fixture
+    def snapshot(self, test_app):
+        """Start without a cached guild snapshot (and drop it afterwards)."""
+        cache.delete(GUILD_SNAPSHOT_KEY)
+        yield
+        cache.delete(GUILD_SNAPSHOT_KEY)
+
     # -------------------------------------------------------------------------
     # User operations
     # -------------------------------------------------------------------------
@@ -33,6 +46,21 @@ class TestDiscordService:
         mock_bot.get_user.assert_called_once_with("123")
         assert result["user"]["id"] == "123"
 
+    def test_iter_guild_members_pages_by_last_user_id(self, discord_service, mock_bot):
+        """Pages are requested after the last member ID until a short page."""
+        mock_bot.list_guild_members.side_effect = [
+            [{"user": {"id": "1"}}, {"user": {"id": "2"}}],
+            [{"user": {"id": "3"}}],
+        ]
+
+        members = list(discord_service.iter_guild_members(page_size=2))
+
+        assert [m["user"]["id"] for m in members] == ["1", "2", "3"]
+        assert mock_bot.list_guild_members.call_args_list[1].kwargs == {
+            "limit": 2,
+            "after": "2",
+        }
+
     def test_add_role_to_user(self, discord_service, mock_bot):
         """Test adding role to user."""
         mock_bot.add_role_to_user.return_value = {}
@@ -73,7 +101,7 @@ class TestDiscordService:
         mock_bot.delete_role.assert_called_once_with("role123")
         assert result == {}
 
-    def test_count_roles(self, discord_service, mock_bot):
+    def test_count_roles(self, discord_service, mock_bot, snapshot):
         """count_roles returns the number of guild roles."""
         mock_bot.list_roles.return_value = [{"id": "1"}, {"id": "2"}, {"id": "3"}]
 
@@ -96,6 +124,43 @@ class TestDiscordService:
 
         mock_bot.delete_channel_permission.assert_called_once_with("chan1", "user1")
 
+    def test_sync_channel_members_edits_only_player_overwrites(self, discord_service, mock_bot):
+        """One PATCH adds and removes players and keeps every other overwrite."""
+        everyone = {"id": "guild", "type": 0, "allow": "0", "deny": "1024"}
+        gm = {"id": "gm", "type": 1, "allow": GM_ROLE_PERMISSION, "deny": "0"}
+        mock_bot.get_channel.return_value = {
+            "permission_overwrites": [
+                everyone,
+                gm,
+                {"id": "left", "type": 1, "allow": PLAYER_ROLE_PERMISSION, "deny": "0"},
+                {"id": "stays", "type": 1, "allow": PLAYER_ROLE_PERMISSION, "deny": "0"},
+            ]
+        }
+
+        assert discord_service.sync_channel_members("chan1", ["stays", "new", "gm"]) is True
+
+        mock_bot.edit_channel_permissions.assert_called_once_with(
+            "chan1",
+            [
+                everyone,
+                gm,
+                {"id": "new", "type": 1, "allow": PLAYER_ROLE_PERMISSION},
+                {"id": "stays", "type": 1, "allow": PLAYER_ROLE_PERMISSION},
+            ],
+        )
+        mock_bot.set_channel_permission.assert_not_called()
+        mock_bot.delete_channel_permission.assert_not_called()
+
+    def test_sync_channel_members_skips_channels_in_sync(self, discord_service, mock_bot):
+        mock_bot.get_channel.return_value = {
+            "permission_overwrites": [
+                {"id": "p1", "type": 1, "allow": PLAYER_ROLE_PERMISSION, "deny": "0"}
+            ]
+        }
+
+        assert discord_service.sync_channel_members("chan1", ["p1"]) is False
+        mock_bot.edit_channel_permissions.assert_not_called()
+
     # -------------------------------------------------------------------------
     # Channel operations
     # -------------------------------------------------------------------------
@@ -112,7 +177,7 @@ class TestDiscordService:
         )
 
         mock_bot.create_channel.assert_called_once_with(
-            "test-channel", "category123", "role456", "gm789"
+            "test-channel", "category123", "role456", "gm789", ()
         )
         assert result["id"] == "channel123"
 
@@ -125,8 +190,8 @@ class TestDiscordService:
         mock_bot.create_category.assert_called_once_with("🎲 CAMPAGNES 1 📖")
         assert result["id"] == "cat123"
 
-    def test_list_guild_channels(self, discord_service, mock_bot):
-        """list_guild_channels forwards to the client."""
+    def test_list_guild_channels(self, discord_service, mock_bot, snapshot):
+        """list_guild_channels reads the channels fetched by the client."""
         mock_bot.list_guild_channels.return_value = [{"id": "1"}, {"id": "2"}]
 
         result = discord_service.list_guild_channels()
@@ -134,13 +199,13 @@ class TestDiscordService:
         mock_bot.list_guild_channels.assert_called_once_with()
         assert len(result) == 2
 
-    def test_count_category_children(self, discord_service, mock_bot):
+    def test_count_category_children(self, discord_service, mock_bot, snapshot):
         """count_category_children counts only text children of the category."""
         mock_bot.list_guild_channels.return_value = [
-            {"type": 0, "parent_id": "cat"},
-            {"type": 0, "parent_id": "cat"},
-            {"type": 2, "parent_id": "cat"},  # voice — ignored
-            {"type": 0, "parent_id": "other"},  # other parent — ignored
+            {"id": "1", "type": 0, "parent_id": "cat"},
+            {"id": "2", "type": 0, "parent_id": "cat"},
+            {"id": "3", "type": 2, "parent_id": "cat"},  # voice — ignored
+            {"id": "4", "type": 0, "parent_id": "other"},  # other parent — ignored
         ]
 
         assert discord_service.count_category_children("cat") == 2
@@ -307,9 +372,166 @@ class TestDiscordService:
             mock_bot.edit_embed_message.assert_called_once()
             assert result == "existing_msg_456"
 
+    def test_send_game_embed_skips_unchanged_annonce(
+        self, discord_service, mock_bot, db_session, sample_game
+    ):
+        """Re-rendering an identical announcement does not PATCH the message."""
+        sample_game.msg_id = f"msg_{uuid.uuid4().hex}"
+        mock_bot.edit_embed_message.return_value = {"id": sample_game.msg_id}
+        before = embed_edit_stats()
+
+        discord_service.send_game_embed(sample_game, embed_type="annonce")
+        result = discord_service.send_game_embed(sample_game, embed_type="annonce")
+
+        assert result == sample_game.msg_id
+        mock_bot.edit_embed_message.assert_called_once()
+        after = embed_edit_stats()
+        assert after["sent"] == before["sent"] + 1
+        assert after["skipped"] == before["skipped"] + 1
+
+    def test_send_game_embed_edits_changed_annonce(
+        self, discord_service, mock_bot, db_session, sample_game
+    ):
+        sample_game.msg_id = f"msg_{uuid.uuid4().hex}"
+        mock_bot.edit_embed_message.return_value = {"id": sample_game.msg_id}
+
+        discord_service.send_game_embed(sample_game, embed_type="annonce")
+        sample_game.status = "closed"
+        discord_service.send_game_embed(sample_game, embed_type="annonce")
+
+        assert mock_bot.edit_embed_message.call_count == 2
+
+    def test_send_game_embed_remembers_posted_annonce(
+        self, discord_service, mock_bot, db_session, sample_game
+    ):
+        """The first edit after posting is skipped when nothing changed."""
+        sample_game.msg_id = None
+        mock_bot.send_embed_message.return_value = {"id": f"msg_{uuid.uuid4().hex}"}
+
+        sample_game.msg_id = discord_service.send_game_embed(sample_game, embed_type="annonce")
+        discord_service.send_game_embed(sample_game, embed_type="annonce")
+
+        mock_bot.edit_embed_message.assert_not_called()
+
     def test_send_game_embed_unknown_type_raises(self, discord_service):
         """Test that unknown embed type raises ValueError."""
         mock_game = MagicMock()
 
         with pytest.raises(ValueError, match="Unknown embed type"):
             discord_service.send_game_embed(mock_game, embed_type="invalid_type")
+
+
+class TestGuildSnapshot:
+    """The guild's roles and channels are fetched once and edited in place."""
+
+    @pytest.fixture
+    def mock_bot(self, test_app):
+        bot = MagicMock()
+        bot.list_roles.return_value = [{"id": "everyone", "name": "@everyone", "color": 0}]
+        bot.list_guild_channels.return_value = [
+            {"id": "cat", "name": "Parties", "type": 4, "parent_id": None, "position": 1}
+        ]
+        cache.delete(GUILD_SNAPSHOT_KEY)
+        yield bot
+        cache.delete(GUILD_SNAPSHOT_KEY)
+        cache.delete(f"{GUILD_SNAPSHOT_KEY}:edit:lock")
+
+    @pytest.fixture
+    def discord_service(self, mock_bot):
+        return DiscordService(bot=mock_bot)
+
+    def test_roles_and_channels_share_one_fetch(self, discord_service, mock_bot):
+        discord_service.count_roles()
+        discord_service.list_guild_channels()
+        discord_service.list_roles()
+
+        mock_bot.list_roles.assert_called_once_with()
+        mock_bot.list_guild_channels.assert_called_once_with()
+
+    def test_snapshot_keeps_only_the_fields_the_app_reads(self, discord_service):
+        assert discord_service.list_roles() == [{"id": "everyone", "name": "@everyone"}]
+        assert discord_service.list_guild_channels() == [
+            {"id": "cat", "name": "Parties", "type": 4, "parent_id": None}
+        ]
+
+    def test_failed_fetch_raises_and_caches_nothing(self, discord_service, mock_bot):
+        """Roles and channels are fetched together; either failing fails the snapshot."""
+        mock_bot.list_guild_channels.side_effect = DiscordAPIError("Down", status_code=503)
+
+        with pytest.raises(DiscordAPIError):
+            discord_service.list_roles()
+
+        mock_bot.list_roles.assert_called_once_with()
+        assert cache.get(GUILD_SNAPSHOT_KEY) is None
+
+    def test_refresh_refetches(self, discord_service, mock_bot):
+        discord_service.count_roles()
+        mock_bot.list_roles.return_value = []
+
+        assert discord_service.count_roles(refresh=True) == 0
+        assert mock_bot.list_roles.call_count == 2
+
+    def test_created_and_deleted_items_are_applied_in_place(self, discord_service, mock_bot):
+        version = discord_service.get_guild_snapshot()["version"]
+        mock_bot.create_role.return_value = {"id": "r1", "name": "Game"}
+        mock_bot.create_channel.return_value = {"id": "c1", "type": 0, "parent_id": "cat"}
+
+        discord_service.create_role("Game")
+        discord_service.create_channel("game", "cat", "r1", "gm")
+        discord_service.delete_channel("cat")
+
+        snapshot = discord_service.get_guild_snapshot()
+        assert [r["id"] for r in snapshot["roles"]] == ["everyone", "r1"]
+        assert [c["id"] for c in snapshot["channels"]] == ["c1"]
+        assert snapshot["version"] > version
+        mock_bot.list_roles.assert_called_once_with()
+
+    def test_edits_keep_the_original_expiry(self, discord_service, mock_bot):
+        expires_at = discord_service.get_guild_snapshot()["expires_at"]
+        mock_bot.create_role.return_value = {"id": "r1", "name": "Game"}
+
+        discord_service.create_role("Game")
+
+        assert discord_service.get_guild_snapshot()["expires_at"] == expires_at
+
+    def test_interleaved_edits_are_both_applied(self, test_app, discord_service):
+        discord_service.get_guild_snapshot()
+        editing, resume = threading.Event(), threading.Event()
+
+        def slow_edit(snapshot):
+            editing.set()
+            resume.wait(5)
+            snapshot["roles"].append({"id": "r1", "name": "First"})
+
+        def first_worker():
+            with test_app.app_context():
+                discord_service._edit_guild_snapshot(slow_edit)
+
+        first = threading.Thread(target=first_worker)
+        first.start()
+        editing.wait(5)
+        threading.Timer(0.2, resume.set).start()
+
+        discord_service.snapshot_upsert("roles", {"id": "r2", "name": "Second"})
+        first.join()
+
+        roles = [r["id"] for r in discord_service.get_guild_snapshot()["roles"]]
+        assert roles == ["everyone", "r1", "r2"]
+
+    def test_edit_lock_held_too_long_drops_the_snapshot(self, discord_service, mock_bot):
+        discord_service.get_guild_snapshot()
+        acquire_lock(f"{GUILD_SNAPSHOT_KEY}:edit")
+        mock_bot.create_role.return_value = {"id": "r1", "name": "Game"}
+
+        with patch("website.services.discord.SINGLE_FLIGHT_WAIT", 0.1):
+            discord_service.create_role("Game")
+
+        assert cache.get(GUILD_SNAPSHOT_KEY) is None
+
+    def test_edit_without_snapshot_does_not_fetch(self, discord_service, mock_bot):
+        mock_bot.delete_role.return_value = {}
+
+        discord_service.delete_role("r1")
+
+        mock_bot.list_roles.assert_not_called()
+        assert cache.get(GUILD_SNAPSHOT_KEY) is None
@@ -5,7 +5,7 @@ from unittest.mock import Mock, patch
 
 import pytest
 
-from config.constants import DISCORD_NAME_MAX, MAX_SLUG_LENGTH, PLAYER_ROLE_PERMISSION
+from config.constants import DISCORD_NAME_MAX, MAX_SLUG_LENGTH
 from tests.factories import GameFactory, UserFactory
 from website.exceptions import (
     DiscordAPIError,
@@ -16,7 +16,14 @@ from website.exceptions import (
     PastDateError,
     ValidationError,
 )
+from website.repositories.co_play import CoPlayRepository
 from website.services.game import GameService
+from website.services.stats import StatsService
+
+
+def _drain(service):
+    """Send every Discord operation the service queued in its outbox."""
+    service.outbox.dispatch_pending()
 
 
 class TestGameService:
@@ -365,17 +372,32 @@ class TestGameService:
         game = game_service.publish(sample_game.slug, silent=False, allow_past_date=True)
 
         assert game.status == "open"
+        # The announcement is queued, then posted by the outbox dispatcher.
+        assert game.msg_id is None
+        mock_discord.send_game_embed.assert_not_called()
+        _drain(game_service)
         assert game.msg_id == "msg_123456"
         mock_discord.send_game_embed.assert_called()
 
+    def test_publish_twice_while_announcement_queued(
+        self, db_session, sample_game, game_service, oneshot_channel
+    ):
+        """A queued (not yet posted) announcement already counts as published."""
+        game_service.publish(sample_game.slug, silent=False, allow_past_date=True)
+
+        with pytest.raises(ValidationError, match="already published"):
+            game_service.publish(sample_game.slug, allow_past_date=True)
+
     def test_publish_game_silent(
         self, db_session, sample_game, mock_discord, game_service, oneshot_channel
     ):
         game = game_service.publish(sample_game.slug, silent=True, allow_past_date=True)
+        _drain(game_service)
 
         assert game.status == "closed"
         assert game.msg_id is None
         mock_discord.send_game_embed.assert_called_once_with(game, embed_type="annonce_details")
+        mock_discord.pin_message.assert_called_once_with("mock_msg_id", game.channel)
 
     def test_publish_already_published(self, db_session, sample_game, game_service):
         sample_game.msg_id = "existing_msg"
@@ -408,6 +430,7 @@ class TestGameService:
         mock_discord.send_game_embed.return_value = "msg_past"
 
         game = game_service.publish(sample_game.slug, silent=False, allow_past_date=True)
+        _drain(game_service)
 
         assert game.status == "open"
         assert game.msg_id == "msg_past"
@@ -421,6 +444,7 @@ class TestGameService:
         mock_discord.send_game_embed.return_value = "msg_future"
 
         game = game_service.publish(sample_game.slug, silent=False)
+        _drain(game_service)
 
         assert game.status == "open"
         assert game.msg_id == "msg_future"
@@ -451,6 +475,8 @@ class TestGameService:
 
         game = game_service.get_by_slug(sample_game.slug)
         assert game.status == "archived"
+        mock_discord.delete_channel.assert_not_called()
+        _drain(game_service)
         mock_discord.delete_role.assert_called_once()
         mock_discord.delete_channel.assert_called_once()
 
@@ -482,7 +508,31 @@ class TestGameService:
         game = game_service.register_player(sample_game.slug, regular_user.id, force=False)
 
         assert regular_user in game.players
+        mock_discord.add_role_to_user.assert_not_called()
+        _drain(game_service)
         mock_discord.add_role_to_user.assert_called_once_with(regular_user.id, "role_123")
+        mock_discord.send_game_embed.assert_called_once_with(
+            game, embed_type="register", player=regular_user.id
+        )
+
+    def test_register_player_updates_co_play(
+        self, db_session, sample_game, regular_user, game_service
+    ):
+        """Registering links the player and the GM in the co-play network."""
+        sample_game.status = "open"
+        db_session.commit()
+
+        game_service.register_player(sample_game.slug, regular_user.id)
+        assert CoPlayRepository().find_network(regular_user.id) == []
+        StatsService().refresh_stale()
+
+        edges = CoPlayRepository().find_network(regular_user.id)
+        assert [(e.mate_id, e.gm_games, e.games_together) for e in edges] == [
+            (sample_game.gm_id, 1, 0)
+        ]
+        assert [e.mate_id for e in CoPlayRepository().find_network(sample_game.gm_id)] == [
+            regular_user.id
+        ]
 
     def test_register_player_duplicate(self, db_session, sample_game, regular_user, game_service):
         sample_game.status = "open"
@@ -558,6 +608,7 @@ class TestGameService:
         db_session.commit()
 
         game = game_service.unregister_player(sample_game.slug, regular_user.id)
+        _drain(game_service)
 
         assert regular_user not in game.players
         mock_discord.remove_role_from_user.assert_called_once_with(regular_user.id, "role_123")
@@ -624,8 +675,9 @@ class TestGameServicePrivateHelpers:
         sample_game.channel = "channel_123"
         sample_game.role = "role_456"
 
-        # Should not raise — errors are caught and logged
+        # Should not raise — a missing channel counts as already deleted
         service._cleanup_discord_resources(sample_game)
+        _drain(service)
 
         mock_discord.delete_channel.assert_called_once_with("channel_123")
         mock_discord.delete_role.assert_called_once_with("role_456")
@@ -647,6 +699,7 @@ class TestGameServicePrivateHelpers:
 
         # Should not raise
         service._cleanup_discord_resources(sample_game)
+        _drain(service)
 
         mock_discord.delete_channel.assert_called_once_with("channel_123")
         mock_discord.delete_role.assert_called_once_with("role_456")
@@ -669,7 +722,7 @@ class TestGameServicePrivateHelpers:
     def test_delete_game_message_logs_on_failure(self, db_session, sample_game, mock_discord):
         """Discord message deletion failure is logged but doesn't propagate."""
         mock_discord.delete_message.side_effect = DiscordAPIError(
-            "Message not found", status_code=404
+            "Service unavailable", status_code=503
         )
 
         service = GameService(discord_service=mock_discord)
@@ -679,10 +732,12 @@ class TestGameServicePrivateHelpers:
 
         # Should not raise
         service._delete_game_message(sample_game)
+        _drain(service)
 
         mock_discord.delete_message.assert_called_once()
-        # msg_id should NOT be cleared since deletion failed
+        # msg_id should NOT be cleared since deletion failed; it will be retried
         assert sample_game.msg_id == "msg_to_delete"
+        assert service.outbox.has_pending(sample_game.id, "delete_annonce")
 
     def test_delete_game_message_skips_when_no_msg_id(self, db_session, sample_game, mock_discord):
         """When game has no msg_id, deletion is skipped entirely."""
@@ -691,6 +746,7 @@ class TestGameServicePrivateHelpers:
         sample_game.msg_id = None
 
         service._delete_game_message(sample_game)
+        _drain(service)
 
         mock_discord.delete_message.assert_not_called()
 
@@ -721,6 +777,19 @@ class TestGameServicePrivateHelpers:
         mock_discord.delete_channel.assert_called_once_with("channel_123")
         mock_discord.delete_role.assert_called_once_with("role_456")
 
+    def test_rollback_deletes_the_role_even_if_the_channel_deletion_fails(
+        self, db_session, sample_game, mock_discord
+    ):
+        """Rollback deletions are independent and never raise over the original error."""
+        mock_discord.delete_channel.side_effect = DiscordAPIError("Down", status_code=503)
+        service = GameService(discord_service=mock_discord)
+        sample_game.channel = "channel_123"
+        sample_game.role = "role_456"
+
+        service._rollback_discord_resources(sample_game)
+
+        mock_discord.delete_role.assert_called_once_with("role_456")
+
 
 class TestGameServiceDirectPermissions:
     """Tests for direct per-player channel permission mode (no per-game role)."""
@@ -732,6 +801,12 @@ class TestGameServiceDirectPermissions:
         settings.is_direct_permissions_enabled.return_value = True
         return settings
 
+    @pytest.fixture(autouse=True)
+    def _send_syncs_immediately(self):
+        """Make queued overwrite syncs due at once so ``_drain`` sends them."""
+        with patch("website.services.discord_outbox.OUTBOX_ACCESS_SYNC_DEBOUNCE", 0):
+            yield
+
     @patch("website.utils.form_parsers.get_classification")
     @patch("website.utils.form_parsers.get_ambience")
     @patch("website.utils.form_parsers.parse_restriction_tags")
@@ -772,9 +847,11 @@ class TestGameServiceDirectPermissions:
         assert game.role is None
         assert game.channel == "mock_channel_id"
         mock_discord.create_role.assert_not_called()
-        # Channel is created with role_id=None (no player-role overwrite).
+        # Channel is created with role_id=None (no player-role overwrite) and the
+        # (still empty) player list as member overwrites.
         _, kwargs = mock_discord.create_channel.call_args
         assert kwargs["role_id"] is None
+        assert kwargs["member_ids"] == []
 
     def test_silent_then_open_publish_reuses_channel(
         self, db_session, sample_game, mock_discord, direct_settings, oneshot_channel
@@ -790,6 +867,7 @@ class TestGameServiceDirectPermissions:
 
         # First publish: open silently -> creates session + channel, no role.
         game = service.publish(sample_game.slug, silent=True, allow_past_date=True)
+        _drain(service)
         channel_after_silent = game.channel
         assert channel_after_silent == "mock_channel_id"
         assert game.role is None
@@ -799,6 +877,7 @@ class TestGameServiceDirectPermissions:
         # Second publish: open for real. Must reuse the existing resources.
         mock_discord.send_game_embed.return_value = "announce_msg"
         game = service.publish(sample_game.slug, silent=False)
+        _drain(service)
 
         assert game.status == "open"
         assert game.channel == channel_after_silent
@@ -808,37 +887,39 @@ class TestGameServiceDirectPermissions:
         # ...and the live channel must never be deleted.
         mock_discord.delete_channel.assert_not_called()
 
-    def test_register_player_grants_channel_permission(
+    def test_register_player_syncs_channel_overwrites(
         self, db_session, sample_game, regular_user, mock_discord, game_service
     ):
-        """A roleless game grants access via a per-member channel overwrite."""
+        """A roleless game syncs the channel's member overwrites in one edit."""
         sample_game.status = "open"
         sample_game.role = None
         sample_game.channel = "channel_123"
         db_session.commit()
 
         game_service.register_player(sample_game.slug, regular_user.id, force=False)
+        _drain(game_service)
 
-        mock_discord.set_channel_permission.assert_called_once_with(
-            "channel_123", regular_user.id, PLAYER_ROLE_PERMISSION
-        )
+        mock_discord.sync_channel_members.assert_called_once_with("channel_123", [regular_user.id])
+        mock_discord.set_channel_permission.assert_not_called()
         mock_discord.add_role_to_user.assert_not_called()
 
-    def test_unregister_player_revokes_channel_permission(
+    def test_unregistering_several_players_sends_one_sync(
         self, db_session, sample_game, regular_user, mock_discord, game_service
     ):
-        """A roleless game revokes the per-member channel overwrite on unregister."""
+        """Removing a list of players costs a single overwrite sync."""
+        other = UserFactory(db_session)
         sample_game.status = "open"
         sample_game.role = None
         sample_game.channel = "channel_123"
-        sample_game.players.append(regular_user)
+        sample_game.players.extend([regular_user, other])
         db_session.commit()
 
         game_service.unregister_player(sample_game.slug, regular_user.id)
+        game_service.unregister_player(sample_game.slug, other.id)
+        _drain(game_service)
 
-        mock_discord.delete_channel_permission.assert_called_once_with(
-            "channel_123", regular_user.id
-        )
+        mock_discord.sync_channel_members.assert_called_once_with("channel_123", [])
+        mock_discord.delete_channel_permission.assert_not_called()
         mock_discord.remove_role_from_user.assert_not_called()
 
     def test_cleanup_skips_role_deletion_when_no_role(self, db_session, sample_game, mock_discord):
@@ -852,6 +933,7 @@ class TestGameServiceDirectPermissions:
         sample_game.role = None
 
         service._cleanup_discord_resources(sample_game)
+        _drain(service)
 
         mock_discord.delete_channel.assert_called_once_with("channel_123")
         mock_discord.delete_role.assert_not_called()
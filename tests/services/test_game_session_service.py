@@ -3,7 +3,9 @@
 from datetime import datetime
 
 import pytest
+from sqlalchemy import event
 
+from tests.factories import GameFactory, GameSessionFactory, UserFactory
 from website.exceptions import SessionConflictError, ValidationError
 from website.models import GameSession
 from website.services.game_session import GameSessionService
@@ -146,6 +148,60 @@ class TestGameSessionService:
         assert stats["gm_names"] == []
         assert stats["os_games"] == {}
 
+    def test_get_stats_for_period_breakdown(self, db_session, default_system):
+        """Sessions are tallied per system and game, and credited to the game's GM."""
+        gm = UserFactory(db_session, name="Alice")
+        campaign = GameFactory(
+            db_session, gm_id=gm.id, system_id=default_system.id, type="campaign", status="open"
+        )
+        for day in (3, 17):
+            GameSessionFactory(
+                db_session,
+                game_id=campaign.id,
+                start=datetime(2031, 5, day, 20, 0),
+                end=datetime(2031, 5, day, 23, 0),
+            )
+
+        stats = GameSessionService().get_stats_for_period(2031, 5)
+
+        assert stats["num_campaign"] == 2
+        assert stats["campaign_games"] == {
+            default_system.name: {
+                campaign.slug: {"name": campaign.name, "gm": "Alice", "count": 2}
+            }
+        }
+        assert stats["gm_names"] == ["Alice", "Alice"]
+
+    def test_get_stats_for_period_constant_query_count(self, db_session, default_system):
+        """The month report costs the same number of queries however busy the month."""
+        for day in range(1, 6):
+            gm = UserFactory(db_session)
+            game = GameFactory(db_session, gm_id=gm.id, system_id=default_system.id, status="open")
+            GameSessionFactory(
+                db_session,
+                game_id=game.id,
+                start=datetime(2032, 3, day, 20, 0),
+                end=datetime(2032, 3, day, 23, 0),
+            )
+        db_session.expire_all()
+        statements = []
+
+        def count(*args):
+            statements.append(args)
+
+        engine = db_session.get_bind()
+        event.listen(engine, "before_cursor_execute", count)
+        try:
+            GameSessionService().get_stats_for_period(2032, 2)
+            quiet = len(statements)
+            statements.clear()
+            busy = GameSessionService().get_stats_for_period(2032, 3)
+        finally:
+            event.remove(engine, "before_cursor_execute", count)
+
+        assert busy["num_os"] == 5
+        assert len(statements) == quiet == 1
+
     def test_get_stats_for_period_empty(self, db_session, sample_game):
         service = GameSessionService()
 
@@ -0,0 +1,172 @@
+from datetime import datetime
+
+import pytest
+
+from config.constants import DISCORD_CHANNEL_TYPE_CATEGORY, DISCORD_CHANNEL_TYPE_TEXT
+from tests.factories import ChannelFactory, UserFactory
+from website.extensions import cache
+from website.models import Channel, GuildMemberRole, User
+from website.services.discord import GUILD_SNAPSHOT_KEY
+from website.services.gateway import GatewayEventService
+
+GUILD_ID = "900000000000000001"
+
+
+def _member(user_id, username, nick=None, roles=()):
+    """Return a GUILD_MEMBER_UPDATE payload."""
+    return {
+        "guild_id": GUILD_ID,
+        "user": {"id": user_id, "username": username, "avatar": None},
+        "nick": nick,
+        "roles": list(roles),
+    }
+
+
+def _role_ids(db_session, user_id):
+    rows = db_session.query(GuildMemberRole.role_id).filter(GuildMemberRole.user_id == user_id)
+    return sorted(row[0] for row in rows)
+
+
+def _text_channel(channel_id, parent_id):
+    return {
+        "id": channel_id,
+        "guild_id": GUILD_ID,
+        "type": DISCORD_CHANNEL_TYPE_TEXT,
+        "parent_id": parent_id,
+    }
+
+
+@pytest.fixture(autouse=True)
+def _clear_snapshot(test_app):
+    yield
+    cache.delete(GUILD_SNAPSHOT_KEY)
+    cache.delete(f"{GUILD_SNAPSHOT_KEY}:edit")
+
+
+@pytest.fixture
+def service():
+    return GatewayEventService(GUILD_ID)
+
+
+@pytest.fixture
+def synced(service):
+    """A service that received GUILD_CREATE for an empty guild with two roles."""
+    roles = [{"id": "r1", "name": "One"}, {"id": "r2", "name": "Two"}]
+    service.handle("GUILD_CREATE", {"id": GUILD_ID, "channels": [], "roles": roles})
+    return service
+
+
+def _snapshot_ids(kind):
+    return [item["id"] for item in cache.get(GUILD_SNAPSHOT_KEY)[kind]]
+
+
+class TestMemberEvents:
+    def test_member_update_stores_profile_and_roles(self, db_session, service):
+        user = UserFactory(db_session, name="Old", not_player_as_of=datetime(2025, 1, 1))
+        cache.set(f"user_roles_{user.id}", ["stale"])
+        cache.set(f"user_perms_{user.id}", ["stale"])
+
+        service.handle("GUILD_MEMBER_UPDATE", _member(user.id, "new", "New", ["r1", "r2"]))
+
+        row = db_session.query(User.name, User.username, User.not_player_as_of)
+        assert row.filter(User.id == user.id).one() == ("New", "new", None)
+        assert _role_ids(db_session, user.id) == ["r1", "r2"]
+        assert cache.get(f"user_profile_{user.id}")["name"] == "New"
+        assert cache.get(f"user_roles_{user.id}") is None
+        assert cache.get(f"user_perms_{user.id}") is None
+
+    def test_member_update_replaces_previous_roles(self, db_session, service):
+        user = UserFactory(db_session)
+        service.handle("GUILD_MEMBER_ADD", _member(user.id, "u", roles=["r1", "r2"]))
+
+        service.handle("GUILD_MEMBER_UPDATE", _member(user.id, "u", roles=["r3"]))
+
+        assert _role_ids(db_session, user.id) == ["r3"]
+
+    def test_member_remove_marks_user_inactive(self, db_session, service):
+        user = UserFactory(db_session)
+        service.handle("GUILD_MEMBER_ADD", _member(user.id, "u", roles=["r1"]))
+
+        service.handle("GUILD_MEMBER_REMOVE", {"guild_id": GUILD_ID, "user": {"id": user.id}})
+
+        db_session.expire_all()
+        assert db_session.get(User, user.id).not_player_as_of is not None
+        assert _role_ids(db_session, user.id) == []
+
+    def test_events_from_other_guilds_are_ignored(self, db_session, service):
+        user = UserFactory(db_session, name="Kept")
+        payload = _member(user.id, "u", "Changed") | {"guild_id": "1"}
+
+        service.handle("GUILD_MEMBER_UPDATE", payload)
+
+        assert db_session.query(User.name).filter(User.id == user.id).scalar() == "Kept"
+
+
+class TestRoleEvents:
+    def test_guild_create_stores_the_guild_snapshot(self, db_session, service):
+        roles = [{"id": "r1"}, {"id": "r2"}, {"id": "r3"}]
+        channels = [{"id": "cat", "type": DISCORD_CHANNEL_TYPE_CATEGORY}]
+
+        service.handle("GUILD_CREATE", {"id": GUILD_ID, "channels": channels, "roles": roles})
+
+        assert _snapshot_ids("roles") == ["r1", "r2", "r3"]
+        assert _snapshot_ids("channels") == ["cat"]
+
+    def test_role_events_update_the_snapshot_and_index(self, db_session, synced):
+        user = UserFactory(db_session)
+        synced.handle("GUILD_MEMBER_UPDATE", _member(user.id, "u", roles=["r1", "r2"]))
+
+        synced.handle("GUILD_ROLE_CREATE", {"guild_id": GUILD_ID, "role": {"id": "r3"}})
+        assert _snapshot_ids("roles") == ["r1", "r2", "r3"]
+
+        renamed = {"id": "r2", "name": "Renamed"}
+        synced.handle("GUILD_ROLE_UPDATE", {"guild_id": GUILD_ID, "role": renamed})
+        assert renamed in cache.get(GUILD_SNAPSHOT_KEY)["roles"]
+
+        synced.handle("GUILD_ROLE_DELETE", {"guild_id": GUILD_ID, "role_id": "r1"})
+        assert _snapshot_ids("roles") == ["r3", "r2"]
+        assert _role_ids(db_session, user.id) == ["r2"]
+
+
+class TestChannelEvents:
+    def test_guild_create_sets_absolute_category_sizes(self, db_session, service):
+        category = ChannelFactory(db_session, size=20)
+        channels = [
+            {"id": category.id, "type": DISCORD_CHANNEL_TYPE_CATEGORY},
+            _text_channel("c1", category.id),
+            _text_channel("c2", category.id),
+        ]
+
+        service.handle("GUILD_CREATE", {"id": GUILD_ID, "channels": channels, "roles": []})
+
+        assert db_session.get(Channel, category.id).size == 2
+
+    def test_channel_create_move_and_delete_recount_categories(self, db_session, synced):
+        first = ChannelFactory(db_session, size=0)
+        second = ChannelFactory(db_session, size=0)
+
+        synced.handle("CHANNEL_CREATE", _text_channel("c1", first.id))
+        synced.handle("CHANNEL_CREATE", _text_channel("c2", first.id))
+        assert (first.size, second.size) == (2, 0)
+
+        synced.handle("CHANNEL_UPDATE", _text_channel("c1", second.id))
+        assert (first.size, second.size) == (1, 1)
+
+        synced.handle("CHANNEL_DELETE", _text_channel("c2", first.id))
+        assert (first.size, second.size) == (0, 1)
+        assert _snapshot_ids("channels") == ["c1"]
+
+    def test_replayed_events_are_idempotent(self, db_session, synced):
+        category = ChannelFactory(db_session, size=0)
+
+        synced.handle("CHANNEL_CREATE", _text_channel("c1", category.id))
+        synced.handle("CHANNEL_CREATE", _text_channel("c1", category.id))
+
+        assert category.size == 1
+
+    def test_channel_events_wait_for_guild_create(self, db_session, service):
+        category = ChannelFactory(db_session, size=5)
+
+        service.handle("CHANNEL_CREATE", _text_channel("c1", category.id))
+
+        assert category.size == 5
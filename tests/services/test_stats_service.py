@@ -2,6 +2,8 @@
 
 from datetime import datetime
 
+from sqlalchemy import event
+
 from config.constants import BADGE_CAMPAIGN_ID, BADGE_OS_ID, RESTRICTION_LABELS
 from tests.factories import (
     GameFactory,
@@ -11,7 +13,12 @@ from tests.factories import (
     UserTrophyFactory,
     VttFactory,
 )
+from website.repositories.co_play import CoPlayRepository
+from website.repositories.game import GameRepository
+from website.repositories.user_stats import UserStatsRepository
+from website.services.game_session import GameSessionService
 from website.services.stats import ROLE_GM, ROLE_PLAYER, StatsService
+from website.services.trophy import TrophyService
 
 PAST = (datetime(2026, 1, 10, 20, 0), datetime(2026, 1, 10, 23, 0))
 FUTURE = (datetime(2030, 1, 10, 20, 0), datetime(2030, 1, 10, 23, 0))
@@ -39,6 +46,8 @@ def _build_scenario(db_session, default_system):
     GameSessionFactory(db_session, game_id=player_game.id, start=FUTURE[0], end=FUTURE[1])
     GameSessionFactory(db_session, game_id=player_game.id, start=FUTURE[0], end=FUTURE[1])
     db_session.flush()
+    # Factories bypass the service write hooks: build the co-play edges as they would.
+    CoPlayRepository().replace_for_users([user.id, other_gm.id, mate.id], datetime.now())
 
     return user, other_gm, mate
 
@@ -62,6 +71,7 @@ class TestStatsService:
         gm_game.players.append(user)
         GameSessionFactory(db_session, game_id=gm_game.id, start=PAST[0], end=PAST[1])
         db_session.flush()
+        CoPlayRepository().replace_for_users([user.id], datetime.now())
 
         stats = StatsService().get_dashboard_stats(user.id, 10)["stats"]
         # 2 GM games + 1 player game + the new GM game (counted once) == 3.
@@ -143,6 +153,150 @@ class TestStatsService:
         assert data["stats"]["role"]["sessions"] == 0
 
 
+def _persist_rows(*users):
+    """Flag then recompute the users' rows, as a write and the scheduler job would."""
+    StatsService().mark_stale(*(user.id for user in users))
+    StatsService().refresh_stale()
+
+
+class TestUserStatsReadModel:
+    """The dashboard figures come from a user_stats row kept current in the background."""
+
+    def test_missing_row_is_computed_without_writing(self, db_session, default_system):
+        user, *_ = _build_scenario(db_session, default_system)
+
+        stats = StatsService().get_dashboard_stats(user.id, 10)["stats"]
+
+        assert stats["games_count"] == 2
+        assert stats["play_hours_total"] == 6
+        assert UserStatsRepository().get_current(user.id) is None
+
+    def test_refresh_persists_flagged_rows(self, db_session, default_system):
+        user, *_ = _build_scenario(db_session, default_system)
+        StatsService().mark_stale(user.id)
+
+        assert StatsService().refresh_stale() == 1
+
+        row = UserStatsRepository().get_current(user.id)
+        assert (row.gm_games, row.player_games) == (1, 1)
+        assert (row.gm_sessions, row.player_sessions) == (2, 3)
+        assert row.gm_seconds == row.player_seconds == 3 * 3600
+        assert row.valid_until == FUTURE[1]  # next session still to end
+        assert StatsService().refresh_stale() == 0
+
+    def test_session_change_only_flags_everyone_in_the_game(self, db_session, default_system):
+        user, other_gm, mate = _build_scenario(db_session, default_system)
+        _persist_rows(user, other_gm, mate)
+        game = GameRepository().find_by_gm(other_gm.id)[0]
+
+        GameSessionService().create(game, datetime(2026, 2, 1, 20), datetime(2026, 2, 1, 23))
+
+        # The write left the figures alone; the dashboard computes them meanwhile.
+        assert UserStatsRepository().get_current(other_gm.id).gm_sessions == 3
+        stats = StatsService().get_dashboard_stats(other_gm.id, 10)["stats"]
+        assert stats["sessions_count"] == 4
+
+        assert StatsService().refresh_stale() == 3
+        assert UserStatsRepository().get_current(other_gm.id).gm_sessions == 4
+        assert UserStatsRepository().get_current(user.id).player_sessions == 4
+        assert UserStatsRepository().get_current(mate.id).player_sessions == 4 + 2
+
+    def test_trophy_award_updates_badges(self, db_session, default_system):
+        user, *_ = _build_scenario(db_session, default_system)
+        _persist_rows(user)
+
+        TrophyService().award(user.id, BADGE_OS_ID, amount=2)
+
+        assert StatsService().get_dashboard_stats(user.id, 10)["stats"]["badges"] == 2
+
+    def test_trophy_removal_updates_badges(self, db_session, default_system):
+        user, *_ = _build_scenario(db_session, default_system)
+        _persist_rows(user)
+        service = TrophyService()
+        service.award(user.id, BADGE_OS_ID, amount=2)
+
+        service.decrement_user_trophy(user.id, BADGE_OS_ID, amount=1)
+        assert UserStatsRepository().get_current(user.id).badges == 1
+        service.decrement_user_trophy(user.id, BADGE_OS_ID, amount=1)
+        assert UserStatsRepository().get_current(user.id).badges == 0
+
+    def test_row_is_recomputed_once_a_pending_session_ended(self, db_session, default_system):
+        user, *_ = _build_scenario(db_session, default_system)
+        _persist_rows(user)
+        row = UserStatsRepository().get_current(user.id)
+        # Pretend a session ended since: the row still holds the old played time.
+        row.valid_until = datetime(2026, 1, 1)
+        row.gm_seconds = 0
+        db_session.commit()
+
+        stats = StatsService().get_dashboard_stats(user.id, 10)["stats"]
+
+        assert stats["play_hours_gm"] == 3
+        assert UserStatsRepository().get_current(user.id).valid_until == datetime(2026, 1, 1)
+        StatsService().refresh_stale()
+        assert UserStatsRepository().get_current(user.id).valid_until == FUTURE[1]
+
+    def test_top_systems_and_rythme_from_tallies(self, db_session, default_system):
+        user, *_ = _build_scenario(db_session, default_system)
+        stats = StatsService().get_dashboard_stats(user.id, 10)["stats"]
+
+        name = default_system.name
+        assert stats["top_systems"]["gm"]["sessions"] == [{"name": name, "n": 2}]
+        assert stats["top_systems"]["player"]["parties"] == [{"name": name, "n": 1}]
+        assert len(stats["rythme"]["sessions"]) == 12
+
+
+class TestCoPlay:
+    """The network panel and table-mates come from the co_play edges."""
+
+    def test_edges_per_direction(self, db_session, default_system):
+        user, other_gm, mate = _build_scenario(db_session, default_system)
+
+        edges = {e.mate_id: e for e in CoPlayRepository().find_network(user.id)}
+        assert (edges[mate.id].games_together, edges[mate.id].gm_games) == (2, 0)
+        assert (edges[other_gm.id].games_together, edges[other_gm.id].gm_games) == (0, 1)
+        assert edges[mate.id].last_played == PAST[0]
+        # The mate ran no game: the user is their table-mate and, once, their GM.
+        back = {e.mate_id: e for e in CoPlayRepository().find_network(mate.id)}
+        assert (back[user.id].games_together, back[user.id].gm_games) == (1, 1)
+
+    def test_session_change_refreshes_last_played(self, db_session, default_system):
+        user, other_gm, mate = _build_scenario(db_session, default_system)
+        game = GameRepository().find_by_gm(other_gm.id)[0]
+        later = datetime(2026, 3, 1, 20)
+
+        GameSessionService().create(game, later, datetime(2026, 3, 1, 23))
+        StatsService().refresh_stale()
+
+        edges = {e.mate_id: e for e in CoPlayRepository().find_network(user.id)}
+        assert edges[mate.id].last_played == later
+        assert edges[other_gm.id].last_played == later
+
+    def test_upcoming_sessions_are_not_last_played(self, db_session, default_system):
+        user, _, mate = _build_scenario(db_session, default_system)
+        game = GameFactory(
+            db_session, type="oneshot", status="open", gm_id=user.id, system_id=default_system.id
+        )
+        game.players.append(mate)
+        GameSessionFactory(db_session, game_id=game.id, start=FUTURE[0], end=FUTURE[1])
+        db_session.flush()
+        CoPlayRepository().replace_for_users([user.id], datetime(2030, 1, 10, 19))
+
+        edges = {e.mate_id: e for e in CoPlayRepository().find_network(user.id)}
+        assert edges[mate.id].games_together == 3
+        assert edges[mate.id].last_played == PAST[0]
+
+    def test_table_mates(self, db_session, default_system):
+        user, other_gm, mate = _build_scenario(db_session, default_system)
+
+        mates = StatsService().get_table_mates(user.id, 5)
+
+        assert [m["id"] for m in mates] == [mate.id]  # the GM never registered
+        assert mates[0]["games_together"] == 2
+        assert mates[0]["last_played"] == PAST[0].isoformat()
+        assert mates[0]["avatar"]
+
+
 def _game_with(
     db_session,
     system,
@@ -179,25 +333,29 @@ def _game_with(
 
 
 class TestGlobalStats:
-    """Pure aggregation helpers run on a controlled game list (DB-independent)."""
+    """App-wide aggregates, computed in SQL over the (otherwise empty) game table."""
 
     def test_role_ratios_count_engagements(self, db_session, default_system):
         # 1 GM slot + 2 player slots -> GM share 33%; sessions 2 GM vs 2*2 player -> 33%.
-        game = _game_with(db_session, default_system, players=2, sessions=2)
-        role = StatsService()._global_role_ratios([game])
+        _game_with(db_session, default_system, players=2, sessions=2)
+        role = StatsService().get_global_stats()["role"]
         assert role["parties"] == 33
         assert role["sessions"] == 33
 
+    def test_type_ratios(self, db_session, default_system):
+        _game_with(db_session, default_system, type="oneshot", sessions=1)
+        _game_with(db_session, default_system, type="campaign", sessions=3)
+        ratios = StatsService().get_global_stats()["type"]
+        assert ratios == {"sessions": 25, "parties": 50}
+
     def test_global_top_ranks_by_games_split_by_type(self, db_session, default_system):
         popular = SystemFactory(db_session)
         niche = SystemFactory(db_session)
-        games = [
-            _game_with(db_session, popular, type="oneshot"),
-            _game_with(db_session, popular, type="oneshot"),
-            _game_with(db_session, popular, type="campaign"),
-            _game_with(db_session, niche, type="oneshot"),
-        ]
-        top = StatsService()._global_top(games, lambda g: g.system.name)
+        _game_with(db_session, popular, type="oneshot")
+        _game_with(db_session, popular, type="oneshot")
+        _game_with(db_session, popular, type="campaign")
+        _game_with(db_session, niche, type="oneshot")
+        top = StatsService().get_global_stats()["top_systems"]
 
         assert top["all"][0] == {"name": popular.name, "n": 3}
         assert {r["name"]: r["n"] for r in top["all"]} == {popular.name: 3, niche.name: 1}
@@ -206,25 +364,37 @@ class TestGlobalStats:
 
     def test_global_top_skips_missing_key(self, db_session, default_system):
         vtt = VttFactory(db_session)
-        games = [
-            _game_with(db_session, default_system, vtt=vtt),
-            _game_with(db_session, default_system, vtt=None),  # no VTT
-        ]
-        top = StatsService()._global_top(games, lambda g: g.vtt.name if g.vtt else None)
+        _game_with(db_session, default_system, vtt=vtt)
+        _game_with(db_session, default_system, vtt=None)  # no VTT
+        top = StatsService().get_global_stats()["top_vtts"]
         assert top["all"] == [{"name": vtt.name, "n": 1}]
 
     def test_play_hours_sum_ended_sessions(self, db_session, default_system):
         game = _game_with(db_session, default_system, sessions=2)  # two ended 3h sessions
-        play = StatsService()._global_play_hours([game], datetime(2027, 1, 1))
+        GameSessionFactory(db_session, game_id=game.id, start=FUTURE[0], end=FUTURE[1])
+        db_session.flush()
+        play = StatsService().get_global_stats()["play"]
         assert play == {"hours": 6, "sessions": 2}
 
+    def test_rythme_buckets_sessions_by_month(self, db_session, default_system):
+        now = datetime.now()
+        this_month = now.replace(day=1, hour=12, minute=0, second=0, microsecond=0)
+        game = _game_with(db_session, default_system)
+        other = _game_with(db_session, default_system)
+        for g in (game, game, other):
+            GameSessionFactory(db_session, game_id=g.id, start=this_month, end=this_month)
+        db_session.flush()
+        rythme = StatsService().get_global_stats()["rythme"]
+
+        assert rythme["labels"][-1] == f"{now.month:02d}/{now.year % 100:02d}"
+        assert rythme["sessions"][-1] == 3
+        assert rythme["parties"][-1] == 2
+
     def test_restriction_split(self, db_session, default_system):
-        games = [
-            _game_with(db_session, default_system, restriction="all"),
-            _game_with(db_session, default_system, restriction="all"),
-            _game_with(db_session, default_system, restriction="18+"),
-        ]
-        split = StatsService()._restriction_split(games)
+        _game_with(db_session, default_system, restriction="all")
+        _game_with(db_session, default_system, restriction="all")
+        _game_with(db_session, default_system, restriction="18+")
+        split = StatsService().get_global_stats()["restriction"]
         rows = {r["label"]: r for r in split["rows"]}
 
         assert split["total"] == 3
@@ -246,15 +416,39 @@ class TestGlobalStats:
 
     def test_global_stats_exclude_draft_games(self, db_session, default_system):
         """Draft games must not appear in the app-wide statistics aggregation."""
-        from website.repositories.game import GameRepository
-
-        published = _game_with(db_session, default_system, sessions=1, status="open")
-        draft = _game_with(db_session, default_system, sessions=1, status="draft")
-        db_session.flush()
+        _game_with(db_session, default_system, sessions=1, status="open")
+        _game_with(db_session, default_system, sessions=1, status="draft", restriction="18+")
+        data = StatsService().get_global_stats()
 
-        ids = {g.id for g in GameRepository().find_all_with_relations()}
-        assert published.id in ids
-        assert draft.id not in ids
+        assert data["catalogue"]["games"] == 1
+        assert data["catalogue"]["sessions"] == 1
+        assert data["play"]["sessions"] == 1
+        assert data["restriction"]["total"] == 1
+        assert sum(data["rythme"]["sessions"]) <= 1
+
+    def test_constant_query_count(self, db_session, default_system):
+        """The page costs the same number of queries however many games exist."""
+        statements = []
+
+        def count(*args):
+            statements.append(args)
+
+        engine = db_session.get_bind()
+        event.listen(engine, "before_cursor_execute", count)
+        try:
+            _game_with(db_session, default_system, players=1, sessions=1)
+            statements.clear()
+            StatsService().get_global_stats()
+            few = len(statements)
+
+            for _ in range(5):
+                _game_with(db_session, default_system, players=2, sessions=2)
+            statements.clear()
+            StatsService().get_global_stats()
+        finally:
+            event.remove(engine, "before_cursor_execute", count)
+
+        assert 0 < len(statements) == few
 
     def test_get_global_stats_shape(self, db_session, default_system):
         _game_with(db_session, default_system, players=2, sessions=2)
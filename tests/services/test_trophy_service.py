@@ -1,10 +1,26 @@
 """Tests for TrophyService."""
 
+import uuid
+from unittest.mock import Mock
+
 import pytest
+from redis.exceptions import ConnectionError as RedisConnectionError
 
 from tests.factories import TrophyFactory, UserFactory, UserTrophyFactory
 from website.exceptions import NotFoundError
+from website.extensions import get_redis_client
 from website.services.trophy import TrophyService
+from website.utils.leaderboard import TrophyLeaderboards
+
+
+@pytest.fixture
+def leaderboards(test_app):
+    """Leaderboards under a unique key prefix on the app's Redis, cleaned up after the test."""
+    client = get_redis_client(test_app)
+    prefix = f"test_leaderboard:{uuid.uuid4().hex}:"
+    yield TrophyLeaderboards(client, prefix)
+    for key in client.scan_iter(match=f"{prefix}*"):
+        client.delete(key)
 
 
 class TestTrophyService:
@@ -138,3 +154,99 @@ class TestTrophyService:
         service = TrophyService()
         badges = service.get_user_badges("92345678901234575")
         assert badges == []
+
+
+class TestTrophyLeaderboards:
+    """Leaderboards are Redis sorted sets kept current by the trophy writes."""
+
+    def test_built_from_database_on_first_read(self, db_session, leaderboards):
+        service = TrophyService(leaderboards=leaderboards)
+        trophy = TrophyFactory(db_session)
+        low, high = UserFactory(db_session), UserFactory(db_session)
+        UserTrophyFactory(db_session, user_id=low.id, trophy_id=trophy.id, quantity=2)
+        UserTrophyFactory(db_session, user_id=high.id, trophy_id=trophy.id, quantity=7)
+
+        leaderboard = service.get_leaderboard(trophy.id, limit=10)
+
+        assert [(user.id, n) for user, n in leaderboard] == [(high.id, 7), (low.id, 2)]
+        assert leaderboards.is_built(trophy.id) is True
+
+    def test_writes_keep_the_leaderboard_current(self, db_session, leaderboards):
+        service = TrophyService(leaderboards=leaderboards)
+        trophy = TrophyFactory(db_session)
+        first, second = UserFactory(db_session), UserFactory(db_session)
+        assert service.get_leaderboard(trophy.id) == []  # builds the empty set
+
+        service.award(first.id, trophy.id, amount=3)
+        service.award(second.id, trophy.id, amount=1)
+        assert leaderboards.top(trophy.id, 10) == [(first.id, 3), (second.id, 1)]
+
+        service.update_user_trophy(second.id, trophy.id, 5)
+        assert service.get_user_rank(trophy.id, second.id) == {"rank": 1, "count": 5}
+
+        service.decrement_user_trophy(first.id, trophy.id, amount=3)
+        service.delete_user_trophy(second.id, trophy.id)
+        assert leaderboards.top(trophy.id, 10) == []
+
+    def test_user_rank_is_shared_by_ties(self, db_session, leaderboards):
+        service = TrophyService(leaderboards=leaderboards)
+        trophy = TrophyFactory(db_session)
+        users = [UserFactory(db_session) for _ in range(3)]
+        for user, quantity in zip(users, (4, 4, 1)):
+            UserTrophyFactory(db_session, user_id=user.id, trophy_id=trophy.id, quantity=quantity)
+        outsider = UserFactory(db_session)
+
+        assert service.get_user_rank(trophy.id, users[1].id) == {"rank": 1, "count": 4}
+        assert service.get_user_rank(trophy.id, users[2].id) == {"rank": 3, "count": 1}
+        assert service.get_user_rank(trophy.id, outsider.id) == {"rank": None, "count": 0}
+
+    def test_ties_are_ordered_like_the_sql_fallback(self, db_session, leaderboards):
+        service = TrophyService(leaderboards=leaderboards)
+        trophy = TrophyFactory(db_session)
+        for _ in range(3):
+            user = UserFactory(db_session)
+            UserTrophyFactory(db_session, user_id=user.id, trophy_id=trophy.id, quantity=2)
+
+        from_redis = [u.id for u, _ in service.get_leaderboard(trophy.id)]
+
+        assert from_redis == [u.id for u, _ in service.repo.get_leaderboard(trophy.id, 10)]
+
+    def test_write_during_a_rebuild_is_applied(self, db_session, leaderboards):
+        trophy = TrophyFactory(db_session)
+        holder, late, leaving = (UserFactory(db_session) for _ in range(3))
+
+        def load_scores():
+            # Committed after this read: only set_score carries them.
+            leaderboards.set_score(trophy.id, late.id, 4)
+            leaderboards.set_score(trophy.id, leaving.id, 0)
+            return {holder.id: 2, leaving.id: 1}
+
+        assert leaderboards.rebuild(trophy.id, load_scores) is True
+
+        assert leaderboards.top(trophy.id, 10) == [(late.id, 4), (holder.id, 2)]
+
+    def test_concurrent_rebuild_reads_from_sql(self, db_session, leaderboards):
+        service = TrophyService(leaderboards=leaderboards)
+        trophy = TrophyFactory(db_session)
+        user = UserFactory(db_session)
+        UserTrophyFactory(db_session, user_id=user.id, trophy_id=trophy.id, quantity=3)
+
+        def load_scores():
+            assert [(u.id, n) for u, n in service.get_leaderboard(trophy.id)] == [(user.id, 3)]
+            return {user.id: 3}
+
+        assert leaderboards.rebuild(trophy.id, load_scores) is True
+        assert leaderboards.top(trophy.id, 10) == [(user.id, 3)]
+
+    def test_falls_back_to_sql_when_redis_is_down(self, db_session):
+        client = Mock()
+        client.exists.side_effect = RedisConnectionError("down")
+        client.zscore.side_effect = RedisConnectionError("down")
+        service = TrophyService(leaderboards=TrophyLeaderboards(client, "down:"))
+        trophy = TrophyFactory(db_session)
+        user = UserFactory(db_session)
+
+        service.award(user.id, trophy.id, amount=2)
+
+        assert [(u.id, n) for u, n in service.get_leaderboard(trophy.id)] == [(user.id, 2)]
+        assert service.get_user_rank(trophy.id, user.id) == {"rank": 1, "count": 2}
@@ -1,12 +1,15 @@
 import random
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
+from unittest.mock import Mock, patch
 
 import pytest
 
+from config.constants import GUILD_MEMBER_INDEX_MAX_AGE
 from tests.constants import TEST_ADMIN_USER_ID
 from tests.factories import UserFactory
-from website.exceptions import NotFoundError
-from website.models import User
+from website.exceptions import DiscordAPIError, NotFoundError
+from website.extensions import cache
+from website.models import GuildMember, GuildMemberRole, User
 from website.services.user import UserService
 
 
@@ -44,6 +47,27 @@ class TestUserService:
         found = db_session.get(User, user_id)
         assert found is not None
 
+    def test_get_or_create_new_takes_name_from_cached_profile(self, db_session):
+        user_id = str(random.randint(10**17, 10**18 - 1))
+        profile = {"name": "Discord Name", "avatar": "/a.png", "username": "dname"}
+        cache.set(f"user_profile_{user_id}", profile)
+        try:
+            user, created = UserService().get_or_create(user_id)
+        finally:
+            cache.delete(f"user_profile_{user_id}")
+
+        assert created is True
+        assert (user.name, user.username, user.avatar_url) == ("Discord Name", "dname", "/a.png")
+
+    def test_get_or_create_new_leaves_an_uncached_profile_to_the_refresh_queue(self, db_session):
+        user_id = str(random.randint(10**17, 10**18 - 1))
+        with patch("website.services.user._get_user_profile") as fetch:
+            user, created = UserService().get_or_create(user_id)
+
+        fetch.assert_not_called()
+        assert created is True
+        assert (user.name, user.profile_refreshed_at) == ("Inconnu", None)
+
     def test_get_active_users_excludes_inactive(self, db_session):
         inactive_user = UserFactory(db_session, not_player_as_of=datetime(2025, 1, 1))
         service = UserService()
@@ -108,9 +132,15 @@ class TestUserService:
             user.id, {"name": "RealName", "avatar": "/a.png", "username": "realname"}
         )
 
-        stored = db_session.query(User.name, User.username).filter(User.id == user.id).one()
+        stored = (
+            db_session.query(User.name, User.username, User.avatar_url, User.profile_refreshed_at)
+            .filter(User.id == user.id)
+            .one()
+        )
         assert stored.name == "RealName"
         assert stored.username == "realname"
+        assert stored.avatar_url == "/a.png"
+        assert stored.profile_refreshed_at is not None
 
     def test_search_matches_username(self, db_session):
         user = UserFactory(db_session, name="Display", username="zsearch-handle")
@@ -186,3 +216,122 @@ class TestUserService:
         )
         assert stored.name == "Back"
         assert stored.not_player_as_of is None
+
+
+def _member(user_id, username, nick=None, avatar=None, roles=()):
+    """Return a guild member payload as listed by Discord."""
+    return {
+        "user": {"id": user_id, "username": username, "avatar": avatar},
+        "nick": nick,
+        "roles": list(roles),
+    }
+
+
+def _stored(db_session, user_id):
+    """Read a user's raw columns, bypassing User.init_on_load."""
+    return (
+        db_session.query(User.name, User.username, User.not_player_as_of)
+        .filter(User.id == user_id)
+        .one()
+    )
+
+
+class TestSyncGuildMembers:
+    def test_updates_reactivates_and_deactivates_in_one_pass(self, db_session):
+        renamed = UserFactory(db_session, name="Old")
+        returning = UserFactory(db_session, not_player_as_of=datetime(2025, 1, 1))
+        gone = UserFactory(db_session)
+        discord = Mock()
+        discord.iter_guild_members.return_value = iter(
+            [
+                _member(renamed.id, renamed.username, nick="New", avatar="abc"),
+                _member(returning.id, returning.username),
+            ]
+        )
+
+        stats = UserService().sync_guild_members(discord)
+
+        assert stats["members"] == 2
+        assert stats["reactivated"] == 1
+        assert stats["deactivated"] >= 1
+        assert _stored(db_session, renamed.id).name == "New"
+        stored_avatar = db_session.query(User.avatar_url).filter(User.id == renamed.id).scalar()
+        assert stored_avatar.endswith(f"/avatars/{renamed.id}/abc.png")
+        assert _stored(db_session, returning.id).not_player_as_of is None
+        assert _stored(db_session, gone.id).not_player_as_of is not None
+        profile = cache.get(f"user_profile_{renamed.id}")
+        assert profile["avatar"].endswith(f"/avatars/{renamed.id}/abc.png")
+        cache.delete_many(f"user_profile_{renamed.id}", f"user_profile_{returning.id}")
+
+    def test_rebuilds_the_role_index(self, db_session):
+        member = UserFactory(db_session)
+        db_session.add(GuildMemberRole(user_id="10000000000000002", role_id="gone_role"))
+        db_session.flush()
+        discord = Mock()
+        discord.iter_guild_members.return_value = iter(
+            [_member(member.id, member.username, roles=["r1", "r2"])]
+        )
+        service = UserService()
+
+        service.sync_guild_members(discord)
+
+        assert sorted(service.get_role_ids(member.id)) == ["r1", "r2"]
+        assert service.member_roles.get_role_ids("10000000000000002") is None
+        cache.delete(f"user_profile_{member.id}")
+
+    @patch("website.models.user.get_user_roles")
+    def test_roleless_members_are_not_looked_up_on_discord(self, mock_get_roles, db_session):
+        member = UserFactory(db_session)
+        discord = Mock()
+        discord.iter_guild_members.return_value = iter([_member(member.id, member.username)])
+        service = UserService()
+
+        service.sync_guild_members(discord)
+
+        assert service.get_role_ids(member.id) == []
+        mock_get_roles.assert_not_called()
+        cache.delete(f"user_profile_{member.id}")
+
+    @patch("website.models.user.get_user_roles", return_value=["r1"])
+    def test_members_not_indexed_fall_back_to_discord(self, mock_get_roles, db_session):
+        db_session.add(GuildMemberRole(user_id="10000000000000003", role_id="granted"))
+        db_session.flush()
+
+        assert UserService().get_role_ids("10000000000000003") == ["r1"]
+        mock_get_roles.assert_called_once_with("10000000000000003")
+
+    @patch("website.models.user.get_user_roles", return_value=["r1"])
+    def test_stale_index_rows_fall_back_to_discord(self, mock_get_roles, db_session):
+        stale = datetime.now(timezone.utc) - timedelta(seconds=GUILD_MEMBER_INDEX_MAX_AGE + 60)
+        db_session.add(GuildMember(user_id="10000000000000004", indexed_at=stale))
+        db_session.add(GuildMemberRole(user_id="10000000000000004", role_id="revoked"))
+        db_session.flush()
+
+        assert UserService().get_role_ids("10000000000000004") == ["r1"]
+        mock_get_roles.assert_called_once_with("10000000000000004")
+
+    def test_empty_member_list_changes_nothing(self, db_session):
+        user = UserFactory(db_session)
+        discord = Mock()
+        discord.iter_guild_members.return_value = iter([])
+
+        stats = UserService().sync_guild_members(discord)
+
+        assert stats["deactivated"] == 0
+        assert _stored(db_session, user.id).not_player_as_of is None
+
+    def test_failed_page_writes_nothing(self, db_session):
+        """An incomplete member list must not flag the rest of the guild inactive."""
+        user = UserFactory(db_session)
+
+        def pages():
+            yield _member(TEST_ADMIN_USER_ID, "admin")
+            raise DiscordAPIError("Down", status_code=503)
+
+        discord = Mock()
+        discord.iter_guild_members.return_value = pages()
+
+        with pytest.raises(DiscordAPIError):
+            UserService().sync_guild_members(discord)
+
+        assert _stored(db_session, user.id).not_player_as_of is None
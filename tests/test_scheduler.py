@@ -2,12 +2,17 @@
 
 from unittest.mock import patch
 
-from config.constants import DEFAULT_AVATAR
+from config.constants import DEFAULT_AVATAR, PROFILE_REFRESH_WINDOW_HOURS, STATS_REFRESH_INTERVAL
+from config.settings import Settings
+from website.exceptions import DiscordAPIError
 from website.scheduler import (
+    FREQUENCY,
     check_inactive_users,
     monitor_category_capacity,
     monitor_role_count,
     refresh_user_profiles,
+    start_scheduler,
+    sweep_guild_members,
 )
 
 USER_ID = "11111111111111111"
@@ -35,24 +40,61 @@ def _not_found_profile():
     }
 
 
+class TestSweepGuildMembers:
+    @patch("website.scheduler.refresh_user_profiles")
+    @patch("website.scheduler.UserService")
+    def test_syncs_all_members(self, mock_service_cls, mock_refresh, test_app):
+        mock_service_cls.return_value.sync_guild_members.return_value = {"members": 3}
+
+        sweep_guild_members(test_app)
+
+        mock_service_cls.return_value.sync_guild_members.assert_called_once()
+        mock_refresh.assert_not_called()
+
+    @patch("website.scheduler.refresh_user_profiles")
+    @patch("website.scheduler.UserService")
+    def test_falls_back_to_sampling_without_members_intent(
+        self, mock_service_cls, mock_refresh, test_app
+    ):
+        """A 403 on the member list (intent disabled) falls back to per-user refresh."""
+        mock_service_cls.return_value.sync_guild_members.side_effect = DiscordAPIError(
+            "Missing Access", status_code=403
+        )
+
+        sweep_guild_members(test_app)
+
+        mock_refresh.assert_called_once_with(test_app)
+
+    @patch("website.scheduler.refresh_user_profiles")
+    @patch("website.scheduler.UserService")
+    def test_transient_error_skips_the_run(self, mock_service_cls, mock_refresh, test_app):
+        mock_service_cls.return_value.sync_guild_members.side_effect = DiscordAPIError(
+            "Down", status_code=503
+        )
+
+        sweep_guild_members(test_app)
+
+        mock_refresh.assert_not_called()
+
+
 class TestRefreshUserProfiles:
     @patch("website.scheduler.UserService")
     def test_force_refreshes_each_active_user(self, mock_service_cls, test_app):
-        """Each sampled active user is fetched with force_refresh=True."""
+        """Each of the stalest active users is fetched with force_refresh=True."""
         mock_service = mock_service_cls.return_value
-        mock_service.get_active_user_ids.return_value = [USER_ID]
+        mock_service.get_stalest_active_user_ids.return_value = [USER_ID]
         mock_service.get_user_profile.return_value = {"name": "Active", "avatar": DEFAULT_AVATAR}
 
         refresh_user_profiles(test_app, batch_size=100)
 
-        mock_service.get_active_user_ids.assert_called_once()
+        mock_service.get_stalest_active_user_ids.assert_called_once_with(100)
         mock_service.get_user_profile.assert_called_once_with(USER_ID, force_refresh=True)
 
     @patch("website.scheduler.UserService")
     def test_marks_user_inactive_on_404(self, mock_service_cls, test_app):
         """When get_user_profile returns not_found, the user is marked inactive."""
         mock_service = mock_service_cls.return_value
-        mock_service.get_active_user_ids.return_value = [USER_ID]
+        mock_service.get_stalest_active_user_ids.return_value = [USER_ID]
         mock_service.get_user_profile.return_value = _not_found_profile()
 
         refresh_user_profiles(test_app, batch_size=100)
@@ -65,7 +107,7 @@ class TestRefreshUserProfiles:
         """A successful fetch persists the name via the service (not a no-op)."""
         profile = {"name": "NewName", "avatar": "/new/avatar.png", "username": "newname"}
         mock_service = mock_service_cls.return_value
-        mock_service.get_active_user_ids.return_value = [USER_ID]
+        mock_service.get_stalest_active_user_ids.return_value = [USER_ID]
         mock_service.get_user_profile.return_value = profile
 
         refresh_user_profiles(test_app, batch_size=100)
@@ -77,7 +119,7 @@ class TestRefreshUserProfiles:
     def test_transient_error_does_not_write(self, mock_service_cls, test_app):
         """A non-404 fetch error neither persists nor marks the user inactive."""
         mock_service = mock_service_cls.return_value
-        mock_service.get_active_user_ids.return_value = [USER_ID]
+        mock_service.get_stalest_active_user_ids.return_value = [USER_ID]
         mock_service.get_user_profile.return_value = _error_profile()
 
         refresh_user_profiles(test_app, batch_size=100)
@@ -85,26 +127,65 @@ class TestRefreshUserProfiles:
         mock_service.persist_profile.assert_not_called()
         mock_service.mark_inactive.assert_not_called()
 
+    @patch("website.services.discord.DiscordService")
     @patch("website.services.setting.SettingsService")
     @patch("website.scheduler.UserService")
     def test_uses_configured_batch_size_by_default(
-        self, mock_service_cls, mock_settings_cls, test_app
+        self, mock_service_cls, mock_settings_cls, mock_discord_cls, test_app
     ):
         """With no explicit batch_size, the admin-configured value is used."""
         mock_service = mock_service_cls.return_value
-        mock_service.get_active_user_ids.return_value = [USER_ID]
+        mock_service.count_active_users.return_value = 10
+        mock_service.get_stalest_active_user_ids.return_value = [USER_ID]
         mock_service.get_user_profile.return_value = {"name": "Active", "avatar": DEFAULT_AVATAR}
         mock_settings_cls.return_value.get_profile_refresh_batch_size.return_value = 5
+        mock_discord_cls.return_value.get_user_budget.return_value = None
 
         refresh_user_profiles(test_app)
 
-        mock_settings_cls.return_value.get_profile_refresh_batch_size.assert_called_once()
+        mock_service.get_stalest_active_user_ids.assert_called_once_with(5)
+
+    @patch("website.services.discord.DiscordService")
+    @patch("website.services.setting.SettingsService")
+    @patch("website.scheduler.UserService")
+    def test_batch_grows_to_cover_everyone_within_the_window(
+        self, mock_service_cls, mock_settings_cls, mock_discord_cls, test_app
+    ):
+        runs_per_window = PROFILE_REFRESH_WINDOW_HOURS * 60 // FREQUENCY
+        mock_service = mock_service_cls.return_value
+        mock_service.count_active_users.return_value = 50 * runs_per_window
+        mock_service.get_stalest_active_user_ids.return_value = []
+        mock_settings_cls.return_value.get_profile_refresh_batch_size.return_value = 5
+        mock_discord_cls.return_value.get_user_budget.return_value = None
+
+        refresh_user_profiles(test_app)
+
+        mock_service.get_stalest_active_user_ids.assert_called_once_with(50)
+
+    @patch("website.services.discord.DiscordService")
+    @patch("website.services.setting.SettingsService")
+    @patch("website.scheduler.UserService")
+    def test_batch_shrinks_to_the_rate_limit_budget(
+        self, mock_service_cls, mock_settings_cls, mock_discord_cls, test_app
+    ):
+        mock_service = mock_service_cls.return_value
+        mock_service.count_active_users.return_value = 10
+        mock_settings_cls.return_value.get_profile_refresh_batch_size.return_value = 20
+        mock_discord_cls.return_value.get_user_budget.return_value = 3
+
+        refresh_user_profiles(test_app)
+        mock_service.get_stalest_active_user_ids.assert_called_once_with(3)
+
+        mock_discord_cls.return_value.get_user_budget.return_value = 0
+        mock_service.reset_mock()
+        refresh_user_profiles(test_app)
+        mock_service.get_stalest_active_user_ids.assert_not_called()
 
     @patch("website.scheduler.UserService")
     def test_no_op_when_no_active_users(self, mock_service_cls, test_app):
         """Should not call get_user_profile when there are no active users."""
         mock_service = mock_service_cls.return_value
-        mock_service.get_active_user_ids.return_value = []
+        mock_service.get_stalest_active_user_ids.return_value = []
 
         refresh_user_profiles(test_app, batch_size=100)
 
@@ -229,3 +310,49 @@ class TestMonitorCategoryCapacity:
         monitor_category_capacity(test_app)
 
         channels.auto_provision_if_full.assert_not_called()
+
+
+class TestStartScheduler:
+    @staticmethod
+    def _jobs(app, **config):
+        """Start the scheduler with config overrides and return its jobs by id."""
+        saved = {key: app.config.get(key) for key in config}
+        app.config.update(config)
+        try:
+            with patch("website.scheduler.BackgroundScheduler") as mock_scheduler_cls:
+                start_scheduler(app)
+        finally:
+            app.config.update(saved)
+        add_job = mock_scheduler_cls.return_value.add_job
+        return {c.kwargs["id"]: c.kwargs for c in add_job.call_args_list}
+
+    def test_default_mode_refreshes_profiles_one_by_one(self, test_app):
+        """Without opting in to the sweep, the per-user refresh and inactive check run."""
+        jobs = self._jobs(
+            test_app, GATEWAY_ENABLED=False, PROFILE_REFRESH_MODE=Settings.PROFILE_REFRESH_MODE
+        )
+
+        assert jobs["refresh_user_profiles"]["minutes"] == FREQUENCY
+        assert jobs["check_inactive_users"]["hours"] == 24
+        assert "sweep_guild_members" not in jobs
+
+    def test_sweep_mode_polls_members_hourly(self, test_app):
+        jobs = self._jobs(test_app, GATEWAY_ENABLED=False, PROFILE_REFRESH_MODE="sweep")
+
+        assert jobs["sweep_guild_members"]["minutes"] == 60
+        assert "refresh_user_profiles" not in jobs
+        assert "check_inactive_users" not in jobs
+
+    def test_gateway_mode_keeps_only_a_daily_sweep(self, test_app):
+        """With the Gateway worker, profiles and inactive users are no longer polled."""
+        jobs = self._jobs(test_app, GATEWAY_ENABLED=True, PROFILE_REFRESH_MODE="sample")
+
+        assert jobs["sweep_guild_members"]["hours"] == 24
+        assert "refresh_user_profiles" not in jobs
+        assert "check_inactive_users" not in jobs
+
+    def test_user_stats_are_refreshed_off_the_daily_worker(self, test_app):
+        jobs = self._jobs(test_app, STATS_REFRESH_ENABLED=True)
+
+        assert jobs["refresh_user_stats"]["seconds"] == STATS_REFRESH_INTERVAL
+        assert jobs["refresh_user_stats"]["executor"] == "outbox"
@@ -0,0 +1,151 @@
+"""Tests for the Discord circuit breaker (no live Discord required)."""
+
+from unittest.mock import Mock, patch
+
+import pytest
+import requests
+
+from website.client.circuit import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+from website.client.discord import Discord
+from website.exceptions import DiscordAPIError, DiscordUnavailableError
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def breaker(clock):
+    return CircuitBreaker(
+        window=4, min_calls=4, failure_rate=0.5, slow_call_seconds=2, slow_call_rate=0.75,
+        open_seconds=30, probes=2, clock=clock,
+    )  # fmt: skip
+
+
+def _calls(breaker, *outcomes, duration=0.1):
+    for success in outcomes:
+        generation = breaker.allow()
+        breaker.record(success, duration, generation)
+
+
+class TestCircuitBreaker:
+    def test_stays_closed_below_the_minimum_number_of_calls(self, breaker):
+        _calls(breaker, False, False, False)
+
+        assert breaker.state == CLOSED
+
+    def test_opens_on_the_failure_rate_and_fails_fast(self, breaker):
+        _calls(breaker, True, False, True, False)
+
+        assert breaker.state == OPEN
+        with pytest.raises(DiscordUnavailableError) as exc:
+            breaker.allow()
+        assert exc.value.retry_after == 30
+
+    def test_opens_on_the_slow_call_rate(self, breaker):
+        _calls(breaker, True, True, True, duration=2.5)
+        assert breaker.state == CLOSED
+
+        _calls(breaker, True, duration=3)
+
+        assert breaker.state == OPEN
+
+    def test_half_open_lets_a_limited_number_of_probes_through(self, breaker, clock):
+        _calls(breaker, False, False, False, False)
+        clock.now += 30
+
+        assert breaker.state == HALF_OPEN
+        breaker.allow()
+        breaker.allow()
+        with pytest.raises(DiscordUnavailableError):
+            breaker.allow()
+
+    def test_successful_probes_close_the_circuit(self, breaker, clock):
+        _calls(breaker, False, False, False, False)
+        clock.now += 30
+
+        _calls(breaker, True, True)
+
+        assert breaker.state == CLOSED
+        assert breaker.snapshot()["calls"] == 0
+
+    def test_a_failed_probe_reopens_the_circuit(self, breaker, clock):
+        _calls(breaker, False, False, False, False)
+        clock.now += 30
+
+        _calls(breaker, True, False)
+
+        assert breaker.state == OPEN
+        assert breaker.retry_after() == 30
+
+    def test_released_probe_frees_its_slot(self, breaker, clock):
+        _calls(breaker, False, False, False, False)
+        clock.now += 30
+        breaker.allow()
+        generation = breaker.allow()
+
+        breaker.release(generation)
+
+        breaker.allow()
+
+    def test_calls_started_before_the_circuit_opened_are_not_probes(self, breaker, clock):
+        in_flight = [breaker.allow() for _ in range(2)]
+        _calls(breaker, False, False, False, False)
+        clock.now += 30
+        assert breaker.state == HALF_OPEN
+
+        for generation in in_flight:
+            breaker.record(True, 0.1, generation)
+
+        assert breaker.state == HALF_OPEN
+        breaker.allow()
+        breaker.allow()
+        with pytest.raises(DiscordUnavailableError):
+            breaker.allow()
+
+    def test_outcomes_from_before_the_circuit_closed_are_ignored(self, breaker, clock):
+        stale = breaker.allow()
+        _calls(breaker, False, False, False, False)
+        clock.now += 30
+        _calls(breaker, True, True)
+        assert breaker.state == CLOSED
+
+        breaker.record(False, 0.1, stale)
+
+        assert breaker.snapshot()["failed"] == 0
+
+
+class TestClientBreaker:
+    @pytest.fixture
+    def client(self, breaker):
+        return Discord(guild_id="guild_1", bot_token="token", breaker=breaker)
+
+    def test_open_circuit_refuses_calls_without_sending_them(self, client):
+        with patch.object(client.session, "request", side_effect=requests.ConnectionError("x")):
+            for _ in range(4):
+                with pytest.raises(DiscordAPIError):
+                    client.get_channel("chan_1")
+
+        with patch.object(client.session, "request") as req:
+            with pytest.raises(DiscordUnavailableError):
+                client.get_channel("chan_1")
+        req.assert_not_called()
+
+    def test_client_errors_do_not_count_as_failures(self, client, breaker):
+        response = Mock(status_code=404, ok=False, headers={}, text="")
+        response.json.return_value = {"message": "Unknown Channel"}
+        with patch.object(client.session, "request", return_value=response):
+            for _ in range(4):
+                with pytest.raises(DiscordAPIError):
+                    client.get_channel("chan_1")
+
+        assert breaker.state == CLOSED
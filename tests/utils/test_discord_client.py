@@ -4,12 +4,14 @@ These mock the HTTP layer (``Discord._request``) to assert endpoint and payload
 shaping for the channel-permission and role-related helpers.
 """
 
-from unittest.mock import patch
+from unittest.mock import Mock, patch
 
 import pytest
+import requests
 
 from config.constants import GM_ROLE_PERMISSION, PLAYER_ROLE_PERMISSION
-from website.client.discord import Discord
+from website.client.discord import Discord, http_pool_stats
+from website.exceptions import DiscordAPIError
 
 
 @pytest.fixture
@@ -40,6 +42,15 @@ class TestCreateChannel:
         assert all(o["id"] != "role_9" for o in overwrites)
         assert {"id": "guild_1", "type": 0, "deny": "1024"} in overwrites
 
+    def test_adds_member_overwrites_for_given_players(self, client):
+        """Players passed at creation get their overwrite in the same request."""
+        with patch.object(Discord, "_request", return_value={"id": "chan"}) as req:
+            client.create_channel("My Game", "cat_1", None, "gm_1", ["p1", "gm_1"])
+
+        overwrites = req.call_args.kwargs["json"]["permission_overwrites"]
+        assert {"id": "p1", "type": 1, "allow": PLAYER_ROLE_PERMISSION} in overwrites
+        assert len(overwrites) == 3
+
 
 class TestChannelPermissions:
     def test_set_channel_permission(self, client):
@@ -51,6 +62,16 @@ class TestChannelPermissions:
         assert req.call_args.kwargs["method"] == "PUT"
         assert req.call_args.kwargs["json"] == {"allow": PLAYER_ROLE_PERMISSION, "type": 1}
 
+    def test_edit_channel_permissions(self, client):
+        """edit_channel_permissions PATCHes the complete overwrite list."""
+        overwrites = [{"id": "user_1", "type": 1, "allow": PLAYER_ROLE_PERMISSION}]
+        with patch.object(Discord, "_request", return_value={}) as req:
+            client.edit_channel_permissions("chan_1", overwrites)
+
+        assert req.call_args.kwargs["endpoint"] == "/channels/chan_1"
+        assert req.call_args.kwargs["method"] == "PATCH"
+        assert req.call_args.kwargs["json"] == {"permission_overwrites": overwrites}
+
     def test_delete_channel_permission(self, client):
         """delete_channel_permission DELETEs the member overwrite."""
         with patch.object(Discord, "_request", return_value={}) as req:
@@ -68,6 +89,22 @@ class TestRolesAndMessages:
 
         assert req.call_args.kwargs["endpoint"] == "/guilds/guild_1/roles"
 
+    def test_list_guild_members_pages_after_id(self, client):
+        """list_guild_members passes the page size and cursor as query params."""
+        with patch.object(Discord, "_request", return_value=[]) as req:
+            client.list_guild_members(limit=1000, after="42")
+
+        assert req.call_args.kwargs["endpoint"] == "/guilds/guild_1/members"
+        assert req.call_args.kwargs["params"] == {"limit": 1000, "after": "42"}
+
+    def test_get_gateway_url_adds_version_and_encoding(self, client):
+        """get_gateway_url asks for the bot gateway and pins API v10 with JSON."""
+        with patch.object(Discord, "_request", return_value={"url": "wss://gw.test"}) as req:
+            url = client.get_gateway_url()
+
+        assert req.call_args.kwargs["endpoint"] == "/gateway/bot"
+        assert url == "wss://gw.test/?v=10&encoding=json"
+
     def test_send_message_forwards_allowed_mentions(self, client):
         """allowed_mentions is included in the message payload when provided."""
         allowed = {"parse": ["users", "roles"]}
@@ -82,3 +119,40 @@ class TestRolesAndMessages:
             client.send_message("hi", "chan_1")
 
         assert "allowed_mentions" not in req.call_args.kwargs["json"]
+
+
+class TestHttpPool:
+    def test_clients_share_one_session(self):
+        """Every client in the process reuses the same pooled session."""
+        a = Discord(guild_id="guild_1", bot_token="token")
+        b = Discord(guild_id="guild_2", bot_token="other")
+
+        assert a.session is b.session
+
+    def test_request_uses_session_with_timeout(self, client):
+        """_request goes through the pooled session with connect/read timeouts."""
+        response = Mock(status_code=200, ok=True, content=b'{"id": "1"}', headers={})
+        response.json.return_value = {"id": "1"}
+        with patch.object(client.session, "request", return_value=response) as req:
+            assert client.get_channel("chan_1") == {"id": "1"}
+
+        assert req.call_args.kwargs["timeout"] == client.timeout
+
+    def test_timeout_raises_discord_api_error(self, client):
+        """A network timeout surfaces as a DiscordAPIError instead of hanging."""
+        with patch.object(client.session, "request", side_effect=requests.Timeout("slow")):
+            with pytest.raises(DiscordAPIError) as exc:
+                client.get_channel("chan_1")
+
+        assert exc.value.status_code == 504
+
+    def test_pool_stats_shape(self, client):
+        """http_pool_stats reports requests, handshakes and reuse."""
+        stats = http_pool_stats()
+
+        assert set(stats) == {"pool_size", "requests", "connections", "reused"}
+        assert stats["reused"] == max(stats["requests"] - stats["connections"], 0)
+
+    def test_pool_stats_report_the_configured_pool_size(self, test_app, client):
+        """The reported pool size is the one the shared session was built with."""
+        assert http_pool_stats()["pool_size"] == test_app.config["DISCORD_HTTP_POOL_SIZE"]
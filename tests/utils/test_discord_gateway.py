@@ -0,0 +1,263 @@
+"""Tests for the Discord Gateway client against a local stub gateway (no Discord)."""
+
+import base64
+import hashlib
+import json
+import re
+import socket
+import threading
+from unittest.mock import patch
+
+import pytest
+from websocket import ABNF
+
+from website.client.gateway import (
+    HEARTBEAT,
+    HEARTBEAT_ACK,
+    HELLO,
+    IDENTIFY,
+    RECONNECT,
+    RESUME,
+    Gateway,
+)
+from website.exceptions import DiscordGatewayError
+
+_WS_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+
+class StubPeer:
+    """Server side of one WebSocket connection."""
+
+    def __init__(self, conn):
+        conn.settimeout(5)
+        request = b""
+        while b"\r\n\r\n" not in request:
+            request += conn.recv(4096)
+        key = re.search(rb"Sec-WebSocket-Key: (\S+)", request).group(1).decode()
+        accept = base64.b64encode(hashlib.sha1((key + _WS_GUID).encode()).digest()).decode()
+        conn.sendall(
+            (
+                "HTTP/1.1 101 Switching Protocols\r\n"
+                "Upgrade: websocket\r\nConnection: Upgrade\r\n"
+                f"Sec-WebSocket-Accept: {accept}\r\n\r\n"
+            ).encode()
+        )
+        self.conn = conn
+
+    def _recv_exact(self, size):
+        data = b""
+        while len(data) < size:
+            chunk = self.conn.recv(size - len(data))
+            if not chunk:
+                raise ConnectionError("client closed the socket")
+            data += chunk
+        return data
+
+    def _recv_frame(self):
+        first, second = self._recv_exact(2)
+        length = second & 0x7F
+        if length >= 126:
+            length = int.from_bytes(self._recv_exact(2 if length == 126 else 8), "big")
+        key = self._recv_exact(4) if second & 0x80 else None
+        payload = self._recv_exact(length)
+        return first & 0x0F, ABNF.mask(key, payload) if key else payload
+
+    def _send_frame(self, opcode, payload):
+        self.conn.sendall(ABNF(fin=1, opcode=opcode, mask_value=0, data=payload).format())
+
+    def send(self, op, d=None, s=None, t=None):
+        payload = json.dumps({"op": op, "d": d, "s": s, "t": t}).encode()
+        self._send_frame(ABNF.OPCODE_TEXT, payload)
+
+    def recv(self):
+        """Return the next client payload, or None once the client closed."""
+        try:
+            opcode, payload = self._recv_frame()
+        except ConnectionError:
+            return None
+        return None if opcode == ABNF.OPCODE_CLOSE else json.loads(payload)
+
+    def close(self, code):
+        self._send_frame(ABNF.OPCODE_CLOSE, code.to_bytes(2, "big"))
+
+
+class StubGateway:
+    """Local gateway serving one scripted connection per script."""
+
+    def __init__(self, *scripts):
+        self.scripts = list(scripts)
+        self.errors = []
+        self.server = socket.create_server(("127.0.0.1", 0))
+        self.url = f"ws://127.0.0.1:{self.server.getsockname()[1]}/?v=10&encoding=json"
+        self.thread = threading.Thread(target=self._serve, daemon=True)
+        self.thread.start()
+
+    def _serve(self):
+        for script in self.scripts:
+            conn, _ = self.server.accept()
+            with conn:
+                try:
+                    script(StubPeer(conn))
+                except Exception as e:  # surfaced by run()
+                    self.errors.append(e)
+
+    def run(self, gateway, stop):
+        """Run the client until ``stop`` is set (or 5 s pass) and check the scripts."""
+        timed_out = threading.Event()
+        watchdog = threading.Timer(5, lambda: (timed_out.set(), stop.set()))
+        watchdog.start()
+        try:
+            gateway.run(stop)
+        finally:
+            watchdog.cancel()
+            self.thread.join(timeout=1)
+            self.server.close()
+        assert not self.errors
+        assert not timed_out.is_set()
+
+
+def _hello(peer, interval_ms=45000):
+    peer.send(HELLO, {"heartbeat_interval": interval_ms})
+
+
+def _ready(peer, url, seq=1):
+    peer.send(
+        0,
+        {"session_id": "session_1", "resume_gateway_url": url.split("/?")[0]},
+        s=seq,
+        t="READY",
+    )
+
+
+class TestGateway:
+    def test_identifies_and_forwards_dispatch_events(self):
+        stop = threading.Event()
+        received, events = [], []
+
+        def script(peer):
+            _hello(peer)
+            received.append(peer.recv())
+            _ready(peer, stub.url)
+            peer.send(0, {"user": {"id": "1"}}, s=2, t="GUILD_MEMBER_UPDATE")
+            peer.recv()
+
+        def handler(event, data):
+            events.append((event, data))
+            if event == "GUILD_MEMBER_UPDATE":
+                stop.set()
+
+        stub = StubGateway(script)
+        gateway = Gateway("token", handler, url=stub.url, intents=3)
+        stub.run(gateway, stop)
+
+        assert received[0]["op"] == IDENTIFY
+        assert received[0]["d"]["token"] == "token"
+        assert received[0]["d"]["intents"] == 3
+        assert [event for event, _ in events] == ["READY", "GUILD_MEMBER_UPDATE"]
+        assert gateway.session_id == "session_1"
+        assert gateway.sequence == 2
+
+    def test_heartbeats_with_the_last_sequence(self):
+        stop = threading.Event()
+        beats = []
+
+        def script(peer):
+            _hello(peer, interval_ms=50)
+            peer.recv()
+            _ready(peer, stub.url, seq=7)
+            for _ in range(2):
+                beats.append(peer.recv())
+                peer.send(HEARTBEAT_ACK)
+            stop.set()
+            peer.recv()
+
+        stub = StubGateway(script)
+        stub.run(Gateway("token", lambda *_: None, url=stub.url), stop)
+
+        assert [(b["op"], b["d"]) for b in beats] == [(HEARTBEAT, 7), (HEARTBEAT, 7)]
+
+    def test_resumes_after_a_reconnect_request(self):
+        stop = threading.Event()
+        resumed = []
+
+        def first(peer):
+            _hello(peer)
+            peer.recv()
+            _ready(peer, stub.url, seq=4)
+            peer.send(RECONNECT)
+            peer.recv()
+
+        def second(peer):
+            _hello(peer)
+            resumed.append(peer.recv())
+            peer.send(0, {}, s=5, t="RESUMED")
+            peer.recv()
+
+        def handler(event, data):
+            if event == "RESUMED":
+                stop.set()
+
+        stub = StubGateway(first, second)
+        stub.run(Gateway("token", handler, url=stub.url), stop)
+
+        assert resumed[0]["op"] == RESUME
+        assert resumed[0]["d"] == {"token": "token", "session_id": "session_1", "seq": 4}
+
+    def test_reconnects_when_heartbeats_are_not_acknowledged(self):
+        stop = threading.Event()
+        identified = []
+
+        def silent(peer):
+            _hello(peer, interval_ms=50)
+            identified.append(peer.recv())
+            while peer.recv() is not None:
+                pass
+
+        def second(peer):
+            _hello(peer)
+            identified.append(peer.recv())
+            stop.set()
+            peer.recv()
+
+        stub = StubGateway(silent, second)
+        with patch("website.client.gateway.DISCORD_GATEWAY_RECONNECT_MIN_DELAY", 0.01):
+            stub.run(Gateway("token", lambda *_: None, url=stub.url), stop)
+
+        assert [p["op"] for p in identified] == [IDENTIFY, IDENTIFY]
+
+    def test_handler_errors_do_not_stop_the_connection(self):
+        stop = threading.Event()
+        events = []
+
+        def script(peer):
+            _hello(peer)
+            peer.recv()
+            peer.send(0, {}, s=1, t="BROKEN")
+            peer.send(0, {}, s=2, t="GUILD_ROLE_CREATE")
+            peer.recv()
+
+        def handler(event, data):
+            if event == "BROKEN":
+                raise ValueError("bad payload")
+            events.append(event)
+            stop.set()
+
+        stub = StubGateway(script)
+        stub.run(Gateway("token", handler, url=stub.url), stop)
+
+        assert events == ["GUILD_ROLE_CREATE"]
+
+    def test_fatal_close_code_raises(self):
+        stop = threading.Event()
+
+        def script(peer):
+            _hello(peer)
+            peer.recv()
+            peer.close(4004)
+            peer.recv()
+
+        stub = StubGateway(script)
+        with pytest.raises(DiscordGatewayError) as exc:
+            stub.run(Gateway("bad-token", lambda *_: None, url=stub.url), stop)
+
+        assert exc.value.close_code == 4004
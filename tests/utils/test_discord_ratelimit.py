@@ -0,0 +1,225 @@
+"""Unit tests for the proactive Discord rate-limit tracker (no Discord calls)."""
+
+import uuid
+from unittest.mock import Mock, patch
+
+import pytest
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from website.client.discord import Discord
+from website.client.ratelimit import (
+    MemoryRateLimitStore,
+    RateLimiter,
+    RedisRateLimitStore,
+    route_key,
+)
+from website.exceptions import DiscordAPIError
+from website.extensions import get_redis_client
+
+
+class FakeClock:
+    """Deterministic clock whose sleep() just advances time."""
+
+    def __init__(self, now=1000.0):
+        self.now = now
+        self.slept = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+def _headers(bucket="abc", remaining=1, reset_after=2.0):
+    return {
+        "X-RateLimit-Bucket": bucket,
+        "X-RateLimit-Remaining": str(remaining),
+        "X-RateLimit-Reset-After": str(reset_after),
+    }
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def limiter(clock):
+    return RateLimiter(max_wait=5, clock=clock, sleep=clock.sleep)
+
+
+class TestRouteKey:
+    def test_keeps_major_parameter_and_templates_minor_ids(self):
+        """Only the guild/channel ID survives; other snowflakes are templated."""
+        route, major = route_key("get", "/guilds/111/members/222")
+
+        assert route == "GET /guilds/111/members/{id}"
+        assert major == "111"
+
+    def test_channel_routes_share_template_across_messages(self):
+        """Two messages of the same channel map to the same route."""
+        assert route_key("PATCH", "/channels/1/messages/10") == route_key(
+            "PATCH", "/channels/1/messages/20"
+        )
+
+
+class TestRateLimiter:
+    def test_unknown_route_is_not_delayed(self, limiter, clock):
+        """A route with no learned bucket goes straight through."""
+        assert limiter.acquire("GET", "/guilds/1/roles") == 0
+        assert clock.slept == []
+
+    def test_waits_for_reset_when_bucket_is_exhausted(self, limiter, clock):
+        """Once the budget is spent, the next request waits for the reset."""
+        limiter.update("GET", "/guilds/1/members/2", _headers(remaining=0, reset_after=1.5))
+
+        waited = limiter.acquire("GET", "/guilds/1/members/3")
+
+        assert waited == pytest.approx(1.5)
+        assert clock.slept == [pytest.approx(1.5)]
+
+    def test_counts_down_remaining_between_responses(self, limiter, clock):
+        """A bucket with one request left allows exactly one more before waiting."""
+        limiter.update("GET", "/guilds/1/members/2", _headers(remaining=1, reset_after=3))
+
+        assert limiter.acquire("GET", "/guilds/1/members/2") == 0
+        assert limiter.acquire("GET", "/guilds/1/members/2") == pytest.approx(3)
+
+    def test_buckets_are_scoped_by_major_parameter(self, limiter):
+        """An exhausted bucket on one channel does not delay another channel."""
+        limiter.update("POST", "/channels/1/messages", _headers(remaining=0, reset_after=4))
+
+        assert limiter.acquire("POST", "/channels/2/messages") == 0
+
+    def test_raises_when_wait_exceeds_max(self, limiter):
+        """A wait longer than max_wait fails fast with a 429."""
+        limiter.update("GET", "/guilds/1/roles", _headers(remaining=0, reset_after=60))
+
+        with pytest.raises(DiscordAPIError) as exc:
+            limiter.acquire("GET", "/guilds/1/roles")
+
+        assert exc.value.status_code == 429
+
+    def test_global_429_blocks_every_route(self, limiter):
+        """A global rate limit holds back requests on unrelated routes."""
+        limiter.on_rate_limited(
+            "GET", "/guilds/1/roles", {"X-RateLimit-Global": "true"}, {"retry_after": 2}
+        )
+
+        assert limiter.acquire("DELETE", "/channels/9") == pytest.approx(2)
+
+    def test_budget_reports_remaining_until_reset(self, limiter, clock):
+        """The budget is known only while the bucket's window is open."""
+        assert limiter.budget("GET", "/guilds/1/members/2") is None
+        limiter.update("GET", "/guilds/1/members/2", _headers(remaining=3, reset_after=2))
+
+        limiter.acquire("GET", "/guilds/1/members/4")
+
+        assert limiter.budget("GET", "/guilds/1/members/0") == 2
+        clock.now += 2
+        assert limiter.budget("GET", "/guilds/1/members/0") is None
+
+    def test_global_window_limits_requests_per_second(self, clock):
+        """No more than the global limit is sent within one second."""
+        limiter = RateLimiter(
+            store=MemoryRateLimitStore(global_limit=2), clock=clock, sleep=clock.sleep
+        )
+
+        limiter.acquire("GET", "/channels/1")
+        limiter.acquire("GET", "/channels/2")
+
+        assert limiter.acquire("GET", "/channels/3") == pytest.approx(1)
+
+
+@pytest.fixture
+def redis_prefix(test_app):
+    """Unique key prefix on the app's Redis, cleaned up after the test."""
+    client = get_redis_client(test_app)
+    prefix = f"test_discord_rl:{uuid.uuid4().hex}:"
+    yield client, prefix
+    for key in client.scan_iter(match=f"{prefix}*"):
+        client.delete(key)
+
+
+class TestRedisRateLimitStore:
+    def test_bucket_budget_is_shared_between_limiters(self, redis_prefix, clock):
+        """Two processes (limiters) draw from the same bucket budget."""
+        client, prefix = redis_prefix
+        first, second = (
+            RateLimiter(RedisRateLimitStore(client, prefix), clock=clock, sleep=clock.sleep)
+            for _ in range(2)
+        )
+        first.update("GET", "/guilds/1/roles", _headers(remaining=1, reset_after=2))
+
+        assert second.acquire("GET", "/guilds/1/roles") == 0
+        assert first.acquire("GET", "/guilds/1/roles") == pytest.approx(2)
+
+    def test_budget_is_shared(self, redis_prefix, clock):
+        client, prefix = redis_prefix
+        first, second = (
+            RateLimiter(RedisRateLimitStore(client, prefix), clock=clock, sleep=clock.sleep)
+            for _ in range(2)
+        )
+        first.update("GET", "/guilds/1/members/2", _headers(remaining=5, reset_after=2))
+
+        assert second.budget("GET", "/guilds/1/members/3") == 5
+
+    def test_global_window_is_shared(self, redis_prefix, clock):
+        """The global per-second limit counts requests from every limiter."""
+        client, prefix = redis_prefix
+        first, second = (
+            RateLimiter(
+                RedisRateLimitStore(client, prefix, global_limit=2),
+                clock=clock,
+                sleep=clock.sleep,
+            )
+            for _ in range(2)
+        )
+
+        first.acquire("GET", "/channels/1")
+        second.acquire("GET", "/channels/2")
+
+        assert first.acquire("GET", "/channels/3") == pytest.approx(1)
+
+    def test_global_block_is_shared(self, redis_prefix, clock):
+        """A global 429 seen by one limiter holds back the others."""
+        client, prefix = redis_prefix
+        first, second = (
+            RateLimiter(RedisRateLimitStore(client, prefix), clock=clock, sleep=clock.sleep)
+            for _ in range(2)
+        )
+        first.on_rate_limited("GET", "/guilds/1", {}, {"retry_after": 1.5, "global": True})
+
+        assert second.acquire("GET", "/channels/1") == pytest.approx(1.5)
+
+    def test_falls_back_to_local_state_when_redis_is_down(self, clock):
+        """Redis errors never block Discord calls."""
+        client = Mock()
+        client.register_script.return_value = Mock(side_effect=RedisConnectionError("down"))
+        client.hget.side_effect = RedisConnectionError("down")
+        limiter = RateLimiter(RedisRateLimitStore(client), clock=clock, sleep=clock.sleep)
+
+        assert limiter.acquire("GET", "/guilds/1/roles") == 0
+
+
+class TestClientIntegration:
+    def test_429_is_recorded_and_retried(self):
+        """A 429 is recorded on the limiter, then the request is retried."""
+        clock = FakeClock()
+        client = Discord(
+            guild_id="1",
+            bot_token="token",
+            rate_limiter=RateLimiter(clock=clock, sleep=clock.sleep),
+        )
+        limited = Mock(status_code=429, ok=False, headers=_headers(remaining=0, reset_after=1))
+        limited.json.return_value = {"retry_after": 1}
+        ok = Mock(status_code=200, ok=True, content=b"[]", headers=_headers(remaining=4))
+        ok.json.return_value = []
+
+        with patch.object(client.session, "request", side_effect=[limited, ok]) as req:
+            assert client.list_roles() == []
+
+        assert req.call_count == 2
+        assert clock.slept == [pytest.approx(1)]
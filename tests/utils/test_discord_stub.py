@@ -0,0 +1,110 @@
+"""Tests for the local Discord API stub, driven through the real client."""
+
+import random
+import threading
+
+import pytest
+import requests
+
+from tests.discord_stub import DiscordStub, DiscordStubServer, StubConfig, parse_latency
+from website.client.circuit import OPEN, CircuitBreaker
+from website.client.discord import Discord
+from website.client.ratelimit import RateLimiter
+from website.exceptions import DiscordAPIError, DiscordUnavailableError
+
+
+@pytest.fixture
+def stub():
+    return DiscordStub(StubConfig(seed=1), members=5)
+
+
+@pytest.fixture
+def server(stub):
+    server = DiscordStubServer(stub)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def client(server, stub):
+    return Discord(
+        stub.guild_id,
+        "token",
+        rate_limiter=RateLimiter(),
+        breaker=CircuitBreaker(),
+        api_base_url=server.api_base_url,
+    )
+
+
+class TestParseLatency:
+    def test_distributions(self):
+        rng = random.Random(0)
+        assert parse_latency("fixed:50")(rng) == 0.05
+        assert 0.01 <= parse_latency("uniform:10:20")(rng) <= 0.02
+        assert parse_latency("lognormal:40:0.5")(rng) > 0
+
+    @pytest.mark.parametrize("spec", ["", "fixed", "uniform:1", "normal:1:2", "fixed:x"])
+    def test_invalid_spec(self, spec):
+        with pytest.raises(ValueError):
+            parse_latency(spec)
+
+
+class TestDiscordStub:
+    def test_channel_message_and_pin_flow(self, client, stub):
+        channel = client.create_channel("My Game", None, None, "1")
+        message = client.send_message("hello", channel["id"])
+        client.pin_message(message["id"], channel["id"])
+        client.edit_message(message["id"], "edited", channel["id"])
+
+        stored = stub.messages[channel["id"]][message["id"]]
+        assert stored["pinned"] is True
+        assert stored["content"] == "edited"
+        assert client.get_channel(channel["id"])["name"] == channel["name"]
+
+        client.delete_channel(channel["id"])
+        with pytest.raises(DiscordAPIError) as exc:
+            client.get_channel(channel["id"])
+        assert exc.value.status_code == 404
+
+    def test_member_list_pages_by_user_id(self, client, stub):
+        first = client.list_guild_members(limit=3)
+        rest = client.list_guild_members(limit=3, after=first[-1]["user"]["id"])
+
+        ids = [m["user"]["id"] for m in first + rest]
+        assert ids == sorted(stub.members, key=int)
+
+    def test_bucket_limit_answers_429_and_client_retries(self, client, stub):
+        stub.configure({"bucket_limit": 2, "bucket_window": 0.2})
+
+        for _ in range(3):
+            client.list_roles()
+
+        assert stub.stats["status 429"] <= 1
+        assert stub.stats["status 200"] == 3
+
+    def test_injected_errors_open_the_breaker(self, client, stub):
+        stub.configure({"error_rate": 1.0, "error_status": 502})
+
+        for _ in range(client.breaker.min_calls):
+            with pytest.raises(DiscordAPIError):
+                client.list_roles()
+
+        assert client.breaker.state == OPEN
+        with pytest.raises(DiscordUnavailableError):
+            client.list_roles()
+
+    def test_control_endpoints(self, server, stub):
+        root = server.api_base_url.rsplit("/api/", 1)[0]
+
+        config = requests.post(f"{root}/_stub/config", json={"latency": "fixed:1"}, timeout=5)
+        assert config.json()["latency"] == "fixed:1"
+        assert requests.post(f"{root}/_stub/config", json={"x": 1}, timeout=5).status_code == 400
+
+        requests.get(f"{server.api_base_url}/guilds/{stub.guild_id}/roles", timeout=5)
+        assert requests.get(f"{root}/_stub/stats", timeout=5).json()["status 200"] == 1
+
+        requests.post(f"{root}/_stub/reset", timeout=5)
+        assert stub.stats == {}
@@ -0,0 +1,48 @@
+"""Tests for the bounded concurrent fan-out helper."""
+
+import threading
+
+from flask import current_app
+
+from website.utils.fan_out import failures, fan_out
+
+
+class TestFanOut:
+    def test_calls_run_concurrently(self):
+        """Both calls must be in flight at once to get past the barrier."""
+        barrier = threading.Barrier(2, timeout=2)
+
+        def call(value):
+            barrier.wait()
+            return value
+
+        assert fan_out(lambda: call(1), lambda: call(2)) == [1, 2]
+
+    def test_every_call_runs_and_errors_are_collected(self):
+        ran = []
+
+        def fail(message):
+            ran.append(message)
+            raise ValueError(message)
+
+        results = fan_out(lambda: fail("first"), lambda: ran.append("ok"), lambda: fail("last"))
+
+        assert sorted(ran) == ["first", "last", "ok"]
+        assert [str(e) for e in failures(results)] == ["first", "last"]
+        assert results[1] is None
+
+    def test_single_worker_runs_calls_in_order(self):
+        order = []
+
+        fan_out(*(lambda i=i: order.append(i) for i in range(5)), max_workers=1)
+
+        assert order == [0, 1, 2, 3, 4]
+
+    def test_calls_run_in_the_application_context(self, parser_app):
+        with parser_app.app_context():
+            results = fan_out(lambda: current_app.name, lambda: current_app.name)
+
+        assert results == [parser_app.name, parser_app.name]
+
+    def test_no_calls(self):
+        assert fan_out() == []
@@ -0,0 +1,120 @@
+"""Tests for single-flight cache loading (real Redis cache, no Discord calls)."""
+
+import threading
+import time
+import uuid
+from unittest.mock import Mock
+
+import pytest
+
+from website.exceptions import DiscordAPIError
+from website.extensions import cache, get_redis_client
+from website.utils.single_flight import cached_fetch, store, store_many
+
+
+@pytest.fixture
+def key(test_app):
+    """Unique cache key, cleaned up after the test."""
+    key = f"test_single_flight_{uuid.uuid4().hex}"
+    yield key
+    cache.delete_many(key, f"{key}:fresh", f"{key}:lock")
+
+
+class TestCachedFetch:
+    def test_miss_fetches_once_then_hits(self, key):
+        fetch = Mock(return_value=("value", 60))
+
+        assert cached_fetch(key, fetch) == "value"
+        assert cached_fetch(key, fetch) == "value"
+
+        fetch.assert_called_once()
+
+    def test_concurrent_misses_share_one_fetch(self, test_app, key):
+        calls = []
+
+        def fetch():
+            calls.append(1)
+            time.sleep(0.2)
+            return "value", 60
+
+        results = []
+
+        def worker():
+            with test_app.app_context():
+                results.append(cached_fetch(key, fetch))
+
+        threads = [threading.Thread(target=worker) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(calls) == 1
+        assert results == ["value"] * 5
+
+    def test_uncacheable_value_is_returned_but_not_stored(self, key):
+        fetch = Mock(return_value=("error", None))
+
+        assert cached_fetch(key, fetch) == "error"
+
+        assert cache.get(key) is None
+
+    def test_stale_value_is_served_while_another_caller_refreshes(self, key):
+        store(key, "stale", 60)
+        cache.add(f"{key}:lock", 1)
+        fetch = Mock(return_value=("fresh", 60))
+
+        assert cached_fetch(key, fetch, soft_timeout=30) == "stale"
+
+        fetch.assert_not_called()
+
+    def test_lock_winner_revalidates_a_stale_value(self, key):
+        store(key, "stale", 60)
+        fetch = Mock(return_value=("fresh", 60))
+
+        assert cached_fetch(key, fetch, soft_timeout=30) == "fresh"
+        assert cached_fetch(key, fetch, soft_timeout=30) == "fresh"
+
+        fetch.assert_called_once()
+
+    def test_failed_refresh_keeps_the_stale_value(self, key):
+        store(key, "stale", 60)
+        fetch = Mock(side_effect=DiscordAPIError("Down", status_code=503))
+
+        assert cached_fetch(key, fetch, soft_timeout=30) == "stale"
+
+    def test_expired_lock_taken_over_is_not_released(self, test_app, key):
+        client = get_redis_client(test_app)
+        lock_key = f"{test_app.config['CACHE_KEY_PREFIX']}{key}:lock"
+
+        def fetch():
+            # The lock expired during a slow fetch and another caller took it.
+            client.set(lock_key, "other-token")
+            return "value", 60
+
+        assert cached_fetch(key, fetch) == "value"
+
+        assert client.get(lock_key) == b"other-token"
+
+    def test_lock_is_released_after_the_fetch(self, key):
+        cached_fetch(key, Mock(return_value=("value", 60)))
+
+        assert cache.get(f"{key}:lock") is None
+
+    def test_force_fetches_even_when_fresh(self, key):
+        store(key, "old", 60, soft_timeout=30)
+        fetch = Mock(return_value=("new", 60))
+
+        assert cached_fetch(key, fetch, soft_timeout=30, force=True) == "new"
+        assert cache.get(key) == "new"
+
+
+class TestStoreMany:
+    def test_fresh_marker_never_outlives_the_value(self, test_app, key):
+        client = get_redis_client(test_app)
+        prefix = test_app.config["CACHE_KEY_PREFIX"]
+
+        store_many({key: "value"}, 30, soft_timeout=60)
+
+        assert cache.get(key) == "value"
+        assert 0 < client.ttl(f"{prefix}{key}:fresh") <= 30
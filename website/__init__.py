@@ -8,7 +8,19 @@ from werkzeug.middleware.proxy_fix import ProxyFix
 
 from website.bot import set_bot
 from website.client.discord import Discord
-from website.extensions import cache, csrf, db, migrate, oauth, seed_trophies, setup_test_db
+from website.client.ratelimit import MemoryRateLimitStore, RateLimiter, RedisRateLimitStore
+from website.extensions import (
+    cache,
+    csrf,
+    db,
+    get_redis_client,
+    migrate,
+    oauth,
+    rebuild_leaderboards,
+    seed_trophies,
+    setup_test_db,
+)
+from website.gateway import discord_gateway
 from website.logging_config import configure_logging
 from website.scheduler import start_scheduler
 from website.utils import get_app_version
@@ -89,10 +101,29 @@ def create_app():
         client_kwargs={"scope": "identify"},
     )
     app.cli.add_command(seed_trophies)
+    app.cli.add_command(rebuild_leaderboards)
     app.cli.add_command(setup_test_db)
+    app.cli.add_command(discord_gateway)
+
+    # Share the Discord rate-limit budget across workers through Redis
+    redis_client = get_redis_client(app)
+    if redis_client is not None:
+        rate_limit_store = RedisRateLimitStore(
+            redis_client, prefix=f"{app.config['CACHE_KEY_PREFIX']}discord_rl:"
+        )
+    else:
+        rate_limit_store = MemoryRateLimitStore()
 
     # Create bot instance and store it
-    bot_instance = Discord(app.config["DISCORD_GUILD_ID"], app.config["DISCORD_BOT_TOKEN"])
+    bot_instance = Discord(
+        app.config["DISCORD_GUILD_ID"],
+        app.config["DISCORD_BOT_TOKEN"],
+        pool_size=app.config["DISCORD_HTTP_POOL_SIZE"],
+        connect_timeout=app.config["DISCORD_HTTP_CONNECT_TIMEOUT"],
+        read_timeout=app.config["DISCORD_HTTP_READ_TIMEOUT"],
+        rate_limiter=RateLimiter(rate_limit_store),
+        api_base_url=app.config.get("DISCORD_API_BASE_URL"),
+    )
     set_bot(bot_instance)
 
     register_blueprints(app)
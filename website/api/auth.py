@@ -75,9 +75,8 @@ def _mint_token(user) -> dict:
 
     Roles are included in the token for client-side convenience (e.g. UI
     decisions), but are **not** trusted for server-side authorization.
-    Role-gated decorators verify roles live against the 5-minute Discord
-    cache via ``refresh_roles()`` / ``get_user_roles()``, matching the
-    monolith behaviour.
+    Role-gated decorators verify roles live against the local guild role
+    index via ``refresh_roles()``, matching the monolith behaviour.
 
     Args:
         user: User ORM instance (must have refresh_roles called beforehand).
@@ -178,12 +177,11 @@ def api_login_optional(fn):
 
 
 def _load_and_refresh_user():
-    """Load the full User from DB and refresh roles via the 5-min cache.
+    """Load the full User from DB and refresh roles from the local role index.
 
-    Calls ``user.refresh_roles()`` which delegates to
-    ``get_user_roles()`` — a function that caches Discord role data for
-    5 minutes in Redis.  Within the cache window this is effectively
-    free; only after expiry does it hit the Discord API.
+    Calls ``user.refresh_roles()``, which reads the ``guild_member_role``
+    table (one indexed query) and only calls Discord, through the 5-minute
+    ``get_user_roles()`` cache, for members not indexed yet.
 
     Returns:
         User ORM instance with up-to-date roles.
@@ -218,8 +216,8 @@ def require_gm(fn):
     """Require the authenticated user to have the GM role.
 
     Must be applied **after** ``@api_login_required``.  Performs a live
-    role check using ``refresh_roles()`` (backed by a 5-minute Redis
-    cache), so role changes are picked up even if the JWT has stale claims.
+    role check using ``refresh_roles()`` (backed by the local guild role
+    index), so role changes are picked up even if the JWT has stale claims.
 
     Raises:
         UnauthorizedError: If the user is not a GM.
@@ -240,8 +238,8 @@ def require_admin(fn):
     """Require the authenticated user to have the admin role.
 
     Must be applied **after** ``@api_login_required``.  Performs a live
-    role check using ``refresh_roles()`` (backed by a 5-minute Redis
-    cache), so role changes are picked up even if the JWT has stale claims.
+    role check using ``refresh_roles()`` (backed by the local guild role
+    index), so role changes are picked up even if the JWT has stale claims.
 
     Raises:
         UnauthorizedError: If the user is not an admin.
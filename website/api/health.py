@@ -7,7 +7,11 @@ import psutil
 from flask import Blueprint, jsonify
 from sqlalchemy import text
 
+from website.bot import get_bot
+from website.client.discord import http_pool_stats
 from website.extensions import db
+from website.services.discord import embed_edit_stats
+from website.services.discord_outbox import DiscordOutboxService
 from website.utils import get_app_version
 
 health_bp = Blueprint("api_health", __name__)
@@ -33,11 +37,16 @@ def health():
     """Return API health status as JSON.
 
     Returns:
-        JSON with status, version, database connectivity, and uptime.
+        JSON with status, version, database connectivity, uptime, this
+        worker's Discord HTTP pool usage, circuit breaker state and
+        announcement edits (sent vs. skipped as unchanged), and the Discord
+        outbox backlog.
     """
     db_status = "ok"
+    outbox = None
     try:
         db.session.execute(text("SELECT 1"))
+        outbox = DiscordOutboxService().stats()
     except Exception:
         db_status = "error"
 
@@ -46,6 +55,8 @@ def health():
         (datetime.now() - datetime.fromtimestamp(process.create_time())).total_seconds()
     )
 
+    bot = get_bot()
+
     return (
         jsonify(
             {
@@ -53,6 +64,12 @@ def health():
                 "version": get_app_version(),
                 "database": db_status,
                 "uptime": _format_uptime(uptime_secs),
+                "discord": {
+                    "http_pool": http_pool_stats(),
+                    "circuit": bot.breaker.snapshot() if bot is not None else None,
+                    "embed_edits": embed_edit_stats(),
+                    "outbox": outbox,
+                },
                 "timestamp": datetime.now(timezone.utc).isoformat(),
             }
         ),
@@ -1,8 +1,15 @@
 """Read-only leaderboard endpoint for the QuestMaster API."""
 
-from flask import Blueprint, jsonify
+from flask import Blueprint, g, jsonify, request
 
-from config.constants import BADGE_CAMPAIGN_GM_ID, BADGE_CAMPAIGN_ID, BADGE_OS_GM_ID, BADGE_OS_ID
+from config.constants import (
+    BADGE_CAMPAIGN_GM_ID,
+    BADGE_CAMPAIGN_ID,
+    BADGE_OS_GM_ID,
+    BADGE_OS_ID,
+    LEADERBOARD_LIMIT_DEFAULT,
+    LEADERBOARD_LIMIT_MAX,
+)
 from website.api.auth import api_login_required
 from website.services.trophy import TrophyService
 
@@ -49,3 +56,31 @@ def get_leaderboards():
             ),
         }
     )
+
+
+@leaderboards_bp.route("/leaderboards/<int:trophy_id>/", methods=["GET"])
+@api_login_required
+def get_trophy_leaderboard(trophy_id):
+    """Get the leaderboard of any trophy, with the current user's rank.
+
+    Args:
+        trophy_id: Trophy ID.
+
+    Query parameters:
+        limit: Number of entries (default: 10, max: 100).
+
+    Returns:
+        JSON object with ``entries`` (user/count, highest first) and ``me``
+        (the current user's ``rank`` and ``count``).
+
+    Raises:
+        NotFoundError: If the trophy does not exist.
+    """
+    limit = request.args.get("limit", LEADERBOARD_LIMIT_DEFAULT, type=int)
+    limit = max(1, min(limit, LEADERBOARD_LIMIT_MAX))
+    return jsonify(
+        {
+            "entries": _serialize_leaderboard(trophy_service.get_leaderboard(trophy_id, limit)),
+            "me": trophy_service.get_user_rank(trophy_id, g.current_user["sub"]),
+        }
+    )
@@ -2,9 +2,11 @@
 
 from flask import Blueprint, g, jsonify, request
 
+from config.constants import TABLE_MATES_LIMIT_DEFAULT, TABLE_MATES_LIMIT_MAX
 from website.api.auth import api_login_required
 from website.api.pagination import paginated_response, parse_pagination_args
 from website.services.game import GameService
+from website.services.stats import StatsService
 from website.services.trophy import TrophyService
 from website.services.user import UserService
 
@@ -14,6 +16,7 @@ users_bp = Blueprint("api_users", __name__)
 user_service = UserService()
 trophy_service = TrophyService()
 game_service = GameService()
+stats_service = StatsService()
 
 
 @users_bp.route("/users/me/", methods=["GET"])
@@ -46,6 +49,23 @@ def search_users():
     )
 
 
+@users_bp.route("/users/me/table-mates/", methods=["GET"])
+@api_login_required
+def get_my_table_mates():
+    """Get the users the current user most often shared a table with.
+
+    Query parameters:
+        limit: Number of table-mates (default: 10, max: 50).
+
+    Returns:
+        JSON array of table-mates (id, name, avatar, games_together, gm_games,
+        last_played), most shared games first.
+    """
+    limit = request.args.get("limit", TABLE_MATES_LIMIT_DEFAULT, type=int)
+    limit = max(1, min(limit, TABLE_MATES_LIMIT_MAX))
+    return jsonify(stats_service.get_table_mates(g.current_user["sub"], limit))
+
+
 @users_bp.route("/users/<user_id>/", methods=["GET"])
 @api_login_required
 def get_user(user_id):
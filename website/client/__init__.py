@@ -1,5 +1,15 @@
 """Client layer for external API integrations."""
 
+from website.client.circuit import CircuitBreaker
 from website.client.discord import Discord
+from website.client.gateway import Gateway
+from website.client.ratelimit import MemoryRateLimitStore, RateLimiter, RedisRateLimitStore
 
-__all__ = ["Discord"]
+__all__ = [
+    "CircuitBreaker",
+    "Discord",
+    "Gateway",
+    "MemoryRateLimitStore",
+    "RateLimiter",
+    "RedisRateLimitStore",
+]
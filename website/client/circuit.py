@@ -0,0 +1,210 @@
+"""Circuit breaker for Discord API calls.
+
+When Discord is down or very slow, each call holds a web worker thread until
+its timeout, and a handful of such calls is enough to stall the whole site.
+:class:`CircuitBreaker` watches the outcome of recent calls and, once too many
+of them failed or were slow, *opens*: further calls are refused immediately
+with :class:`~website.exceptions.DiscordUnavailableError` (callers fall back to
+cached data, and queued writes wait in the outbox). After a cooldown it turns
+*half-open* and lets a few probe calls through; if they succeed the circuit
+closes again, otherwise it reopens for another cooldown.
+
+Every state change starts a new *generation*. A call records the generation it
+was let through in, and outcomes from earlier generations are ignored: a slow
+call sent before the circuit opened cannot pass for a half-open probe.
+
+The state is kept per process, like
+:class:`~website.client.ratelimit.MemoryRateLimitStore`.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+
+from config.constants import (
+    DISCORD_BREAKER_FAILURE_RATE,
+    DISCORD_BREAKER_MIN_CALLS,
+    DISCORD_BREAKER_OPEN_SECONDS,
+    DISCORD_BREAKER_PROBES,
+    DISCORD_BREAKER_SLOW_CALL_RATE,
+    DISCORD_BREAKER_SLOW_CALL_SECONDS,
+    DISCORD_BREAKER_WINDOW,
+)
+from website.exceptions import DiscordUnavailableError
+from website.utils.logger import logger
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Fail fast on Discord calls while Discord is failing or slow.
+
+    Call :meth:`allow` before sending a request and :meth:`record` with its
+    outcome and the generation :meth:`allow` returned once it completes (or
+    :meth:`release` if it was not sent after all). A call counts as failed when it could not reach Discord or got a 5xx;
+    client errors (4xx) mean Discord is up.
+
+    Attributes:
+        window: Number of most recent calls the rates are computed over.
+        min_calls: Calls needed in the window before the circuit may open.
+        failure_rate: Share of failed calls that opens the circuit.
+        slow_call_seconds: Duration above which a call counts as slow.
+        slow_call_rate: Share of slow calls that opens the circuit.
+        open_seconds: Cooldown before probe calls are let through.
+        probes: Probe calls let through, all of which must succeed to close.
+    """
+
+    def __init__(
+        self,
+        window: int = DISCORD_BREAKER_WINDOW,
+        min_calls: int = DISCORD_BREAKER_MIN_CALLS,
+        failure_rate: float = DISCORD_BREAKER_FAILURE_RATE,
+        slow_call_seconds: float = DISCORD_BREAKER_SLOW_CALL_SECONDS,
+        slow_call_rate: float = DISCORD_BREAKER_SLOW_CALL_RATE,
+        open_seconds: float = DISCORD_BREAKER_OPEN_SECONDS,
+        probes: int = DISCORD_BREAKER_PROBES,
+        clock=time.monotonic,
+    ):
+        self.window = window
+        self.min_calls = min_calls
+        self.failure_rate = failure_rate
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_call_rate = slow_call_rate
+        self.open_seconds = open_seconds
+        self.probes = probes
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._calls: deque[tuple[bool, bool]] = deque(maxlen=window)
+        self._state = CLOSED
+        self._generation = 0
+        self._opened_at = 0.0
+        self._probes_sent = 0
+        self._probes_passed = 0
+
+    @property
+    def state(self) -> str:
+        """Current state: ``closed``, ``open`` or ``half_open``."""
+        with self._lock:
+            self._expire_open()
+            return self._state
+
+    def retry_after(self) -> float:
+        """Return the seconds left before probe calls are let through (0 if not open)."""
+        with self._lock:
+            self._expire_open()
+            if self._state != OPEN:
+                return 0.0
+            return max(self._opened_at + self.open_seconds - self._clock(), 0.0)
+
+    def allow(self) -> int:
+        """Let a call through, or refuse it while the circuit is open.
+
+        In the half-open state only :attr:`probes` calls are let through until
+        their outcomes are known.
+
+        Returns:
+            The generation the call was let through in, to pass to
+            :meth:`record` or :meth:`release`.
+
+        Raises:
+            DiscordUnavailableError: If the call must not be sent.
+        """
+        with self._lock:
+            self._expire_open()
+            if self._state == CLOSED:
+                return self._generation
+            if self._state == HALF_OPEN and self._probes_sent < self.probes:
+                self._probes_sent += 1
+                return self._generation
+            retry_after = self._opened_at + self.open_seconds - self._clock()
+        raise DiscordUnavailableError(max(retry_after, 0.0))
+
+    def release(self, generation: int) -> None:
+        """Forget a call :meth:`allow` let through but that was never sent.
+
+        Args:
+            generation: Generation returned by :meth:`allow` for the call.
+        """
+        with self._lock:
+            if generation != self._generation:
+                return
+            if self._state == HALF_OPEN and self._probes_sent > self._probes_passed:
+                self._probes_sent -= 1
+
+    def record(self, success: bool, duration: float, generation: int) -> None:
+        """Record the outcome of a call that :meth:`allow` let through.
+
+        Outcomes of calls let through before the last state change are
+        ignored.
+
+        Args:
+            success: Whether Discord answered (any status below 500).
+            duration: Seconds the call took.
+            generation: Generation returned by :meth:`allow` for the call.
+        """
+        slow = duration >= self.slow_call_seconds
+        with self._lock:
+            self._expire_open()
+            if generation != self._generation:
+                return
+            if self._state == HALF_OPEN:
+                if not success or slow:
+                    self._open("a probe call failed" if not success else "a probe call was slow")
+                    return
+                self._probes_passed += 1
+                if self._probes_passed >= self.probes:
+                    self._state = CLOSED
+                    self._generation += 1
+                    self._calls.clear()
+                    logger.info("Discord circuit closed: probe calls succeeded")
+                return
+            if self._state == OPEN:
+                return
+            self._calls.append((not success, slow))
+            if len(self._calls) < self.min_calls:
+                return
+            failed = sum(f for f, _ in self._calls) / len(self._calls)
+            slowed = sum(s for _, s in self._calls) / len(self._calls)
+            if failed >= self.failure_rate:
+                self._open(f"{failed:.0%} of the last {len(self._calls)} calls failed")
+            elif slowed >= self.slow_call_rate:
+                self._open(f"{slowed:.0%} of the last {len(self._calls)} calls were slow")
+
+    def snapshot(self) -> dict:
+        """Return the breaker state, for diagnostics.
+
+        Returns:
+            Dict with ``state``, ``retry_after`` (seconds), and the number of
+            ``calls``, ``failed`` and ``slow`` calls in the window.
+        """
+        retry_after = self.retry_after()
+        with self._lock:
+            return {
+                "state": self._state,
+                "retry_after": round(retry_after, 1),
+                "calls": len(self._calls),
+                "failed": sum(f for f, _ in self._calls),
+                "slow": sum(s for _, s in self._calls),
+            }
+
+    def _open(self, reason: str) -> None:
+        """Open the circuit (lock held)."""
+        self._state = OPEN
+        self._generation += 1
+        self._opened_at = self._clock()
+        self._calls.clear()
+        logger.warning(
+            f"Discord circuit opened for {self.open_seconds}s: {reason}; calls fail fast"
+        )
+
+    def _expire_open(self) -> None:
+        """Turn an open circuit half-open once its cooldown is over (lock held)."""
+        if self._state == OPEN and self._clock() >= self._opened_at + self.open_seconds:
+            self._state = HALF_OPEN
+            self._generation += 1
+            self._probes_sent = 0
+            self._probes_passed = 0
@@ -2,39 +2,152 @@
 
 This module provides the low-level Discord API client with HTTP request handling,
 rate limiting, and retry logic. Business logic should use DiscordService instead.
+
+Every client in the process shares one keep-alive connection pool (see
+:func:`get_http_session`), so back-to-back API calls reuse an established
+TCP+TLS connection to discord.com instead of paying a fresh handshake each time.
 """
 
+import threading
 import time
 
 import requests
+from requests.adapters import HTTPAdapter
 from unidecode import unidecode
 
 from config.constants import (
     DISCORD_API_BASE_URL,
     DISCORD_CHANNEL_TYPE_CATEGORY,
+    DISCORD_GATEWAY_QUERY,
+    DISCORD_HTTP_CONNECT_TIMEOUT,
+    DISCORD_HTTP_POOL_SIZE_DEFAULT,
+    DISCORD_HTTP_READ_TIMEOUT,
     GM_ROLE_PERMISSION,
     PLAYER_ROLE_PERMISSION,
 )
+from website.client.circuit import CircuitBreaker
+from website.client.ratelimit import RateLimiter
 from website.exceptions import DiscordAPIError
 from website.utils.logger import logger
 
+_session_lock = threading.Lock()
+_http_session: requests.Session | None = None
+_http_adapter: HTTPAdapter | None = None
+_http_pool_size = 0
+
+
+def get_http_session(pool_size: int = DISCORD_HTTP_POOL_SIZE_DEFAULT) -> requests.Session:
+    """Return the process-wide pooled HTTP session used for Discord API calls.
+
+    The session is created on first use and shared by every thread afterwards.
+    Its urllib3 pool keeps up to ``pool_size`` idle connections alive per host;
+    extra concurrent requests still proceed on short-lived connections rather
+    than blocking. Retries are left to :meth:`Discord._request`.
+
+    Args:
+        pool_size: Keep-alive connections per host. Only honoured by the call
+            that creates the session; later calls return the existing one.
+
+    Returns:
+        The shared ``requests.Session``.
+    """
+    global _http_session, _http_adapter, _http_pool_size
+    if _http_session is None:
+        with _session_lock:
+            if _http_session is None:
+                adapter = HTTPAdapter(pool_connections=2, pool_maxsize=pool_size, max_retries=0)
+                session = requests.Session()
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _http_adapter = adapter
+                _http_pool_size = pool_size
+                _http_session = session
+    return _http_session
+
+
+def http_pool_stats() -> dict:
+    """Report connection reuse for the shared Discord HTTP pool.
+
+    Each new connection costs a TCP+TLS handshake; every other request was
+    served on a kept-alive connection.
+
+    Returns:
+        Dict with ``pool_size`` (as configured by ``QM_DISCORD_POOL_SIZE``
+        when the session was created), ``requests`` (sent through the pool),
+        ``connections`` (handshakes performed) and ``reused`` (requests that
+        did not need a new connection). All zero before the first request.
+    """
+    stats = {"pool_size": 0, "requests": 0, "connections": 0, "reused": 0}
+    adapter = _http_adapter
+    if adapter is None:
+        return stats
+    stats["pool_size"] = _http_pool_size
+    pools = adapter.poolmanager.pools
+    for key in list(pools.keys()):
+        pool = pools.get(key)
+        if pool is None:
+            continue
+        stats["requests"] += pool.num_requests
+        stats["connections"] += pool.num_connections
+    stats["reused"] = max(stats["requests"] - stats["connections"], 0)
+    return stats
+
+
+def player_overwrite(member_id: str) -> dict:
+    """Return the member permission overwrite granting a player a game channel.
+
+    Args:
+        member_id: Discord user ID of the player.
+
+    Returns:
+        Overwrite dict as sent in ``permission_overwrites``.
+    """
+    return {"id": member_id, "type": 1, "allow": PLAYER_ROLE_PERMISSION}
+
 
 class Discord:
     """Low-level Discord API client.
 
-    Handles HTTP requests to the Discord API with retry logic and rate limiting.
-    For business logic, use DiscordService which wraps this client.
+    Handles HTTP requests to the Discord API with retry logic and rate limiting:
+    requests are held back *before* they would exceed a known rate-limit bucket
+    (see :class:`~website.client.ratelimit.RateLimiter`) rather than only
+    reacting to 429 responses. While Discord keeps failing or answering slowly,
+    a circuit breaker (see :class:`~website.client.circuit.CircuitBreaker`)
+    refuses calls without sending them. For business logic, use DiscordService
+    which wraps this client.
 
     Attributes:
         guild_id: The Discord guild (server) ID.
         authorization: The bot token for authentication.
         headers: HTTP headers for API requests.
+        session: Shared pooled HTTP session (see :func:`get_http_session`).
+        timeout: ``(connect, read)`` timeout in seconds applied to every request.
+        rate_limiter: Tracks Discord's per-route buckets and global limit.
+        breaker: Fails calls fast while Discord is down or slow.
+        api_base_url: REST API root, the real Discord API unless pointed at a
+            local stand-in (the test stub in ``tests/discord_stub.py``).
     """
 
-    def __init__(self, guild_id, bot_token):
+    def __init__(
+        self,
+        guild_id,
+        bot_token,
+        *,
+        pool_size: int = DISCORD_HTTP_POOL_SIZE_DEFAULT,
+        connect_timeout: float = DISCORD_HTTP_CONNECT_TIMEOUT,
+        read_timeout: float = DISCORD_HTTP_READ_TIMEOUT,
+        rate_limiter: RateLimiter | None = None,
+        breaker: CircuitBreaker | None = None,
+        api_base_url: str | None = None,
+    ):
         self.guild_id = guild_id
+        self.api_base_url = (api_base_url or DISCORD_API_BASE_URL).rstrip("/")
         self.authorization = bot_token
         self.headers = self._make_headers(self.authorization)
+        self.session = get_http_session(pool_size)
+        self.timeout = (connect_timeout, read_timeout)
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.breaker = breaker or CircuitBreaker()
 
     def _make_headers(self, authorization=""):
         headers = {
@@ -55,20 +168,50 @@ class Discord:
         max_retries=3,
     ):
         """Generic helper for all HTTP requests with retry + error handling."""
-        url = f"{DISCORD_API_BASE_URL}{endpoint}"
+        url = f"{self.api_base_url}{endpoint}"
         headers = dict(self.headers)
         if reason:
             headers["X-Audit-Log-Reason"] = reason
 
         for _ in range(max_retries):
-            r = requests.request(method, url, headers=headers, json=json, params=params)
-
-            # Handle rate limiting (HTTP 429)
+            # Fails fast while the circuit is open, before waiting on any limit.
+            generation = self.breaker.allow()
+            try:
+                # Waits out any known bucket/global limit (bounded), or raises a 429.
+                self.rate_limiter.acquire(method, endpoint)
+            except DiscordAPIError:
+                self.breaker.release(generation)
+                raise
+            started = time.monotonic()
+            reached = False
+            try:
+                r = self.session.request(
+                    method, url, headers=headers, json=json, params=params, timeout=self.timeout
+                )
+                reached = r.status_code < 500
+            except requests.Timeout as e:
+                raise DiscordAPIError(f"Request timed out: {e}", status_code=504) from e
+            except requests.RequestException as e:
+                raise DiscordAPIError(f"Request failed: {e}", status_code=503) from e
+            finally:
+                self.breaker.record(reached, time.monotonic() - started, generation)
+
+            self.rate_limiter.update(method, endpoint, r.headers)
+
+            # Handle rate limiting (HTTP 429): record it so the next acquire()
+            # waits it out, then retry.
             if r.status_code == 429:
-                data = r.json()
-                retry_after = data.get("retry_after", 1)
-                logger.warning("Rate limited by Discord. Retrying after %.2f s...", retry_after)
-                time.sleep(float(retry_after))
+                try:
+                    data = r.json()
+                except ValueError:
+                    data = {}
+                retry_after = self.rate_limiter.on_rate_limited(method, endpoint, r.headers, data)
+                logger.warning(
+                    "Rate limited by Discord on %s %s. Retrying after %.2f s...",
+                    method,
+                    endpoint,
+                    retry_after,
+                )
                 continue
 
             # Handle non-success codes
@@ -102,6 +245,33 @@ class Discord:
         """
         return self._request(endpoint=f"/guilds/{self.guild_id}/members/{user_id}", method="GET")
 
+    def get_gateway_url(self) -> str:
+        """Fetch the WebSocket URL to open a Gateway connection on.
+
+        Returns:
+            Gateway URL with the API version and JSON encoding parameters.
+        """
+        url = self._request(endpoint="/gateway/bot", method="GET")["url"]
+        return url.rstrip("/") + "/" + DISCORD_GATEWAY_QUERY
+
+    def list_guild_members(self, limit: int = 1000, after: str = "0") -> list:
+        """Fetch one page of guild members, ordered by user ID.
+
+        Requires the privileged "Server Members" intent on the bot.
+
+        Args:
+            limit: Page size (Discord caps it at 1000).
+            after: Only return members whose user ID is greater than this one.
+
+        Returns:
+            List of member dicts (``user``, ``nick``, ``avatar``, ``roles``...).
+        """
+        return self._request(
+            endpoint=f"/guilds/{self.guild_id}/members",
+            method="GET",
+            params={"limit": limit, "after": after},
+        )
+
     def send_message(
         self,
         content: str,
@@ -271,7 +441,12 @@ class Discord:
         )
 
     def create_channel(
-        self, channel_name: str, parent_id: str, role_id: str | None, gm_id: str
+        self,
+        channel_name: str,
+        parent_id: str,
+        role_id: str | None,
+        gm_id: str,
+        member_ids: list[str] | tuple = (),
     ) -> dict:
         """Create a text channel in the guild with permission overwrites.
 
@@ -282,6 +457,8 @@ class Discord:
                 the channel without a player-role overwrite (direct-permission mode,
                 where players are granted access individually).
             gm_id: GM user ID for elevated permissions.
+            member_ids: Players granted access by a member overwrite in the same
+                request (direct-permission mode).
 
         Returns:
             Dict with the created channel data.
@@ -294,6 +471,7 @@ class Discord:
             permission_overwrites.insert(
                 0, {"id": role_id, "type": 0, "allow": PLAYER_ROLE_PERMISSION}
             )
+        permission_overwrites += [player_overwrite(m) for m in member_ids if m != gm_id]
         payload = {
             "name": "-".join(unidecode(channel_name).split()),
             "type": 0,
@@ -340,6 +518,23 @@ class Discord:
         """
         return self._request(endpoint=f"/channels/{channel_id}", method="GET")
 
+    def edit_channel_permissions(self, channel_id: str, permission_overwrites: list) -> dict:
+        """Replace every permission overwrite of a channel in one request.
+
+        Args:
+            channel_id: Channel to edit.
+            permission_overwrites: Complete overwrite list; overwrites left out
+                are removed.
+
+        Returns:
+            Dict with the updated channel data.
+        """
+        return self._request(
+            endpoint=f"/channels/{channel_id}",
+            method="PATCH",
+            json={"permission_overwrites": permission_overwrites},
+        )
+
     def delete_channel(self, channel_id: str) -> dict:
         """Delete a Discord channel.
 
@@ -0,0 +1,246 @@
+"""Discord Gateway client for push-based guild events.
+
+The WebSocket transport is websocket-client; this module holds the Gateway
+session logic on top of it: HELLO/heartbeat, IDENTIFY or RESUME, sequence
+tracking and reconnects. Every
+DISPATCH event is handed to a callback; what to do with it is business logic
+and lives in :class:`~website.services.gateway.GatewayEventService`.
+
+The URL is a parameter, so the client can be pointed at a local stub gateway
+(``ws://``) in tests or development.
+"""
+
+import json
+import random
+import threading
+import time
+from collections.abc import Callable
+
+import websocket
+
+from config.constants import (
+    DISCORD_GATEWAY_CONNECT_TIMEOUT,
+    DISCORD_GATEWAY_INTENTS,
+    DISCORD_GATEWAY_POLL_INTERVAL,
+    DISCORD_GATEWAY_QUERY,
+    DISCORD_GATEWAY_RECONNECT_MAX_DELAY,
+    DISCORD_GATEWAY_RECONNECT_MIN_DELAY,
+)
+from website.exceptions import DiscordGatewayError
+from website.utils.logger import logger
+
+# Gateway opcodes
+DISPATCH = 0
+HEARTBEAT = 1
+IDENTIFY = 2
+RESUME = 6
+RECONNECT = 7
+INVALID_SESSION = 9
+HELLO = 10
+HEARTBEAT_ACK = 11
+
+# Close codes after which reconnecting cannot succeed (bad token, shard or
+# intents): the worker stops instead of hammering Discord.
+FATAL_CLOSE_CODES = {4004, 4010, 4011, 4012, 4013, 4014}
+# Close codes after which the session cannot be resumed, only re-identified.
+SESSION_CLOSE_CODES = {4007, 4009}
+
+
+class ConnectionClosed(ConnectionError):
+    """The WebSocket peer closed the connection.
+
+    Args:
+        code: Close code sent by the peer (1005 when none was given).
+    """
+
+    def __init__(self, code: int):
+        self.code = code
+        super().__init__(f"WebSocket closed with code {code}")
+
+
+def connect(url: str) -> websocket.WebSocket:
+    """Open a ``ws://`` or ``wss://`` connection to a gateway.
+
+    Args:
+        url: WebSocket URL.
+
+    Returns:
+        The open connection.
+    """
+    return websocket.create_connection(url, timeout=DISCORD_GATEWAY_CONNECT_TIMEOUT)
+
+
+class Gateway:
+    """Discord Gateway session that forwards DISPATCH events to a handler.
+
+    A single thread runs the connection: it heartbeats at the interval given in
+    HELLO, identifies (or resumes after a reconnect, replaying missed events),
+    and calls ``handler(event_name, data)`` for every event. Dropped or zombie
+    connections (no heartbeat ACK) are re-opened with exponential backoff.
+
+    Attributes:
+        url: Gateway URL used to identify.
+        session_id: Current session, used to resume (None before READY).
+        sequence: Last sequence number received.
+        resume_url: URL to resume on, as given by READY.
+    """
+
+    def __init__(
+        self,
+        token: str,
+        handler: Callable[[str, dict], None],
+        *,
+        url: str,
+        intents: int = DISCORD_GATEWAY_INTENTS,
+        connect: Callable[[str], websocket.WebSocket] = connect,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.token = token
+        self.handler = handler
+        self.url = url
+        self.intents = intents
+        self._connect = connect
+        self._clock = clock
+        self.session_id: str | None = None
+        self.sequence: int | None = None
+        self.resume_url: str | None = None
+        self._ready = False
+
+    def run(self, stop: threading.Event) -> None:
+        """Consume events until ``stop`` is set.
+
+        Args:
+            stop: Event that ends the loop (checked at least every
+                ``DISCORD_GATEWAY_POLL_INTERVAL`` seconds).
+
+        Raises:
+            DiscordGatewayError: If Discord closes the connection with a fatal
+                close code (e.g. invalid token or disallowed intents).
+        """
+        delay = DISCORD_GATEWAY_RECONNECT_MIN_DELAY
+        while not stop.is_set():
+            self._ready = False
+            try:
+                self._run_connection(stop)
+                continue
+            except ConnectionClosed as e:
+                if e.code in FATAL_CLOSE_CODES:
+                    raise DiscordGatewayError("Gateway closed the connection", e.code) from e
+                if e.code in SESSION_CLOSE_CODES:
+                    self._reset_session()
+                logger.warning(f"Gateway connection closed ({e.code}), reconnecting")
+            except (OSError, ValueError, KeyError, websocket.WebSocketException) as e:
+                logger.warning(f"Gateway connection failed, reconnecting: {e}")
+            if self._ready:
+                delay = DISCORD_GATEWAY_RECONNECT_MIN_DELAY
+            stop.wait(delay)
+            delay = min(delay * 2, DISCORD_GATEWAY_RECONNECT_MAX_DELAY)
+
+    def _reset_session(self) -> None:
+        self.session_id = self.sequence = self.resume_url = None
+
+    def _send(self, ws: websocket.WebSocket, op: int, data) -> None:
+        ws.send(json.dumps({"op": op, "d": data}))
+
+    def _receive(self, ws: websocket.WebSocket, timeout: float) -> dict | None:
+        """Wait for the next payload; pings are answered by websocket-client.
+
+        Args:
+            ws: Open connection.
+            timeout: Seconds to wait.
+
+        Returns:
+            The decoded payload, or None if nothing arrived in time.
+
+        Raises:
+            ConnectionClosed: If the peer closed the connection.
+        """
+        ws.settimeout(timeout)
+        try:
+            opcode, frame = ws.recv_data_frame()
+        except websocket.WebSocketTimeoutException:
+            return None
+        except websocket.WebSocketConnectionClosedException:
+            raise ConnectionClosed(1006) from None
+        if opcode == websocket.ABNF.OPCODE_CLOSE:
+            code = int.from_bytes(frame.data[:2], "big") if len(frame.data) >= 2 else 1005
+            raise ConnectionClosed(code)
+        return json.loads(frame.data)
+
+    def _run_connection(self, stop: threading.Event) -> None:
+        """Run one connection until Discord asks to reconnect or ``stop`` is set."""
+        resuming = self.session_id is not None
+        ws = self._connect(self.resume_url if resuming and self.resume_url else self.url)
+        try:
+            hello = self._receive(ws, DISCORD_GATEWAY_CONNECT_TIMEOUT)
+            if not hello or hello["op"] != HELLO:
+                raise ConnectionError("Gateway did not send HELLO")
+            interval = hello["d"]["heartbeat_interval"] / 1000
+            # The first heartbeat is jittered so reconnecting clients spread out.
+            next_beat = self._clock() + interval * random.random()
+            acked = True
+            if resuming:
+                self._send(
+                    ws,
+                    RESUME,
+                    {"token": self.token, "session_id": self.session_id, "seq": self.sequence},
+                )
+            else:
+                self._send(
+                    ws,
+                    IDENTIFY,
+                    {
+                        "token": self.token,
+                        "intents": self.intents,
+                        "properties": {
+                            "os": "linux",
+                            "browser": "questmaster",
+                            "device": "questmaster",
+                        },
+                    },
+                )
+
+            while not stop.is_set():
+                now = self._clock()
+                if now >= next_beat:
+                    if not acked:
+                        raise ConnectionError("No heartbeat ACK received (zombie connection)")
+                    self._send(ws, HEARTBEAT, self.sequence)
+                    acked = False
+                    next_beat = now + interval
+                payload = self._receive(ws, min(next_beat - now, DISCORD_GATEWAY_POLL_INTERVAL))
+                if payload is None:
+                    continue
+                if payload.get("s") is not None:
+                    self.sequence = payload["s"]
+                op = payload["op"]
+                if op == DISPATCH:
+                    self._dispatch(payload["t"], payload["d"])
+                elif op == HEARTBEAT:
+                    self._send(ws, HEARTBEAT, self.sequence)
+                elif op == HEARTBEAT_ACK:
+                    acked = True
+                elif op == RECONNECT:
+                    return
+                elif op == INVALID_SESSION:
+                    if not payload["d"]:
+                        self._reset_session()
+                    stop.wait(random.uniform(1, 5))
+                    return
+        finally:
+            # Closing with 1000 would end the session on Discord's side too.
+            ws.close(status=1000 if stop.is_set() else 4000, timeout=DISCORD_GATEWAY_POLL_INTERVAL)
+
+    def _dispatch(self, event: str, data: dict) -> None:
+        if event == "READY":
+            self.session_id = data["session_id"]
+            self.resume_url = data["resume_gateway_url"].rstrip("/") + "/" + DISCORD_GATEWAY_QUERY
+            self._ready = True
+            logger.info(f"Gateway session {self.session_id} ready")
+        elif event == "RESUMED":
+            self._ready = True
+            logger.info(f"Gateway session {self.session_id} resumed")
+        try:
+            self.handler(event, data)
+        except Exception:
+            logger.exception(f"Gateway handler failed on {event}")
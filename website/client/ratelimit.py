@@ -0,0 +1,481 @@
+"""Proactive Discord rate-limit tracking.
+
+Discord groups routes into rate-limit *buckets* it only reveals through response
+headers (``X-RateLimit-Bucket``, ``-Remaining``, ``-Reset-After``). A bucket is
+further scoped by the route's *major parameter* (the channel, guild or webhook
+ID), so ``PATCH /channels/1/messages/…`` and ``PATCH /channels/2/messages/…``
+share a bucket hash but not a budget. On top of the buckets, a bot may send at
+most ``DISCORD_GLOBAL_RATE_LIMIT`` requests per second.
+
+:class:`RateLimiter` learns the route → bucket mapping from the headers, counts
+down each bucket's remaining budget as requests are sent, and makes the caller
+wait *before* a request that Discord would otherwise reject with a 429. The
+state itself lives in a store: :class:`MemoryRateLimitStore` keeps it per
+process, :class:`RedisRateLimitStore` shares one budget between every gunicorn
+worker and scheduler thread using the same bot token.
+"""
+
+from __future__ import annotations
+
+import math
+import threading
+import time
+
+from redis.exceptions import RedisError
+
+from config.constants import DISCORD_GLOBAL_RATE_LIMIT, DISCORD_RATE_LIMIT_MAX_WAIT
+from website.exceptions import DiscordAPIError
+from website.utils.logger import logger
+
+# Path segments whose following ID is a Discord "major parameter".
+MAJOR_PARAMETERS = ("channels", "guilds", "webhooks")
+
+
+def route_key(method: str, endpoint: str) -> tuple[str, str]:
+    """Split a request into its rate-limit route and major parameter.
+
+    Every snowflake in the path except the major parameter is templated, so all
+    requests Discord counts against the same bucket map to the same route.
+
+    Args:
+        method: HTTP method.
+        endpoint: API path relative to the base URL (e.g. ``/guilds/1/members/2``).
+
+    Returns:
+        Tuple of ``(route, major)`` where ``route`` looks like
+        ``"GET /guilds/1/members/{id}"`` and ``major`` is the major parameter
+        value (empty string when the route has none).
+    """
+    parts = endpoint.split("?", 1)[0].strip("/").split("/")
+    major = ""
+    templated = []
+    for i, part in enumerate(parts):
+        if i == 1 and parts[0] in MAJOR_PARAMETERS:
+            major = part
+            templated.append(part)
+        elif part.isdigit():
+            templated.append("{id}")
+        else:
+            templated.append(part)
+    return f"{method.upper()} /{'/'.join(templated)}", major
+
+
+class MemoryRateLimitStore:
+    """In-process rate-limit state, shared by every thread of a worker.
+
+    Holds the learned route → bucket mapping, each bucket's remaining budget and
+    reset time, and the global per-second window. All mutations happen under a
+    single lock so concurrent threads never over-spend a bucket.
+    """
+
+    def __init__(self, global_limit: int = DISCORD_GLOBAL_RATE_LIMIT):
+        self.global_limit = global_limit
+        self._lock = threading.Lock()
+        self._routes: dict[str, str] = {}
+        self._buckets: dict[str, tuple[int, float]] = {}
+        self._global_window = (0.0, 0)
+        self._global_blocked_until = 0.0
+
+    def get_bucket(self, route: str) -> str | None:
+        """Return the bucket hash learned for a route, if any."""
+        return self._routes.get(route)
+
+    def set_bucket(self, route: str, bucket: str) -> None:
+        """Remember which bucket a route belongs to."""
+        self._routes[route] = bucket
+
+    def reserve(self, bucket_key: str | None, now: float) -> float:
+        """Reserve one request slot, or report how long to wait for one.
+
+        Checks the global limit first, then the bucket (when known). A slot is
+        only consumed when both have room.
+
+        Args:
+            bucket_key: ``"<bucket>:<major>"`` key, or None for an unmapped route.
+            now: Current wall-clock time (seconds since the epoch).
+
+        Returns:
+            ``0.0`` when a slot was reserved, otherwise the seconds to wait
+            before trying again.
+        """
+        with self._lock:
+            if self._global_blocked_until > now:
+                return self._global_blocked_until - now
+
+            window_start, count = self._global_window
+            if now - window_start >= 1:
+                window_start, count = now, 0
+            if count >= self.global_limit:
+                return window_start + 1 - now
+
+            if bucket_key is not None:
+                state = self._buckets.get(bucket_key)
+                if state is not None:
+                    remaining, reset_at = state
+                    if reset_at <= now:
+                        # The window has rolled over; Discord's headers on the
+                        # next response will restore the authoritative values.
+                        self._buckets.pop(bucket_key)
+                    elif remaining <= 0:
+                        return reset_at - now
+                    else:
+                        self._buckets[bucket_key] = (remaining - 1, reset_at)
+
+            self._global_window = (window_start, count + 1)
+            return 0.0
+
+    def remaining(self, bucket_key: str, now: float) -> int | None:
+        """Return a bucket's remaining budget in its current window.
+
+        Args:
+            bucket_key: ``"<bucket>:<major>"`` key.
+            now: Current wall-clock time (seconds since the epoch).
+
+        Returns:
+            Requests left before the bucket resets, or None when its state is
+            unknown or its window has already rolled over.
+        """
+        with self._lock:
+            state = self._buckets.get(bucket_key)
+        if state is None or state[1] <= now:
+            return None
+        return state[0]
+
+    def record(self, bucket_key: str, remaining: int, reset_at: float) -> None:
+        """Store the authoritative bucket state reported by Discord."""
+        with self._lock:
+            self._buckets[bucket_key] = (remaining, reset_at)
+
+    def block_global(self, until: float) -> None:
+        """Hold every request until ``until`` (after a global 429)."""
+        with self._lock:
+            self._global_blocked_until = max(self._global_blocked_until, until)
+
+    def snapshot(self) -> dict:
+        """Return a copy of the bucket state, for diagnostics.
+
+        Returns:
+            Dict with ``routes`` (route → bucket) and ``buckets``
+            (bucket key → ``{"remaining", "reset_at"}``).
+        """
+        with self._lock:
+            return {
+                "routes": dict(self._routes),
+                "buckets": {
+                    key: {"remaining": remaining, "reset_at": reset_at}
+                    for key, (remaining, reset_at) in self._buckets.items()
+                },
+            }
+
+
+# Atomically reserve one request slot against the global window and, when the
+# route's bucket is known, the bucket budget. Returns "0" on success or the
+# seconds to wait as a string (Lua numbers are truncated to integers in replies).
+#   KEYS: global block key, global window key (one per second), bucket key or ""
+#   ARGV: now, global limit
+_RESERVE_SCRIPT = """
+local now = tonumber(ARGV[1])
+local blocked_until = tonumber(redis.call('GET', KEYS[1]) or '0')
+if blocked_until > now then
+    return tostring(blocked_until - now)
+end
+
+local count = tonumber(redis.call('GET', KEYS[2]) or '0')
+if count >= tonumber(ARGV[2]) then
+    return tostring(math.floor(now) + 1 - now)
+end
+
+if KEYS[3] ~= '' then
+    local state = redis.call('HMGET', KEYS[3], 'remaining', 'reset_at')
+    if state[1] then
+        local remaining = tonumber(state[1])
+        local reset_at = tonumber(state[2])
+        if reset_at <= now then
+            redis.call('DEL', KEYS[3])
+        elseif remaining <= 0 then
+            return tostring(reset_at - now)
+        else
+            redis.call('HINCRBY', KEYS[3], 'remaining', -1)
+        end
+    end
+end
+
+redis.call('INCR', KEYS[2])
+redis.call('PEXPIRE', KEYS[2], 2000)
+return '0'
+"""
+
+# Move the global block deadline forward, never backward.
+#   KEYS: global block key
+#   ARGV: deadline, TTL in milliseconds
+_BLOCK_SCRIPT = """
+local current = tonumber(redis.call('GET', KEYS[1]) or '0')
+if tonumber(ARGV[1]) > current then
+    redis.call('SET', KEYS[1], ARGV[1], 'PX', ARGV[2])
+end
+return 1
+"""
+
+
+class RedisRateLimitStore:
+    """Rate-limit state shared through Redis by every process of the app.
+
+    Same interface as :class:`MemoryRateLimitStore`, so several gunicorn
+    workers and their scheduler threads draw from one budget per bucket and one
+    global window. Reservations run as a Lua script and are therefore atomic
+    across processes.
+
+    The route → bucket mapping almost never changes, so it is also memoised
+    locally to save a round trip per request. If Redis becomes unreachable the
+    store degrades to a per-process :class:`MemoryRateLimitStore` rather than
+    blocking Discord calls.
+
+    Attributes:
+        client: ``redis.Redis`` client (typically the Flask-Caching one).
+        prefix: Key prefix for every rate-limit key.
+        global_limit: Requests per second allowed across all processes.
+    """
+
+    def __init__(
+        self,
+        client,
+        prefix: str = "discord_rl:",
+        global_limit: int = DISCORD_GLOBAL_RATE_LIMIT,
+    ):
+        self.client = client
+        self.prefix = prefix
+        self.global_limit = global_limit
+        self._routes: dict[str, str] = {}
+        self._fallback = MemoryRateLimitStore(global_limit)
+        self._reserve = client.register_script(_RESERVE_SCRIPT)
+        self._block = client.register_script(_BLOCK_SCRIPT)
+
+    def _key(self, *parts: str) -> str:
+        return self.prefix + ":".join(parts)
+
+    def get_bucket(self, route: str) -> str | None:
+        """Return the bucket hash learned for a route, if any."""
+        bucket = self._routes.get(route)
+        if bucket is not None:
+            return bucket
+        try:
+            raw = self.client.hget(self._key("routes"), route)
+        except RedisError:
+            return self._fallback.get_bucket(route)
+        if raw is None:
+            return None
+        bucket = raw.decode() if isinstance(raw, bytes) else raw
+        self._routes[route] = bucket
+        return bucket
+
+    def set_bucket(self, route: str, bucket: str) -> None:
+        """Remember which bucket a route belongs to."""
+        if self._routes.get(route) == bucket:
+            return
+        self._routes[route] = bucket
+        self._fallback.set_bucket(route, bucket)
+        try:
+            self.client.hset(self._key("routes"), route, bucket)
+        except RedisError as e:
+            logger.warning(f"Could not share Discord rate-limit bucket for {route}: {e}")
+
+    def reserve(self, bucket_key: str | None, now: float) -> float:
+        """Reserve one request slot, or report how long to wait for one.
+
+        See :meth:`MemoryRateLimitStore.reserve`.
+        """
+        keys = [
+            self._key("global", "blocked"),
+            self._key("global", str(int(now))),
+            self._key("bucket", bucket_key) if bucket_key else "",
+        ]
+        try:
+            wait = self._reserve(keys=keys, args=[repr(now), self.global_limit])
+        except RedisError as e:
+            logger.warning(f"Redis rate-limit store unavailable, using local state: {e}")
+            return self._fallback.reserve(bucket_key, now)
+        return max(0.0, float(wait))
+
+    def remaining(self, bucket_key: str, now: float) -> int | None:
+        """Return a bucket's remaining budget in its current window.
+
+        See :meth:`MemoryRateLimitStore.remaining`.
+        """
+        try:
+            remaining, reset_at = self.client.hmget(
+                self._key("bucket", bucket_key), "remaining", "reset_at"
+            )
+        except RedisError:
+            return self._fallback.remaining(bucket_key, now)
+        if remaining is None or float(reset_at) <= now:
+            return None
+        return int(remaining)
+
+    def record(self, bucket_key: str, remaining: int, reset_at: float) -> None:
+        """Store the authoritative bucket state reported by Discord."""
+        self._fallback.record(bucket_key, remaining, reset_at)
+        key = self._key("bucket", bucket_key)
+        ttl = max(1, math.ceil(reset_at - time.time()) + 1)
+        try:
+            pipe = self.client.pipeline()
+            pipe.hset(key, mapping={"remaining": remaining, "reset_at": repr(reset_at)})
+            pipe.expire(key, ttl)
+            pipe.execute()
+        except RedisError as e:
+            logger.warning(f"Could not share Discord rate-limit state for {bucket_key}: {e}")
+
+    def block_global(self, until: float) -> None:
+        """Hold every request, in every process, until ``until``."""
+        self._fallback.block_global(until)
+        ttl_ms = max(1, math.ceil((until - time.time()) * 1000))
+        try:
+            self._block(keys=[self._key("global", "blocked")], args=[repr(until), ttl_ms])
+        except RedisError as e:
+            logger.warning(f"Could not share Discord global rate limit: {e}")
+
+    def snapshot(self) -> dict:
+        """Return a copy of the shared bucket state, for diagnostics.
+
+        Returns:
+            Same shape as :meth:`MemoryRateLimitStore.snapshot`.
+        """
+        try:
+            routes = self.client.hgetall(self._key("routes"))
+            buckets = {}
+            for key in self.client.scan_iter(match=self._key("bucket", "*")):
+                state = self.client.hgetall(key)
+                if not state:
+                    continue
+                name = key.decode() if isinstance(key, bytes) else key
+                buckets[name.removeprefix(self._key("bucket", ""))] = {
+                    "remaining": int(state[b"remaining"]),
+                    "reset_at": float(state[b"reset_at"]),
+                }
+        except RedisError:
+            return self._fallback.snapshot()
+        return {
+            "routes": {k.decode(): v.decode() for k, v in routes.items()},
+            "buckets": buckets,
+        }
+
+
+class RateLimiter:
+    """Delay Discord requests so they stay within the known rate limits.
+
+    Call :meth:`acquire` before each request and :meth:`update` with every
+    response's headers; :meth:`on_rate_limited` handles a 429 that still got
+    through (e.g. a bucket shared with another bot process).
+
+    Attributes:
+        store: Backing state store (per process by default, or Redis to share
+            the budget between processes).
+        max_wait: Longest a single request may be held back before giving up.
+    """
+
+    def __init__(
+        self,
+        store: MemoryRateLimitStore | RedisRateLimitStore | None = None,
+        max_wait: float = DISCORD_RATE_LIMIT_MAX_WAIT,
+        clock=time.time,
+        sleep=time.sleep,
+    ):
+        self.store = store or MemoryRateLimitStore()
+        self.max_wait = max_wait
+        self._clock = clock
+        self._sleep = sleep
+
+    def _bucket_key(self, route: str, major: str) -> str | None:
+        bucket = self.store.get_bucket(route)
+        return f"{bucket}:{major}" if bucket else None
+
+    def acquire(self, method: str, endpoint: str) -> float:
+        """Wait until a request on this route can be sent without a 429.
+
+        Args:
+            method: HTTP method.
+            endpoint: API path relative to the base URL.
+
+        Returns:
+            Total seconds spent waiting (``0.0`` when the request went straight
+            through).
+
+        Raises:
+            DiscordAPIError: With status 429 when the required wait exceeds
+                ``max_wait``, so a worker thread is never parked for long.
+        """
+        route, major = route_key(method, endpoint)
+        waited = 0.0
+        while True:
+            wait = self.store.reserve(self._bucket_key(route, major), self._clock())
+            if wait <= 0:
+                return waited
+            if waited + wait > self.max_wait:
+                raise DiscordAPIError(
+                    f"Rate limit on {route} would delay the request by {wait:.2f}s",
+                    status_code=429,
+                    response={"retry_after": wait},
+                )
+            logger.debug("Delaying %s by %.2fs to respect Discord rate limits", route, wait)
+            self._sleep(wait)
+            waited += wait
+
+    def budget(self, method: str, endpoint: str) -> int | None:
+        """Return how many requests a route may still send before its bucket resets.
+
+        Args:
+            method: HTTP method.
+            endpoint: API path relative to the base URL.
+
+        Returns:
+            The remaining budget of the route's bucket, or None when the bucket
+            is unknown or idle (its window has rolled over, so a full budget is
+            available).
+        """
+        route, major = route_key(method, endpoint)
+        bucket_key = self._bucket_key(route, major)
+        if bucket_key is None:
+            return None
+        return self.store.remaining(bucket_key, self._clock())
+
+    def update(self, method: str, endpoint: str, headers) -> None:
+        """Learn the bucket and remaining budget from a response's headers.
+
+        Args:
+            method: HTTP method of the request.
+            endpoint: API path of the request.
+            headers: Response headers (case-insensitive mapping).
+        """
+        bucket = headers.get("X-RateLimit-Bucket")
+        if not bucket:
+            return
+        route, major = route_key(method, endpoint)
+        self.store.set_bucket(route, bucket)
+        remaining = headers.get("X-RateLimit-Remaining")
+        reset_after = headers.get("X-RateLimit-Reset-After")
+        if remaining is None or reset_after is None:
+            return
+        self.store.record(f"{bucket}:{major}", int(remaining), self._clock() + float(reset_after))
+
+    def on_rate_limited(self, method: str, endpoint: str, headers, body: dict) -> float:
+        """Record a 429 so every following request waits it out.
+
+        Args:
+            method: HTTP method of the rejected request.
+            endpoint: API path of the rejected request.
+            headers: 429 response headers.
+            body: Decoded 429 response body.
+
+        Returns:
+            Seconds Discord asked us to wait before retrying.
+        """
+        retry_after = float(body.get("retry_after") or headers.get("Retry-After") or 1)
+        is_global = body.get("global") or headers.get("X-RateLimit-Global") == "true"
+        if is_global or headers.get("X-RateLimit-Scope") == "global":
+            self.store.block_global(self._clock() + retry_after)
+            return retry_after
+        bucket = headers.get("X-RateLimit-Bucket")
+        if bucket:
+            route, major = route_key(method, endpoint)
+            self.store.set_bucket(route, bucket)
+            self.store.record(f"{bucket}:{major}", 0, self._clock() + retry_after)
+        return retry_after
@@ -10,7 +10,12 @@ from website.exceptions.business import (
     SessionConflictError,
 )
 from website.exceptions.database import DatabaseError
-from website.exceptions.discord import DiscordAPIError, DiscordError
+from website.exceptions.discord import (
+    DiscordAPIError,
+    DiscordError,
+    DiscordGatewayError,
+    DiscordUnavailableError,
+)
 from website.exceptions.validation import ValidationError
 
 __all__ = [
@@ -21,6 +26,8 @@ __all__ = [
     "DatabaseError",
     "DiscordError",
     "DiscordAPIError",
+    "DiscordGatewayError",
+    "DiscordUnavailableError",
     "GameError",
     "GameFullError",
     "GameClosedError",
@@ -28,3 +28,39 @@ class DiscordAPIError(DiscordError):
             code=f"DISCORD_API_{status_code}",
             details={"status_code": status_code, "response": self.response},
         )
+
+
+class DiscordUnavailableError(DiscordAPIError):
+    """Discord call refused without being sent because the circuit breaker is open.
+
+    Reported as a 503, so every caller that already falls back on Discord API
+    errors (cached data, "Inconnu" profiles, outbox retries) handles it too.
+
+    Args:
+        retry_after: Seconds until the breaker lets a probe request through.
+    """
+
+    def __init__(self, retry_after: float):
+        self.retry_after = retry_after
+        super().__init__(
+            f"Discord is unavailable, retrying in {retry_after:.0f}s", status_code=503
+        )
+
+
+class DiscordGatewayError(DiscordError):
+    """Discord closed the Gateway connection for a reason a reconnect cannot fix.
+
+    Raised for close codes such as an invalid token or disallowed intents.
+
+    Args:
+        message: Description of the failure.
+        close_code: WebSocket close code sent by Discord.
+    """
+
+    def __init__(self, message: str, close_code: int):
+        self.close_code = close_code
+        super().__init__(
+            message=f"[{close_code}] {message}",
+            code=f"DISCORD_GATEWAY_{close_code}",
+            details={"close_code": close_code},
+        )
@@ -16,6 +16,22 @@ csrf = CSRFProtect()
 oauth = OAuth()
 
 
+def get_redis_client(app):
+    """Return the Redis client behind the Flask-Caching backend.
+
+    Lets other components (e.g. the shared Discord rate limiter) reuse the
+    cache's connection pool instead of opening their own.
+
+    Args:
+        app: Flask application on which ``cache`` was initialised.
+
+    Returns:
+        The ``redis.Redis`` client, or None when the cache is not Redis-backed.
+    """
+    backend = app.extensions.get("cache", {}).get(cache)
+    return getattr(backend, "_write_client", None)
+
+
 def _is_db_initialized():
     inspector = inspect(db.engine)
     return "user" in inspector.get_table_names()
@@ -141,6 +157,16 @@ def seed_trophies():
     _seed_trophies()
 
 
+@click.command("rebuild-leaderboards")
+@with_appcontext
+def rebuild_leaderboards():
+    """CLI command to rebuild the Redis trophy leaderboards from the database."""
+    from website.services.trophy import TrophyService
+
+    count = TrophyService().rebuild_leaderboards()
+    click.echo(f"Rebuilt {count} trophy leaderboards.")
+
+
 @click.command("setup-test-db")
 @with_appcontext
 def setup_test_db():
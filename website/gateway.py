@@ -0,0 +1,56 @@
+"""Discord Gateway worker for push-based member, role and channel updates.
+
+Run as its own process (one per deployment) with ``flask discord-gateway``.
+With ``QM_GATEWAY=1`` the scheduler then stops polling profiles and inactive
+users and keeps only a daily member sweep as a safety net (see
+:func:`~website.scheduler.start_scheduler`).
+"""
+
+import signal
+import threading
+
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+
+from website.client.gateway import Gateway
+from website.services.discord import DiscordService
+from website.services.gateway import GatewayEventService
+
+
+def run_gateway(app, stop: threading.Event | None = None) -> None:
+    """Consume Discord Gateway events and apply them until ``stop`` is set.
+
+    Each event is applied in its own application context, so every event gets
+    a fresh database session.
+
+    Args:
+        app: Flask application instance for context.
+        stop: Event that ends the worker (default: never set).
+
+    Raises:
+        DiscordGatewayError: If Discord rejects the connection for good (e.g.
+            invalid token or the "Server Members" intent is not enabled).
+    """
+    with app.app_context():
+        url = app.config.get("DISCORD_GATEWAY_URL") or DiscordService().bot.get_gateway_url()
+    events = GatewayEventService(app.config["DISCORD_GUILD_ID"])
+
+    def handle(event: str, data: dict) -> None:
+        with app.app_context():
+            events.handle(event, data)
+
+    app.logger.info(f"[Gateway] Connecting to {url}")
+    Gateway(app.config["DISCORD_BOT_TOKEN"], handle, url=url).run(stop or threading.Event())
+
+
+@click.command("discord-gateway")
+@with_appcontext
+def discord_gateway():
+    """CLI command to run the Discord Gateway worker."""
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    try:
+        run_gateway(current_app._get_current_object(), stop)
+    except KeyboardInterrupt:
+        stop.set()
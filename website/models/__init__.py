@@ -2,25 +2,33 @@
 
 from .app_log import AppLog
 from .channel import Channel
+from .co_play import CoPlay
 from .discord_message import DiscordMessage
+from .discord_outbox import DiscordOutbox
 from .game import Game
 from .game_event import GameEvent
 from .game_session import GameSession
+from .guild_member_role import GuildMember, GuildMemberRole
 from .permission_grant import PermissionGrant
 from .setting import AppSetting
 from .special_event import SpecialEvent
 from .system import System
 from .trophy import Trophy, UserTrophy
 from .user import User
+from .user_stats import UserStats
 from .vtt import Vtt
 
 __all__ = [
     "AppLog",
     "Channel",
+    "CoPlay",
     "DiscordMessage",
+    "DiscordOutbox",
     "Game",
     "GameEvent",
     "GameSession",
+    "GuildMember",
+    "GuildMemberRole",
     "PermissionGrant",
     "AppSetting",
     "SpecialEvent",
@@ -28,5 +36,6 @@ __all__ = [
     "Trophy",
     "UserTrophy",
     "User",
+    "UserStats",
     "Vtt",
 ]
@@ -0,0 +1,37 @@
+"""CoPlay model: who-played-with-whom edges behind the dashboard network."""
+
+from website.extensions import db
+
+
+class CoPlay(db.Model):
+    """How often one user shared a table with another, kept up to date by the service layer.
+
+    A directed edge of the co-play graph, stored once per direction so a
+    user's whole network is one primary-key range scan. Like
+    :class:`UserStats`, it is a read model over non-draft games and their
+    registrations, recomputed in the background after any change to them (see
+    :meth:`StatsService.refresh_stale`).
+
+    Attributes:
+        user_id: Discord user ID whose network the edge belongs to.
+        mate_id: Discord user ID of the other user.
+        games_together: Games of the user (either role) the mate is registered in.
+        gm_games: Games the user is registered in that the mate runs as GM.
+        last_played: Start of the latest session of a game they share that
+            has started (None: none played yet).
+    """
+
+    __tablename__ = "co_play"
+
+    user_id = db.Column(
+        db.String(), db.ForeignKey("user.id", ondelete="CASCADE"), primary_key=True
+    )
+    mate_id = db.Column(
+        db.String(), db.ForeignKey("user.id", ondelete="CASCADE"), primary_key=True, index=True
+    )
+    games_together = db.Column(db.Integer, nullable=False, default=0)
+    gm_games = db.Column(db.Integer, nullable=False, default=0)
+    last_played = db.Column(db.DateTime, nullable=True)
+
+    def __repr__(self):
+        return f"<CoPlay {self.user_id} -> {self.mate_id}>"
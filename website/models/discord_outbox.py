@@ -0,0 +1,76 @@
+"""DiscordOutbox model queuing Discord side effects of game changes."""
+
+from datetime import datetime, timezone
+
+from website.extensions import db
+from website.models.base import SerializableMixin
+
+
+class DiscordOutbox(db.Model, SerializableMixin):
+    """A pending Discord operation, written in the same transaction as its cause.
+
+    Services enqueue an operation instead of calling Discord from the request
+    thread; ``DiscordOutboxService.dispatch_pending`` sends it later with
+    retries. Operations of the same game are sent strictly in ``id`` order,
+    except the :attr:`NON_BLOCKING_ACTIONS`, which never hold back later ones.
+
+    ``game_id`` is intentionally *not* a foreign key: the clean-up operations of
+    an archived game must still run after the game row is deleted, so every ID
+    they need is copied into ``payload``.
+
+    Attributes:
+        id: Primary key (also the per-game send order).
+        game_id: Game the operation belongs to (no FK on purpose).
+        action: Operation name (see ``DiscordOutboxService.ACTIONS``).
+        payload: JSON arguments of the operation.
+        status: ``pending``, ``done`` or ``dead`` (gave up after retries).
+        attempts: Number of send attempts so far.
+        next_attempt_at: Earliest time the operation may be (re)tried (UTC).
+        last_error: Error message of the latest failed attempt.
+        created_at: When the operation was enqueued (UTC).
+        processed_at: When the operation was sent or dead-lettered (UTC).
+    """
+
+    __tablename__ = "discord_outbox"
+
+    STATUSES = ("pending", "done", "dead")
+
+    #: Debounced actions that later operations do not depend on: they render
+    #: the game's current state when they are sent, so they must not block the
+    #: game's later operations while they wait (they still wait for the earlier
+    #: ones). ``sync_access`` is debounced too but is not listed: the player
+    #: embeds queued after it must not ping players who cannot see the channel.
+    NON_BLOCKING_ACTIONS = ("refresh_annonce",)
+
+    _exclude_fields = []
+    _relationship_fields = []
+
+    id = db.Column(db.Integer, primary_key=True)
+    game_id = db.Column(db.Integer, nullable=True)
+    action = db.Column(db.String(32), nullable=False)
+    payload = db.Column(db.JSON, nullable=False, default=dict)
+    status = db.Column(db.String(16), nullable=False, default="pending")
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    next_attempt_at = db.Column(
+        db.DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        nullable=False,
+    )
+    last_error = db.Column(db.Text, nullable=True)
+    created_at = db.Column(
+        db.DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        nullable=False,
+    )
+    processed_at = db.Column(db.DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        db.Index("ix_discord_outbox_status_next_attempt", "status", "next_attempt_at"),
+        db.Index("ix_discord_outbox_game_id", "game_id", "id"),
+    )
+
+    def __repr__(self):
+        return (
+            f"<DiscordOutbox id={self.id} game={self.game_id} "
+            f"action='{self.action}' status='{self.status}'>"
+        )
@@ -0,0 +1,62 @@
+"""Guild membership models: local copy of the guild's members and their roles."""
+
+from datetime import datetime, timezone
+
+from website.extensions import db
+from website.models.base import SerializableMixin
+
+
+class GuildMember(db.Model, SerializableMixin):
+    """A guild member whose roles are recorded in ``guild_member_role``.
+
+    Marks the member as indexed, so a member holding no role (no
+    ``guild_member_role`` row) is told apart from one the index has not seen
+    yet, which is looked up on Discord instead. Written by the member sweep and
+    the Gateway member events; like :class:`GuildMemberRole`, ``user_id`` is
+    not a foreign key.
+
+    Attributes:
+        user_id: Discord user ID of the member.
+        indexed_at: When the member's full role list was last recorded (UTC).
+    """
+
+    __tablename__ = "guild_member"
+
+    _exclude_fields = []
+    _relationship_fields = []
+
+    user_id = db.Column(db.String(), primary_key=True)
+    indexed_at = db.Column(
+        db.DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        nullable=False,
+    )
+
+    def __repr__(self):
+        return f"<GuildMember {self.user_id}>"
+
+
+class GuildMemberRole(db.Model, SerializableMixin):
+    """One Discord role held by one guild member.
+
+    A local index of the guild's role memberships, so authorization checks
+    (GM, admin, player, role-based permission grants) read the database
+    instead of calling Discord. It is rebuilt by the member sweep and updated
+    when the app grants or revokes a role. ``user_id`` is intentionally not a
+    foreign key: members who never used the app are indexed too.
+
+    Attributes:
+        user_id: Discord user ID of the member.
+        role_id: Discord role ID.
+    """
+
+    __tablename__ = "guild_member_role"
+
+    _exclude_fields = []
+    _relationship_fields = []
+
+    user_id = db.Column(db.String(), primary_key=True)
+    role_id = db.Column(db.String(), primary_key=True)
+
+    def __repr__(self):
+        return f"<GuildMemberRole {self.user_id}:{self.role_id}>"
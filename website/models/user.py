@@ -3,39 +3,99 @@
 import re
 from datetime import datetime
 
-import requests
-from flask import current_app, has_request_context, request
+from flask import current_app, has_app_context
 from sqlalchemy import orm
 
 from config.constants import (
     AVATAR_BASE_URL,
     CACHE_USER_PROFILE_404_TIMEOUT,
+    CACHE_USER_PROFILE_SOFT_TIMEOUT,
     CACHE_USER_PROFILE_TIMEOUT,
+    CACHE_USER_ROLES_SOFT_TIMEOUT,
+    CACHE_USER_ROLES_TIMEOUT,
     DEFAULT_AVATAR,
+    GUILD_AVATAR_URL,
 )
 from website.bot import get_bot
 from website.exceptions import DiscordAPIError, ValidationError
 from website.extensions import cache, db
 from website.models.base import SerializableMixin
+from website.utils.single_flight import cached_fetch
 
 
-def _resolve_avatar_url(user: dict, user_id: str) -> str:
-    """Resolve a Discord avatar URL, falling back to the default."""
-    avatar_hash = user.get("avatar")
-    if not avatar_hash:
-        return DEFAULT_AVATAR
-    potential_url = AVATAR_BASE_URL.format(user_id, avatar_hash)
-    try:
-        if requests.head(potential_url).status_code == 200:
-            return potential_url
-    except requests.RequestException:
-        pass
+def build_avatar_url(
+    user_id: str,
+    avatar_hash: str | None,
+    guild_id: str | None = None,
+    guild_avatar_hash: str | None = None,
+) -> str:
+    """Build a member's avatar URL from the hashes in their Discord payload.
+
+    The server-specific avatar wins over the account avatar; animated hashes
+    (``a_`` prefix) point to the GIF. No request is made: a hash taken from a
+    live payload always resolves on the CDN.
+
+    Args:
+        user_id: Discord user ID.
+        avatar_hash: Account avatar hash (``user.avatar``), if any.
+        guild_id: Guild ID, required to use the server avatar.
+        guild_avatar_hash: Server avatar hash (member ``avatar``), if any.
+
+    Returns:
+        The CDN URL, or ``DEFAULT_AVATAR`` when the member has no avatar.
+    """
+    if guild_avatar_hash and guild_id:
+        ext = "gif" if guild_avatar_hash.startswith("a_") else "png"
+        return GUILD_AVATAR_URL.format(
+            guild_id=guild_id, user_id=user_id, hash=guild_avatar_hash, ext=ext
+        )
+    if avatar_hash:
+        ext = "gif" if avatar_hash.startswith("a_") else "png"
+        return AVATAR_BASE_URL.format(user_id=user_id, hash=avatar_hash, ext=ext)
     return DEFAULT_AVATAR
 
 
+def member_display_name(member: dict) -> str:
+    """Return a guild member's display name (server nick, global name, then username).
+
+    Args:
+        member: Guild member dict from the Discord API.
+
+    Returns:
+        The name to display, or "Inconnu" when Discord provides none.
+    """
+    if member.get("nick"):
+        return member["nick"]
+    user = member.get("user") or {}
+    return user.get("global_name") or user.get("username") or "Inconnu"
+
+
+def profile_from_member(member: dict, guild_id: str | None = None) -> dict:
+    """Build a profile dict (as cached by ``get_user_profile``) from a member payload.
+
+    Args:
+        member: Guild member dict from the Discord API.
+        guild_id: Guild the member was fetched from (enables server avatars).
+
+    Returns:
+        Dict with 'name', 'avatar' and 'username' keys.
+    """
+    user = member["user"]
+    return {
+        "name": member_display_name(member),
+        "avatar": build_avatar_url(user["id"], user.get("avatar"), guild_id, member.get("avatar")),
+        "username": user.get("username"),
+    }
+
+
 def get_user_profile(user_id, force_refresh=False):
     """Return parsed profile info (name and avatar URL), cached for 24h.
 
+    Concurrent misses for the same user cost a single Discord call, and a
+    profile older than ``CACHE_USER_PROFILE_SOFT_TIMEOUT`` is refreshed by one
+    caller while the others keep the cached copy (see
+    :func:`~website.utils.single_flight.cached_fetch`).
+
     Args:
         user_id: Discord user ID.
         force_refresh: If True, bypass cache and fetch from Discord.
@@ -43,31 +103,30 @@ def get_user_profile(user_id, force_refresh=False):
     Returns:
         Dict with 'name' and 'avatar' keys.
     """
-    cache_key = f"user_profile_{user_id}"
+    return cached_fetch(
+        f"user_profile_{user_id}",
+        lambda: _fetch_user_profile(user_id),
+        soft_timeout=CACHE_USER_PROFILE_SOFT_TIMEOUT,
+        force=force_refresh,
+    )
 
-    if not force_refresh:
-        cached = cache.get(cache_key)
-        if cached:
-            return cached
 
+def _fetch_user_profile(user_id):
+    """Fetch a profile from Discord for :func:`get_user_profile`.
+
+    Args:
+        user_id: Discord user ID.
+
+    Returns:
+        Tuple of the profile dict and its cache timeout (None for transient
+        errors, which are not cached).
+    """
     bot = get_bot()
     try:
         user_data = bot.get_user(user_id)
         if not user_data or "user" not in user_data:
             raise ValueError(f"Invalid user data for {user_id}: {user_data}")
-
-        user = user_data["user"]
-
-        if user_data.get("nick"):
-            name = user_data["nick"]
-        else:
-            name = user.get("global_name") or user.get("username") or "Inconnu"
-
-        avatar_url = _resolve_avatar_url(user, user_id)
-
-        profile = {"name": name, "avatar": avatar_url, "username": user.get("username")}
-        cache.set(cache_key, profile, timeout=CACHE_USER_PROFILE_TIMEOUT)
-        return profile
+        return profile_from_member(user_data, bot.guild_id), CACHE_USER_PROFILE_TIMEOUT
 
     except DiscordAPIError as e:
         current_app.logger.warning(f"[get_user_profile] Discord API error for user {user_id}: {e}")
@@ -80,8 +139,8 @@ def get_user_profile(user_id, force_refresh=False):
         }
         if e.status_code == 404:
             fallback["not_found"] = True
-            cache.set(cache_key, fallback, timeout=CACHE_USER_PROFILE_404_TIMEOUT)
-        return fallback
+            return fallback, CACHE_USER_PROFILE_404_TIMEOUT
+        return fallback, None
 
     except Exception as e:
         current_app.logger.warning(f"[get_user_profile] Failed for user {user_id}: {e}")
@@ -91,28 +150,62 @@ def get_user_profile(user_id, force_refresh=False):
             "username": None,
             "raw": None,
             "error": True,
-        }
+        }, None
+
+
+def hydrate_profiles(users) -> None:
+    """Attach Discord avatars to users in one cache round-trip.
+
+    Users already hydrated are skipped. Cached profiles are read with a single
+    ``get_many`` and nothing is fetched from Discord: users without a cached
+    profile keep the default avatar. They have never been refreshed, so they
+    head the profile refresh queue and get a stored ``avatar_url`` on its next
+    run. Names are read from the ``user`` table, which the member sweep keeps
+    in sync with Discord.
+
+    Args:
+        users: Iterable of User instances.
+    """
+    pending = {}
+    for user in users:
+        if "_avatar" not in user.__dict__:
+            user._avatar = DEFAULT_AVATAR
+            pending.setdefault(user.id, []).append(user)
+    if not pending or not has_app_context():
+        return
+
+    ids = list(pending)
+    try:
+        cached = cache.get_many(*(f"user_profile_{user_id}" for user_id in ids))
+    except Exception:  # noqa: BLE001 - cache backend best-effort
+        cached = [None] * len(ids)
+    profiles = {user_id: profile for user_id, profile in zip(ids, cached) if profile}
+
+    for user_id, same_id_users in pending.items():
+        profile = profiles.get(user_id)
+        if not profile or profile.get("error"):
+            continue
+        for user in same_id_users:
+            user._avatar = profile["avatar"]
 
 
 def get_user_roles(user_id):
     """Return Discord roles for a user, cached for 5 minutes.
 
+    Served single-flight with stale-while-revalidate, like
+    :func:`get_user_profile`.
+
     Args:
         user_id: Discord user ID.
 
     Returns:
         List of role ID strings.
     """
-    cache_key = f"user_roles_{user_id}"
-    cached = cache.get(cache_key)
-    if cached:
-        return cached
 
-    bot = get_bot()
-    user_data = bot.get_user(user_id)
-    roles = user_data.get("roles", [])
-    cache.set(cache_key, roles, timeout=300)  # 5 minutes
-    return roles
+    def fetch():
+        return get_bot().get_user(user_id).get("roles", []), CACHE_USER_ROLES_TIMEOUT
+
+    return cached_fetch(f"user_roles_{user_id}", fetch, soft_timeout=CACHE_USER_ROLES_SOFT_TIMEOUT)
 
 
 class User(db.Model, SerializableMixin):
@@ -122,6 +215,9 @@ class User(db.Model, SerializableMixin):
         id: Discord user ID (17-21 digit string).
         name: Display name (nick or global_name), refreshed from Discord.
         username: Stable Discord username, used for slug generation.
+        not_player_as_of: When the user was found to have left the guild.
+        avatar_url: Avatar URL from the last profile refresh (None until then).
+        profile_refreshed_at: When name/username/avatar were last synced (UTC).
         games_gm: Games where this user is the GM.
         trophies: User trophy associations.
     """
@@ -135,9 +231,20 @@ class User(db.Model, SerializableMixin):
     name = db.Column(db.String(), nullable=False, index=True)
     username = db.Column(db.String(), nullable=True)
     not_player_as_of = db.Column(db.DateTime, nullable=True)
+    avatar_url = db.Column(db.String(), nullable=True)
+    profile_refreshed_at = db.Column(db.DateTime(timezone=True), nullable=True)
     games_gm = db.relationship("Game", back_populates="gm")
     trophies = db.relationship("UserTrophy", back_populates="user", cascade="all, delete-orphan")
 
+    # Profile refresh queue: active users, never-refreshed first, then oldest.
+    __table_args__ = (
+        db.Index(
+            "ix_user_profile_refresh_queue",
+            profile_refreshed_at.asc().nulls_first(),
+            postgresql_where=not_player_as_of.is_(None),
+        ),
+    )
+
     def __init__(self, id, name="Inconnu", username=None):
         if not re.fullmatch(r"\d{17,21}", id):
             raise ValidationError("Invalid Discord UID.", field="id", details={"value": id})
@@ -179,54 +286,64 @@ class User(db.Model, SerializableMixin):
             )
         return summary
 
+    @property
+    def avatar(self) -> str:
+        """Avatar URL, read from the row once the profile has been refreshed.
+
+        Users never refreshed yet (no ``avatar_url``) are hydrated on first
+        access, together with every other such user loaded in the session, in
+        one batch (see :func:`hydrate_profiles`). Peers whose row is expired
+        (e.g. after a commit) are left out, as checking them would reload each
+        one from the database.
+        """
+        if "_avatar" in self.__dict__:
+            return self._avatar
+        if self.avatar_url:
+            return self.avatar_url
+        session = orm.object_session(self)
+        peers = (
+            [
+                obj
+                for obj in session.identity_map.values()
+                if isinstance(obj, User) and "avatar_url" in obj.__dict__ and not obj.avatar_url
+            ]
+            if session is not None
+            else []
+        )
+        hydrate_profiles([self, *peers])
+        return self._avatar
+
+    @avatar.setter
+    def avatar(self, value: str) -> None:
+        self._avatar = value
+
     @orm.reconstructor
     def init_on_load(self):
-        """Initialize user data after loading from the database.
+        """Initialize the non-persisted attributes after loading from the database.
 
-        Skips expensive Discord lookups when in admin context.
+        Does no I/O: profile data is hydrated lazily by :attr:`avatar`, and
+        roles by :meth:`refresh_roles`.
         """
-        self.avatar = getattr(self, "avatar", DEFAULT_AVATAR)
         self.is_gm = False
         self.is_admin = False
         self.is_player = False
         self.permissions = set()
 
-        if not has_request_context():
-            profile = get_user_profile(self.id)
-            self.name = profile["name"]
-            self.avatar = profile["avatar"]
-            if profile.get("username") and not self.username:
-                self.username = profile["username"]
-            return
-
-        if request.path.startswith("/admin"):
-            if not getattr(self, "name", None):
-                self.name = "Inconnu"
-            return
-
-        try:
-            profile = get_user_profile(self.id)
-            self.name = profile["name"]
-            self.avatar = profile["avatar"]
-            if profile.get("username") and not self.username:
-                self.username = profile["username"]
-        except Exception:
-            if not getattr(self, "name", None):
-                self.name = "Inconnu"
-            self.avatar = DEFAULT_AVATAR
-
     def refresh_roles(self):
-        """Refresh role info from Discord (cached for 5 minutes).
+        """Refresh role info from the local guild role index.
 
-        Also resolves the user's granular RBAC permission set (admins
-        implicitly hold every capability).
+        Roles are read from ``guild_member_role`` (see
+        :meth:`UserService.get_role_ids`), falling back to Discord for members
+        not indexed yet. Also resolves the user's granular RBAC permission set
+        (admins implicitly hold every capability).
         """
         from website.services.permission import PermissionService
         from website.services.setting import SettingsService
+        from website.services.user import UserService
 
         settings = SettingsService()
         try:
-            roles = get_user_roles(self.id)
+            roles = UserService().get_role_ids(self.id)
             self.is_gm = settings.get("DISCORD_GM_ROLE_ID") in roles
             self.is_admin = settings.get("DISCORD_ADMIN_ROLE_ID") in roles
             self.is_player = settings.get("DISCORD_PLAYER_ROLE_ID") in roles
@@ -0,0 +1,64 @@
+"""UserStats model: per-user read model behind the dashboard statistics."""
+
+from sqlalchemy.dialects.postgresql import JSONB
+
+from website.extensions import db
+
+
+class UserStats(db.Model):
+    """All-time play statistics of one user, kept up to date by the service layer.
+
+    A read model: every figure can be recomputed from games, sessions,
+    registrations and trophies. Any change to them flags the row in its own
+    transaction (see :meth:`StatsService.mark_stale`) and a scheduler job
+    recomputes it shortly after, so the dashboard reads one row instead of the
+    user's whole history and writes never pay for that history. Only non-draft games
+    count; a game the user runs counts under the GM role only, even if they
+    also registered as a player.
+
+    Attributes:
+        user_id: Discord user ID (primary key).
+        gm_games: Games run as GM.
+        player_games: Games played in (other than the user's own).
+        oneshot_games: One-shots, in either role.
+        campaign_games: Campaigns, in either role.
+        gm_sessions: Sessions of the games run as GM.
+        player_sessions: Sessions of the games played in.
+        oneshot_sessions: Sessions of one-shots, in either role.
+        campaign_sessions: Sessions of campaigns, in either role.
+        gm_seconds: Time played as GM (sessions that had ended when computed).
+        player_seconds: Time played as a player (same).
+        badges: Trophies held, counting quantities.
+        systems: ``{"gm" | "player": {system_id: [sessions, games]}}`` tallies.
+        months: ``{"YYYY-MM": [sessions, games]}`` tallies, by session start.
+        valid_until: End of the user's next unfinished session; the played
+            times are stale once it has passed (None: no session pending). Set
+            to the time of the change when the row is flagged for recomputation.
+        updated_at: Time the row was last computed.
+    """
+
+    __tablename__ = "user_stats"
+
+    user_id = db.Column(
+        db.String(), db.ForeignKey("user.id", ondelete="CASCADE"), primary_key=True
+    )
+    gm_games = db.Column(db.Integer, nullable=False, default=0)
+    player_games = db.Column(db.Integer, nullable=False, default=0)
+    oneshot_games = db.Column(db.Integer, nullable=False, default=0)
+    campaign_games = db.Column(db.Integer, nullable=False, default=0)
+    gm_sessions = db.Column(db.Integer, nullable=False, default=0)
+    player_sessions = db.Column(db.Integer, nullable=False, default=0)
+    oneshot_sessions = db.Column(db.Integer, nullable=False, default=0)
+    campaign_sessions = db.Column(db.Integer, nullable=False, default=0)
+    gm_seconds = db.Column(db.Integer, nullable=False, default=0)
+    player_seconds = db.Column(db.Integer, nullable=False, default=0)
+    badges = db.Column(db.Integer, nullable=False, default=0)
+    systems = db.Column(JSONB, nullable=False, default=dict)
+    months = db.Column(JSONB, nullable=False, default=dict)
+    valid_until = db.Column(db.DateTime, nullable=True)
+    updated_at = db.Column(db.DateTime, nullable=False)
+
+    __table_args__ = (db.Index("ix_user_stats_valid_until", "valid_until"),)
+
+    def __repr__(self):
+        return f"<UserStats {self.user_id}>"
@@ -3,28 +3,36 @@
 from website.repositories.app_log import AppLogRepository
 from website.repositories.base import BaseRepository
 from website.repositories.channel import ChannelRepository
+from website.repositories.co_play import CoPlayRepository
 from website.repositories.discord_message import DiscordMessageRepository
+from website.repositories.discord_outbox import DiscordOutboxRepository
 from website.repositories.game import GameRepository
 from website.repositories.game_event import GameEventRepository
 from website.repositories.game_session import GameSessionRepository
+from website.repositories.guild_member_role import GuildMemberRoleRepository
 from website.repositories.permission_grant import PermissionGrantRepository
 from website.repositories.setting import SettingRepository
 from website.repositories.special_event import SpecialEventRepository
 from website.repositories.system import SystemRepository
 from website.repositories.trophy import TrophyRepository
 from website.repositories.user import UserRepository
+from website.repositories.user_stats import UserStatsRepository
 from website.repositories.vtt import VttRepository
 
 __all__ = [
     "AppLogRepository",
     "BaseRepository",
     "DiscordMessageRepository",
+    "DiscordOutboxRepository",
     "SystemRepository",
     "VttRepository",
     "ChannelRepository",
+    "CoPlayRepository",
     "GameEventRepository",
     "UserRepository",
+    "UserStatsRepository",
     "GameSessionRepository",
+    "GuildMemberRoleRepository",
     "PermissionGrantRepository",
     "SettingRepository",
     "SpecialEventRepository",
@@ -0,0 +1,136 @@
+"""CoPlay repository: who-played-with-whom read model."""
+
+from datetime import datetime
+
+from sqlalchemy import delete, false, func, insert, literal, or_, select, true, union, union_all
+
+from config.constants import GAME_STATUS_DRAFT
+from website.models import CoPlay, Game, GameSession, User
+from website.models.game import players_table
+from website.repositories.base import BaseRepository
+
+
+class CoPlayRepository(BaseRepository[CoPlay]):
+    """Data access for the co-play edges (query-only, no commits)."""
+
+    model_class = CoPlay
+
+    def find_network(self, user_id: str) -> list:
+        """List a user's edges with the other user's name and avatar, as plain rows.
+
+        Args:
+            user_id: Discord user ID.
+
+        Returns:
+            Rows with ``mate_id``, ``name``, ``avatar_url``, ``games_together``,
+            ``gm_games`` and ``last_played`` attributes, most shared games first.
+        """
+        return self._network_query(user_id).all()
+
+    def find_table_mates(self, user_id: str, limit: int) -> list:
+        """List the users a user most often shared a table with, as plain rows.
+
+        Args:
+            user_id: Discord user ID.
+            limit: Maximum number of rows.
+
+        Returns:
+            Rows as in :meth:`find_network`, restricted to table-mates (users
+            registered in one of the user's games), most shared games first,
+            then most recently played with.
+        """
+        return (
+            self._network_query(user_id)
+            .filter(CoPlay.games_together > 0)
+            .order_by(None)
+            .order_by(
+                CoPlay.games_together.desc(), CoPlay.last_played.desc().nulls_last(), User.name
+            )
+            .limit(limit)
+            .all()
+        )
+
+    def _network_query(self, user_id: str):
+        return (
+            self.session.query(
+                CoPlay.mate_id,
+                User.name,
+                User.avatar_url,
+                CoPlay.games_together,
+                CoPlay.gm_games,
+                CoPlay.last_played,
+            )
+            .join(User, User.id == CoPlay.mate_id)
+            .filter(CoPlay.user_id == user_id)
+            .order_by(CoPlay.games_together.desc(), User.name)
+        )
+
+    def replace_for_users(self, user_ids: list[str], now: datetime) -> None:
+        """Recompute every edge touching the given users from their games.
+
+        Only the games of these users are read, so the cost depends on their
+        history, not on the size of the tables.
+
+        Args:
+            user_ids: Users whose games, sessions or registrations changed.
+            now: Current time; only sessions started by then set ``last_played``.
+        """
+        published = Game.status != GAME_STATUS_DRAFT
+        not_own = players_table.c.player_id != Game.gm_id
+        affected = union(
+            select(Game.id).where(Game.gm_id.in_(user_ids)),
+            select(players_table.c.game_id).where(players_table.c.player_id.in_(user_ids)),
+        ).subquery()
+        in_affected = Game.id.in_(select(affected.c.id))
+
+        # (user, game) for the non-draft affected games: the GM, then the players.
+        involved = union_all(
+            select(Game.gm_id.label("user_id"), Game.id.label("game_id")).where(
+                published, in_affected
+            ),
+            select(players_table.c.player_id, players_table.c.game_id)
+            .join(Game, Game.id == players_table.c.game_id)
+            .where(published, in_affected, not_own),
+        ).subquery()
+        mates = players_table.alias("mates")
+        pairs = union_all(
+            # Registered players of each of the user's games.
+            select(
+                involved.c.user_id,
+                mates.c.player_id.label("mate_id"),
+                involved.c.game_id,
+                literal(False).label("via_gm"),
+            )
+            .join(mates, mates.c.game_id == involved.c.game_id)
+            .where(mates.c.player_id != involved.c.user_id),
+            # The GM of each game the user is registered in.
+            select(players_table.c.player_id, Game.gm_id, Game.id, literal(True))
+            .join(Game, Game.id == players_table.c.game_id)
+            .where(published, in_affected, not_own),
+        ).subquery()
+
+        games = func.count(func.distinct(pairs.c.game_id))
+        edges = (
+            select(
+                pairs.c.user_id,
+                pairs.c.mate_id,
+                games.filter(pairs.c.via_gm == false()),
+                games.filter(pairs.c.via_gm == true()),
+                func.max(GameSession.start),
+            )
+            .outerjoin(
+                GameSession,
+                (GameSession.game_id == pairs.c.game_id) & (GameSession.start <= now),
+            )
+            .where(or_(pairs.c.user_id.in_(user_ids), pairs.c.mate_id.in_(user_ids)))
+            .group_by(pairs.c.user_id, pairs.c.mate_id)
+        )
+
+        self.session.execute(
+            delete(CoPlay).where(or_(CoPlay.user_id.in_(user_ids), CoPlay.mate_id.in_(user_ids)))
+        )
+        self.session.execute(
+            insert(CoPlay).from_select(
+                ["user_id", "mate_id", "games_together", "gm_games", "last_played"], edges
+            )
+        )
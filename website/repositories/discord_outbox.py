@@ -0,0 +1,123 @@
+"""DiscordOutbox repository for deferred Discord operation data access."""
+
+from datetime import datetime
+
+from sqlalchemy import exists, func
+from sqlalchemy.orm import aliased
+
+from website.models import DiscordOutbox
+from website.repositories.base import BaseRepository
+
+
+class DiscordOutboxRepository(BaseRepository[DiscordOutbox]):
+    """Repository for DiscordOutbox entities."""
+
+    model_class = DiscordOutbox
+
+    def base_query(self):
+        """Return all operations ordered newest-first."""
+        return self.session.query(DiscordOutbox).order_by(DiscordOutbox.id.desc())
+
+    def lock_next_due(self, now: datetime) -> DiscordOutbox | None:
+        """Lock the oldest operation that may be sent now.
+
+        An operation is due when it is pending, its ``next_attempt_at`` has
+        passed, and no older operation of the same game is still pending, so a
+        game's operations are always sent in order. Older pending
+        :attr:`~DiscordOutbox.NON_BLOCKING_ACTIONS` do not count: a debounced
+        announcement refresh renders the game when it is sent, so it never
+        holds back the operations queued after it. Rows locked by
+        another dispatcher are skipped (``FOR UPDATE SKIP LOCKED``).
+
+        Args:
+            now: Current UTC time.
+
+        Returns:
+            The locked operation, or None when nothing is due.
+        """
+        earlier = aliased(DiscordOutbox)
+        blocked = exists().where(
+            earlier.game_id == DiscordOutbox.game_id,
+            earlier.status == "pending",
+            earlier.id < DiscordOutbox.id,
+            earlier.action.notin_(DiscordOutbox.NON_BLOCKING_ACTIONS),
+        )
+        return (
+            self.session.query(DiscordOutbox)
+            .filter(
+                DiscordOutbox.status == "pending",
+                DiscordOutbox.next_attempt_at <= now,
+                ~blocked,
+            )
+            .order_by(DiscordOutbox.id)
+            .with_for_update(skip_locked=True)
+            .first()
+        )
+
+    def find_pending(self, game_id: int, action: str | None = None) -> list[DiscordOutbox]:
+        """Return a game's pending operations in send order.
+
+        Args:
+            game_id: Game ID.
+            action: Restrict to this action name, when given.
+
+        Returns:
+            List of pending DiscordOutbox instances.
+        """
+        query = self.session.query(DiscordOutbox).filter_by(game_id=game_id, status="pending")
+        if action:
+            query = query.filter_by(action=action)
+        return query.order_by(DiscordOutbox.id).all()
+
+    def lock_unclaimed(self, game_id: int, action: str) -> DiscordOutbox | None:
+        """Lock a game's pending operation that no dispatcher has picked up yet.
+
+        Rows currently claimed by a dispatcher are skipped (``SKIP LOCKED``),
+        as are operations already attempted, whose payload may have been sent.
+
+        Args:
+            game_id: Game ID.
+            action: Action name.
+
+        Returns:
+            The locked operation, or None if there is none.
+        """
+        return (
+            self.session.query(DiscordOutbox)
+            .filter_by(game_id=game_id, action=action, status="pending", attempts=0)
+            .order_by(DiscordOutbox.id.desc())
+            .with_for_update(skip_locked=True)
+            .first()
+        )
+
+    def count_by_status(self) -> dict[str, int]:
+        """Return the number of operations per status.
+
+        Returns:
+            Dict mapping each status to its row count (missing statuses are 0).
+        """
+        rows = (
+            self.session.query(DiscordOutbox.status, func.count(DiscordOutbox.id))
+            .group_by(DiscordOutbox.status)
+            .all()
+        )
+        counts = dict.fromkeys(DiscordOutbox.STATUSES, 0)
+        counts.update(dict(rows))
+        return counts
+
+    def prune(self, before: datetime) -> int:
+        """Bulk-delete sent operations processed before the given timestamp.
+
+        Dead-lettered operations are kept for inspection.
+
+        Args:
+            before: Operations sent strictly earlier are deleted.
+
+        Returns:
+            Number of deleted rows (not committed — the service commits).
+        """
+        return (
+            self.session.query(DiscordOutbox)
+            .filter(DiscordOutbox.status == "done", DiscordOutbox.processed_at < before)
+            .delete(synchronize_session=False)
+        )
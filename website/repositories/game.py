@@ -6,8 +6,9 @@ from typing import Optional
 from sqlalchemy import and_, case, func, or_
 from sqlalchemy.orm import joinedload, subqueryload
 
-from config.constants import GAME_STATUS_DRAFT
-from website.models import Game, User
+from config.constants import GAME_STATUS_DRAFT, GAME_TYPE_CAMPAIGN, GAME_TYPE_ONESHOT
+from website.models import Game, GameSession, User
+from website.models.game import players_table
 from website.repositories.base import BaseRepository
 
 
@@ -88,79 +89,108 @@ class GameRepository(BaseRepository[Game]):
         """
         return self.session.query(Game).join(Game.players).filter(User.id == player_id).all()
 
-    def find_by_gm_with_relations(self, gm_id: str) -> list[Game]:
-        """Return all games GMed by a user, with stats relations eager-loaded.
+    def global_totals(self, now: datetime) -> dict:
+        """Aggregate the headline counts of every non-draft game in one query.
 
-        Loads system, vtt, sessions and players to avoid N+1 queries when
-        aggregating dashboard statistics. Draft games are excluded so unpublished
-        announcements never contribute to statistics.
+        Sessions and registrations are pre-counted per game in two grouped
+        subqueries, then summed over the games with ``FILTER`` clauses, so no
+        game, session or player row is loaded.
 
         Args:
-            gm_id: GM user ID.
+            now: Current time; only sessions that ended by then count as played.
 
         Returns:
-            List of non-draft games GMed by this user.
+            Dict of integers: ``games``, ``oneshot_games``, ``campaign_games``,
+            ``sessions``, ``oneshot_sessions``, ``campaign_sessions``,
+            ``registrations`` (player slots), ``player_sessions`` (sessions
+            times players, per game), ``ended_sessions`` and ``ended_seconds``.
         """
-        return (
-            self.session.query(Game)
-            .options(
-                joinedload(Game.system),
-                joinedload(Game.vtt),
-                subqueryload(Game.sessions),
-                subqueryload(Game.players),
+        ended = GameSession.end <= now
+        sessions = (
+            self.session.query(
+                GameSession.game_id.label("game_id"),
+                func.count().label("n"),
+                func.count().filter(ended).label("ended"),
+                func.sum(func.extract("epoch", GameSession.end - GameSession.start))
+                .filter(ended)
+                .label("ended_seconds"),
             )
-            .filter(Game.gm_id == gm_id, Game.status != GAME_STATUS_DRAFT)
-            .all()
+            .group_by(GameSession.game_id)
+            .subquery()
         )
+        players = (
+            self.session.query(players_table.c.game_id.label("game_id"), func.count().label("n"))
+            .group_by(players_table.c.game_id)
+            .subquery()
+        )
+        n_sessions = func.coalesce(sessions.c.n, 0)
+        n_players = func.coalesce(players.c.n, 0)
+        oneshot = Game.type == GAME_TYPE_ONESHOT
+        campaign = Game.type == GAME_TYPE_CAMPAIGN
+        columns = {
+            "games": func.count(),
+            "oneshot_games": func.count().filter(oneshot),
+            "campaign_games": func.count().filter(campaign),
+            "sessions": func.sum(n_sessions),
+            "oneshot_sessions": func.sum(n_sessions).filter(oneshot),
+            "campaign_sessions": func.sum(n_sessions).filter(campaign),
+            "registrations": func.sum(n_players),
+            "player_sessions": func.sum(n_sessions * n_players),
+            "ended_sessions": func.sum(sessions.c.ended),
+            "ended_seconds": func.sum(sessions.c.ended_seconds),
+        }
+        row = (
+            self.session.query(*(func.coalesce(c, 0).label(k) for k, c in columns.items()))
+            .select_from(Game)
+            .outerjoin(sessions, sessions.c.game_id == Game.id)
+            .outerjoin(players, players.c.game_id == Game.id)
+            .filter(Game.status != GAME_STATUS_DRAFT)
+            .one()
+        )
+        return {key: int(value) for key, value in row._asdict().items()}
 
-    def find_by_player_with_relations(self, player_id: str) -> list[Game]:
-        """Return all games a user plays in, with stats relations eager-loaded.
-
-        Loads gm, system, vtt, sessions and players to avoid N+1 queries when
-        aggregating dashboard statistics. Draft games are excluded so unpublished
-        announcements never contribute to statistics.
+    def count_by_name_and_type(self, column) -> list[dict]:
+        """Count non-draft games per value of a related name column, by type.
 
         Args:
-            player_id: Player user ID.
+            column: Grouping column reachable from ``Game`` through a join,
+                e.g. ``System.name`` or ``Vtt.name``. Games without a value
+                (no VTT) are skipped.
 
         Returns:
-            List of non-draft games where the user is registered as a player.
+            List of ``{"name", "all", "oneshot", "campaign"}`` dicts, most
+            games first, then by name.
         """
-        return (
-            self.session.query(Game)
-            .join(Game.players)
-            .options(
-                joinedload(Game.gm),
-                joinedload(Game.system),
-                joinedload(Game.vtt),
-                subqueryload(Game.sessions),
-                subqueryload(Game.players),
+        total = func.count(Game.id)
+        rows = (
+            self.session.query(
+                column.label("name"),
+                total.label("all"),
+                func.count(Game.id).filter(Game.type == GAME_TYPE_ONESHOT).label("oneshot"),
+                func.count(Game.id).filter(Game.type == GAME_TYPE_CAMPAIGN).label("campaign"),
             )
-            .filter(User.id == player_id, Game.status != GAME_STATUS_DRAFT)
+            .select_from(Game)
+            .join(column.class_)
+            .filter(Game.status != GAME_STATUS_DRAFT)
+            .group_by(column)
+            .order_by(total.desc(), column)
             .all()
         )
+        return [row._asdict() for row in rows]
 
-    def find_all_with_relations(self) -> list[Game]:
-        """Return every game with stats relations eager-loaded.
-
-        Loads system, vtt, sessions and players to avoid N+1 queries when
-        aggregating app-wide statistics. Draft games are excluded so unpublished
-        announcements never contribute to statistics.
+    def count_by_restriction(self) -> dict[str, int]:
+        """Count non-draft games per age restriction.
 
         Returns:
-            List of all non-draft games.
+            Dict mapping restriction values to game counts (absent when zero).
         """
-        return (
-            self.session.query(Game)
-            .options(
-                joinedload(Game.system),
-                joinedload(Game.vtt),
-                subqueryload(Game.sessions),
-                subqueryload(Game.players),
-            )
+        rows = (
+            self.session.query(Game.restriction, func.count())
             .filter(Game.status != GAME_STATUS_DRAFT)
+            .group_by(Game.restriction)
             .all()
         )
+        return dict(rows)
 
     def find_by_special_event(self, event_id: int) -> list[Game]:
         """Find all games for a special event.
@@ -2,7 +2,11 @@
 
 from datetime import datetime
 
-from website.models import GameSession
+from sqlalchemy import exists, func
+
+from config.constants import GAME_STATUS_DRAFT
+from website.models import Game, GameSession, System, User, Vtt
+from website.models.game import players_table
 from website.repositories.base import BaseRepository
 
 
@@ -26,3 +30,115 @@ class GameSessionRepository(BaseRepository[GameSession]):
             .filter(GameSession.start >= start, GameSession.end <= end)
             .all()
         )
+
+    def find_report_rows(self, start: datetime, end: datetime) -> list:
+        """List the sessions of non-draft games within a date range, as plain rows.
+
+        One joined projection query (session, game, GM, system) feeding the
+        monthly report, so no game, user or system entity is loaded per session.
+
+        Args:
+            start: Range start datetime (inclusive).
+            end: Range end datetime (inclusive).
+
+        Returns:
+            Rows with ``type``, ``slug``, ``name``, ``gm_name`` and
+            ``system_name`` attributes, one per session, in start order.
+        """
+        return (
+            self.session.query(
+                Game.type,
+                Game.slug,
+                Game.name,
+                User.name.label("gm_name"),
+                System.name.label("system_name"),
+            )
+            .select_from(GameSession)
+            .join(Game, Game.id == GameSession.game_id)
+            .join(User, User.id == Game.gm_id)
+            .join(System, System.id == Game.system_id)
+            .filter(
+                GameSession.start >= start,
+                GameSession.end <= end,
+                Game.status != GAME_STATUS_DRAFT,
+            )
+            .order_by(GameSession.start, GameSession.id)
+            .all()
+        )
+
+    def find_agenda_rows(self, user_id: str, now: datetime, past_limit: int) -> tuple[list, list]:
+        """List a user's recent and upcoming sessions as plain agenda rows.
+
+        Covers the non-draft games the user runs or is registered in; a game
+        they run is listed under the GM role only, even if they also registered
+        as a player. Only the last ``past_limit`` past sessions are read, so the
+        cost follows the user's upcoming schedule, not their whole history.
+
+        Args:
+            user_id: Discord user ID.
+            now: Boundary between past and upcoming sessions.
+            past_limit: Number of past sessions to return.
+
+        Returns:
+            ``(past, upcoming)`` lists of rows with ``start``, ``name``,
+            ``slug``, ``type``, ``system_name``, ``vtt_name`` (None without a
+            VTT) and ``is_gm`` attributes, both in start order.
+        """
+        registered = exists().where(
+            players_table.c.game_id == Game.id, players_table.c.player_id == user_id
+        )
+        is_gm = Game.gm_id == user_id
+        query = (
+            self.session.query(
+                GameSession.start,
+                Game.name,
+                Game.slug,
+                Game.type,
+                System.name.label("system_name"),
+                Vtt.name.label("vtt_name"),
+                is_gm.label("is_gm"),
+            )
+            .select_from(GameSession)
+            .join(Game, Game.id == GameSession.game_id)
+            .join(System, System.id == Game.system_id)
+            .outerjoin(Vtt, Vtt.id == Game.vtt_id)
+            .filter(Game.status != GAME_STATUS_DRAFT, is_gm | registered)
+        )
+        past = (
+            query.filter(GameSession.start < now)
+            .order_by(GameSession.start.desc(), GameSession.id.desc())
+            .limit(past_limit)
+            .all()
+        )
+        upcoming = (
+            query.filter(GameSession.start >= now)
+            .order_by(GameSession.start, GameSession.id)
+            .all()
+        )
+        return past[::-1], upcoming
+
+    def count_by_month(self, since: datetime, until: datetime) -> dict[tuple[int, int], dict]:
+        """Count sessions of non-draft games per calendar month.
+
+        Args:
+            since: First month start (inclusive).
+            until: End of the period (exclusive).
+
+        Returns:
+            Dict mapping ``(year, month)`` to ``{"sessions", "games"}`` counts
+            (distinct games that had a session that month); empty months are
+            absent.
+        """
+        month = func.date_trunc("month", GameSession.start)
+        rows = (
+            self.session.query(month, func.count(), func.count(func.distinct(GameSession.game_id)))
+            .join(Game, Game.id == GameSession.game_id)
+            .filter(
+                GameSession.start >= since,
+                GameSession.start < until,
+                Game.status != GAME_STATUS_DRAFT,
+            )
+            .group_by(month)
+            .all()
+        )
+        return {(m.year, m.month): {"sessions": n, "games": g} for m, n, g in rows}
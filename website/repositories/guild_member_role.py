@@ -0,0 +1,120 @@
+"""GuildMemberRole repository for the local role-membership index."""
+
+from datetime import datetime, timezone
+
+from sqlalchemy import delete, insert
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from website.models import GuildMember, GuildMemberRole
+from website.repositories.base import BaseRepository
+
+
+class GuildMemberRoleRepository(BaseRepository[GuildMemberRole]):
+    """Data access for guild role memberships (query-only, no commits)."""
+
+    model_class = GuildMemberRole
+
+    def get_role_ids(
+        self, user_id: str, indexed_after: datetime | None = None
+    ) -> list[str] | None:
+        """Return the role IDs held by a member (one primary-key lookup).
+
+        Args:
+            user_id: Discord user ID.
+            indexed_after: If given, a member last indexed before this time is
+                treated as not indexed.
+
+        Returns:
+            Role ID strings (empty for an indexed member holding no role), or
+            None when the member is not indexed (or indexed too long ago).
+        """
+        query = (
+            self.session.query(GuildMemberRole.role_id)
+            .select_from(GuildMember)
+            .outerjoin(GuildMemberRole, GuildMemberRole.user_id == GuildMember.user_id)
+            .filter(GuildMember.user_id == user_id)
+        )
+        if indexed_after is not None:
+            query = query.filter(GuildMember.indexed_at >= indexed_after)
+        rows = query.all()
+        if not rows:
+            return None
+        return [row[0] for row in rows if row[0] is not None]
+
+    def replace_all(self, roles_by_user: dict[str, list[str]]) -> None:
+        """Replace the whole index with a fresh snapshot of the guild.
+
+        Args:
+            roles_by_user: Mapping of every member's user ID to their role IDs.
+        """
+        self.session.execute(delete(GuildMemberRole))
+        self.session.execute(delete(GuildMember))
+        if roles_by_user:
+            now = datetime.now(timezone.utc)
+            self.session.execute(
+                insert(GuildMember),
+                [{"user_id": user_id, "indexed_at": now} for user_id in roles_by_user],
+            )
+        rows = [
+            {"user_id": user_id, "role_id": role_id}
+            for user_id, role_ids in roles_by_user.items()
+            for role_id in role_ids
+        ]
+        if rows:
+            self.session.execute(insert(GuildMemberRole), rows)
+
+    def replace_for_user(self, user_id: str, role_ids: list[str]) -> None:
+        """Replace the roles recorded for one member and mark them as indexed.
+
+        Args:
+            user_id: Discord user ID.
+            role_ids: Every role the member now holds.
+        """
+        now = datetime.now(timezone.utc)
+        self.session.execute(
+            pg_insert(GuildMember)
+            .values(user_id=user_id, indexed_at=now)
+            .on_conflict_do_update(index_elements=["user_id"], set_={"indexed_at": now})
+        )
+        self.session.execute(delete(GuildMemberRole).where(GuildMemberRole.user_id == user_id))
+        if role_ids:
+            self.session.execute(
+                insert(GuildMemberRole),
+                [{"user_id": user_id, "role_id": role_id} for role_id in set(role_ids)],
+            )
+
+    def add_role(self, user_id: str, role_id: str) -> None:
+        """Record that a member holds a role (no-op if already recorded).
+
+        A member not indexed yet stays so: one role is not their full list.
+
+        Args:
+            user_id: Discord user ID.
+            role_id: Discord role ID.
+        """
+        self.session.execute(
+            pg_insert(GuildMemberRole)
+            .values(user_id=user_id, role_id=role_id)
+            .on_conflict_do_nothing()
+        )
+
+    def remove_role(self, user_id: str, role_id: str) -> None:
+        """Record that a member no longer holds a role.
+
+        Args:
+            user_id: Discord user ID.
+            role_id: Discord role ID.
+        """
+        self.session.execute(
+            delete(GuildMemberRole).where(
+                GuildMemberRole.user_id == user_id, GuildMemberRole.role_id == role_id
+            )
+        )
+
+    def delete_role(self, role_id: str) -> None:
+        """Forget a deleted role for every member.
+
+        Args:
+            role_id: Discord role ID.
+        """
+        self.session.execute(delete(GuildMemberRole).where(GuildMemberRole.role_id == role_id))
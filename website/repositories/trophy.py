@@ -142,14 +142,54 @@ class TrophyRepository(BaseRepository[Trophy]):
             limit: Maximum number of entries to return. Defaults to 10.
 
         Returns:
-            List of (User, total_quantity) tuples ordered by quantity descending.
+            List of (User, total_quantity) tuples ordered by quantity descending,
+            then by user ID descending (the order of the Redis leaderboards).
         """
         return (
             self.session.query(User, func.sum(UserTrophy.quantity).label("total"))
             .join(UserTrophy)
             .filter(UserTrophy.trophy_id == trophy_id)
             .group_by(User.id)
-            .order_by(func.sum(UserTrophy.quantity).desc())
+            .order_by(func.sum(UserTrophy.quantity).desc(), User.id.collate("C").desc())
             .limit(limit)
             .all()
         )
+
+    def get_scores(self, trophy_id: int) -> dict[str, int]:
+        """Return the quantity each holder of a trophy has.
+
+        Args:
+            trophy_id: Trophy ID.
+
+        Returns:
+            Dict mapping user IDs to quantities.
+        """
+        rows = (
+            self.session.query(UserTrophy.user_id, UserTrophy.quantity)
+            .filter(UserTrophy.trophy_id == trophy_id)
+            .all()
+        )
+        return dict(rows)
+
+    def get_rank(self, trophy_id: int, user_id: str) -> tuple[int | None, int]:
+        """Return a user's rank among the holders of a trophy.
+
+        Args:
+            trophy_id: Trophy ID.
+            user_id: User ID.
+
+        Returns:
+            ``(rank, quantity)`` with a 1-based rank (one more than the number
+            of holders with a higher quantity), or ``(None, 0)`` when the user
+            does not hold the trophy.
+        """
+        user_trophy = self.get_user_trophy(user_id, trophy_id)
+        if user_trophy is None:
+            return None, 0
+        ahead = (
+            self.session.query(func.count())
+            .select_from(UserTrophy)
+            .filter(UserTrophy.trophy_id == trophy_id, UserTrophy.quantity > user_trophy.quantity)
+            .scalar()
+        )
+        return ahead + 1, user_trophy.quantity
@@ -1,5 +1,9 @@
 """User repository for user data access."""
 
+from datetime import datetime
+
+from sqlalchemy import update
+
 from website.models import User
 from website.repositories.base import BaseRepository
 
@@ -25,8 +29,7 @@ class UserRepository(BaseRepository[User]):
     def get_active_user_ids(self) -> list[str]:
         """Retrieve IDs of all users not marked as inactive.
 
-        Uses a scalar query to avoid loading full ORM objects
-        (and triggering init_on_load).
+        Uses a scalar query to avoid loading full ORM objects.
 
         Returns:
             List of user ID strings where not_player_as_of is NULL.
@@ -34,11 +37,39 @@ class UserRepository(BaseRepository[User]):
         rows = self.session.query(User.id).filter(User.not_player_as_of.is_(None)).all()
         return [row[0] for row in rows]
 
+    def get_stalest_active_user_ids(self, limit: int) -> list[str]:
+        """Retrieve the active users whose profile was refreshed longest ago.
+
+        Never-refreshed users come first. Served by the partial
+        ``ix_user_profile_refresh_queue`` index, so only ``limit`` rows are read.
+
+        Args:
+            limit: Maximum number of IDs to return.
+
+        Returns:
+            List of user ID strings, stalest first.
+        """
+        rows = (
+            self.session.query(User.id)
+            .filter(User.not_player_as_of.is_(None))
+            .order_by(User.profile_refreshed_at.asc().nulls_first())
+            .limit(limit)
+            .all()
+        )
+        return [row[0] for row in rows]
+
+    def count_active(self) -> int:
+        """Count users not marked as inactive.
+
+        Returns:
+            Number of users where not_player_as_of is NULL.
+        """
+        return self.session.query(User).filter(User.not_player_as_of.is_(None)).count()
+
     def get_inactive_user_ids(self) -> list[str]:
         """Retrieve IDs of all users marked as inactive.
 
-        Uses a scalar query to avoid loading full ORM objects
-        (and triggering init_on_load).
+        Uses a scalar query to avoid loading full ORM objects.
 
         Returns:
             List of user ID strings where not_player_as_of is set.
@@ -49,10 +80,8 @@ class UserRepository(BaseRepository[User]):
     def update_fields(self, user_id: str, values: dict) -> None:
         """Apply a partial column update without loading the ORM object.
 
-        Uses a Core UPDATE so the write is not suppressed by the display-name
-        resolution performed in ``User.init_on_load`` (which, in background
-        contexts, sets ``name`` at load time and makes an identical ORM
-        assignment a no-op).
+        Uses a Core UPDATE so no ORM object has to be loaded (or be in sync
+        with the session) for the write to happen.
 
         Args:
             user_id: Discord user ID.
@@ -64,6 +93,47 @@ class UserRepository(BaseRepository[User]):
             values, synchronize_session=False
         )
 
+    def get_profile_rows(self) -> list[tuple]:
+        """Retrieve the stored profile columns of every user.
+
+        Uses a column query to avoid loading full ORM objects.
+
+        Returns:
+            List of ``(id, name, username, avatar_url, not_player_as_of)`` tuples.
+        """
+        return self.session.query(
+            User.id, User.name, User.username, User.avatar_url, User.not_player_as_of
+        ).all()
+
+    def bulk_update_fields(self, rows: list[dict]) -> None:
+        """Apply per-user partial updates in a single executemany UPDATE.
+
+        Args:
+            rows: One mapping per user, each holding ``id`` plus the columns to set.
+        """
+        if rows:
+            self.session.execute(update(User), rows)
+
+    def mark_inactive_many(self, ids: list[str], when: datetime) -> int:
+        """Flag the given users as inactive in one UPDATE.
+
+        Users already inactive keep their original ``not_player_as_of``.
+
+        Args:
+            ids: User ID strings.
+            when: Timestamp stored in ``not_player_as_of``.
+
+        Returns:
+            Number of updated rows.
+        """
+        if not ids:
+            return 0
+        return (
+            self.session.query(User)
+            .filter(User.id.in_(ids), User.not_player_as_of.is_(None))
+            .update({"not_player_as_of": when}, synchronize_session=False)
+        )
+
     def get_by_ids(self, ids: list[str]) -> list[User]:
         """Retrieve users by a list of IDs.
 
@@ -0,0 +1,268 @@
+"""UserStats repository: per-user statistics read model."""
+
+from datetime import datetime
+
+from sqlalchemy import Integer, func, literal, select, union_all, update
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from config.constants import GAME_STATUS_DRAFT, GAME_TYPE_CAMPAIGN, GAME_TYPE_ONESHOT
+from website.models import Game, GameSession, User, UserStats, UserTrophy
+from website.models.game import players_table
+from website.repositories.base import BaseRepository
+
+ROLE_GM = "gm"
+ROLE_PLAYER = "player"
+
+
+class UserStatsRepository(BaseRepository[UserStats]):
+    """Data access for the per-user statistics rows (query-only, no commits).
+
+    The ``aggregate_*`` methods compute the figures of a batch of users with
+    grouped queries over games, sessions, registrations and trophies; their
+    cost depends on those users' history only, not on the size of the tables.
+    """
+
+    model_class = UserStats
+
+    def get_current(self, user_id: str) -> UserStats | None:
+        """Return a user's row, reloaded from the database.
+
+        Args:
+            user_id: Discord user ID.
+
+        Returns:
+            The row, or None if it was never computed.
+        """
+        return self.session.get(UserStats, user_id, populate_existing=True)
+
+    def mark_stale(self, user_ids: list[str], now: datetime) -> None:
+        """Flag the users' rows for recomputation.
+
+        Sets ``valid_until`` to ``now``; users without a row get an all-zero
+        one, flagged the same way. IDs without a user row are skipped.
+
+        Args:
+            user_ids: Users whose statistics changed (locked in this order).
+            now: Current time.
+        """
+        placeholder = {"user_id": User.id, "valid_until": literal(now), "updated_at": literal(now)}
+        for column in UserStats.__table__.columns:
+            if isinstance(column.type, Integer):
+                placeholder[column.name] = literal(0)
+            elif isinstance(column.type, JSONB):
+                placeholder[column.name] = literal({}, JSONB)
+        rows = (
+            select(*(value.label(name) for name, value in placeholder.items()))
+            .where(User.id.in_(user_ids))
+            .order_by(User.id)
+        )
+        self.session.execute(
+            pg_insert(UserStats)
+            .from_select(list(placeholder), rows)
+            .on_conflict_do_update(index_elements=[UserStats.user_id], set_={"valid_until": now})
+        )
+
+    def lock_stale(self, now: datetime, limit: int) -> list[str]:
+        """Lock the rows due for recomputation, stalest first.
+
+        A row is due once its ``valid_until`` has passed: flagged by
+        :meth:`mark_stale`, or holding played time of a session that has ended
+        since. Rows locked by another worker are skipped (``SKIP LOCKED``), and
+        writers flagging a locked row wait for its recomputation to commit, so
+        no change is lost.
+
+        Args:
+            now: Current time.
+            limit: Maximum number of rows.
+
+        Returns:
+            User IDs of the locked rows.
+        """
+        rows = (
+            self.session.query(UserStats.user_id)
+            .filter(UserStats.valid_until <= now)
+            .order_by(UserStats.valid_until)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+            .all()
+        )
+        return [row[0] for row in rows]
+
+    @staticmethod
+    def _involvement(user_ids: list[str]):
+        """Subquery of ``(user_id, game_id, role)`` for the users' non-draft games.
+
+        A game the user runs is listed under the GM role only, even if they are
+        also registered in it as a player.
+        """
+        as_gm = select(
+            Game.gm_id.label("user_id"), Game.id.label("game_id"), literal(ROLE_GM).label("role")
+        ).where(Game.gm_id.in_(user_ids), Game.status != GAME_STATUS_DRAFT)
+        as_player = (
+            select(
+                players_table.c.player_id.label("user_id"),
+                players_table.c.game_id.label("game_id"),
+                literal(ROLE_PLAYER).label("role"),
+            )
+            .join(Game, Game.id == players_table.c.game_id)
+            .where(
+                players_table.c.player_id.in_(user_ids),
+                Game.status != GAME_STATUS_DRAFT,
+                Game.gm_id != players_table.c.player_id,
+            )
+        )
+        return union_all(as_gm, as_player).subquery()
+
+    def aggregate_games(self, user_ids: list[str], now: datetime) -> dict[str, dict]:
+        """Count the users' games and sessions, by role and by game type.
+
+        Args:
+            user_ids: Users to aggregate.
+            now: Current time; only sessions that ended by then count as played.
+
+        Returns:
+            Dict mapping user IDs (those with at least one game) to dicts with
+            the game and session counts of :class:`UserStats`, the played
+            ``gm_seconds`` / ``player_seconds``, and ``valid_until``.
+        """
+        involved = self._involvement(user_ids)
+        gm = involved.c.role == ROLE_GM
+        player = involved.c.role == ROLE_PLAYER
+        oneshot = Game.type == GAME_TYPE_ONESHOT
+        campaign = Game.type == GAME_TYPE_CAMPAIGN
+        ended = GameSession.end <= now
+        duration = func.extract("epoch", GameSession.end - GameSession.start)
+        games = func.count(func.distinct(involved.c.game_id))
+        sessions = func.count(GameSession.id)
+        columns = {
+            "gm_games": games.filter(gm),
+            "player_games": games.filter(player),
+            "oneshot_games": games.filter(oneshot),
+            "campaign_games": games.filter(campaign),
+            "gm_sessions": sessions.filter(gm),
+            "player_sessions": sessions.filter(player),
+            "oneshot_sessions": sessions.filter(oneshot),
+            "campaign_sessions": sessions.filter(campaign),
+            "gm_seconds": func.coalesce(func.sum(duration).filter(gm, ended), 0),
+            "player_seconds": func.coalesce(func.sum(duration).filter(player, ended), 0),
+            "valid_until": func.min(GameSession.end).filter(GameSession.end > now),
+        }
+        rows = (
+            self.session.query(involved.c.user_id, *(c.label(k) for k, c in columns.items()))
+            .join(Game, Game.id == involved.c.game_id)
+            .outerjoin(GameSession, GameSession.game_id == involved.c.game_id)
+            .group_by(involved.c.user_id)
+            .all()
+        )
+        result = {}
+        for row in rows:
+            values = row._asdict()
+            user_id = values.pop("user_id")
+            for key in ("gm_seconds", "player_seconds"):
+                values[key] = round(values[key])
+            result[user_id] = values
+        return result
+
+    def aggregate_systems(self, user_ids: list[str]) -> dict[str, dict]:
+        """Tally the users' sessions and games per role and game system.
+
+        Args:
+            user_ids: Users to aggregate.
+
+        Returns:
+            Dict mapping user IDs to ``{role: {system_id: [sessions, games]}}``
+            with ``system_id`` as a string (JSON object key).
+        """
+        involved = self._involvement(user_ids)
+        rows = (
+            self.session.query(
+                involved.c.user_id,
+                involved.c.role,
+                Game.system_id,
+                func.count(GameSession.id),
+                func.count(func.distinct(involved.c.game_id)),
+            )
+            .join(Game, Game.id == involved.c.game_id)
+            .outerjoin(GameSession, GameSession.game_id == involved.c.game_id)
+            .group_by(involved.c.user_id, involved.c.role, Game.system_id)
+            .all()
+        )
+        result: dict[str, dict] = {}
+        for user_id, role, system_id, sessions, games in rows:
+            by_role = result.setdefault(user_id, {ROLE_GM: {}, ROLE_PLAYER: {}})
+            by_role[role][str(system_id)] = [sessions, games]
+        return result
+
+    def aggregate_months(self, user_ids: list[str]) -> dict[str, dict]:
+        """Tally the users' sessions and distinct games per calendar month.
+
+        Args:
+            user_ids: Users to aggregate.
+
+        Returns:
+            Dict mapping user IDs to ``{"YYYY-MM": [sessions, games]}``.
+        """
+        involved = self._involvement(user_ids)
+        month = func.to_char(GameSession.start, "YYYY-MM")
+        rows = (
+            self.session.query(
+                involved.c.user_id,
+                month,
+                func.count(GameSession.id),
+                func.count(func.distinct(involved.c.game_id)),
+            )
+            .join(GameSession, GameSession.game_id == involved.c.game_id)
+            .group_by(involved.c.user_id, month)
+            .all()
+        )
+        result: dict[str, dict] = {}
+        for user_id, key, sessions, games in rows:
+            result.setdefault(user_id, {})[key] = [sessions, games]
+        return result
+
+    def aggregate_badges(self, user_ids: list[str]) -> dict[str, int]:
+        """Sum the trophies held by the users.
+
+        Args:
+            user_ids: Users to aggregate.
+
+        Returns:
+            Dict mapping user IDs (those holding a trophy) to trophy quantities.
+        """
+        rows = (
+            self.session.query(UserTrophy.user_id, func.sum(UserTrophy.quantity))
+            .filter(UserTrophy.user_id.in_(user_ids))
+            .group_by(UserTrophy.user_id)
+            .all()
+        )
+        return {user_id: int(total) for user_id, total in rows}
+
+    def update_badges(self, user_ids: list[str]) -> None:
+        """Recount the trophies held by the users with computed rows.
+
+        Args:
+            user_ids: Users whose trophies changed.
+        """
+        held = (
+            select(func.coalesce(func.sum(UserTrophy.quantity), 0))
+            .where(UserTrophy.user_id == UserStats.user_id)
+            .scalar_subquery()
+        )
+        self.session.execute(
+            update(UserStats).where(UserStats.user_id.in_(user_ids)).values(badges=held)
+        )
+
+    def upsert(self, rows: list[dict]) -> None:
+        """Insert or replace the rows of several users.
+
+        Args:
+            rows: Complete :class:`UserStats` column values, one dict per user.
+        """
+        if not rows:
+            return
+        statement = pg_insert(UserStats).values(rows)
+        columns = {key: statement.excluded[key] for key in rows[0] if key != "user_id"}
+        self.session.execute(
+            statement.on_conflict_do_update(index_elements=[UserStats.user_id], set_=columns)
+        )
@@ -1,16 +1,23 @@
 """Background job scheduler for periodic tasks."""
 
+import math
 import random
 from datetime import datetime, timedelta, timezone
 
 from apscheduler.executors.pool import ThreadPoolExecutor
 from apscheduler.schedulers.background import BackgroundScheduler
 
+from config.constants import (
+    OUTBOX_DISPATCH_INTERVAL,
+    PROFILE_REFRESH_WINDOW_HOURS,
+    STATS_REFRESH_INTERVAL,
+)
 from website.services.user import UserService
 
 FREQUENCY = 5
 INACTIVE_CHECK_BATCH_SIZE = 10
 ROLE_MONITOR_FREQUENCY_HOURS = 12
+MEMBER_SWEEP_FREQUENCY_MINUTES = 60
 # Per-fire random drift (seconds) applied to the long-running jobs so repeated
 # runs do not realign on the same instant. ±1h.
 DAILY_JOB_JITTER = 3600
@@ -19,35 +26,66 @@ DAILY_JOB_JITTER = 3600
 DAILY_JOB_START_SPREAD = 30
 
 
+def _profile_refresh_batch_size(service, configured: int) -> int:
+    """Size a profile refresh run from the user count and the rate-limit budget.
+
+    Takes at least enough users to refresh every active one within
+    ``PROFILE_REFRESH_WINDOW_HOURS`` at one run every ``FREQUENCY`` minutes,
+    then caps that at the member route's remaining budget when other traffic
+    is already spending it.
+
+    Args:
+        service: UserService used to count active users.
+        configured: Admin-configured batch size (the floor).
+
+    Returns:
+        Number of users to refresh this run (0 when the budget is exhausted).
+    """
+    from website.services.discord import DiscordService
+
+    runs_per_window = PROFILE_REFRESH_WINDOW_HOURS * 60 // FREQUENCY
+    batch_size = max(configured, math.ceil(service.count_active_users() / runs_per_window))
+    try:
+        budget = DiscordService().get_user_budget()
+    except RuntimeError:
+        budget = None
+    return batch_size if budget is None else min(batch_size, budget)
+
+
 def refresh_user_profiles(app, batch_size=None):
-    """Refresh a random batch of active user profiles from Discord.
+    """Refresh the stalest active user profiles from Discord.
 
+    Users are taken in ``profile_refreshed_at`` order (never-refreshed first)
+    with an indexed ``LIMIT`` query, so every active user is visited in turn.
     Users marked as inactive (not_player_as_of is set) are excluded.
     When a 404 is encountered, the user is marked inactive.
 
-    Queries only user IDs first to avoid loading all ORM objects
-    (and triggering init_on_load for every active user).
-
     Args:
         app: Flask application instance for context.
         batch_size: Number of users to refresh per run. When ``None`` (the
-            scheduled default), the admin-configured batch size is resolved at
-            run time so changes take effect without restarting the scheduler.
+            scheduled default), it is sized at run time from the
+            admin-configured batch size, the number of active users and the
+            remaining Discord rate-limit budget (see
+            :func:`_profile_refresh_batch_size`).
     """
     with app.app_context():
         service = UserService()
         if batch_size is None:
             from website.services.setting import SettingsService
 
-            batch_size = SettingsService().get_profile_refresh_batch_size()
-        user_ids = service.get_active_user_ids()
+            batch_size = _profile_refresh_batch_size(
+                service, SettingsService().get_profile_refresh_batch_size()
+            )
+            if not batch_size:
+                app.logger.info("[Scheduler] Discord member budget exhausted; refresh skipped")
+                return
+        user_ids = service.get_stalest_active_user_ids(batch_size)
         if not user_ids:
             app.logger.info("[Scheduler] No active users to refresh")
             return
 
-        sample_ids = random.sample(user_ids, min(batch_size, len(user_ids)))
         refreshed = 0
-        for user_id in sample_ids:
+        for user_id in user_ids:
             try:
                 profile = service.get_user_profile(user_id, force_refresh=True)
                 if profile.get("not_found"):
@@ -68,14 +106,44 @@ def refresh_user_profiles(app, batch_size=None):
         app.logger.info(f"[Scheduler] Refreshed {refreshed} users at {datetime.now()}")
 
 
+def sweep_guild_members(app):
+    """Refresh every user's profile from one pass over the guild member list.
+
+    Replaces the per-user refresh and the inactive re-check when
+    ``PROFILE_REFRESH_MODE`` is ``"sweep"``: names, usernames and cached
+    avatars are updated in bulk, users who left the guild are marked inactive
+    and users who came back are reactivated. If Discord refuses the member list
+    (403: the bot lacks the "Server Members" intent), this run falls back to
+    :func:`refresh_user_profiles`.
+
+    Args:
+        app: Flask application instance for context.
+    """
+    from website.exceptions import DiscordAPIError
+
+    with app.app_context():
+        try:
+            stats = UserService().sync_guild_members()
+            app.logger.info(f"[Scheduler] Guild member sweep done: {stats}")
+            return
+        except DiscordAPIError as e:
+            if e.status_code != 403:
+                app.logger.warning(f"[Scheduler] Guild member sweep failed: {e}")
+                return
+            app.logger.warning(
+                "[Scheduler] Guild member list forbidden (missing Server Members intent); "
+                "falling back to per-user profile refresh"
+            )
+    refresh_user_profiles(app)
+
+
 def check_inactive_users(app, batch_size=INACTIVE_CHECK_BATCH_SIZE):
     """Re-check a batch of inactive users to see if they have rejoined.
 
     If the Discord API returns a valid profile, the not_player_as_of
     flag is cleared.
 
-    Queries only user IDs first to avoid loading all ORM objects
-    (and triggering init_on_load for every inactive user).
+    Queries only user IDs first to avoid loading all ORM objects.
 
     Args:
         app: Flask application instance for context.
@@ -201,6 +269,64 @@ def prune_app_logs(app):
             app.logger.warning(f"[Scheduler] Application log pruning failed: {e}")
 
 
+def dispatch_discord_outbox(app):
+    """Send the Discord operations queued by game changes.
+
+    Runs every few seconds. Every gunicorn worker runs it; operations are
+    claimed with ``SKIP LOCKED`` so each one is still sent only once.
+
+    Args:
+        app: Flask application instance for context.
+    """
+    from website.services.discord_outbox import DiscordOutboxService
+
+    with app.app_context():
+        try:
+            sent = DiscordOutboxService().dispatch_pending()
+            if sent:
+                app.logger.info(f"[Scheduler] Sent {sent} queued Discord operation(s)")
+        except Exception as e:
+            app.logger.warning(f"[Scheduler] Discord outbox dispatch failed: {e}")
+
+
+def refresh_user_stats(app):
+    """Recompute the dashboard statistics flagged by game, session and registration changes.
+
+    Runs every few seconds. Every gunicorn worker runs it; rows are claimed
+    with ``SKIP LOCKED`` so each one is recomputed only once.
+
+    Args:
+        app: Flask application instance for context.
+    """
+    from website.services.stats import StatsService
+
+    with app.app_context():
+        try:
+            refreshed = StatsService().refresh_stale()
+            if refreshed:
+                app.logger.info(f"[Scheduler] Recomputed the statistics of {refreshed} user(s)")
+        except Exception as e:
+            app.logger.warning(f"[Scheduler] User statistics refresh failed: {e}")
+
+
+def prune_discord_outbox(app):
+    """Daily: delete sent Discord outbox operations past the retention window.
+
+    Dead-lettered operations are kept for inspection.
+
+    Args:
+        app: Flask application instance for context.
+    """
+    from website.services.discord_outbox import DiscordOutboxService
+
+    with app.app_context():
+        try:
+            deleted = DiscordOutboxService().prune()
+            app.logger.info(f"[Scheduler] Pruned {deleted} sent Discord outbox operations")
+        except Exception as e:
+            app.logger.warning(f"[Scheduler] Discord outbox pruning failed: {e}")
+
+
 def start_scheduler(app):
     """Initialize and start the APScheduler background scheduler.
 
@@ -209,33 +335,82 @@ def start_scheduler(app):
     """
     # A single worker serialises every job, so no two jobs ever run in parallel;
     # coalesce + max_instances=1 also stop a job from stacking up on itself if a
-    # run is delayed.
+    # run is delayed. The Discord outbox and the statistics refresh, both short
+    # and frequent, share their own worker so they are never held up behind a
+    # long daily job.
     scheduler = BackgroundScheduler(
-        executors={"default": ThreadPoolExecutor(max_workers=1)},
+        executors={
+            "default": ThreadPoolExecutor(max_workers=1),
+            "outbox": ThreadPoolExecutor(max_workers=1),
+        },
         job_defaults={"coalesce": True, "max_instances": 1},
     )
 
     # Passing the function and ``args`` (instead of a ``lambda``) keeps the job's
     # real name in APScheduler's logs rather than "<lambda>".
-    scheduler.add_job(
-        func=refresh_user_profiles,
-        args=[app],
-        trigger="interval",
-        minutes=FREQUENCY,
-        id="refresh_user_profiles",
-        name="refresh_user_profiles",
-        replace_existing=True,
-    )
+    # With the Gateway worker, member changes are pushed: profiles are no longer
+    # polled and a daily sweep only catches events missed while it was down.
+    gateway = app.config.get("GATEWAY_ENABLED", False)
+    sweep = app.config.get("PROFILE_REFRESH_MODE") == "sweep"
+    if sweep and not gateway:
+        scheduler.add_job(
+            func=sweep_guild_members,
+            args=[app],
+            trigger="interval",
+            minutes=MEMBER_SWEEP_FREQUENCY_MINUTES,
+            id="sweep_guild_members",
+            name="sweep_guild_members",
+            replace_existing=True,
+        )
+    elif not gateway:
+        scheduler.add_job(
+            func=refresh_user_profiles,
+            args=[app],
+            trigger="interval",
+            minutes=FREQUENCY,
+            id="refresh_user_profiles",
+            name="refresh_user_profiles",
+            replace_existing=True,
+        )
+
+    if app.config.get("OUTBOX_DISPATCH_ENABLED", True):
+        scheduler.add_job(
+            func=dispatch_discord_outbox,
+            args=[app],
+            trigger="interval",
+            seconds=OUTBOX_DISPATCH_INTERVAL,
+            executor="outbox",
+            id="dispatch_discord_outbox",
+            name="dispatch_discord_outbox",
+            replace_existing=True,
+        )
+
+    if app.config.get("STATS_REFRESH_ENABLED", True):
+        scheduler.add_job(
+            func=refresh_user_stats,
+            args=[app],
+            trigger="interval",
+            seconds=STATS_REFRESH_INTERVAL,
+            executor="outbox",
+            id="refresh_user_stats",
+            name="refresh_user_stats",
+            replace_existing=True,
+        )
 
     # Long-running jobs: stagger the first run by a random offset and add per-fire
     # jitter so the daily ones never realign on the same instant.
     now = datetime.now(timezone.utc)
     long_jobs = [
-        ("check_inactive_users", check_inactive_users, 24),
         ("monitor_role_count", monitor_role_count, ROLE_MONITOR_FREQUENCY_HOURS),
         ("monitor_category_capacity", monitor_category_capacity, 24),
         ("prune_app_logs", prune_app_logs, 24),
+        ("prune_discord_outbox", prune_discord_outbox, 24),
     ]
+    if gateway:
+        long_jobs.append(("sweep_guild_members", sweep_guild_members, 24))
+    elif not sweep:
+        # The sweep already reactivates users who rejoined the guild.
+        long_jobs.append(("check_inactive_users", check_inactive_users, 24))
     for job_id, func, hours in long_jobs:
         scheduler.add_job(
             func=func,
@@ -4,9 +4,11 @@ from website.services.app_log import AppLogService
 from website.services.channel import ChannelService
 from website.services.discord import DiscordService
 from website.services.discord_message import DiscordMessageService
+from website.services.discord_outbox import DiscordOutboxService
 from website.services.game import GameService
 from website.services.game_event import GameEventService
 from website.services.game_session import GameSessionService
+from website.services.gateway import GatewayEventService
 from website.services.permission import PermissionService
 from website.services.setting import SettingsService
 from website.services.special_event import SpecialEventService
@@ -24,6 +26,7 @@ __all__ = [
     "GameEventService",
     "UserService",
     "GameSessionService",
+    "GatewayEventService",
     "PermissionService",
     "SettingsService",
     "SpecialEventService",
@@ -32,4 +35,5 @@ __all__ = [
     "GameService",
     "DiscordService",
     "DiscordMessageService",
+    "DiscordOutboxService",
 ]
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from collections.abc import Iterable
 from typing import TYPE_CHECKING
 
 from config.constants import DISCORD_CHANNEL_TYPE_TEXT
@@ -13,7 +14,6 @@ from website.repositories.channel import ChannelRepository
 from website.utils.logger import logger, sanitize_log_value
 
 if TYPE_CHECKING:
-    from website.models import Game
     from website.services.discord import DiscordService
 
 
@@ -150,12 +150,25 @@ class ChannelService:
         """
         self.repo.increment_size(channel)
 
+    def decrement_size(self, category_id: str | None) -> None:
+        """Decrement the channel count of a tracked category, if it is one.
+
+        Does not commit; the caller owns the transaction.
+
+        Args:
+            category_id: Discord ID of the category a channel was removed from.
+        """
+        category = self.repo.get_by_id(category_id) if category_id else None
+        if category:
+            self.repo.decrement_size(category)
+            logger.info(f"Decreased size of category {category.id} to {category.size}")
+
     def reconcile_sizes(self, discord_service: DiscordService) -> list[dict]:
         """Correct every tracked category's ``size`` from its real Discord channel count.
 
-        Fetches the guild channel list once, counts GUILD_TEXT children per category,
-        and updates any ``Channel.size`` that has drifted. Commits once when at least
-        one size changed.
+        Refetches the guild snapshot (see :meth:`DiscordService.get_guild_snapshot`),
+        counts GUILD_TEXT children per category, and updates any ``Channel.size``
+        that has drifted. Commits once when at least one size changed.
 
         Args:
             discord_service: DiscordService used to read the guild's channels.
@@ -164,14 +177,37 @@ class ChannelService:
             List of ``{"id", "old", "new"}`` dicts for each corrected category
             (empty if everything already matched).
         """
-        channels = discord_service.list_guild_channels()
+        channels = discord_service.list_guild_channels(refresh=True)
         counts: dict[str, int] = {}
         for c in channels:
             if c.get("type") == DISCORD_CHANNEL_TYPE_TEXT and c.get("parent_id"):
                 counts[c["parent_id"]] = counts.get(c["parent_id"], 0) + 1
 
+        return self.sync_sizes(counts)
+
+    def sync_sizes(
+        self, counts: dict[str, int], category_ids: Iterable[str] | None = None
+    ) -> list[dict]:
+        """Set tracked categories' ``size`` to their known text channel counts.
+
+        Absolute counts make this idempotent: applying the same counts twice, or
+        after the app's own increments, leaves the sizes correct. Commits once
+        when at least one size changed.
+
+        Args:
+            counts: Text channel count per category ID (missing means 0).
+            category_ids: Categories to update (default: every tracked one).
+                Untracked IDs are ignored.
+
+        Returns:
+            List of ``{"id", "old", "new"}`` dicts for each corrected category.
+        """
+        if category_ids is None:
+            categories = self.repo.get_all()
+        else:
+            categories = [c for c in map(self.repo.get_by_id, category_ids) if c]
         corrections = []
-        for category in self.repo.get_all():
+        for category in categories:
             real = counts.get(category.id, 0)
             if category.size != real:
                 corrections.append({"id": category.id, "old": category.size, "new": real})
@@ -234,22 +270,3 @@ class ChannelService:
         if smallest is None or smallest.size >= threshold:
             return self.create_category(discord_service, type)
         return None
-
-    def adjust_category_size(self, discord_service: DiscordService, game: Game) -> None:
-        """Decrement category size when a game channel is deleted.
-
-        Args:
-            discord_service: DiscordService instance for API calls.
-            game: Game instance with channel to look up.
-        """
-        try:
-            discord_channel = discord_service.get_channel(game.channel)
-            parent_id = discord_channel.get("parent_id")
-            if parent_id:
-                category = self.repo.get_by_id(parent_id)
-                if category:
-                    self.repo.decrement_size(category)
-                    db.session.commit()
-                    logger.info(f"Decreased size of category {category.id} to {category.size}")
-        except Exception as e:
-            logger.warning(f"Failed to adjust category size for game {game.id}: {e}")
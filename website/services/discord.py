@@ -6,20 +6,98 @@ It replaces the global singleton pattern previously used in website/bot.py.
 
 from __future__ import annotations
 
+import hashlib
+import json
+import threading
+import time
+from collections.abc import Callable, Iterator
 from datetime import datetime
 from typing import TYPE_CHECKING, Optional
 
 from config.constants import (
     DISCORD_CHANNEL_TYPE_TEXT,
-    DISCORD_ROLE_COUNT_CACHE_TIMEOUT,
+    DISCORD_EMBED_FINGERPRINT_TIMEOUT,
+    DISCORD_GUILD_SNAPSHOT_TIMEOUT,
+    DISCORD_MEMBERS_PAGE_SIZE,
     PLAYER_ROLE_PERMISSION,
+    SINGLE_FLIGHT_POLL_INTERVAL,
+    SINGLE_FLIGHT_WAIT,
 )
-from website.client.discord import Discord
+from website.client.circuit import OPEN
+from website.client.discord import Discord, player_overwrite
 from website.extensions import cache
+from website.utils.fan_out import failures, fan_out
+from website.utils.logger import logger
+from website.utils.single_flight import acquire_lock, cached_fetch, release_lock
 
 if TYPE_CHECKING:
     from website.models import Game
 
+# Per-worker count of announcement edits sent to Discord vs. skipped because the
+# message already showed the same content (see ``embed_edit_stats``).
+_embed_edit_counts = {"sent": 0, "skipped": 0}
+_embed_edit_lock = threading.Lock()
+
+
+def _count_embed_edit(outcome: str) -> None:
+    """Increment the ``sent`` or ``skipped`` announcement edit counter."""
+    with _embed_edit_lock:
+        _embed_edit_counts[outcome] += 1
+
+
+def embed_edit_stats() -> dict:
+    """Report how many announcement edits this worker sent or skipped.
+
+    Returns:
+        Dict with ``sent`` (PATCH requests made) and ``skipped`` (edits dropped
+        because the rendered embed and buttons matched the last ones sent).
+    """
+    with _embed_edit_lock:
+        return dict(_embed_edit_counts)
+
+
+def _embed_fingerprint(embed: dict, channel_id: str, components: list | None) -> str:
+    """Return a stable hash of a message's rendered content.
+
+    Keys are sorted so that equal payloads hash equally regardless of how the
+    builders ordered them.
+    """
+    payload = json.dumps(
+        {"channel": channel_id, "embed": embed, "components": components},
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _fingerprint_key(message_id: str) -> str:
+    """Return the cache key holding a message's last-sent fingerprint."""
+    return f"discord_embed_fp:{message_id}"
+
+
+GUILD_SNAPSHOT_KEY = "discord_guild_snapshot"
+
+
+def _role_entry(role: dict) -> dict:
+    """Keep the role fields the app reads."""
+    return {"id": role["id"], "name": role.get("name")}
+
+
+def _channel_entry(channel: dict) -> dict:
+    """Keep the channel fields the app reads."""
+    return {
+        "id": channel["id"],
+        "name": channel.get("name"),
+        "type": channel.get("type"),
+        "parent_id": channel.get("parent_id"),
+    }
+
+
+def _upsert(items: list[dict], item: dict) -> None:
+    """Replace the entry with the same ``id``, or append it."""
+    items[:] = [i for i in items if i["id"] != item["id"]] + [item]
+
 
 class DiscordService:
     """Service layer for Discord API interactions.
@@ -54,6 +132,14 @@ class DiscordService:
             raise RuntimeError("Discord bot not initialized")
         return self._bot
 
+    def is_available(self) -> bool:
+        """Return whether Discord calls are let through (circuit breaker not open).
+
+        Returns:
+            False while the client's circuit breaker fails calls fast.
+        """
+        return self.bot.breaker.state != OPEN
+
     # -------------------------------------------------------------------------
     # User operations
     # -------------------------------------------------------------------------
@@ -72,6 +158,38 @@ class DiscordService:
         """
         return self.bot.get_user(user_id)
 
+    def get_user_budget(self) -> int | None:
+        """Return how many :meth:`get_user` calls fit in the current rate-limit window.
+
+        Returns:
+            The remaining budget of the member-fetch bucket, or None when it is
+            unknown or idle (full budget).
+        """
+        return self.bot.rate_limiter.budget("GET", f"/guilds/{self.bot.guild_id}/members/0")
+
+    def iter_guild_members(self, page_size: int = DISCORD_MEMBERS_PAGE_SIZE) -> Iterator[dict]:
+        """Yield every guild member, paging through the member list by user ID.
+
+        A guild of N members costs ``N / page_size + 1`` API calls.
+
+        Args:
+            page_size: Members requested per call (Discord caps it at 1000).
+
+        Yields:
+            Member dicts as returned by the Discord API.
+
+        Raises:
+            DiscordAPIError: If a page request fails (e.g. 403 when the bot lacks
+                the "Server Members" intent).
+        """
+        after = "0"
+        while True:
+            page = self.bot.list_guild_members(limit=page_size, after=after)
+            yield from page
+            if len(page) < page_size:
+                return
+            after = page[-1]["user"]["id"]
+
     def add_role_to_user(self, user_id: str, role_id: str) -> dict:
         """Add a role to a user.
 
@@ -125,7 +243,9 @@ class DiscordService:
         Raises:
             DiscordAPIError: If the API request fails.
         """
-        return self.bot.create_role(name, permissions, color)
+        role = self.bot.create_role(name, permissions, color)
+        self.snapshot_upsert("roles", role)
+        return role
 
     def get_role(self, role_id: str) -> dict:
         """Get a role by ID.
@@ -141,42 +261,35 @@ class DiscordService:
         """
         return self.bot.get_role(role_id)
 
-    def list_roles(self) -> list:
-        """Return all roles defined in the guild.
+    def list_roles(self, refresh: bool = False) -> list:
+        """Return all roles defined in the guild, from the guild snapshot.
 
-        Returns:
-            List of role dicts (each with at least ``id`` and ``name``).
-
-        Raises:
-            DiscordAPIError: If the API request fails.
-        """
-        return self.bot.list_roles()
-
-    def count_roles(self) -> int:
-        """Count the roles currently defined in the guild.
+        Args:
+            refresh: Refetch the snapshot from Discord first.
 
         Returns:
-            Number of guild roles (including the ``@everyone`` role).
+            List of role dicts (``id`` and ``name``).
 
         Raises:
-            DiscordAPIError: If the API request fails.
+            DiscordAPIError: If the snapshot has to be fetched and the API
+                request fails.
         """
-        return len(self.bot.list_roles())
+        return self.get_guild_snapshot(refresh)["roles"]
 
-    @cache.memoize(timeout=DISCORD_ROLE_COUNT_CACHE_TIMEOUT)
-    def count_roles_cached(self) -> int:
-        """Return the guild role count, cached to avoid frequent API calls.
+    def count_roles(self, refresh: bool = False) -> int:
+        """Count the roles currently defined in the guild, from the guild snapshot.
 
-        The admin settings page reads this on every load, so the value is cached
-        rather than hitting the Discord API each time.
+        Args:
+            refresh: Refetch the snapshot from Discord first.
 
         Returns:
-            Number of guild roles.
+            Number of guild roles (including the ``@everyone`` role).
 
         Raises:
-            DiscordAPIError: If the API request fails on a cache miss.
+            DiscordAPIError: If the snapshot has to be fetched and the API
+                request fails.
         """
-        return self.count_roles()
+        return len(self.list_roles(refresh))
 
     def delete_role(self, role_id: str) -> dict:
         """Delete a Discord role.
@@ -190,7 +303,9 @@ class DiscordService:
         Raises:
             DiscordAPIError: If the API request fails.
         """
-        return self.bot.delete_role(role_id)
+        result = self.bot.delete_role(role_id)
+        self.snapshot_remove("roles", role_id)
+        return result
 
     # -------------------------------------------------------------------------
     # Channel operations
@@ -202,6 +317,7 @@ class DiscordService:
         parent_id: str,
         role_id: str | None,
         gm_id: str,
+        member_ids: list[str] | tuple = (),
     ) -> dict:
         """Create a Discord text channel with permissions.
 
@@ -211,6 +327,8 @@ class DiscordService:
             role_id: Player role ID for permission overwrites, or None to create
                 the channel without a player-role overwrite (direct-permission mode).
             gm_id: GM user ID for permission overwrites.
+            member_ids: Players given a member overwrite in the same request
+                (direct-permission mode).
 
         Returns:
             Created channel data including 'id'.
@@ -218,7 +336,9 @@ class DiscordService:
         Raises:
             DiscordAPIError: If the API request fails.
         """
-        return self.bot.create_channel(name, parent_id, role_id, gm_id)
+        channel = self.bot.create_channel(name, parent_id, role_id, gm_id, member_ids)
+        self.snapshot_upsert("channels", channel)
+        return channel
 
     def create_category(self, name: str) -> dict:
         """Create a Discord category channel (name kept verbatim).
@@ -232,34 +352,42 @@ class DiscordService:
         Raises:
             DiscordAPIError: If the API request fails.
         """
-        return self.bot.create_category(name)
+        category = self.bot.create_category(name)
+        self.snapshot_upsert("channels", category)
+        return category
 
-    def list_guild_channels(self) -> list:
-        """Return every channel in the guild.
+    def list_guild_channels(self, refresh: bool = False) -> list:
+        """Return every channel in the guild, from the guild snapshot.
+
+        Args:
+            refresh: Refetch the snapshot from Discord first.
 
         Returns:
-            List of channel dicts as returned by the Discord API.
+            List of channel dicts (``id``, ``name``, ``type`` and ``parent_id``).
 
         Raises:
-            DiscordAPIError: If the API request fails.
+            DiscordAPIError: If the snapshot has to be fetched and the API
+                request fails.
         """
-        return self.bot.list_guild_channels()
+        return self.get_guild_snapshot(refresh)["channels"]
 
-    def count_category_children(self, category_id: str) -> int:
+    def count_category_children(self, category_id: str, refresh: bool = False) -> int:
         """Count the text channels currently parented to a category.
 
         Args:
             category_id: Discord category (parent) ID.
+            refresh: Refetch the guild snapshot from Discord first.
 
         Returns:
             Number of GUILD_TEXT channels whose ``parent_id`` is ``category_id``.
 
         Raises:
-            DiscordAPIError: If the API request fails.
+            DiscordAPIError: If the snapshot has to be fetched and the API
+                request fails.
         """
         return sum(
             1
-            for c in self.list_guild_channels()
+            for c in self.list_guild_channels(refresh)
             if c.get("parent_id") == category_id and c.get("type") == DISCORD_CHANNEL_TYPE_TEXT
         )
 
@@ -282,6 +410,40 @@ class DiscordService:
         """
         return self.bot.set_channel_permission(channel_id, target_id, allow, type_)
 
+    def sync_channel_members(self, channel_id: str, member_ids: list[str]) -> bool:
+        """Make a channel's player overwrites match a list of members.
+
+        Player overwrites are the member overwrites allowing exactly
+        ``PLAYER_ROLE_PERMISSION``; every other overwrite (``@everyone``, GM,
+        roles, anything added by hand on Discord) is kept as is. The channel is
+        only edited when players were added or removed, and then with a single
+        PATCH carrying the complete overwrite list.
+
+        Args:
+            channel_id: Game channel ID.
+            member_ids: Players who must have access to the channel.
+
+        Returns:
+            True if the channel was edited, False if it was already in sync.
+
+        Raises:
+            DiscordAPIError: If an API request fails.
+        """
+        overwrites = self.bot.get_channel(channel_id).get("permission_overwrites", [])
+        current, kept = set(), []
+        for overwrite in overwrites:
+            if overwrite.get("type") == 1 and overwrite.get("allow") == PLAYER_ROLE_PERMISSION:
+                current.add(overwrite["id"])
+            else:
+                kept.append(overwrite)
+        wanted = set(member_ids) - {overwrite["id"] for overwrite in kept}
+        if wanted == current:
+            return False
+        self.bot.edit_channel_permissions(
+            channel_id, kept + [player_overwrite(m) for m in sorted(wanted)]
+        )
+        return True
+
     def delete_channel_permission(self, channel_id: str, target_id: str) -> dict:
         """Remove a permission overwrite from a channel.
 
@@ -323,7 +485,134 @@ class DiscordService:
         Raises:
             DiscordAPIError: If the API request fails.
         """
-        return self.bot.delete_channel(channel_id)
+        result = self.bot.delete_channel(channel_id)
+        self.snapshot_remove("channels", channel_id)
+        return result
+
+    # -------------------------------------------------------------------------
+    # Guild snapshot
+    # -------------------------------------------------------------------------
+
+    def get_guild_snapshot(self, refresh: bool = False) -> dict:
+        """Return the cached roles and channels of the guild.
+
+        Fetched from Discord (two API calls) only when the snapshot expired or
+        ``refresh`` is set; concurrent misses share one fetch. Roles and
+        channels the app creates or deletes are applied to it in place.
+
+        Args:
+            refresh: Refetch from Discord even if a snapshot is cached.
+
+        Returns:
+            Dict with ``version`` (a stamp increased by every change), ``expires_at``
+            (epoch seconds), ``roles`` and ``channels``.
+
+        Raises:
+            DiscordAPIError: If the snapshot has to be fetched and an API
+                request fails.
+        """
+        return cached_fetch(
+            GUILD_SNAPSHOT_KEY,
+            lambda: (self._fetch_guild_snapshot(), DISCORD_GUILD_SNAPSHOT_TIMEOUT),
+            force=refresh,
+        )
+
+    def store_guild_snapshot(self, roles: list, channels: list) -> None:
+        """Replace the cached snapshot with a complete role and channel list.
+
+        Used when the whole guild is known without fetching it (Gateway
+        ``GUILD_CREATE``).
+
+        Args:
+            roles: Every guild role.
+            channels: Every guild channel.
+        """
+        try:
+            cache.set(
+                GUILD_SNAPSHOT_KEY,
+                self._new_guild_snapshot(roles, channels),
+                timeout=DISCORD_GUILD_SNAPSHOT_TIMEOUT,
+            )
+        except Exception as e:  # noqa: BLE001 - cache backend best-effort
+            logger.warning(f"Could not store the guild snapshot: {e}")
+
+    def snapshot_upsert(self, kind: str, item: dict) -> None:
+        """Add or replace a role or channel in the cached snapshot.
+
+        Args:
+            kind: ``"roles"`` or ``"channels"``.
+            item: Role or channel dict as returned by Discord.
+        """
+        entry = _role_entry(item) if kind == "roles" else _channel_entry(item)
+        self._edit_guild_snapshot(lambda snapshot: _upsert(snapshot[kind], entry))
+
+    def snapshot_remove(self, kind: str, item_id: str) -> None:
+        """Remove a role or channel from the cached snapshot.
+
+        Args:
+            kind: ``"roles"`` or ``"channels"``.
+            item_id: Discord ID of the removed role or channel.
+        """
+
+        def remove(snapshot: dict) -> None:
+            snapshot[kind] = [i for i in snapshot[kind] if i["id"] != item_id]
+
+        self._edit_guild_snapshot(remove)
+
+    def _fetch_guild_snapshot(self) -> dict:
+        """Fetch the guild's roles and channels (concurrently) into a new snapshot."""
+        results = fan_out(self.bot.list_roles, self.bot.list_guild_channels)
+        if errors := failures(results):
+            raise errors[0]
+        return self._new_guild_snapshot(*results)
+
+    def _new_guild_snapshot(self, roles: list, channels: list) -> dict:
+        return {
+            "version": time.time_ns(),
+            "expires_at": time.time() + DISCORD_GUILD_SNAPSHOT_TIMEOUT,
+            "roles": [_role_entry(r) for r in roles],
+            "channels": [_channel_entry(c) for c in channels],
+        }
+
+    def _edit_guild_snapshot(self, edit: Callable[[dict], None]) -> None:
+        """Apply an in-place change to the cached snapshot (best effort).
+
+        Edits are serialised by a short Redis lock (see
+        :func:`~website.utils.single_flight.acquire_lock`): a worker finding it
+        taken waits for it and applies its edit after the holder's, so neither
+        is lost. A snapshot that still cannot be edited (lock held for more
+        than ``SINGLE_FLIGHT_WAIT`` seconds, cache error) is dropped so the
+        next read refetches it, rather than being left stale. The snapshot
+        keeps its original expiry, so it is still refetched periodically.
+        """
+        lock = f"{GUILD_SNAPSHOT_KEY}:edit"
+        try:
+            deadline = time.monotonic() + SINGLE_FLIGHT_WAIT
+            while (token := acquire_lock(lock)) is None:
+                if time.monotonic() >= deadline:
+                    logger.warning("Guild snapshot edit lock busy, dropping the snapshot")
+                    cache.delete(GUILD_SNAPSHOT_KEY)
+                    return
+                time.sleep(SINGLE_FLIGHT_POLL_INTERVAL)
+            try:
+                snapshot = cache.get(GUILD_SNAPSHOT_KEY)
+                if snapshot is None:
+                    return
+                edit(snapshot)
+                snapshot["version"] = max(time.time_ns(), snapshot["version"] + 1)
+                ttl = int(snapshot["expires_at"] - time.time())
+                if ttl > 0:
+                    cache.set(GUILD_SNAPSHOT_KEY, snapshot, timeout=ttl)
+                else:
+                    cache.delete(GUILD_SNAPSHOT_KEY)
+            finally:
+                release_lock(lock, token)
+        except Exception as e:  # noqa: BLE001 - cache backend best-effort
+            logger.warning(f"Could not update the guild snapshot: {e}")
+            try:
+                cache.delete(GUILD_SNAPSHOT_KEY)
+            except Exception:  # noqa: BLE001 - cache backend best-effort
+                pass
 
     # -------------------------------------------------------------------------
     # Message operations
@@ -516,7 +805,9 @@ class DiscordService:
         """Send or update a Discord embed for a game event.
 
         This is a high-level method that builds and sends the appropriate embed
-        based on the embed_type.
+        based on the embed_type. Editing an announcement whose rendered embed and
+        buttons match the last ones sent (fingerprint cached for
+        ``DISCORD_EMBED_FINGERPRINT_TIMEOUT``) makes no Discord call.
 
         Args:
             game: Game model instance.
@@ -574,9 +865,37 @@ class DiscordService:
         # the old inline "Pour s'inscrire" URL field); other embeds have no buttons.
         components = build_annonce_components(game) if embed_type == "annonce" else None
 
-        if embed_type == "annonce" and game.msg_id:
-            response = self.edit_embed(game.msg_id, embed, target, components=components)
-        else:
-            response = self.send_embed(embed, target, components=components)
+        if embed_type != "annonce":
+            return self.send_embed(embed, target, components=components)["id"]
 
-        return response["id"]
+        fingerprint = _embed_fingerprint(embed, target, components)
+        if game.msg_id:
+            if self._cached_fingerprint(game.msg_id) == fingerprint:
+                _count_embed_edit("skipped")
+                return game.msg_id
+            message_id = self.edit_embed(game.msg_id, embed, target, components=components)["id"]
+            _count_embed_edit("sent")
+        else:
+            message_id = self.send_embed(embed, target, components=components)["id"]
+        self._remember_fingerprint(message_id, fingerprint)
+        return message_id
+
+    @staticmethod
+    def _cached_fingerprint(message_id: str) -> str | None:
+        """Return the fingerprint last sent for a message, if still cached."""
+        try:
+            return cache.get(_fingerprint_key(message_id))
+        except Exception:  # noqa: BLE001 - cache backend best-effort
+            return None
+
+    @staticmethod
+    def _remember_fingerprint(message_id: str, fingerprint: str) -> None:
+        """Cache the fingerprint of the content just sent for a message."""
+        try:
+            cache.set(
+                _fingerprint_key(message_id),
+                fingerprint,
+                timeout=DISCORD_EMBED_FINGERPRINT_TIMEOUT,
+            )
+        except Exception:  # noqa: BLE001 - cache backend best-effort
+            pass
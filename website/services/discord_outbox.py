@@ -0,0 +1,394 @@
+"""Service queuing Discord side effects and dispatching them in the background.
+
+Game changes used to call Discord from the request thread right after their
+commit, so every role grant, embed update or channel deletion added Discord's
+latency (and its rate-limit waits) to the page response. Instead,
+:meth:`DiscordOutboxService.enqueue` writes a :class:`DiscordOutbox` row in the
+caller's transaction and :meth:`DiscordOutboxService.dispatch_pending`, run by
+the scheduler every few seconds, sends it with retries.
+
+Operations of one game are sent strictly in order; a failing operation is
+retried with exponential backoff and dead-lettered after
+``OUTBOX_MAX_ATTEMPTS`` attempts (or immediately on a permanent 4xx error).
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+from config.constants import (
+    OUTBOX_ACCESS_SYNC_DEBOUNCE,
+    OUTBOX_ANNONCE_DEBOUNCE,
+    OUTBOX_BACKOFF_BASE,
+    OUTBOX_BACKOFF_MAX,
+    OUTBOX_BATCH_SIZE,
+    OUTBOX_LEASE_SECONDS,
+    OUTBOX_MAX_ATTEMPTS,
+    OUTBOX_RETENTION_DAYS,
+    PLAYER_ROLE_PERMISSION,
+)
+from website.exceptions import DiscordAPIError, DiscordUnavailableError
+from website.extensions import db
+from website.models import DiscordOutbox
+from website.repositories.discord_outbox import DiscordOutboxRepository
+from website.repositories.game import GameRepository
+from website.repositories.guild_member_role import GuildMemberRoleRepository
+from website.services.channel import ChannelService
+from website.services.discord import DiscordService
+from website.utils.logger import logger
+
+
+def _ignore_missing(call, *args):
+    """Run a Discord deletion, treating "already gone" (404) as success."""
+    try:
+        return call(*args)
+    except DiscordAPIError as e:
+        if e.status_code != 404:
+            raise
+        return None
+
+
+def _is_permanent(error: Exception) -> bool:
+    """Whether retrying the operation cannot succeed (a 4xx other than 408/429)."""
+    return (
+        isinstance(error, DiscordAPIError)
+        and isinstance(error.status_code, int)
+        and 400 <= error.status_code < 500
+        and error.status_code not in (408, 429)
+    )
+
+
+class DiscordOutboxService:
+    """Service layer for the Discord outbox.
+
+    :meth:`enqueue` never commits: the operation becomes durable with the
+    caller's own commit (and disappears with its rollback). The dispatcher owns
+    its own transactions.
+    """
+
+    #: Supported operations. Each maps to a ``_send_<action>`` method.
+    ACTIONS = (
+        "grant_access",
+        "revoke_access",
+        "sync_access",
+        "register_embed",
+        "refresh_annonce",
+        "post_annonce",
+        "post_details",
+        "delete_annonce",
+        "delete_channel",
+        "delete_role",
+    )
+
+    def __init__(
+        self,
+        repository=None,
+        discord_service=None,
+        game_repository=None,
+        channel_service=None,
+        settings_service=None,
+        member_role_repository=None,
+    ):
+        from website.services.setting import SettingsService
+
+        self.repo = repository or DiscordOutboxRepository()
+        self.discord = discord_service or DiscordService()
+        self.games = game_repository or GameRepository()
+        self.member_roles = member_role_repository or GuildMemberRoleRepository()
+        self.channel_service = channel_service or ChannelService()
+        self.settings_service = settings_service or SettingsService()
+
+    def enqueue(self, game_id: int | None, action: str, **payload) -> DiscordOutbox:
+        """Queue a Discord operation in the current transaction (no commit).
+
+        Args:
+            game_id: Game the operation belongs to (orders its operations).
+            action: One of :attr:`ACTIONS`.
+            **payload: JSON-serialisable arguments of the operation. Discord IDs
+                needed after the game may be gone are passed here.
+
+        Returns:
+            The flushed DiscordOutbox instance.
+
+        Raises:
+            ValueError: If ``action`` is unknown.
+        """
+        if action not in self.ACTIONS:
+            raise ValueError(f"Unknown outbox action: {action}")
+        return self.repo.add(DiscordOutbox(game_id=game_id, action=action, payload=payload))
+
+    def enqueue_annonce_refresh(self, game_id: int) -> DiscordOutbox:
+        """Queue an announcement embed update, coalesced with any unsent one (no commit).
+
+        The refresh renders the game when it is sent, so a refresh that is
+        still waiting already covers the new state: it is reused instead of
+        queuing another PATCH. A new refresh is held back for
+        ``OUTBOX_ANNONCE_DEBOUNCE`` seconds so changes made in quick
+        succession (close, reopen, auto-close...) collapse into one edit.
+
+        Args:
+            game_id: Game whose announcement must be updated.
+
+        Returns:
+            The pending refresh operation (existing or new).
+        """
+        return self._enqueue_coalesced(game_id, "refresh_annonce", OUTBOX_ANNONCE_DEBOUNCE)
+
+    def enqueue_access_sync(self, game_id: int) -> DiscordOutbox:
+        """Queue a channel overwrite sync, coalesced with any unsent one (no commit).
+
+        Direct-permission games grant channel access through per-member
+        overwrites. Rather than one PUT or DELETE per player, the sync reads
+        the game's players when it is sent and edits the channel once (see
+        :meth:`~website.services.discord.DiscordService.sync_channel_members`),
+        so a batch of registrations or removals costs a single Discord edit.
+        Like the per-player ``grant_access`` it replaces, the sync holds back
+        the game's later operations (e.g. the ``register_embed`` pinging the
+        new player) until it is sent.
+
+        Args:
+            game_id: Game whose channel access changed.
+
+        Returns:
+            The pending sync operation (existing or new).
+        """
+        return self._enqueue_coalesced(game_id, "sync_access", OUTBOX_ACCESS_SYNC_DEBOUNCE)
+
+    def _enqueue_coalesced(
+        self, game_id: int, action: str, debounce: int, **payload
+    ) -> DiscordOutbox:
+        """Reuse the game's unsent ``action`` operation, or queue a debounced one.
+
+        A reused operation only has its payload updated: it keeps its place in
+        the game's queue and its ``next_attempt_at``, so later changes never
+        push the send further back. The debounce applies once, from the first
+        change.
+        """
+        op = self.repo.lock_unclaimed(game_id, action)
+        if op is not None:
+            if payload:
+                op.payload = {**op.payload, **payload}
+            return op
+        op = self.enqueue(game_id, action, **payload)
+        op.next_attempt_at = datetime.now(timezone.utc) + timedelta(seconds=debounce)
+        return op
+
+    def has_pending(self, game_id: int, action: str | None = None) -> bool:
+        """Whether a game still has unsent operations.
+
+        Args:
+            game_id: Game ID.
+            action: Only consider this action, when given.
+
+        Returns:
+            True if at least one matching operation is pending.
+        """
+        return bool(self.repo.find_pending(game_id, action))
+
+    def stats(self) -> dict[str, int]:
+        """Return the number of operations per status (for monitoring)."""
+        return self.repo.count_by_status()
+
+    def dispatch_pending(self, limit: int = OUTBOX_BATCH_SIZE) -> int:
+        """Send due operations, oldest first, until none is left or ``limit`` is hit.
+
+        Safe to run concurrently from several processes: each operation is
+        claimed under ``FOR UPDATE SKIP LOCKED`` and leased for
+        ``OUTBOX_LEASE_SECONDS`` before Discord is called, so no lock is held
+        during the HTTP request and no other dispatcher picks it up meanwhile.
+        Nothing is sent while the Discord circuit breaker is open.
+
+        Args:
+            limit: Maximum number of operations attempted in this run.
+
+        Returns:
+            Number of operations sent successfully.
+        """
+        sent = 0
+        for _ in range(limit):
+            # While the circuit breaker is open, operations stay queued untouched.
+            if not self.discord.is_available():
+                break
+            op = self._claim()
+            if op is None:
+                break
+            if self._send(op):
+                sent += 1
+        return sent
+
+    def prune(self, retention_days: int = OUTBOX_RETENTION_DAYS) -> int:
+        """Delete sent operations older than the retention window and commit.
+
+        Args:
+            retention_days: Operations sent more than this many days ago are deleted.
+
+        Returns:
+            Number of deleted rows.
+        """
+        cutoff = datetime.now(timezone.utc) - timedelta(days=retention_days)
+        deleted = self.repo.prune(cutoff)
+        db.session.commit()
+        return deleted
+
+    # -------------------------------------------------------------------------
+    # Dispatcher internals
+    # -------------------------------------------------------------------------
+
+    def _claim(self) -> DiscordOutbox | None:
+        """Lease the next due operation and commit the lease."""
+        now = datetime.now(timezone.utc)
+        op = self.repo.lock_next_due(now)
+        if op is None:
+            db.session.commit()
+            return None
+        op.attempts += 1
+        op.next_attempt_at = now + timedelta(seconds=OUTBOX_LEASE_SECONDS)
+        db.session.commit()
+        return op
+
+    def _send(self, op: DiscordOutbox) -> bool:
+        """Run one leased operation and record its outcome.
+
+        Returns:
+            True if the operation was sent.
+        """
+        try:
+            getattr(self, f"_send_{op.action}")(op)
+        except Exception as e:
+            db.session.rollback()
+            self._record_failure(op, e)
+            return False
+
+        op.status = "done"
+        op.last_error = None
+        op.processed_at = datetime.now(timezone.utc)
+        db.session.commit()
+        return True
+
+    def _record_failure(self, op: DiscordOutbox, error: Exception) -> None:
+        """Schedule a retry with exponential backoff, or dead-letter the operation.
+
+        An operation refused by the open circuit breaker was never sent: it is
+        deferred until the breaker probes Discord again, without using up an
+        attempt.
+        """
+        now = datetime.now(timezone.utc)
+        op.last_error = str(error)
+        if isinstance(error, DiscordUnavailableError):
+            op.attempts -= 1
+            op.next_attempt_at = now + timedelta(seconds=error.retry_after)
+            logger.info(
+                f"Discord outbox operation {op.id} ({op.action}) for game {op.game_id} "
+                f"deferred for {error.retry_after:.0f}s: Discord is unavailable"
+            )
+            db.session.commit()
+            return
+        if _is_permanent(error) or op.attempts >= OUTBOX_MAX_ATTEMPTS:
+            op.status = "dead"
+            op.processed_at = now
+            logger.error(
+                f"Discord outbox operation {op.id} ({op.action}) for game {op.game_id} "
+                f"dead-lettered after {op.attempts} attempt(s): {error}"
+            )
+        else:
+            delay = min(OUTBOX_BACKOFF_BASE * 2 ** (op.attempts - 1), OUTBOX_BACKOFF_MAX)
+            op.next_attempt_at = now + timedelta(seconds=delay)
+            logger.warning(
+                f"Discord outbox operation {op.id} ({op.action}) for game {op.game_id} "
+                f"failed (attempt {op.attempts}), retrying in {delay}s: {error}"
+            )
+        db.session.commit()
+
+    # -------------------------------------------------------------------------
+    # Operations
+    # -------------------------------------------------------------------------
+
+    def _send_grant_access(self, op: DiscordOutbox) -> None:
+        """Give a player access to the game channel (role, or member overwrite).
+
+        Direct-permission games now queue ``sync_access`` instead; the member
+        overwrite branch still sends operations queued before that change.
+        """
+        p = op.payload
+        if p.get("role_id"):
+            self.discord.add_role_to_user(p["user_id"], p["role_id"])
+            self.member_roles.add_role(p["user_id"], p["role_id"])
+        elif p.get("channel_id"):
+            self.discord.set_channel_permission(
+                p["channel_id"], p["user_id"], PLAYER_ROLE_PERMISSION
+            )
+
+    def _send_revoke_access(self, op: DiscordOutbox) -> None:
+        """Remove a player's access to the game channel."""
+        p = op.payload
+        if p.get("role_id"):
+            _ignore_missing(self.discord.remove_role_from_user, p["user_id"], p["role_id"])
+            self.member_roles.remove_role(p["user_id"], p["role_id"])
+        elif p.get("channel_id"):
+            _ignore_missing(self.discord.delete_channel_permission, p["channel_id"], p["user_id"])
+
+    def _send_sync_access(self, op: DiscordOutbox) -> None:
+        """Match the game channel's member overwrites to the current players."""
+        game = self.games.get_by_id(op.game_id)
+        if game is None or game.role or not game.channel or game.status == "archived":
+            return
+        _ignore_missing(
+            self.discord.sync_channel_members, game.channel, [p.id for p in game.players]
+        )
+
+    def _send_register_embed(self, op: DiscordOutbox) -> None:
+        """Post the "new player" embed in the game channel."""
+        game = self.games.get_by_id(op.game_id)
+        if game is not None:
+            self.discord.send_game_embed(game, embed_type="register", player=op.payload["user_id"])
+
+    def _send_refresh_annonce(self, op: DiscordOutbox) -> None:
+        """Re-render the announcement embed from the game's current state."""
+        game = self.games.get_by_id(op.game_id)
+        if game is not None and game.msg_id:
+            self.discord.send_game_embed(game, embed_type="annonce")
+
+    def _send_post_annonce(self, op: DiscordOutbox) -> None:
+        """Post the announcement (or edit it, if already posted) and store its ID."""
+        game = self.games.get_by_id(op.game_id)
+        if game is not None:
+            game.msg_id = self.discord.send_game_embed(game, embed_type="annonce")
+
+    def _send_post_details(self, op: DiscordOutbox) -> None:
+        """Post and pin the details embed in the game channel.
+
+        The posted message ID is saved on the operation before pinning, so a
+        retry after a failed pin does not post the embed twice.
+        """
+        game = self.games.get_by_id(op.game_id)
+        if game is None or not game.channel:
+            return
+        msg_id = op.payload.get("message_id")
+        if not msg_id:
+            msg_id = self.discord.send_game_embed(game, embed_type="annonce_details")
+            op.payload = {**op.payload, "message_id": msg_id}
+            db.session.commit()
+        self.discord.pin_message(msg_id, game.channel)
+
+    def _send_delete_annonce(self, op: DiscordOutbox) -> None:
+        """Delete the announcement message and forget its ID."""
+        game = self.games.get_by_id(op.game_id)
+        msg_id = (game.msg_id if game is not None else None) or op.payload.get("message_id")
+        if msg_id:
+            _ignore_missing(
+                self.discord.delete_message, msg_id, self.settings_service.get("POSTS_CHANNEL_ID")
+            )
+        if game is not None:
+            game.msg_id = None
+
+    def _send_delete_channel(self, op: DiscordOutbox) -> None:
+        """Delete the game channel and free its slot in the parent category."""
+        deleted = _ignore_missing(self.discord.delete_channel, op.payload["channel_id"])
+        # Discord returns the deleted channel, parent category included, which
+        # saves a separate lookup before the deletion.
+        if isinstance(deleted, dict):
+            self.channel_service.decrement_size(deleted.get("parent_id"))
+
+    def _send_delete_role(self, op: DiscordOutbox) -> None:
+        """Delete the game's player role."""
+        _ignore_missing(self.discord.delete_role, op.payload["role_id"])
@@ -16,7 +16,6 @@ from config.constants import (
     SITE_BASE_URL,
 )
 from website.exceptions import (
-    DiscordAPIError,
     DuplicateRegistrationError,
     GameClosedError,
     GameFullError,
@@ -31,6 +30,7 @@ from website.services.channel import ChannelService
 from website.services.game_session import GameSessionService
 from website.services.trophy import TrophyService
 from website.services.user import UserService
+from website.utils.fan_out import fan_out
 from website.utils.logger import log_game_event, logger
 
 
@@ -39,6 +39,10 @@ class GameService:
 
     Handles game creation, updates, status transitions, player registration,
     and Discord integration. Owns transaction boundaries (commits).
+
+    Discord resources whose IDs are needed right away (role, channel) are
+    created synchronously; every other Discord side effect is queued in the
+    Discord outbox within the same transaction and sent in the background.
     """
 
     def __init__(
@@ -50,8 +54,10 @@ class GameService:
         trophy_service=None,
         discord_service=None,
         settings_service=None,
+        outbox_service=None,
     ):
         from website.services.discord import DiscordService
+        from website.services.discord_outbox import DiscordOutboxService
         from website.services.setting import SettingsService
 
         self.repo = repository or GameRepository()
@@ -61,6 +67,12 @@ class GameService:
         self.trophy_service = trophy_service or TrophyService()
         self.discord = discord_service or DiscordService()
         self.settings_service = settings_service or SettingsService()
+        self.outbox = outbox_service or DiscordOutboxService(
+            discord_service=self.discord,
+            game_repository=self.repo,
+            channel_service=self.channel_service,
+            settings_service=self.settings_service,
+        )
 
     def list_all(self) -> list[Game]:
         """List all games ordered by date (most recent first).
@@ -96,6 +108,14 @@ class GameService:
             "open_hidden": max(open_total - len(open_games), 0),
         }
 
+    @staticmethod
+    def _mark_dashboard_stats_stale(*user_ids: str) -> None:
+        """Flag the dashboard statistics of the given users for recomputation (no commit)."""
+        from website.services.stats import StatsService
+
+        db.session.flush()
+        StatsService().mark_stale(*user_ids)
+
     @staticmethod
     def _invalidate_dashboard_stats(*user_ids: str) -> None:
         """Drop cached dashboard stats for the given users (ignoring falsy IDs)."""
@@ -172,13 +192,17 @@ class GameService:
             ValidationError: If a field value is invalid.
         """
         game = self.get_by_id(game_id)
+        previous_gm_id = game.gm_id
 
         try:
             # Slug is protected by update_from_dict; the admin may edit it explicitly.
             if "slug" in data:
                 game.slug = data["slug"]
             game.update_from_dict(data)
+            affected = [previous_gm_id, game.gm_id, *(p.id for p in game.players)]
+            self._mark_dashboard_stats_stale(*affected)
             db.session.commit()
+            self._invalidate_dashboard_stats(*affected)
             logger.info(f"Game {game.id} updated via admin panel")
             return game
         except ValidationError:
@@ -364,6 +388,7 @@ class GameService:
                 self._setup_game_resources(game)
                 logger.info("Game post-creation setup completed.")
 
+            self._mark_dashboard_stats_stale(game.gm_id)
             db.session.commit()
             log_game_event(
                 "create",
@@ -390,6 +415,9 @@ class GameService:
     def _setup_game_resources(self, game: Game) -> None:
         """Set up Discord resources for a game (role, channel, session, channel message).
 
+        The role and channel are created right away (their IDs are stored on the
+        game); the pinned details message is queued in the outbox.
+
         Args:
             game: Game instance.
 
@@ -417,22 +445,23 @@ class GameService:
             )["id"]
             logger.info(f"Role created with ID: {game.role}")
 
-        # Create Discord channel (without a player-role overwrite in direct mode)
+        # Create Discord channel. In direct mode it has no player-role overwrite;
+        # players already on the game get their member overwrites in the same call.
         category = self.channel_service.get_category(game.type)
         game.channel = self.discord.create_channel(
             name=game.slug.lower(),
             parent_id=category.id,
             role_id=game.role,
             gm_id=game.gm_id,
+            member_ids=[p.id for p in game.players] if direct_permissions else (),
         )["id"]
         logger.info(f"Channel created with ID: {game.channel} under category: {category.id}")
 
         self.channel_service.increment_size(category)
 
         # Post and pin initial message in the game channel
-        msg_id = self.discord.send_game_embed(game, embed_type="annonce_details")
-        self.discord.pin_message(msg_id, game.channel)
-        logger.info("Initial channel message posted and pinned.")
+        self.outbox.enqueue(game.id, "post_details")
+        logger.info("Initial channel message queued.")
 
     def _rollback_discord_resources(self, game: Game) -> None:
         """Rollback Discord resources on error.
@@ -440,12 +469,30 @@ class GameService:
         Args:
             game: Game instance with potentially created resources.
         """
-        if game.channel:
-            self.discord.delete_channel(game.channel)
-            logger.info(f"Channel {game.channel} deleted")
-        if game.role:
-            self.discord.delete_role(game.role)
-            logger.info(f"Role {game.role} deleted")
+        self._delete_discord_resources(game.channel, game.role)
+
+    def _delete_discord_resources(self, channel_id: str | None, role_id: str | None) -> None:
+        """Delete a channel and a role right away, concurrently.
+
+        Used to undo a failed creation. Failures are logged rather than raised,
+        so the error that caused the rollback is the one that surfaces.
+
+        Args:
+            channel_id: Channel to delete, if any.
+            role_id: Role to delete, if any.
+        """
+        calls, labels = [], []
+        if channel_id:
+            calls.append(lambda: self.discord.delete_channel(channel_id))
+            labels.append(f"Channel {channel_id}")
+        if role_id:
+            calls.append(lambda: self.discord.delete_role(role_id))
+            labels.append(f"Role {role_id}")
+        for label, result in zip(labels, fan_out(*calls)):
+            if isinstance(result, Exception):
+                logger.error(f"{label} could not be deleted during rollback: {result}")
+            else:
+                logger.info(f"{label} deleted")
 
     def update(self, slug: str, data: dict, user_id: str | None = None) -> Game:
         """Update an existing game.
@@ -501,21 +548,16 @@ class GameService:
             game.img = data.get("img")
             game.restriction = data["restriction"]
             game.restriction_tags = parse_restriction_tags(data)
+            self._queue_annonce_refresh(game)
 
+            # The system (and, for drafts, the type) may have changed.
+            self._mark_dashboard_stats_stale(game.gm_id, *(p.id for p in game.players))
             db.session.commit()
             log_game_event(
                 "edit", game.id, "Le contenu de l'annonce a été édité.", user_id=user_id
             )
             logger.info(f"Game {game.id} changes saved")
 
-            # Update Discord embed if message exists
-            if game.msg_id:
-                try:
-                    self.discord.send_game_embed(game, embed_type="annonce")
-                    logger.info(f"Embed updated for game {game.id}")
-                except DiscordAPIError as e:
-                    logger.warning(f"Failed to update Discord embed for game {game.id}: {e}")
-
             return game
 
         except ValidationError:
@@ -554,7 +596,7 @@ class GameService:
         """
         game = self.get_by_slug(slug)
 
-        if game.msg_id:
+        if game.msg_id or self.outbox.has_pending(game.id, "post_annonce"):
             raise ValidationError("Game is already published.", field="status")
 
         if len(game.players) >= game.party_size:
@@ -592,11 +634,14 @@ class GameService:
                 created_channel = game.channel
                 created_role = game.role
 
-            # Send Discord announcement if not silent
+            # Queue the Discord announcement if not silent; the dispatcher stores
+            # its message ID on the game once posted.
             if not silent:
-                game.msg_id = self.discord.send_game_embed(game, embed_type="annonce")
-                logger.info(f"Discord embed sent with message ID: {game.msg_id}")
+                self.outbox.enqueue(game.id, "post_annonce")
+                logger.info(f"Discord announcement queued for game {game.id}")
 
+            # A published game starts counting in everyone's statistics.
+            self._mark_dashboard_stats_stale(game.gm_id, *(p.id for p in game.players))
             db.session.commit()
             log_game_event(
                 "edit",
@@ -620,10 +665,7 @@ class GameService:
             # Only undo Discord resources created during THIS publish. Resources
             # from a prior silent publish must survive a failed re-publish —
             # deleting them here is what previously wiped users' game channels.
-            if created_channel:
-                self.discord.delete_channel(created_channel)
-            if created_role:
-                self.discord.delete_role(created_role)
+            self._delete_discord_resources(created_channel, created_role)
             raise
 
     def close(self, slug: str, user_id: str | None = None) -> Game:
@@ -641,6 +683,7 @@ class GameService:
         """
         game = self.get_by_slug(slug)
         game.status = "closed"
+        self._queue_annonce_refresh(game)
 
         db.session.commit()
         log_game_event(
@@ -648,14 +691,6 @@ class GameService:
         )
         logger.info(f"Game status for {game.id} has been updated to closed")
 
-        # Update Discord embed
-        if game.msg_id:
-            try:
-                self.discord.send_game_embed(game, embed_type="annonce")
-                logger.info(f"Embed updated due to status change for game {game.id}")
-            except DiscordAPIError as e:
-                logger.warning(f"Failed to update embed on status change for game {game.id}: {e}")
-
         return game
 
     def reopen(self, slug: str, user_id: str | None = None) -> Game:
@@ -673,6 +708,7 @@ class GameService:
         """
         game = self.get_by_slug(slug)
         game.status = "open"
+        self._queue_annonce_refresh(game)
 
         db.session.commit()
         log_game_event(
@@ -680,14 +716,6 @@ class GameService:
         )
         logger.info(f"Game status for {game.id} has been updated to open")
 
-        # Update Discord embed
-        if game.msg_id:
-            try:
-                self.discord.send_game_embed(game, embed_type="annonce")
-                logger.info(f"Embed updated due to status change for game {game.id}")
-            except DiscordAPIError as e:
-                logger.warning(f"Failed to update embed on status change for game {game.id}: {e}")
-
         return game
 
     def archive(self, slug: str, award_trophies: bool = True, user_id: str | None = None) -> None:
@@ -710,6 +738,10 @@ class GameService:
             return
         game.status = "archived"
 
+        # Clean up Discord resources (queued with the status change)
+        self._cleanup_discord_resources(game)
+        self._delete_game_message(game)
+
         db.session.commit()
         log_game_event("edit", game.id, "L'annonce a été archivée.", user_id=user_id)
         logger.info(f"Game status for {game.id} has been updated to archived")
@@ -722,10 +754,6 @@ class GameService:
         else:
             msg += " Badges non-distribués."
 
-        # Clean up Discord resources
-        self._cleanup_discord_resources(game)
-        self._delete_game_message(game)
-
         log_game_event("delete", game.id, msg, user_id=user_id)
 
         # Awarded badges + a now-archived game change everyone's stats.
@@ -751,27 +779,31 @@ class GameService:
                 logger.error(f"Failed to award trophies for game {game.id}: {e}")
 
     def _cleanup_discord_resources(self, game: Game) -> None:
-        """Clean up Discord resources for a game.
+        """Queue the deletion of a game's Discord channel and role (no commit).
+
+        The channel deletion also frees the channel's slot in its category.
 
         Args:
             game: Game instance.
         """
-        self.channel_service.adjust_category_size(self.discord, game)
-
-        try:
-            self.discord.delete_channel(game.channel)
-            logger.info(f"Game {game.id} channel {game.channel} has been deleted")
-        except DiscordAPIError as e:
-            logger.warning(f"Failed to delete channel for game {game.id}: {e}")
+        if game.channel:
+            self.outbox.enqueue(game.id, "delete_channel", channel_id=game.channel)
+            logger.info(f"Game {game.id} channel {game.channel} queued for deletion")
 
         # Direct-permission games have no role (per-member overwrites are removed
         # with the channel), so only delete a role when one exists.
         if game.role:
-            try:
-                self.discord.delete_role(game.role)
-                logger.info(f"Game {game.id} role {game.role} has been deleted")
-            except DiscordAPIError as e:
-                logger.warning(f"Failed to delete role for game {game.id}: {e}")
+            self.outbox.enqueue(game.id, "delete_role", role_id=game.role)
+            logger.info(f"Game {game.id} role {game.role} queued for deletion")
+
+    def _queue_annonce_refresh(self, game: Game) -> None:
+        """Queue an update of the announcement embed, if the game has one (no commit).
+
+        Args:
+            game: Game instance whose state changed.
+        """
+        if game.msg_id:
+            self.outbox.enqueue_annonce_refresh(game.id)
 
     def _auto_close_if_full(self, game: Game) -> None:
         """Close the game and update the Discord embed if it has reached capacity.
@@ -783,12 +815,7 @@ class GameService:
             return
 
         game.status = "closed"
-        if game.msg_id:
-            try:
-                self.discord.send_game_embed(game, embed_type="annonce")
-                logger.info(f"Embed updated due to status change for game {game.id}")
-            except DiscordAPIError as e:
-                logger.warning(f"Failed to update embed on status change for game {game.id}: {e}")
+        self._queue_annonce_refresh(game)
         log_game_event(
             "edit",
             game.id,
@@ -869,21 +896,20 @@ class GameService:
         log_game_event("register", game.id, msg, user_id=user.id)
 
     def _delete_game_message(self, game: Game) -> None:
-        """Delete Discord announcement message.
+        """Queue the deletion of the Discord announcement message (no commit).
+
+        The game's ``msg_id`` is cleared once the message is actually deleted.
+        An announcement still waiting in the outbox is deleted right after it
+        is posted.
 
         Args:
             game: Game instance.
         """
-        if not game.msg_id:
+        if not game.msg_id and not self.outbox.has_pending(game.id, "post_annonce"):
             return
 
-        try:
-            self.discord.delete_message(game.msg_id, self.settings_service.get("POSTS_CHANNEL_ID"))
-            game.msg_id = None
-            db.session.commit()
-            logger.info(f"Discord embed message deleted for archived game {game.id}")
-        except DiscordAPIError as e:
-            logger.warning(f"Failed to delete message for archived game {game.id}: {e}")
+        self.outbox.enqueue(game.id, "delete_annonce", message_id=game.msg_id)
+        logger.info(f"Discord embed message queued for deletion for archived game {game.id}")
 
     def delete(self, slug: str) -> None:
         """Delete a game permanently.
@@ -897,6 +923,7 @@ class GameService:
         game = self.get_by_slug(slug)
         affected = [game.gm_id, *(p.id for p in game.players)]
         self.repo.delete_by_id(game.id)
+        self._mark_dashboard_stats_stale(*affected)
         db.session.commit()
         logger.info(f"Game {game.id} has been deleted.")
         self._invalidate_dashboard_stats(*affected)
@@ -936,27 +963,22 @@ class GameService:
             locked_game.players.append(user)
             self._auto_close_if_full(locked_game)
 
+            # Grant channel access: dedicated role, or a sync of the channel's
+            # member overwrites when the game runs in direct-permission mode.
+            if locked_game.role:
+                self.outbox.enqueue(
+                    locked_game.id, "grant_access", user_id=user.id, role_id=locked_game.role
+                )
+            elif locked_game.channel:
+                self.outbox.enqueue_access_sync(locked_game.id)
+            self.outbox.enqueue(locked_game.id, "register_embed", user_id=user.id)
+
+            self._mark_dashboard_stats_stale(user.id, locked_game.gm_id)
             db.session.commit()
 
             self._log_registration_event(locked_game, user, force)
             logger.info(f"User {user.id} registered to Game {locked_game.id}")
 
-            # Grant channel access: dedicated role, or a per-member permission
-            # overwrite when the game runs in direct-permission mode (no role).
-            if locked_game.role:
-                self.discord.add_role_to_user(user.id, locked_game.role)
-                logger.info(f"Role {locked_game.role} added to user {user.id}")
-            elif locked_game.channel:
-                self.discord.set_channel_permission(
-                    locked_game.channel, user.id, PLAYER_ROLE_PERMISSION
-                )
-                logger.info(
-                    f"Channel permission granted to user {user.id} on {locked_game.channel}"
-                )
-
-            # Send registration embed
-            self.discord.send_game_embed(locked_game, embed_type="register", player=user.id)
-
             self._invalidate_dashboard_stats(user.id, locked_game.gm_id)
             return locked_game
 
@@ -994,25 +1016,21 @@ class GameService:
         game.players.remove(user)
         reopened = self._auto_reopen_if_space(game)
 
-        db.session.commit()
-        logger.info(f"User {user.id} removed from Game {game.id}")
-
         # Refresh the announcement embed so its title and register button reflect
         # the reopened status.
-        if reopened and game.msg_id:
-            try:
-                self.discord.send_game_embed(game, embed_type="annonce")
-            except DiscordAPIError as e:
-                logger.warning(f"Failed to update embed on status change for game {game.id}: {e}")
+        if reopened:
+            self._queue_annonce_refresh(game)
 
-        # Revoke channel access: dedicated role, or the per-member permission
-        # overwrite when the game runs in direct-permission mode (no role).
+        # Revoke channel access: dedicated role, or a sync of the channel's
+        # member overwrites when the game runs in direct-permission mode.
         if game.role:
-            self.discord.remove_role_from_user(user.id, game.role)
-            logger.info(f"Role {game.role} removed from Player {user.id}")
+            self.outbox.enqueue(game.id, "revoke_access", user_id=user.id, role_id=game.role)
         elif game.channel:
-            self.discord.delete_channel_permission(game.channel, user.id)
-            logger.info(f"Channel permission removed from user {user.id} on {game.channel}")
+            self.outbox.enqueue_access_sync(game.id)
+
+        self._mark_dashboard_stats_stale(user.id, game.gm_id)
+        db.session.commit()
+        logger.info(f"User {user.id} removed from Game {game.id}")
 
         log_game_event(
             "unregister",
@@ -6,7 +6,7 @@ import calendar
 from datetime import datetime
 from typing import TYPE_CHECKING
 
-from config.constants import GAME_STATUS_DRAFT, MAX_SESSION_DURATION_HOURS
+from config.constants import GAME_TYPE_ONESHOT, MAX_SESSION_DURATION_HOURS
 from website.exceptions import SessionConflictError, ValidationError
 from website.extensions import cache, db
 from website.models import GameSession
@@ -54,6 +54,7 @@ class GameSessionService:
         session = GameSession(start=start, end=end)
         self.repo.add(session)
         game.sessions.append(session)
+        self._mark_stats_stale(game)
         db.session.commit()
         logger.info(f"Session added for game {game.id} from {start} to {end}")
         self._invalidate_stats(game)
@@ -70,6 +71,7 @@ class GameSessionService:
         start = session.start
         end = session.end
         self.repo.delete(session)
+        self._mark_stats_stale(game)
         db.session.commit()
         logger.info(f"Session removed for game {game_id} from {start} to {end}")
         self._invalidate_stats(game)
@@ -99,6 +101,7 @@ class GameSessionService:
 
         session.start = new_start
         session.end = new_end
+        self._mark_stats_stale(game)
         db.session.commit()
         logger.info(f"Session {session.id} updated to {new_start} - {new_end}")
         self._invalidate_stats(game)
@@ -166,7 +169,7 @@ class GameSessionService:
             999999,
         )
 
-        sessions = self.find_in_range(base_day, last_day)
+        rows = self.repo.find_report_rows(base_day, last_day)
 
         num_os = 0
         num_campaign = 0
@@ -174,20 +177,16 @@ class GameSessionService:
         campaign_games: dict[str, dict] = {}
         gm_names: list[str] = []
 
-        for session in sessions:
-            game = session.game
-            # Draft (unpublished) games must never contribute to statistics.
-            if game.status == GAME_STATUS_DRAFT:
-                continue
-
-            if game.type == "oneshot":
+        # Draft (unpublished) games are filtered out by the query.
+        for row in rows:
+            if row.type == GAME_TYPE_ONESHOT:
                 num_os += 1
-                self._accumulate_game(os_games, game)
+                self._accumulate_game(os_games, row)
             else:
                 num_campaign += 1
-                self._accumulate_game(campaign_games, game)
+                self._accumulate_game(campaign_games, row)
 
-            gm_names.append(game.gm.name)
+            gm_names.append(row.gm_name)
 
         return {
             "base_day": base_day,
@@ -200,7 +199,7 @@ class GameSessionService:
         }
 
     @staticmethod
-    def _accumulate_game(bucket: dict[str, dict], game) -> None:
+    def _accumulate_game(bucket: dict[str, dict], row) -> None:
         """Tally one session's game into a system-keyed breakdown bucket.
 
         Groups games by system name, then by slug, incrementing a per-game
@@ -210,13 +209,22 @@ class GameSessionService:
         Args:
             bucket: System-keyed mapping being built (``os_games`` or
                 ``campaign_games``); mutated in place.
-            game: Game owning the current session.
+            row: Report row of the current session (see
+                :meth:`GameSessionRepository.find_report_rows`).
         """
-        system_games = bucket.setdefault(game.system.name, {})
-        if game.slug in system_games:
-            system_games[game.slug]["count"] += 1
+        system_games = bucket.setdefault(row.system_name, {})
+        if row.slug in system_games:
+            system_games[row.slug]["count"] += 1
         else:
-            system_games[game.slug] = {"name": game.name, "gm": game.gm.name, "count": 1}
+            system_games[row.slug] = {"name": row.name, "gm": row.gm_name, "count": 1}
+
+    @staticmethod
+    def _mark_stats_stale(game) -> None:
+        """Flag the statistics of everyone involved in the game for recomputation (no commit)."""
+        from website.services.stats import StatsService
+
+        db.session.flush()
+        StatsService().mark_stale_for_game(game)
 
     @staticmethod
     def _invalidate_stats(game) -> None:
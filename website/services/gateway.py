@@ -0,0 +1,123 @@
+"""Gateway event service for applying pushed Discord events."""
+
+from collections import Counter
+
+from config.constants import DISCORD_CHANNEL_TYPE_TEXT
+from website.services.channel import ChannelService
+from website.services.discord import DiscordService
+from website.services.permission import PermissionService
+from website.services.user import UserService
+from website.utils.logger import logger
+
+
+class GatewayEventService:
+    """Apply Discord Gateway events to users, role memberships and categories.
+
+    Member events update the user row, the ``guild_member_role`` index and the
+    related cache keys; role and channel events are applied to the cached guild
+    snapshot, and channel events also recount the affected categories. The
+    guild's text channels are kept in memory (seeded by ``GUILD_CREATE``, which
+    Discord sends after every IDENTIFY, along with a full snapshot), so no
+    event costs an API call.
+
+    Attributes:
+        guild_id: Guild whose events are applied; others are ignored.
+        channel_parents: Text channel ID to parent category ID.
+        synced: Whether ``GUILD_CREATE`` seeded the channels yet; until then,
+            channel events cannot be counted reliably.
+    """
+
+    def __init__(
+        self,
+        guild_id: str,
+        user_service=None,
+        channel_service=None,
+        permission_service=None,
+        discord_service=None,
+    ):
+        self.guild_id = str(guild_id)
+        self.users = user_service or UserService()
+        self.channels = channel_service or ChannelService()
+        self.permissions = permission_service or PermissionService()
+        self.discord = discord_service or DiscordService()
+        self.channel_parents: dict[str, str | None] = {}
+        self.synced = False
+        self._handlers = {
+            "GUILD_CREATE": self._on_guild_create,
+            "GUILD_MEMBER_ADD": self._on_member_update,
+            "GUILD_MEMBER_UPDATE": self._on_member_update,
+            "GUILD_MEMBER_REMOVE": self._on_member_remove,
+            "GUILD_ROLE_CREATE": self._on_role_update,
+            "GUILD_ROLE_UPDATE": self._on_role_update,
+            "GUILD_ROLE_DELETE": self._on_role_delete,
+            "CHANNEL_CREATE": self._on_channel_update,
+            "CHANNEL_UPDATE": self._on_channel_update,
+            "CHANNEL_DELETE": self._on_channel_delete,
+        }
+
+    def handle(self, event: str, data: dict) -> None:
+        """Apply one Gateway DISPATCH event.
+
+        Args:
+            event: Event name (e.g. ``GUILD_MEMBER_UPDATE``).
+            data: Event payload.
+        """
+        handler = self._handlers.get(event)
+        if handler is None:
+            return
+        guild_id = data.get("id") if event == "GUILD_CREATE" else data.get("guild_id")
+        if str(guild_id) != self.guild_id:
+            return
+        handler(data)
+
+    def _on_guild_create(self, data: dict) -> None:
+        channels, roles = data.get("channels", []), data.get("roles", [])
+        self.discord.store_guild_snapshot(roles, channels)
+        self.channel_parents = {
+            c["id"]: c.get("parent_id")
+            for c in channels
+            if c.get("type") == DISCORD_CHANNEL_TYPE_TEXT
+        }
+        self.channels.sync_sizes(self._channel_counts())
+        self.synced = True
+        logger.info(
+            f"Gateway synced guild {self.guild_id}: {len(self.channel_parents)} text "
+            f"channels, {len(roles)} roles"
+        )
+
+    def _on_member_update(self, data: dict) -> None:
+        user_id = data["user"]["id"]
+        self.users.apply_member(data, self.guild_id)
+        self.permissions.invalidate_user(user_id)
+
+    def _on_member_remove(self, data: dict) -> None:
+        user_id = data["user"]["id"]
+        self.users.remove_member(user_id)
+        self.permissions.invalidate_user(user_id)
+
+    def _on_role_update(self, data: dict) -> None:
+        self.discord.snapshot_upsert("roles", data["role"])
+
+    def _on_role_delete(self, data: dict) -> None:
+        self.users.forget_role(data["role_id"])
+        self.discord.snapshot_remove("roles", data["role_id"])
+
+    def _on_channel_update(self, data: dict) -> None:
+        self.discord.snapshot_upsert("channels", data)
+        old_parent = self.channel_parents.pop(data["id"], None)
+        new_parent = None
+        if data.get("type") == DISCORD_CHANNEL_TYPE_TEXT:
+            new_parent = self.channel_parents[data["id"]] = data.get("parent_id")
+        self._sync_categories(old_parent, new_parent)
+
+    def _on_channel_delete(self, data: dict) -> None:
+        self.discord.snapshot_remove("channels", data["id"])
+        self._sync_categories(self.channel_parents.pop(data["id"], None))
+
+    def _channel_counts(self) -> dict[str, int]:
+        return Counter(parent for parent in self.channel_parents.values() if parent)
+
+    def _sync_categories(self, *category_ids: str | None) -> None:
+        affected = {category_id for category_id in category_ids if category_id}
+        if affected and self.synced:
+            self.channels.sync_sizes(self._channel_counts(), affected)
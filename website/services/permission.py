@@ -160,9 +160,19 @@ class PermissionService:
             subject_type: ``"role"`` or ``"user"``.
             subject_id: Discord role or user ID affected.
         """
-        if subject_type != PermissionGrant.SUBJECT_USER:
-            return
+        if subject_type == PermissionGrant.SUBJECT_USER:
+            self.invalidate_user(subject_id)
+
+    @staticmethod
+    def invalidate_user(user_id: str) -> None:
+        """Drop a user's cached permission set (best effort).
+
+        Used after a grant change and when the user's Discord roles change.
+
+        Args:
+            user_id: Discord user ID.
+        """
         try:
-            cache.delete(_user_cache_key(subject_id))
+            cache.delete(_user_cache_key(user_id))
         except Exception as exc:  # noqa: BLE001 - best-effort cache invalidation
-            logger.warning("Failed to invalidate permissions for %s: %s", subject_id, exc)
+            logger.warning("Failed to invalidate permissions for %s: %s", user_id, exc)
@@ -1,14 +1,18 @@
 """Per-user dashboard statistics and agenda aggregation.
 
 Computes the data behind the dashboard's "Mes prochaines sessions" agenda and
-"Mes statistiques" panel. All public results are plain, JSON-serialisable dicts
-(no ORM instances) so they can be safely memoised in the request/Redis cache,
-keyed by user — repeated dashboard loads do not re-hit the database.
+"Mes statistiques" panel. The statistics figures are read from the user's
+:class:`~website.models.UserStats` row and the network from their
+:class:`~website.models.CoPlay` edges. A change to the user's games,
+sessions or registrations only flags the row, in the change's transaction; a
+scheduler job (:meth:`StatsService.refresh_stale`) recomputes flagged rows and
+their edges in the background. The agenda and network are memoised per user in
+the Redis cache.
+All public results are plain, JSON-serialisable dicts (no ORM instances).
 """
 
 from __future__ import annotations
 
-from collections import Counter
 from datetime import datetime
 
 from dateutil.relativedelta import relativedelta
@@ -22,17 +26,36 @@ from config.constants import (
     GAME_TYPE_CAMPAIGN,
     GAME_TYPE_ONESHOT,
     RESTRICTION_LABELS,
+    STATS_REFRESH_BATCH_SIZE,
     STATS_TOP_GLOBAL,
 )
 from website.extensions import cache, db
-from website.models import User
+from website.models import System, UserStats, Vtt
+from website.repositories.co_play import CoPlayRepository
 from website.repositories.game import GameRepository
+from website.repositories.game_session import GameSessionRepository
 from website.repositories.system import SystemRepository
 from website.repositories.trophy import TrophyRepository
 from website.repositories.user import UserRepository
+from website.repositories.user_stats import UserStatsRepository
 from website.repositories.vtt import VttRepository
+from website.services.system import SystemService
 from website.utils.logger import logger
 
+# Count columns of a UserStats row, all zero for a user without games.
+USER_STATS_COUNTS = (
+    "gm_games",
+    "player_games",
+    "oneshot_games",
+    "campaign_games",
+    "gm_sessions",
+    "player_sessions",
+    "oneshot_sessions",
+    "campaign_sessions",
+    "gm_seconds",
+    "player_seconds",
+)
+
 ROLE_GM = "MJ"
 ROLE_PLAYER = "Joueur·euse"
 
@@ -43,15 +66,26 @@ class StatsService:
     def __repr__(self) -> str:
         return f"<{self.__class__.__name__}>"
 
-    def __init__(self, repository: GameRepository | None = None):
+    def __init__(
+        self,
+        repository: GameRepository | None = None,
+        session_repository: GameSessionRepository | None = None,
+        user_stats_repository: UserStatsRepository | None = None,
+        co_play_repository: CoPlayRepository | None = None,
+    ):
         self.repo = repository or GameRepository()
+        self.sessions = session_repository or GameSessionRepository()
+        self.user_stats = user_stats_repository or UserStatsRepository()
+        self.co_play = co_play_repository or CoPlayRepository()
 
     def get_dashboard_stats(self, user_id: str, agenda_limit: int) -> dict:
         """Return the agenda and all-time stats for a user.
 
-        The heavy aggregation is memoised per user (independent of
-        ``agenda_limit``); only the cheap final slice of the upcoming agenda is
-        applied per call.
+        The figures come from the user's statistics row; a row not computed yet,
+        flagged by a change or holding a session counted as upcoming that has
+        since ended is computed on the fly (and never written here). The agenda and
+        network are memoised per user (independent of ``agenda_limit``), and
+        only the cheap final slice of the upcoming agenda is applied per call.
 
         Args:
             user_id: Discord user ID.
@@ -62,11 +96,13 @@ class StatsService:
             (headline numbers, ratios, rhythm, top systems and network), all as
             plain serialisable values.
         """
-        data = self._compute_data(user_id)
+        now = datetime.now()
+        data = self._compute_panels(user_id)
         agenda = data["agenda"]
         return {
             "agenda": {"past": agenda["past"], "upcoming": agenda["upcoming"][:agenda_limit]},
-            "stats": data["stats"],
+            "stats": self._stats_from_row(self._current_row(user_id, now), now)
+            | {"network": data["network"]},
         }
 
     def get_global_stats(self) -> dict:
@@ -74,46 +110,140 @@ class StatsService:
 
         Aggregates catalogue sizes, the game-type and role repartition, the top
         systems and VTTs, the 12-month activity rhythm and the age-restriction
-        split across **all** games. Mirrors :meth:`get_dashboard_stats` but
-        without the per-user filter, returning plain serialisable dicts (no ORM)
-        so the result can render directly in the template.
+        split across **all** non-draft games. Every figure is computed by
+        PostgreSQL (grouped counts and sums), so the page costs the same
+        handful of small queries however many games exist, and no ORM instance
+        is loaded.
 
         Returns:
-            Dict with ``catalogue``, ``type``, ``role``, ``top_systems``,
-            ``top_vtts``, ``rythme`` and ``restriction`` entries.
+            Dict with ``catalogue``, ``play``, ``type``, ``role``,
+            ``top_systems``, ``top_vtts``, ``rythme`` and ``restriction`` entries.
         """
         now = datetime.now()
-        games = self.repo.find_all_with_relations()
-        tagged = [(g, None) for g in games]
+        totals = self.repo.global_totals(now)
         return {
-            "catalogue": self._catalogue(games),
-            "play": self._global_play_hours(games, now),
-            "type": self._type_ratios(tagged),
-            "role": self._global_role_ratios(games),
-            "top_systems": self._global_top(games, lambda g: g.system.name if g.system else None),
-            "top_vtts": self._global_top(games, lambda g: g.vtt.name if g.vtt else None),
-            "rythme": self._rythme(tagged, now),
-            "restriction": self._restriction_split(games),
+            "catalogue": self._catalogue(totals),
+            "play": {
+                "hours": round(totals["ended_seconds"] / 3600),
+                "sessions": totals["ended_sessions"],
+            },
+            "type": {
+                "sessions": self._pct(totals["oneshot_sessions"], totals["campaign_sessions"]),
+                "parties": self._pct(totals["oneshot_games"], totals["campaign_games"]),
+            },
+            "role": self._global_role_ratios(totals),
+            "top_systems": self._global_top(self.repo.count_by_name_and_type(System.name)),
+            "top_vtts": self._global_top(self.repo.count_by_name_and_type(Vtt.name)),
+            "rythme": self._global_rythme(now),
+            "restriction": self._restriction_split(self.repo.count_by_restriction()),
         }
 
+    def get_table_mates(self, user_id: str, limit: int) -> list[dict]:
+        """Return the users a user most often shared a table with.
+
+        Args:
+            user_id: Discord user ID.
+            limit: Maximum number of table-mates to list.
+
+        Returns:
+            List of dicts with ``id``, ``name``, ``avatar``, ``games_together``,
+            ``gm_games`` (games of the mate the user played in) and
+            ``last_played`` (ISO datetime or None), most shared games first.
+        """
+        return [
+            {
+                "id": row.mate_id,
+                "name": row.name,
+                "avatar": row.avatar_url or DEFAULT_AVATAR,
+                "games_together": row.games_together,
+                "gm_games": row.gm_games,
+                "last_played": row.last_played.isoformat() if row.last_played else None,
+            }
+            for row in self.co_play.find_table_mates(user_id, limit)
+        ]
+
+    def mark_stale(self, *user_ids: str) -> None:
+        """Flag the statistics rows and co-play edges of the given users as stale (no commit).
+
+        Call in the transaction of any change to the users' games (status,
+        type, system, GM), sessions or registrations, so the flag commits with
+        it. Only the users' own rows are written; their figures and edges are
+        recomputed from their history by :meth:`refresh_stale`, in the
+        background, so the write never pays for that history. Falsy IDs are
+        ignored.
+
+        Args:
+            *user_ids: Discord user IDs whose statistics changed.
+        """
+        ids = sorted({user_id for user_id in user_ids if user_id})
+        if ids:
+            self.user_stats.mark_stale(ids, datetime.now())
+
+    def refresh_stale(self, limit: int = STATS_REFRESH_BATCH_SIZE) -> int:
+        """Recompute the stalest statistics rows and their co-play edges, and commit.
+
+        Run by the scheduler. Picks rows flagged by :meth:`mark_stale` or whose
+        pending session has ended, re-aggregates them with a few grouped
+        queries for the whole batch, then drops the users' cached panels.
+
+        Args:
+            limit: Maximum number of users recomputed in this run.
+
+        Returns:
+            Number of users recomputed.
+        """
+        now = datetime.now()
+        ids = self.user_stats.lock_stale(now, limit)
+        if not ids:
+            db.session.commit()
+            return 0
+        self.user_stats.upsert(self._compute_rows(ids, now))
+        self.co_play.replace_for_users(ids, now)
+        db.session.commit()
+        for user_id in ids:
+            self.invalidate(user_id)
+        return len(ids)
+
+    def refresh_badges(self, *user_ids: str) -> None:
+        """Recount the trophies of the given users in their statistics rows (no commit).
+
+        Call in the transaction of any change to the users' trophies. A single
+        indexed count per user, so it runs inline. Users without a row yet are
+        skipped: their first recomputation counts the trophies.
+
+        Args:
+            *user_ids: Discord user IDs whose trophies changed.
+        """
+        ids = [user_id for user_id in user_ids if user_id]
+        if ids:
+            self.user_stats.update_badges(ids)
+
+    def mark_stale_for_game(self, game) -> None:
+        """Flag the statistics of a game's GM and players as stale (no commit).
+
+        Args:
+            game: Game whose GM and registered players are affected.
+        """
+        self.mark_stale(game.gm_id, *(player.id for player in game.players))
+
     def invalidate(self, user_id: str) -> None:
-        """Drop the cached dashboard data for a single user.
+        """Drop the cached agenda and network for a single user.
 
-        Call after a change that affects the user's sessions, games, registrations
-        or trophies so their next dashboard load recomputes fresh data.
+        Call after a change that affects the user's sessions, games or
+        registrations so their next dashboard load recomputes fresh data.
 
         Args:
-            user_id: Discord user ID whose cached stats should be invalidated.
+            user_id: Discord user ID whose cached panels should be invalidated.
         """
         # Invalidation runs after a successful write; never let a cache backend
         # hiccup bubble up and fail the user's action (the entry expires via TTL).
         try:
-            cache.delete_memoized(self._compute_data, user_id)
+            cache.delete_memoized(self._compute_panels, user_id)
         except Exception as exc:  # noqa: BLE001 - best-effort cache invalidation
             logger.warning("Failed to invalidate dashboard stats for %s: %s", user_id, exc)
 
     def invalidate_for_game(self, game) -> None:
-        """Invalidate the cached stats of everyone involved in a game (GM + players).
+        """Invalidate the cached panels of everyone involved in a game (GM + players).
 
         Args:
             game: Game whose GM and registered players should be invalidated.
@@ -122,228 +252,192 @@ class StatsService:
         for player in game.players:
             self.invalidate(player.id)
 
-    @cache.memoize(timeout=DASHBOARD_STATS_CACHE_TIMEOUT)
-    def _compute_data(self, user_id: str) -> dict:
-        now = datetime.now()
-        gm_games = self.repo.find_by_gm_with_relations(user_id)
-        # A game the user GMs must count once, under the GM role only. Drop any
-        # game already in the GM list so a user registered as a player in their
-        # own game isn't double-counted across every headline stat.
-        gm_ids = {g.id for g in gm_games}
-        player_games = [
-            g for g in self.repo.find_by_player_with_relations(user_id) if g.id not in gm_ids
+    def _compute_rows(self, ids: list[str], now: datetime) -> list[dict]:
+        """Aggregate the statistics rows of the given users (nothing is written)."""
+        games = self.user_stats.aggregate_games(ids, now)
+        systems = self.user_stats.aggregate_systems(ids)
+        months = self.user_stats.aggregate_months(ids)
+        badges = self.user_stats.aggregate_badges(ids)
+        empty = dict.fromkeys(USER_STATS_COUNTS, 0) | {"valid_until": None}
+        return [
+            {
+                "user_id": user_id,
+                **games.get(user_id, empty),
+                "badges": badges.get(user_id, 0),
+                "systems": systems.get(user_id, {}),
+                "months": months.get(user_id, {}),
+                "updated_at": now,
+            }
+            for user_id in ids
         ]
 
+    def _current_row(self, user_id: str, now: datetime):
+        """Return the user's statistics row, computed on the fly if missing or stale.
+
+        Read-only: a computed row is a transient instance, never added to the
+        session; :meth:`refresh_stale` persists it.
+        """
+        row = self.user_stats.get_current(user_id)
+        if row is None or (row.valid_until is not None and row.valid_until <= now):
+            row = UserStats(**self._compute_rows([user_id], now)[0])
+        return row
+
+    @cache.memoize(timeout=DASHBOARD_STATS_CACHE_TIMEOUT)
+    def _compute_panels(self, user_id: str) -> dict:
         return {
-            "agenda": self._build_agenda(gm_games, player_games, now),
-            "stats": self._build_stats(user_id, gm_games, player_games, now),
+            "agenda": self._build_agenda(user_id, datetime.now()),
+            "network": self._network(user_id),
         }
 
     # ------------------------------------------------------------------ agenda
 
-    def _build_agenda(self, gm_games, player_games, now) -> dict:
+    def _build_agenda(self, user_id, now) -> dict:
         """Build the chronological agenda (recent past + all upcoming sessions).
 
-        The upcoming list is returned in full; the caller slices it to the
-        configured display limit so the cache stays limit-independent.
+        Reads plain rows from one projection per side of ``now``. The upcoming
+        list is returned in full; the caller slices it to the configured display
+        limit so the cache stays limit-independent.
         """
-        rows = []
-        for game, role in self._iter_with_role(gm_games, player_games):
-            for session in game.sessions:
-                rows.append((session.start, self._session_row(session, game, role)))
-
-        past = sorted((r for r in rows if r[0] < now), key=lambda r: r[0])
-        upcoming = sorted((r for r in rows if r[0] >= now), key=lambda r: r[0])
-
+        past, upcoming = self.sessions.find_agenda_rows(user_id, now, DASHBOARD_AGENDA_PAST)
         return {
-            "past": [r[1] for r in past[-DASHBOARD_AGENDA_PAST:]],
-            "upcoming": [r[1] for r in upcoming],
+            "past": [self._session_row(row) for row in past],
+            "upcoming": [self._session_row(row) for row in upcoming],
         }
 
     @staticmethod
-    def _session_row(session, game, role) -> dict:
+    def _session_row(row) -> dict:
         """Serialise a single agenda row for the template."""
-        vtt = game.vtt.name if game.vtt else None
-        meta = f"{game.system.name} · {vtt}" if vtt else game.system.name
+        meta = f"{row.system_name} · {row.vtt_name}" if row.vtt_name else row.system_name
         return {
-            "dow": session.start.strftime("%a"),
-            "day": session.start.strftime("%d"),
-            "month": session.start.strftime("%b"),
-            "time": session.start.strftime("%Hh%M"),
-            "name": game.name,
-            "slug": game.slug,
+            "dow": row.start.strftime("%a"),
+            "day": row.start.strftime("%d"),
+            "month": row.start.strftime("%b"),
+            "time": row.start.strftime("%Hh%M"),
+            "name": row.name,
+            "slug": row.slug,
             "meta": meta,
-            "role": role,
-            "type": game.type,
+            "role": ROLE_GM if row.is_gm else ROLE_PLAYER,
+            "type": row.type,
         }
 
     # ------------------------------------------------------------------- stats
 
-    def _build_stats(self, user_id, gm_games, player_games, now) -> dict:
-        """Compute the all-time statistics panel."""
-        gm_sessions = self._all_sessions(gm_games)
-        player_sessions = self._all_sessions(player_games)
-        all_games = [(g, ROLE_GM) for g in gm_games] + [(g, ROLE_PLAYER) for g in player_games]
-
-        gm_hours = self._played_hours(gm_sessions, now)
-        player_hours = self._played_hours(player_sessions, now)
-
+    def _stats_from_row(self, row, now) -> dict:
+        """Build the all-time statistics panel from a statistics row."""
+        if row is None:  # unknown user: nothing to count
+            row = UserStats(**dict.fromkeys(USER_STATS_COUNTS, 0), badges=0, systems={}, months={})
+        names = {str(system.id): system.name for system in SystemService().get_all()}
+        systems = row.systems or {}
         return {
-            "play_hours_total": round(gm_hours + player_hours),
-            "play_hours_gm": round(gm_hours),
-            "play_hours_player": round(player_hours),
-            "badges": self._badge_count(user_id),
-            "games_count": len(gm_games) + len(player_games),
-            "sessions_count": len(gm_sessions) + len(player_sessions),
+            "play_hours_total": round((row.gm_seconds + row.player_seconds) / 3600),
+            "play_hours_gm": round(row.gm_seconds / 3600),
+            "play_hours_player": round(row.player_seconds / 3600),
+            "badges": row.badges,
+            "games_count": row.gm_games + row.player_games,
+            "sessions_count": row.gm_sessions + row.player_sessions,
             "role": {
-                "sessions": self._pct(len(gm_sessions), len(player_sessions)),
-                "parties": self._pct(len(gm_games), len(player_games)),
+                "sessions": self._pct(row.gm_sessions, row.player_sessions),
+                "parties": self._pct(row.gm_games, row.player_games),
+            },
+            "type": {
+                "sessions": self._pct(row.oneshot_sessions, row.campaign_sessions),
+                "parties": self._pct(row.oneshot_games, row.campaign_games),
             },
-            "type": self._type_ratios(all_games),
-            "rythme": self._rythme(all_games, now),
+            "rythme": self._rythme(row.months or {}, now),
             "top_systems": {
-                "player": self._top_systems(player_games),
-                "gm": self._top_systems(gm_games),
+                "player": self._top_systems(systems.get("player", {}), names),
+                "gm": self._top_systems(systems.get("gm", {}), names),
             },
-            "network": self._network(user_id, gm_games, player_games),
         }
 
-    @staticmethod
-    def _iter_with_role(gm_games, player_games):
-        for g in gm_games:
-            yield g, ROLE_GM
-        for g in player_games:
-            yield g, ROLE_PLAYER
-
-    @staticmethod
-    def _all_sessions(games) -> list:
-        return [s for g in games for s in g.sessions]
-
-    @staticmethod
-    def _played_hours(sessions, now) -> float:
-        """Sum the duration (hours) of sessions that have already ended."""
-        total = 0.0
-        for s in sessions:
-            if s.end and s.end <= now:
-                total += (s.end - s.start).total_seconds() / 3600
-        return total
-
     @staticmethod
     def _pct(a_count: int, b_count: int) -> int:
         """Return ``a`` as a whole-percent share of ``a + b`` (0 when empty)."""
         total = a_count + b_count
         return round(a_count / total * 100) if total else 0
 
-    def _type_ratios(self, all_games) -> dict:
-        os_sessions = sum(len(g.sessions) for g, _ in all_games if g.type == "oneshot")
-        camp_sessions = sum(len(g.sessions) for g, _ in all_games if g.type == "campaign")
-        os_games = sum(1 for g, _ in all_games if g.type == "oneshot")
-        camp_games = sum(1 for g, _ in all_games if g.type == "campaign")
-        return {
-            "sessions": self._pct(os_sessions, camp_sessions),
-            "parties": self._pct(os_games, camp_games),
-        }
-
-    def _rythme(self, all_games, now) -> dict:
-        """Sessions and distinct games per month over the last N months."""
-        months_meta = []
+    @staticmethod
+    def _rythme_months(now) -> list[tuple[int, int]]:
+        """Return the ``(year, month)`` of the last N months, oldest first."""
         start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+        months = []
         for i in range(DASHBOARD_RYTHME_MONTHS - 1, -1, -1):
             d = start - relativedelta(months=i)
-            months_meta.append((d.year, d.month))
+            months.append((d.year, d.month))
+        return months
+
+    @staticmethod
+    def _rythme_labels(months) -> list[str]:
+        return [f"{m:02d}/{y % 100:02d}" for y, m in months]
 
-        index = {ym: i for i, ym in enumerate(months_meta)}
-        sessions = [0] * DASHBOARD_RYTHME_MONTHS
-        games_per_month = [set() for _ in range(DASHBOARD_RYTHME_MONTHS)]
+    def _rythme(self, months, now) -> dict:
+        """Sessions and distinct games per month over the last N months.
 
-        for game, _ in all_games:
-            for s in game.sessions:
-                key = (s.start.year, s.start.month)
-                i = index.get(key)
-                if i is not None:
-                    sessions[i] += 1
-                    games_per_month[i].add(game.id)
+        Args:
+            months: ``{"YYYY-MM": [sessions, games]}`` tallies.
+            now: Current time (the last month shown).
 
+        Returns:
+            Dict with the month ``labels`` and the ``sessions`` and ``parties``
+            count lists.
+        """
+        window = self._rythme_months(now)
+        tallies = [months.get(f"{y:04d}-{m:02d}", (0, 0)) for y, m in window]
         return {
-            "labels": [f"{m:02d}/{y % 100:02d}" for y, m in months_meta],
-            "sessions": sessions,
-            "parties": [len(s) for s in games_per_month],
+            "labels": self._rythme_labels(window),
+            "sessions": [sessions for sessions, _ in tallies],
+            "parties": [games for _, games in tallies],
         }
 
     @staticmethod
-    def _top_systems(games) -> dict:
-        """Top systems for a set of games, by sessions and by game count."""
-        by_sessions: Counter = Counter()
-        by_games: Counter = Counter()
-        for g in games:
-            name = g.system.name
-            by_sessions[name] += len(g.sessions)
-            by_games[name] += 1
+    def _top_systems(tallies, names) -> dict:
+        """Top systems by sessions and by game count.
+
+        Args:
+            tallies: ``{system_id: [sessions, games]}`` for one role.
+            names: System ID (string) to system name.
+
+        Returns:
+            Dict with ``sessions`` and ``parties`` ranked lists of ``{"name", "n"}``.
+        """
+        rows = [
+            (names.get(sid, "?"), sessions, games) for sid, (sessions, games) in tallies.items()
+        ]
+        by_sessions = sorted(rows, key=lambda row: -row[1])[:DASHBOARD_TOP_SYSTEMS]
+        by_games = sorted(rows, key=lambda row: -row[2])[:DASHBOARD_TOP_SYSTEMS]
         return {
-            "sessions": [
-                {"name": n, "n": c} for n, c in by_sessions.most_common(DASHBOARD_TOP_SYSTEMS)
-            ],
-            "parties": [
-                {"name": n, "n": c} for n, c in by_games.most_common(DASHBOARD_TOP_SYSTEMS)
-            ],
+            "sessions": [{"name": name, "n": n} for name, n, _ in by_sessions],
+            "parties": [{"name": name, "n": n} for name, _, n in by_games],
         }
 
     # ------------------------------------------------------------ global stats
 
     @staticmethod
-    def _catalogue(games) -> dict:
+    def _catalogue(totals) -> dict:
         """Headline catalogue sizes across the whole platform."""
         return {
             "systems": SystemRepository().count(),
             "vtts": VttRepository().count(),
             "trophies": TrophyRepository().count_awarded(),
             "users": UserRepository().count(),
-            "games": len(games),
-            "sessions": sum(len(g.sessions) for g in games),
+            "games": totals["games"],
+            "sessions": totals["sessions"],
         }
 
-    @staticmethod
-    def _global_play_hours(games, now) -> dict:
-        """Total elapsed game time across the platform (ended sessions only).
-
-        Sums the real duration of every session that has already happened — the
-        actual hours of play that took place at the tables. Counted once per
-        session (not per participant), so the figure is wall-clock game time.
-
-        Args:
-            games: Games to aggregate (sessions eager-loaded).
-            now: Current time; only sessions that have already ended count.
-
-        Returns:
-            Dict with the rounded total ``hours`` and the number of ended
-            ``sessions`` that contributed to it.
-        """
-        hours = 0.0
-        sessions = 0
-        for g in games:
-            for s in g.sessions:
-                if s.end and s.end <= now:
-                    hours += (s.end - s.start).total_seconds() / 3600
-                    sessions += 1
-        return {"hours": round(hours), "sessions": sessions}
-
-    def _global_role_ratios(self, games) -> dict:
+    def _global_role_ratios(self, totals) -> dict:
         """GM vs player engagement share across the platform.
 
         Each game has one GM and several player registrations; the share counts
         engagements (not distinct people): GM slots vs player slots, by sessions
         and by games.
         """
-        gm_games = len(games)
-        player_games = sum(len(g.players) for g in games)
-        gm_sessions = sum(len(g.sessions) for g in games)
-        player_sessions = sum(len(g.sessions) * len(g.players) for g in games)
         return {
-            "sessions": self._pct(gm_sessions, player_sessions),
-            "parties": self._pct(gm_games, player_games),
+            "sessions": self._pct(totals["sessions"], totals["player_sessions"]),
+            "parties": self._pct(totals["games"], totals["registrations"]),
         }
 
-    def _global_top(self, games, key) -> dict:
+    @staticmethod
+    def _global_top(counts) -> dict:
         """Top ``STATS_TOP_GLOBAL`` entries by game count, split by game type.
 
         The ranking is independent of the sessions/annonces toggle (it always
@@ -351,42 +445,35 @@ class StatsService:
         games, one-shots only and campaigns only.
 
         Args:
-            games: Games to rank.
-            key: Callable mapping a game to its grouping name (``None`` skips it).
+            counts: Per-name game counts, as returned by
+                :meth:`GameRepository.count_by_name_and_type`.
 
         Returns:
             Dict with ``all``, ``oneshot`` and ``campaign`` ranked-list values,
             each a list of ``{"name", "n"}`` dicts.
         """
+        top = {}
+        for key in ("all", GAME_TYPE_ONESHOT, GAME_TYPE_CAMPAIGN):
+            ranked = sorted((row for row in counts if row[key]), key=lambda row: -row[key])
+            top[key] = [{"name": row["name"], "n": row[key]} for row in ranked[:STATS_TOP_GLOBAL]]
+        return top
+
+    def _global_rythme(self, now) -> dict:
+        """Sessions and distinct games per month over the last N months, app-wide."""
+        months = self._rythme_months(now)
+        until = datetime(*months[-1], 1) + relativedelta(months=1)
+        counts = self.sessions.count_by_month(datetime(*months[0], 1), until)
+        empty = {"sessions": 0, "games": 0}
         return {
-            "all": self._top_ranked(games, key),
-            "oneshot": self._top_ranked([g for g in games if g.type == GAME_TYPE_ONESHOT], key),
-            "campaign": self._top_ranked([g for g in games if g.type == GAME_TYPE_CAMPAIGN], key),
+            "labels": self._rythme_labels(months),
+            "sessions": [counts.get(ym, empty)["sessions"] for ym in months],
+            "parties": [counts.get(ym, empty)["games"] for ym in months],
         }
 
     @staticmethod
-    def _top_ranked(games, key) -> list[dict]:
-        """Return the top ``STATS_TOP_GLOBAL`` groups by game count.
-
-        Args:
-            games: Games to rank.
-            key: Callable mapping a game to its grouping name (``None`` skips it).
-
-        Returns:
-            Ranked list of ``{"name", "n"}`` dicts (most games first).
-        """
-        by_games: Counter = Counter()
-        for g in games:
-            name = key(g)
-            if name:
-                by_games[name] += 1
-        return [{"name": n, "n": c} for n, c in by_games.most_common(STATS_TOP_GLOBAL)]
-
-    @staticmethod
-    def _restriction_split(games) -> dict:
+    def _restriction_split(counter) -> dict:
         """Age-restriction repartition (Tout public / 16+ / 18+) over all games."""
-        counter = Counter(g.restriction for g in games)
-        total = len(games)
+        total = sum(counter.values())
         rows = [
             {
                 "value": value,
@@ -398,44 +485,18 @@ class StatsService:
         ]
         return {"rows": rows, "total": total}
 
-    def _network(self, user_id, gm_games, player_games) -> dict:
-        """Distinct GMs played with and distinct table-mates met."""
-        gm_counter: Counter = Counter()
-        gm_meta = {}
-        for g in player_games:
-            if g.gm:
-                gm_counter[g.gm.id] += 1
-                gm_meta[g.gm.id] = g.gm
-
-        mate_counter: Counter = Counter()
-        mate_meta = {}
-        for g, _ in self._iter_with_role(gm_games, player_games):
-            for p in g.players:
-                if p.id != user_id:
-                    mate_counter[p.id] += 1
-                    mate_meta[p.id] = p
-
+    def _network(self, user_id) -> dict:
+        """Distinct GMs played with and distinct table-mates met, from the co-play edges."""
+        edges = self.co_play.find_network(user_id)
+        gms = sorted((e for e in edges if e.gm_games), key=lambda e: -e.gm_games)
+        mates = [e for e in edges if e.games_together]
         return {
-            "gm_count": len(gm_counter),
-            "player_count": len(mate_counter),
-            "gms": self._people(gm_counter, gm_meta),
-            "players": self._people(mate_counter, mate_meta),
+            "gm_count": len(gms),
+            "player_count": len(mates),
+            "gms": [self._person(e, e.gm_games) for e in gms],
+            "players": [self._person(e, e.games_together) for e in mates],
         }
 
     @staticmethod
-    def _people(counter, meta) -> list[dict]:
-        return [
-            {
-                "name": meta[uid].name,
-                "avatar": getattr(meta[uid], "avatar", DEFAULT_AVATAR),
-                "n": n,
-            }
-            for uid, n in counter.most_common()
-        ]
-
-    @staticmethod
-    def _badge_count(user_id) -> int:
-        user = db.session.get(User, user_id)
-        if not user:
-            return 0
-        return sum(ut.quantity for ut in user.trophies)
+    def _person(edge, n) -> dict:
+        return {"name": edge.name, "avatar": edge.avatar_url or DEFAULT_AVATAR, "n": n}
@@ -8,6 +8,9 @@ from website.models.trophy import Trophy, UserTrophy
 from website.models.user import User
 from website.repositories.base import Pagination
 from website.repositories.trophy import TrophyRepository
+from website.repositories.user import UserRepository
+from website.services.stats import StatsService
+from website.utils.leaderboard import TrophyLeaderboards
 from website.utils.logger import sanitize_log_value
 
 logger = logging.getLogger(__name__)
@@ -20,8 +23,10 @@ class TrophyService:
     Manages transaction boundaries and trophy-specific business rules.
     """
 
-    def __init__(self, repository=None):
+    def __init__(self, repository=None, leaderboards=None, stats=None):
         self.repo = repository or TrophyRepository()
+        self.leaderboards = leaderboards or TrophyLeaderboards()
+        self.stats = stats or StatsService()
 
     def get_by_id(self, trophy_id: int) -> Trophy:
         """Get trophy by ID.
@@ -132,6 +137,7 @@ class TrophyService:
         trophy = self.repo.get_by_id_or_404(trophy_id)
         self.repo.delete(trophy)
         db.session.commit()
+        self.leaderboards.drop(trophy_id)
         logger.info("Trophy %s deleted", trophy_id)
 
     def get_all_user_trophies(self) -> list[UserTrophy]:
@@ -190,7 +196,9 @@ class TrophyService:
             quantity = 1
         user_trophy = UserTrophy(user_id=user_id, trophy_id=trophy_id, quantity=quantity)
         self.repo.add_user_trophy(user_trophy)
+        self.stats.refresh_badges(user_id)
         db.session.commit()
+        self.leaderboards.set_score(trophy_id, user_id, quantity)
         logger.info(
             "Trophy %s awarded to user %s (quantity=%s)",
             trophy_id,
@@ -216,12 +224,14 @@ class TrophyService:
         user_trophy = self.get_user_trophy(user_id, trophy_id)
         if user_trophy.trophy.unique:
             quantity = 1
-        user_trophy.quantity = max(1, quantity)
+        user_trophy.quantity = quantity = max(1, quantity)
+        self.stats.refresh_badges(user_id)
         db.session.commit()
+        self.leaderboards.set_score(trophy_id, user_id, quantity)
         logger.info(
             "Trophy %s quantity set to %s for user %s",
             trophy_id,
-            user_trophy.quantity,
+            quantity,
             sanitize_log_value(user_id),
         )
         return user_trophy
@@ -238,7 +248,9 @@ class TrophyService:
         """
         user_trophy = self.get_user_trophy(user_id, trophy_id)
         self.repo.delete_user_trophy(user_trophy)
+        self.stats.refresh_badges(user_id)
         db.session.commit()
+        self.leaderboards.set_score(trophy_id, user_id, 0)
         logger.info("Trophy %s removed from user %s", trophy_id, sanitize_log_value(user_id))
 
     def decrement_user_trophy(
@@ -263,10 +275,15 @@ class TrophyService:
         user_trophy = self.get_user_trophy(user_id, trophy_id)
         if user_trophy.quantity - amount <= 0:
             self.repo.delete_user_trophy(user_trophy)
+            self.stats.refresh_badges(user_id)
             db.session.commit()
+            self.leaderboards.set_score(trophy_id, user_id, 0)
             return None
         user_trophy.quantity -= amount
+        quantity = user_trophy.quantity
+        self.stats.refresh_badges(user_id)
         db.session.commit()
+        self.leaderboards.set_score(trophy_id, user_id, quantity)
         return user_trophy
 
     def award(self, user_id: str, trophy_id: int, amount: int = 1) -> UserTrophy:
@@ -311,12 +328,19 @@ class TrophyService:
                 amount,
             )
 
+        quantity = user_trophy.quantity
+        self.stats.refresh_badges(user_id)
         db.session.commit()
+        self.leaderboards.set_score(trophy_id, user_id, quantity)
         return user_trophy
 
     def get_leaderboard(self, trophy_id: int, limit: int = 10) -> list[tuple[User, int]]:
         """Get leaderboard for a specific trophy.
 
+        Read from the trophy's Redis sorted set (built from the database on
+        first use), falling back to a grouped SQL query when Redis is
+        unavailable.
+
         Args:
             trophy_id: Trophy ID to get leaderboard for.
             limit: Maximum number of entries to return. Defaults to 10.
@@ -329,7 +353,61 @@ class TrophyService:
         """
         # Verify trophy exists
         self.get_by_id(trophy_id)
-        return self.repo.get_leaderboard(trophy_id, limit)
+        entries = (
+            self.leaderboards.top(trophy_id, limit) if self._ensure_built(trophy_id) else None
+        )
+        if entries is None:
+            return self.repo.get_leaderboard(trophy_id, limit)
+        users = {user.id: user for user in UserRepository().get_by_ids([u for u, _ in entries])}
+        return [(users[user_id], total) for user_id, total in entries if user_id in users]
+
+    def get_user_rank(self, trophy_id: int, user_id: str) -> dict:
+        """Get a user's position in a trophy's leaderboard.
+
+        Args:
+            trophy_id: Trophy ID.
+            user_id: User ID.
+
+        Returns:
+            Dict with ``rank`` (1-based, shared by equal quantities; None when
+            the user does not hold the trophy) and ``count`` (quantity held).
+
+        Raises:
+            NotFoundError: If trophy doesn't exist.
+        """
+        self.get_by_id(trophy_id)
+        position = (
+            self.leaderboards.rank(trophy_id, user_id) if self._ensure_built(trophy_id) else None
+        )
+        if position is None:
+            position = self.repo.get_rank(trophy_id, user_id)
+        rank, count = position
+        return {"rank": rank, "count": count}
+
+    def rebuild_leaderboards(self) -> int:
+        """Rebuild every trophy's leaderboard from the database.
+
+        Returns:
+            Number of leaderboards rebuilt.
+        """
+        return sum(
+            self.leaderboards.rebuild(trophy.id, lambda: self.repo.get_scores(trophy.id))
+            for trophy in self.repo.get_all_ordered()
+        )
+
+    def _ensure_built(self, trophy_id: int) -> bool:
+        """Build a trophy's leaderboard from the database if needed.
+
+        Returns:
+            Whether the leaderboard can be read from Redis (False while another
+            caller is still building it).
+        """
+        built = self.leaderboards.is_built(trophy_id)
+        if built is None:
+            return False
+        if not built:
+            return self.leaderboards.rebuild(trophy_id, lambda: self.repo.get_scores(trophy_id))
+        return True
 
     def get_user_badges(self, user_id: str) -> list[dict]:
         """Get all trophies/badges for a user.
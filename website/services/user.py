@@ -1,15 +1,37 @@
 """User service for user-related business logic."""
 
 import re
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 
+from config.constants import (
+    CACHE_USER_PROFILE_SOFT_TIMEOUT,
+    CACHE_USER_PROFILE_TIMEOUT,
+    GUILD_MEMBER_INDEX_MAX_AGE,
+)
 from website.exceptions import NotFoundError
-from website.extensions import db
+from website.extensions import cache, db
 from website.models import User
 from website.models.user import get_user_profile as _get_user_profile
+from website.models.user import profile_from_member
 from website.repositories.base import Pagination
+from website.repositories.guild_member_role import GuildMemberRoleRepository
 from website.repositories.user import UserRepository
 from website.utils.logger import logger, sanitize_log_value
+from website.utils.single_flight import store, store_many
+
+
+def _profile_values(profile: dict, reactivate: bool) -> dict:
+    """Return the user columns to write for a freshly fetched profile."""
+    values: dict = {
+        "name": profile["name"],
+        "avatar_url": profile["avatar"],
+        "profile_refreshed_at": datetime.now(timezone.utc),
+    }
+    if profile.get("username"):
+        values["username"] = profile["username"]
+    if reactivate:
+        values["not_player_as_of"] = None
+    return values
 
 
 class UserService:
@@ -18,8 +40,9 @@ class UserService:
     Handles user retrieval, creation, and Discord profile management.
     """
 
-    def __init__(self, repository=None):
+    def __init__(self, repository=None, member_role_repository=None):
         self.repo = repository or UserRepository()
+        self.member_roles = member_role_repository or GuildMemberRoleRepository()
 
     def get_by_id(self, user_id: str) -> User:
         """Get user by ID.
@@ -47,6 +70,11 @@ class UserService:
     ) -> tuple[User, bool]:
         """Get an existing user or create a new one.
 
+        A new user's missing name or username is taken from their cached
+        Discord profile, if any. Discord is not called: a user created without
+        a profile has never been refreshed, so the profile refresh job (or the
+        member sweep) fills it in on its next run.
+
         Args:
             user_id: Discord user ID.
             name: Display name for new users. Defaults to 'Inconnu'.
@@ -58,10 +86,17 @@ class UserService:
         user = self.repo.get_by_id(user_id)
         if user:
             return user, False
+        profile = None
+        if name == "Inconnu" or not username:
+            profile = cache.get(f"user_profile_{user_id}")
+            if profile and not profile.get("error"):
+                name = profile["name"] if name == "Inconnu" else name
+                username = username or profile.get("username")
         user = User(id=user_id, name=name, username=username)
+        if profile and not profile.get("error"):
+            user.avatar_url = profile["avatar"]
         self.repo.add(user)
         db.session.commit()
-        user.init_on_load()
         return user, True
 
     def get_all(self) -> list[User]:
@@ -142,6 +177,25 @@ class UserService:
         """
         return self.repo.get_active_user_ids()
 
+    def get_stalest_active_user_ids(self, limit: int) -> list[str]:
+        """Get the active users whose profile is the most out of date.
+
+        Args:
+            limit: Maximum number of IDs to return.
+
+        Returns:
+            List of active user ID strings, never-refreshed and oldest first.
+        """
+        return self.repo.get_stalest_active_user_ids(limit)
+
+    def count_active_users(self) -> int:
+        """Count users not marked as inactive.
+
+        Returns:
+            Number of active users.
+        """
+        return self.repo.count_active()
+
     def get_inactive_users(self) -> list[User]:
         """Get all users marked as inactive.
 
@@ -171,6 +225,31 @@ class UserService:
         """
         return self.repo.get_by_ids(ids)
 
+    def get_role_ids(self, user_id: str) -> list[str]:
+        """Return the Discord role IDs held by a user.
+
+        Read from the local ``guild_member_role`` index (one primary-key
+        lookup); an indexed member holding no role gets an empty list. Members
+        not indexed yet (no sweep or Gateway event since they joined, or both
+        disabled) and members indexed more than ``GUILD_MEMBER_INDEX_MAX_AGE``
+        seconds ago fall back to the cached Discord lookup, so a missed
+        Gateway event cannot keep a revoked role authorized.
+
+        Args:
+            user_id: Discord user ID.
+
+        Returns:
+            List of role ID strings.
+
+        Raises:
+            DiscordAPIError: If the fallback Discord lookup fails.
+        """
+        from website.models.user import get_user_roles
+
+        indexed_after = datetime.now(timezone.utc) - timedelta(seconds=GUILD_MEMBER_INDEX_MAX_AGE)
+        role_ids = self.member_roles.get_role_ids(user_id, indexed_after)
+        return get_user_roles(user_id) if role_ids is None else role_ids
+
     @staticmethod
     def get_user_profile(user_id: str, force_refresh: bool = False) -> dict:
         """Fetch a user's Discord profile.
@@ -187,9 +266,9 @@ class UserService:
     def persist_profile(self, user_id: str, profile: dict, reactivate: bool = False) -> None:
         """Persist a freshly fetched Discord profile to the database.
 
-        Writes ``name`` (and ``username`` when present) via a direct column
-        update so the change is not silently dropped by the load-time name
-        resolution in ``User.init_on_load``.
+        Writes ``name``, ``avatar_url`` (and ``username`` when present) and
+        stamps ``profile_refreshed_at``, via a direct column update without
+        loading the user.
 
         Args:
             user_id: Discord user ID.
@@ -198,12 +277,139 @@ class UserService:
             reactivate: When True, also clears the inactive flag
                 (``not_player_as_of``) — used when an inactive user reappears.
         """
-        values: dict = {"name": profile["name"]}
-        if profile.get("username"):
-            values["username"] = profile["username"]
-        if reactivate:
-            values["not_player_as_of"] = None
-        self.repo.update_fields(user_id, values)
+        self.repo.update_fields(user_id, _profile_values(profile, reactivate))
+        db.session.commit()
+
+    def sync_guild_members(self, discord_service=None) -> dict:
+        """Refresh every stored user from one pass over the guild member list.
+
+        Pages through ``GET /guilds/{id}/members`` (a handful of calls for the
+        whole guild), then, in a single commit: stores the name, username and
+        avatar of every member (stamping ``profile_refreshed_at``), reactivates
+        inactive users found in the guild, marks users missing from it as
+        inactive, and rebuilds the ``guild_member_role`` index. The profile
+        cache of every member is then warmed (and marked fresh) in bulk.
+
+        Nothing is written unless the member list was read completely, so a
+        failing page never flags the rest of the guild as inactive.
+
+        Args:
+            discord_service: DiscordService used to list members (default: new one).
+
+        Returns:
+            Dict with ``members`` (guild size), ``updated`` (users whose profile
+            changed), ``reactivated`` and ``deactivated`` counts.
+
+        Raises:
+            DiscordAPIError: If the member list cannot be read (e.g. 403 when the
+                bot lacks the "Server Members" intent).
+        """
+        from website.services.discord import DiscordService
+
+        discord_service = discord_service or DiscordService()
+        guild_id = discord_service.bot.guild_id
+        profiles, roles = {}, {}
+        for member in discord_service.iter_guild_members():
+            user_id = member["user"]["id"]
+            profiles[user_id] = profile_from_member(member, guild_id)
+            roles[user_id] = member.get("roles", [])
+        stats = {"members": len(profiles), "updated": 0, "reactivated": 0, "deactivated": 0}
+        if not profiles:
+            logger.warning("Guild member sweep returned no members; nothing updated")
+            return stats
+
+        now = datetime.now(timezone.utc)
+        refreshed, missing, cached = [], [], {}
+        rows = self.repo.get_profile_rows()
+        for user_id, name, username, avatar, inactive_since in rows:
+            profile = profiles.get(user_id)
+            if profile is None:
+                if inactive_since is None:
+                    missing.append(user_id)
+                continue
+            cached[f"user_profile_{user_id}"] = profile
+            new_username = profile["username"] or username
+            if (name, username, avatar) != (profile["name"], new_username, profile["avatar"]):
+                stats["updated"] += 1
+            stats["reactivated"] += inactive_since is not None
+            refreshed.append(
+                {
+                    "id": user_id,
+                    "name": profile["name"],
+                    "username": new_username,
+                    "avatar_url": profile["avatar"],
+                    "profile_refreshed_at": now,
+                    "not_player_as_of": None,
+                }
+            )
+
+        self.repo.bulk_update_fields(refreshed)
+        stats["deactivated"] = self.repo.mark_inactive_many(missing, now)
+        self.member_roles.replace_all(roles)
+        db.session.commit()
+
+        try:
+            store_many(
+                cached, CACHE_USER_PROFILE_TIMEOUT, soft_timeout=CACHE_USER_PROFILE_SOFT_TIMEOUT
+            )
+        except Exception:  # noqa: BLE001 - cache backend best-effort
+            pass
+        logger.info(f"Guild member sweep: {stats}")
+        return stats
+
+    def apply_member(self, member: dict, guild_id: str | None = None) -> None:
+        """Store a guild member's profile and roles as pushed by the Gateway.
+
+        The member's roles replace their ``guild_member_role`` entries; a stored
+        user also gets their name, username and avatar updated (and is
+        reactivated if they had left). One commit, then the profile cache is
+        refreshed and marked fresh and the cached Discord roles are dropped.
+
+        Args:
+            member: Guild member payload (``GUILD_MEMBER_ADD``/``UPDATE``).
+            guild_id: Guild the member belongs to (enables server avatars).
+        """
+        user_id = member["user"]["id"]
+        profile = profile_from_member(member, guild_id)
+        self.repo.update_fields(user_id, _profile_values(profile, reactivate=True))
+        self.member_roles.replace_for_user(user_id, member.get("roles", []))
+        db.session.commit()
+        try:
+            store(
+                f"user_profile_{user_id}",
+                profile,
+                CACHE_USER_PROFILE_TIMEOUT,
+                soft_timeout=CACHE_USER_PROFILE_SOFT_TIMEOUT,
+            )
+            cache.delete(f"user_roles_{user_id}")
+        except Exception:  # noqa: BLE001 - cache backend best-effort
+            pass
+
+    def remove_member(self, user_id: str) -> None:
+        """Record that a member left the guild.
+
+        Marks a stored user as inactive (keeping an earlier departure date) and
+        clears their ``guild_member_role`` entries.
+
+        Args:
+            user_id: Discord user ID.
+        """
+        self.repo.mark_inactive_many([user_id], datetime.now(timezone.utc))
+        self.member_roles.replace_for_user(user_id, [])
+        db.session.commit()
+        try:
+            cache.delete(f"user_roles_{user_id}")
+        except Exception:  # noqa: BLE001 - cache backend best-effort
+            pass
+        logger.info(f"User {sanitize_log_value(user_id)} left the guild")
+
+    def forget_role(self, role_id: str) -> None:
+        """Drop a deleted Discord role from every member's ``guild_member_role`` entries.
+
+        Args:
+            role_id: Discord role ID.
+        """
+        self.member_roles.delete_role(role_id)
         db.session.commit()
 
     def update(self, user_id: str, data: dict) -> User:
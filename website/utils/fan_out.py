@@ -0,0 +1,67 @@
+"""Bounded concurrent fan-out of independent calls (e.g. Discord requests).
+
+A flow making several Discord calls that do not depend on each other (deleting
+a game's channel and its role, fetching the guild's roles and its channels)
+would otherwise wait for the sum of their latencies. :func:`fan_out` runs them
+on a small thread pool so the flow takes as long as its slowest call. Calls
+that need another's result (e.g. pinning a message after posting it) must stay
+sequential.
+"""
+
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+from flask import current_app, has_app_context
+
+from config.constants import DISCORD_FAN_OUT_WORKERS
+
+
+def fan_out(*calls: Callable[[], Any], max_workers: int = DISCORD_FAN_OUT_WORKERS) -> list:
+    """Run independent calls concurrently and return their outcomes in order.
+
+    Every call runs to completion even if others fail: the exception a call
+    raised takes its place in the returned list, so the caller sees all the
+    errors at once (see :func:`failures`). Each call runs in its own context of
+    the current Flask application, so it can use the cache and the logger, but
+    it must not use the caller's database session.
+
+    Args:
+        *calls: Zero-argument callables.
+        max_workers: Most calls running at the same time.
+
+    Returns:
+        One entry per call, in call order: its return value, or the exception
+        it raised.
+    """
+    app = current_app._get_current_object() if has_app_context() else None
+
+    def run(call: Callable[[], Any]) -> Any:
+        try:
+            return call()
+        except Exception as e:
+            return e
+
+    def run_in_app(call: Callable[[], Any]) -> Any:
+        if app is None:
+            return run(call)
+        with app.app_context():
+            return run(call)
+
+    workers = min(len(calls), max_workers)
+    if workers <= 1:
+        return [run(call) for call in calls]
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="fan-out") as executor:
+        return list(executor.map(run_in_app, calls))
+
+
+def failures(results: list) -> list[Exception]:
+    """Return the exceptions among :func:`fan_out` results.
+
+    Args:
+        results: List returned by :func:`fan_out`.
+
+    Returns:
+        The exceptions, in call order (empty when every call succeeded).
+    """
+    return [result for result in results if isinstance(result, Exception)]
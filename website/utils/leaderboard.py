@@ -0,0 +1,240 @@
+"""Trophy leaderboards kept as Redis sorted sets.
+
+Each trophy has a sorted set of ``user_id → quantity`` next to a "built"
+marker. A set is built from the database on first read (or by the
+``rebuild-leaderboards`` command) and then kept current by
+:class:`~website.services.trophy.TrophyService`, which writes each user's
+committed quantity after every change. Scores are absolute, never increments,
+so a repeated or late write cannot make a set drift. Top-N and rank lookups
+then cost ``O(log n)`` in Redis, whatever the number of holders.
+
+A rebuild first takes a ``:building`` lock, then reads the database. Scores
+written while it runs are also recorded in a ``:pending`` hash, and the rebuild
+applies them on top of what it read. A write committed after that read is
+therefore never lost.
+
+Equal quantities are ordered by descending user ID, like
+:meth:`~website.repositories.trophy.TrophyRepository.get_leaderboard`.
+
+Every method degrades gracefully: without a Redis-backed cache, or when Redis
+is unreachable, reads return None (the caller falls back to SQL) and writes are
+skipped (the set is rebuilt on the next read once its marker is gone).
+"""
+
+import secrets
+from collections.abc import Callable
+
+from flask import current_app
+from redis.exceptions import RedisError
+
+from config.constants import LEADERBOARD_REBUILD_TIMEOUT
+from website.extensions import get_redis_client
+from website.utils.logger import logger
+
+# Write a user's quantity to a built set, and record it while a rebuild runs.
+#   KEYS: set, built marker, rebuild lock, pending updates
+#   ARGV: user ID, quantity
+_SET_SCORE_SCRIPT = """
+if redis.call('EXISTS', KEYS[3]) == 1 then
+    redis.call('HSET', KEYS[4], ARGV[1], ARGV[2])
+end
+if redis.call('EXISTS', KEYS[2]) == 1 then
+    if tonumber(ARGV[2]) > 0 then
+        redis.call('ZADD', KEYS[1], ARGV[2], ARGV[1])
+    else
+        redis.call('ZREM', KEYS[1], ARGV[1])
+    end
+end
+return 1
+"""
+
+# Swap the staged set in, apply the updates recorded since the rebuild started
+# and mark the set built, if the rebuild still holds its lock.
+#   KEYS: set, built marker, rebuild lock, pending updates, staged set
+#   ARGV: lock token
+_FINISH_REBUILD_SCRIPT = """
+if redis.call('GET', KEYS[3]) ~= ARGV[1] then
+    return 0
+end
+if redis.call('EXISTS', KEYS[5]) == 1 then
+    redis.call('RENAME', KEYS[5], KEYS[1])
+else
+    redis.call('DEL', KEYS[1])
+end
+local pending = redis.call('HGETALL', KEYS[4])
+for i = 1, #pending, 2 do
+    if tonumber(pending[i + 1]) > 0 then
+        redis.call('ZADD', KEYS[1], pending[i + 1], pending[i])
+    else
+        redis.call('ZREM', KEYS[1], pending[i])
+    end
+end
+redis.call('SET', KEYS[2], 1)
+redis.call('DEL', KEYS[3], KEYS[4])
+return 1
+"""
+
+
+class TrophyLeaderboards:
+    """Redis sorted sets ranking the holders of each trophy by quantity.
+
+    Attributes:
+        prefix: Key prefix of the sets (under the cache's own prefix when None).
+    """
+
+    def __init__(self, client=None, prefix: str | None = None):
+        self._client = client
+        self.prefix = prefix
+
+    @property
+    def client(self):
+        """Redis client of the app's cache, or None when the cache is not Redis."""
+        if self._client is None:
+            self._client = get_redis_client(current_app)
+        return self._client
+
+    def _key(self, trophy_id: int) -> str:
+        prefix = self.prefix
+        if prefix is None:
+            prefix = f"{current_app.config['CACHE_KEY_PREFIX']}leaderboard:"
+        return f"{prefix}{trophy_id}"
+
+    def _run(self, script: str, keys: list[str], args: list):
+        return self.client.register_script(script)(keys=keys, args=args)
+
+    def is_built(self, trophy_id: int) -> bool | None:
+        """Tell whether a trophy's set is built.
+
+        Args:
+            trophy_id: Trophy ID.
+
+        Returns:
+            Whether the set is built, or None when Redis is unavailable.
+        """
+        if self.client is None:
+            return None
+        try:
+            return bool(self.client.exists(f"{self._key(trophy_id)}:built"))
+        except RedisError as e:
+            logger.warning(f"Redis leaderboards unavailable: {e}")
+            return None
+
+    def rebuild(self, trophy_id: int, load_scores: Callable[[], dict[str, int]]) -> bool:
+        """Replace a trophy's set with the quantities read from the database.
+
+        ``load_scores`` runs once the rebuild lock is held, so every
+        :meth:`set_score` from then on is applied on top of what it returns.
+
+        Args:
+            trophy_id: Trophy ID.
+            load_scores: Callable returning the quantity held by each user
+                holding the trophy.
+
+        Returns:
+            Whether the set was rebuilt (False when another rebuild is running
+            or Redis is unavailable).
+        """
+        if self.client is None:
+            return False
+        key = self._key(trophy_id)
+        keys = [key, f"{key}:built", f"{key}:building", f"{key}:pending", f"{key}:staging"]
+        token = secrets.token_hex(16)
+        try:
+            if not self.client.set(keys[2], token, nx=True, ex=LEADERBOARD_REBUILD_TIMEOUT):
+                return False
+            self.client.delete(keys[3], keys[4])
+            scores = load_scores()
+            if scores:
+                self.client.zadd(keys[4], scores)
+            if self._run(_FINISH_REBUILD_SCRIPT, keys, [token]):
+                return True
+            self.client.delete(keys[4])
+            logger.warning(f"Leaderboard {trophy_id} rebuild took too long, discarded")
+        except RedisError as e:
+            logger.warning(f"Could not rebuild leaderboard {trophy_id}: {e}")
+        return False
+
+    def set_score(self, trophy_id: int, user_id: str, quantity: int) -> None:
+        """Record the quantity a user now holds, if the trophy's set is built.
+
+        While the set is being rebuilt the quantity is also kept aside, to be
+        applied on top of the database read.
+
+        Args:
+            trophy_id: Trophy ID.
+            user_id: User ID.
+            quantity: Committed quantity (0 when the user no longer holds it).
+        """
+        if self.client is None:
+            return
+        key = self._key(trophy_id)
+        # Skipped when the set is neither built nor being rebuilt: it is built
+        # from the database, change included, on the next read.
+        keys = [key, f"{key}:built", f"{key}:building", f"{key}:pending"]
+        try:
+            self._run(_SET_SCORE_SCRIPT, keys, [user_id, quantity])
+        except RedisError as e:
+            logger.warning(f"Could not update leaderboard {trophy_id}: {e}")
+
+    def drop(self, trophy_id: int) -> None:
+        """Delete a trophy's set and marker.
+
+        Args:
+            trophy_id: Trophy ID.
+        """
+        if self.client is None:
+            return
+        key = self._key(trophy_id)
+        try:
+            self.client.delete(key, f"{key}:built", f"{key}:pending", f"{key}:staging")
+        except RedisError as e:
+            logger.warning(f"Could not drop leaderboard {trophy_id}: {e}")
+
+    def top(self, trophy_id: int, limit: int) -> list[tuple[str, int]] | None:
+        """Return a trophy's top holders.
+
+        Args:
+            trophy_id: Trophy ID (its set must be built).
+            limit: Maximum number of entries.
+
+        Returns:
+            ``(user_id, quantity)`` pairs, highest first, or None when Redis
+            is unavailable.
+        """
+        if self.client is None:
+            return None
+        try:
+            entries = self.client.zrevrange(self._key(trophy_id), 0, limit - 1, withscores=True)
+        except RedisError as e:
+            logger.warning(f"Redis leaderboards unavailable: {e}")
+            return None
+        return [(_text(member), int(score)) for member, score in entries]
+
+    def rank(self, trophy_id: int, user_id: str) -> tuple[int | None, int] | None:
+        """Return a user's rank and quantity for a trophy.
+
+        Args:
+            trophy_id: Trophy ID (its set must be built).
+            user_id: User ID.
+
+        Returns:
+            ``(rank, quantity)`` with a 1-based rank, shared by equal quantities
+            (``(None, 0)`` when the user does not hold the trophy), or None when
+            Redis is unavailable.
+        """
+        if self.client is None:
+            return None
+        key = self._key(trophy_id)
+        try:
+            score = self.client.zscore(key, user_id)
+            if score is None:
+                return None, 0
+            ahead = self.client.zcount(key, f"({score}", "+inf")
+        except RedisError as e:
+            logger.warning(f"Redis leaderboards unavailable: {e}")
+            return None
+        return ahead + 1, int(score)
+
+
+def _text(value) -> str:
+    return value.decode() if isinstance(value, bytes) else value
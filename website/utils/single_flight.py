@@ -0,0 +1,193 @@
+"""Single-flight loading of cached values backed by slow calls (e.g. Discord).
+
+When a hot cache key expires, every concurrent request misses at once and calls
+Discord in parallel. :func:`cached_fetch` lets only the caller that wins a short
+Redis lock (``SET NX`` with a unique token) run the fetch; the others wait
+briefly for its result and only fetch themselves if it never comes. The lock is
+released with a compare-and-delete on that token, so a caller whose lock
+expired during a slow fetch cannot release the lock of the one that took over.
+
+With a ``soft_timeout``, each value also gets a freshness marker that expires
+before the value itself. Once the marker is gone the value is *stale*: the lock
+winner refreshes it while every other caller keeps getting the stale copy, so a
+hot key never causes a burst of Discord calls (stale-while-revalidate).
+"""
+
+import secrets
+import time
+from collections.abc import Callable
+from typing import Any
+
+from flask import current_app
+
+from config.constants import (
+    SINGLE_FLIGHT_LOCK_TIMEOUT,
+    SINGLE_FLIGHT_POLL_INTERVAL,
+    SINGLE_FLIGHT_WAIT,
+)
+from website.extensions import cache, get_redis_client
+from website.utils.logger import logger
+
+# Delete a lock only while it still holds the caller's token.
+#   KEYS: lock key
+#   ARGV: token
+_RELEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+def _fresh_key(key: str) -> str:
+    return f"{key}:fresh"
+
+
+def _lock_key(key: str) -> str:
+    return f"{key}:lock"
+
+
+def acquire_lock(key: str) -> str | None:
+    """Take the lock of ``key`` (``<key>:lock``) for ``SINGLE_FLIGHT_LOCK_TIMEOUT`` seconds.
+
+    Args:
+        key: Cache key of the value.
+
+    Returns:
+        The token that owns the lock, or None if another caller holds it.
+    """
+    token = secrets.token_hex(16)
+    client = get_redis_client(current_app)
+    if client is None:
+        acquired = cache.add(_lock_key(key), token, timeout=SINGLE_FLIGHT_LOCK_TIMEOUT)
+    else:
+        lock_key = f"{current_app.config['CACHE_KEY_PREFIX']}{_lock_key(key)}"
+        acquired = client.set(lock_key, token, nx=True, ex=SINGLE_FLIGHT_LOCK_TIMEOUT)
+    return token if acquired else None
+
+
+def release_lock(key: str, token: str) -> None:
+    """Release the lock of ``key`` if ``token`` still owns it.
+
+    Args:
+        key: Cache key of the value.
+        token: Token returned by :func:`acquire_lock`.
+    """
+    client = get_redis_client(current_app)
+    if client is None:
+        if cache.get(_lock_key(key)) == token:
+            cache.delete(_lock_key(key))
+        return
+    lock_key = f"{current_app.config['CACHE_KEY_PREFIX']}{_lock_key(key)}"
+    client.register_script(_RELEASE_SCRIPT)(keys=[lock_key], args=[token])
+
+
+def store(key: str, value: Any, timeout: int, soft_timeout: int | None = None) -> None:
+    """Cache a value, marking it fresh for ``soft_timeout`` seconds.
+
+    Args:
+        key: Cache key of the value.
+        value: Value to cache.
+        timeout: Seconds the value is kept.
+        soft_timeout: Seconds it is served without revalidation (None: until
+            it expires).
+    """
+    cache.set(key, value, timeout=timeout)
+    if soft_timeout:
+        cache.set(_fresh_key(key), 1, timeout=min(soft_timeout, timeout))
+
+
+def store_many(values: dict, timeout: int, soft_timeout: int | None = None) -> None:
+    """Cache several values at once, like :func:`store`.
+
+    Args:
+        values: Mapping of cache keys to values.
+        timeout: Seconds each value is kept.
+        soft_timeout: Seconds each value is served without revalidation.
+    """
+    if not values:
+        return
+    cache.set_many(values, timeout=timeout)
+    if soft_timeout:
+        cache.set_many(
+            dict.fromkeys(map(_fresh_key, values), 1), timeout=min(soft_timeout, timeout)
+        )
+
+
+def _wait_for(key: str) -> Any:
+    """Poll the cache until another caller has stored ``key``, or give up."""
+    deadline = time.monotonic() + SINGLE_FLIGHT_WAIT
+    while time.monotonic() < deadline:
+        time.sleep(SINGLE_FLIGHT_POLL_INTERVAL)
+        value = cache.get(key)
+        if value is not None:
+            return value
+    return None
+
+
+def cached_fetch(
+    key: str,
+    fetch: Callable[[], tuple[Any, int | None]],
+    soft_timeout: int | None = None,
+    force: bool = False,
+) -> Any:
+    """Return a cached value, letting a single caller at a time fetch it.
+
+    On a miss, the caller holding the ``<key>:lock`` fetches and stores the
+    value; concurrent callers wait up to ``SINGLE_FLIGHT_WAIT`` seconds for it.
+    On a stale hit (see ``soft_timeout``), the lock holder refreshes the value
+    and everyone else returns the stale copy immediately. A refresh that fails
+    or produces an uncacheable value also falls back to the stale copy.
+
+    Args:
+        key: Cache key of the value.
+        fetch: Callable returning ``(value, timeout)``. A falsy ``timeout``
+            returns the value without caching it (e.g. a transient error).
+        soft_timeout: Seconds a value is served before being revalidated. None
+            serves it until it expires.
+        force: Fetch (and store) unconditionally, ignoring the cached value.
+
+    Returns:
+        The cached, stale or freshly fetched value.
+
+    Raises:
+        Exception: Whatever ``fetch`` raises when no stale value is available.
+    """
+    if force:
+        return _fetch_and_store(key, fetch, soft_timeout)
+
+    if soft_timeout:
+        value, fresh = cache.get_many(key, _fresh_key(key))
+    else:
+        value, fresh = cache.get(key), True
+    if value is not None and fresh:
+        return value
+
+    token = acquire_lock(key)
+    if token is None:
+        if value is not None:
+            return value
+        value = _wait_for(key)
+        if value is not None:
+            return value
+        return _fetch_and_store(key, fetch, soft_timeout)
+
+    try:
+        return _fetch_and_store(key, fetch, soft_timeout, stale=value)
+    finally:
+        release_lock(key, token)
+
+
+def _fetch_and_store(key, fetch, soft_timeout, stale=None):
+    try:
+        value, timeout = fetch()
+    except Exception as e:
+        if stale is None:
+            raise
+        logger.warning(f"Refreshing {key} failed, serving the stale value: {e}")
+        return stale
+    if timeout:
+        store(key, value, timeout, soft_timeout)
+    elif stale is not None:
+        return stale
+    return value
@@ -19,8 +19,9 @@ discord_service = DiscordService()
 def _role_name_map(grants: list[PermissionGrant]) -> dict[str, str]:
     """Map Discord role IDs (used by role grants) to their role names.
 
-    Fetches the guild roles once. Returns an empty map (callers fall back to the
-    raw ID) if there are no role grants or Discord is unreachable.
+    Reads the roles from the cached guild snapshot. Returns an empty map
+    (callers fall back to the raw ID) if there are no role grants or Discord is
+    unreachable.
 
     Args:
         grants: The grants being displayed.
@@ -24,7 +24,7 @@ discord_service = DiscordService()
 def _current_role_count() -> int | None:
     """Best-effort current guild role count for display, or None on failure."""
     try:
-        return discord_service.count_roles_cached()
+        return discord_service.count_roles()
     except (DiscordAPIError, RuntimeError) as exc:
         logger.warning(f"Could not fetch guild role count: {exc}")
         return None
@@ -160,7 +160,11 @@ def callback():
         resp.raise_for_status()
         discord_user = resp.json()
         uid = discord_user["id"]
-        user, _ = UserService().get_or_create(str(uid))
+        user, _ = UserService().get_or_create(
+            str(uid),
+            name=discord_user.get("global_name") or discord_user.get("username", "Inconnu"),
+            username=discord_user.get("username"),
+        )
         user.refresh_roles()
         if not user.is_player:
             raise UnauthorizedError(
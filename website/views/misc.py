@@ -4,7 +4,6 @@ from flask import Blueprint, flash, redirect, render_template, request, url_for
 
 from config.constants import BADGE_CAMPAIGN_GM_ID, BADGE_CAMPAIGN_ID, BADGE_OS_GM_ID, BADGE_OS_ID
 from website.exceptions import NotFoundError
-from website.extensions import cache
 from website.services.system import SystemService
 from website.services.trophy import TrophyService
 from website.services.user import UserService
@@ -66,49 +65,9 @@ def list_user_badges():
     )
 
 
-@cache.cached(timeout=3600, key_prefix="leaderboard_os")
-def get_os_leaderboard():
-    """Get leaderboard for one-shot player badge.
-
-    Returns:
-        List of (User, total_quantity) tuples.
-    """
-    return trophy_service.get_leaderboard(BADGE_OS_ID, limit=10)
-
-
-@cache.cached(timeout=3600, key_prefix="leaderboard_campaign")
-def get_campaign_leaderboard():
-    """Get leaderboard for campaign player badge.
-
-    Returns:
-        List of (User, total_quantity) tuples.
-    """
-    return trophy_service.get_leaderboard(BADGE_CAMPAIGN_ID, limit=10)
-
-
-@cache.cached(timeout=3600, key_prefix="leaderboard_os_gm")
-def get_os_gm_leaderboard():
-    """Get leaderboard for one-shot GM badge.
-
-    Returns:
-        List of (User, total_quantity) tuples.
-    """
-    return trophy_service.get_leaderboard(BADGE_OS_GM_ID, limit=10)
-
-
-@cache.cached(timeout=3600, key_prefix="leaderboard_campaign_gm")
-def get_campaign_gm_leaderboard():
-    """Get leaderboard for campaign GM badge.
-
-    Returns:
-        List of (User, total_quantity) tuples.
-    """
-    return trophy_service.get_leaderboard(BADGE_CAMPAIGN_GM_ID, limit=10)
-
-
-def _serialize_leaderboard(entries):
-    """Convert (User, count) tuples to (dict, count) tuples."""
-    return [(user.to_dict(), count) for user, count in entries]
+def _leaderboard(trophy_id):
+    """Return a trophy's top 10 as (user dict, count) tuples."""
+    return [(user.to_dict(), count) for user, count in trophy_service.get_leaderboard(trophy_id)]
 
 
 @misc_bp.route("/badges/classement/", methods=["GET"])
@@ -116,8 +75,8 @@ def trophies_leaderboard():
     """Render the trophy leaderboard page."""
     return render_template(
         "trophies_leaderboard.j2",
-        os_leaderboard=_serialize_leaderboard(get_os_leaderboard()),
-        campaign_leaderboard=_serialize_leaderboard(get_campaign_leaderboard()),
-        os_gm_leaderboard=_serialize_leaderboard(get_os_gm_leaderboard()),
-        campaign_gm_leaderboard=_serialize_leaderboard(get_campaign_gm_leaderboard()),
+        os_leaderboard=_leaderboard(BADGE_OS_ID),
+        campaign_leaderboard=_leaderboard(BADGE_CAMPAIGN_ID),
+        os_gm_leaderboard=_leaderboard(BADGE_OS_GM_ID),
+        campaign_gm_leaderboard=_leaderboard(BADGE_CAMPAIGN_GM_ID),
     )